@@ -7,6 +7,9 @@ Exports:
     db: Function to get Supabase client
     get_supabase_client: Same as db
     check_connection: Health check function
+    get_pool_stats: Supabase HTTP connection pool statistics
+    run_db: Await a blocking DB call on the DB thread pool
+    execute_async: Await a query builder's execute() on the DB thread pool
 """
 
 from config.settings import settings, get_settings, Settings
@@ -15,7 +18,12 @@ from config.database import (
     get_supabase_client,
     get_admin_client,
     check_connection,
+    get_pool_stats,
     reset_connection,
+    run_db,
+    execute_async,
+    get_db_executor,
+    shutdown_db_executor,
     DatabaseSession,
     DatabaseError,
     ConnectionError
@@ -32,7 +40,12 @@ __all__ = [
     "get_supabase_client",
     "get_admin_client",
     "check_connection",
+    "get_pool_stats",
     "reset_connection",
+    "run_db",
+    "execute_async",
+    "get_db_executor",
+    "shutdown_db_executor",
     "DatabaseSession",
     "DatabaseError",
     "ConnectionError",
@@ -5,15 +5,24 @@ Provides Supabase client singleton for database operations.
 See STANDARDS_LOGGING.md for query logging patterns.
 """
 
-from supabase import create_client, Client
-from functools import lru_cache
-from typing import Optional
+from supabase import create_client, Client, ClientOptions
+from supabase_auth import SyncMemoryStorage
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable, Optional, TypeVar
+import asyncio
+import contextvars
+import threading
+import httpx
 import structlog
 
 from config.settings import settings
+from lib.query_stats import InstrumentedTransport
 
 logger = structlog.get_logger(__name__)
 
+T = TypeVar("T")
+
 
 class DatabaseError(Exception):
     """Base exception for database errors."""
@@ -25,6 +34,66 @@ class ConnectionError(DatabaseError):
     pass
 
 
+# ===================
+# HTTP TRANSPORT
+# ===================
+
+# One pooled httpx client per Supabase key, shared by PostgREST, storage and
+# auth. Keeps TLS connections warm and multiplexes requests over HTTP/2.
+_http_clients: dict[str, httpx.Client] = {}
+_request_counts: dict[str, int] = {}
+_counts_lock = threading.Lock()
+
+
+def _build_http_client(name: str) -> httpx.Client:
+    """
+    Build a pooled httpx client for one Supabase client.
+
+    Pool size, keep-alive and HTTP/2 come from settings (supabase_pool_*,
+    supabase_http2). Requests are counted per client for get_pool_stats()
+    and recorded per request by lib.query_stats.
+    """
+    _request_counts[name] = 0
+
+    def count_request(request: httpx.Request) -> None:
+        with _counts_lock:
+            _request_counts[name] += 1
+
+    transport = httpx.HTTPTransport(
+        http2=settings.supabase_http2,
+        limits=httpx.Limits(
+            max_connections=settings.supabase_pool_max_connections,
+            max_keepalive_connections=settings.supabase_pool_max_keepalive,
+            keepalive_expiry=settings.supabase_pool_keepalive_seconds,
+        ),
+    )
+    client = httpx.Client(
+        transport=InstrumentedTransport(transport),
+        timeout=httpx.Timeout(
+            settings.supabase_timeout_seconds,
+            connect=settings.supabase_connect_timeout_seconds,
+        ),
+        follow_redirects=True,
+        event_hooks={"request": [count_request]},
+    )
+    _http_clients[name] = client
+    return client
+
+
+def _client_options(name: str) -> ClientOptions:
+    """Supabase client options wired to a pooled httpx client."""
+    return ClientOptions(
+        storage=SyncMemoryStorage(),
+        httpx_client=_build_http_client(name),
+    )
+
+
+def _close_http_client(name: str) -> None:
+    client = _http_clients.pop(name, None)
+    if client is not None:
+        client.close()
+
+
 @lru_cache()
 def get_supabase_client() -> Client:
     """
@@ -42,12 +111,15 @@ def get_supabase_client() -> Client:
     try:
         logger.info(
             "connecting_to_supabase",
-            url=settings.supabase_url[:30] + "..."  # Log partial URL only
+            url=settings.supabase_url[:30] + "...",  # Log partial URL only
+            http2=settings.supabase_http2,
+            max_connections=settings.supabase_pool_max_connections,
         )
         
         client = create_client(
             settings.supabase_url,
-            settings.supabase_key
+            settings.supabase_key,
+            options=_client_options("default"),
         )
         
         # Test connection with simple query
@@ -61,6 +133,7 @@ def get_supabase_client() -> Client:
         return client
         
     except Exception as e:
+        _close_http_client("default")
         logger.error(
             "supabase_connection_failed",
             error=str(e),
@@ -69,31 +142,79 @@ def get_supabase_client() -> Client:
         raise ConnectionError(f"Failed to connect to Supabase: {e}") from e
 
 
+_admin_client: Optional[Client] = None
+_admin_lock = threading.Lock()
+
+
 def get_admin_client() -> Optional[Client]:
     """
     Get Supabase client with service role key (admin access).
     
     Only available if SUPABASE_SERVICE_KEY is configured.
     Use sparingly - only for operations requiring admin access.
+    Created once and reused; failures are not cached so the next
+    call retries.
     
     Returns:
         Client: Admin Supabase client, or None if not configured
     """
+    global _admin_client
+
     if not settings.supabase_service_key:
         logger.warning("admin_client_not_configured")
         return None
-    
-    try:
-        return create_client(
-            settings.supabase_url,
-            settings.supabase_service_key
-        )
-    except Exception as e:
-        logger.error(
-            "admin_client_failed",
-            error=str(e)
-        )
-        return None
+
+    if _admin_client is not None:
+        return _admin_client
+
+    with _admin_lock:
+        if _admin_client is None:
+            try:
+                _admin_client = create_client(
+                    settings.supabase_url,
+                    settings.supabase_service_key,
+                    options=_client_options("admin"),
+                )
+            except Exception as e:
+                _close_http_client("admin")
+                logger.error(
+                    "admin_client_failed",
+                    error=str(e)
+                )
+                return None
+
+    return _admin_client
+
+
+def get_pool_stats() -> dict:
+    """
+    Connection pool statistics for each Supabase client.
+
+    Returns:
+        dict keyed by client name ("default", "admin") with pool limits,
+        open/idle/HTTP2 connection counts and total requests sent
+    """
+    stats = {}
+    for name, client in list(_http_clients.items()):
+        # httpx does not expose its pool publicly; read the httpcore pool
+        transport = getattr(client, "_transport", None)
+        transport = getattr(transport, "wrapped", transport)
+        pool = getattr(transport, "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+        stats[name] = {
+            "http2_enabled": settings.supabase_http2,
+            "max_connections": settings.supabase_pool_max_connections,
+            "max_keepalive_connections": settings.supabase_pool_max_keepalive,
+            "keepalive_expiry_seconds": settings.supabase_pool_keepalive_seconds,
+            "open_connections": len(connections),
+            "idle_connections": sum(1 for c in connections if c.is_idle()),
+            "http2_connections": sum(
+                1 for c in connections
+                if "HTTP/2" in (c.info() if hasattr(c, "info") else "")
+            ),
+            "requests_total": _request_counts.get(name, 0),
+        }
+    return stats
 
 
 # Convenience alias
@@ -137,6 +258,87 @@ class DatabaseSession:
         return False  # Don't suppress exceptions
 
 
+# ===================
+# ASYNC ACCESS
+# ===================
+
+_db_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """
+    Get the bounded thread pool used for blocking Supabase calls.
+
+    Size comes from settings.db_max_workers. Calls beyond that limit queue
+    inside the executor instead of opening more connections.
+
+    Returns:
+        ThreadPoolExecutor: Shared DB executor
+    """
+    global _db_executor
+    if _db_executor is None:
+        _db_executor = ThreadPoolExecutor(
+            max_workers=settings.db_max_workers,
+            thread_name_prefix="db",
+        )
+        logger.info("db_executor_created", max_workers=settings.db_max_workers)
+    return _db_executor
+
+
+async def run_db(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking database call on the DB thread pool.
+
+    supabase-py is synchronous, so calling it from an async route blocks
+    the event loop for the whole round trip. Awaiting run_db keeps the
+    loop free and lets concurrent requests overlap their I/O. The caller's
+    contextvars are carried into the worker thread.
+
+    Usage:
+        products, total = await run_db(service.get_all, page=1)
+
+    Args:
+        func: Synchronous callable (service method, helper, ...)
+        *args, **kwargs: Passed through to func
+
+    Returns:
+        Whatever func returns
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(
+        get_db_executor(),
+        partial(ctx.run, func, *args, **kwargs),
+    )
+
+
+async def execute_async(query: Any) -> Any:
+    """
+    Await a PostgREST query builder's execute() on the DB thread pool.
+
+    Usage:
+        result = await execute_async(
+            db.table("products").select("id, sku").eq("active", True)
+        )
+
+    Args:
+        query: Any supabase-py builder with an execute() method
+
+    Returns:
+        The APIResponse from execute()
+    """
+    return await run_db(query.execute)
+
+
+def shutdown_db_executor() -> None:
+    """Shut down the DB thread pool, waiting for in-flight calls."""
+    global _db_executor
+    if _db_executor is not None:
+        _db_executor.shutdown(wait=True)
+        _db_executor = None
+        logger.info("db_executor_shutdown")
+
+
 # ===================
 # HELPER FUNCTIONS
 # ===================
@@ -174,5 +376,10 @@ def reset_connection():
     
     Call this if connection becomes stale or after config changes.
     """
+    global _admin_client
+
     get_supabase_client.cache_clear()
+    _admin_client = None
+    for name in list(_http_clients):
+        _close_http_client(name)
     logger.info("database_connection_reset")
@@ -45,6 +45,52 @@ class Settings(BaseSettings):
         None,
         description="Supabase JWT signing secret (used to verify user tokens)"
     )
+    db_max_workers: int = Field(
+        default=16,
+        ge=1,
+        le=128,
+        description="Threads for blocking Supabase calls awaited from async routes"
+    )
+    supabase_http2: bool = Field(
+        default=True,
+        description="Multiplex PostgREST/storage requests over HTTP/2"
+    )
+    supabase_pool_max_connections: int = Field(
+        default=20,
+        ge=1,
+        le=200,
+        description="Maximum open HTTP connections per Supabase client"
+    )
+    supabase_pool_max_keepalive: int = Field(
+        default=10,
+        ge=0,
+        le=200,
+        description="Idle connections kept warm per Supabase client"
+    )
+    supabase_pool_keepalive_seconds: float = Field(
+        default=60.0,
+        ge=1,
+        le=600,
+        description="Seconds an idle Supabase connection stays open"
+    )
+    supabase_timeout_seconds: float = Field(
+        default=120.0,
+        ge=1,
+        le=600,
+        description="Read/write timeout for Supabase HTTP requests"
+    )
+    supabase_connect_timeout_seconds: float = Field(
+        default=10.0,
+        ge=1,
+        le=120,
+        description="Connect timeout for Supabase HTTP requests"
+    )
+    db_query_alarm_threshold: int = Field(
+        default=50,
+        ge=0,
+        le=10000,
+        description="Log db_query_alarm when one request makes more Supabase calls than this (0 = off)"
+    )
 
     # ===================
     # API SECURITY
@@ -73,7 +119,137 @@ class Settings(BaseSettings):
         None,
         description="Telegram chat ID for alerts"
     )
-    
+    telegram_outbox_batch_window_seconds: float = Field(
+        default=2.0,
+        ge=0,
+        le=60,
+        description="Seconds the Telegram outbox waits to coalesce a burst into one digest"
+    )
+    telegram_outbox_max_retries: int = Field(
+        default=5,
+        ge=0,
+        le=20,
+        description="Retries (exponential backoff) before a Telegram digest is dropped"
+    )
+    telegram_outbox_max_queue: int = Field(
+        default=1000,
+        ge=10,
+        le=100000,
+        description="Maximum queued Telegram messages; further sends are dropped"
+    )
+
+    # ===================
+    # DOCUMENT INGESTION
+    # ===================
+    ingest_jobs_db_path: str = Field(
+        default="data/ingest_jobs.sqlite3",
+        description="Local SQLite file storing background ingestion job status and results"
+    )
+    ingest_max_concurrency: int = Field(
+        default=2,
+        ge=1,
+        le=16,
+        description="Ingestion jobs (PDF parsing, Claude Vision calls) running at once"
+    )
+    ingest_job_retention_hours: int = Field(
+        default=48,
+        ge=1,
+        le=720,
+        description="Finished jobs older than this are pruned from the job store"
+    )
+    pdf_extract_workers: int = Field(
+        default=2,
+        ge=0,
+        le=16,
+        description="Processes for page-parallel pdfplumber extraction (0 = extract inline)"
+    )
+    pdf_parallel_min_pages: int = Field(
+        default=4,
+        ge=2,
+        le=100,
+        description="PDFs with fewer pages are extracted inline; the pool only pays off for longer documents"
+    )
+    pdf_early_exit: bool = Field(
+        default=False,
+        description="Stop extracting pages once the document type's required fields are found. "
+                    "Faster on long BLs, but containers listed only on later pages are missed"
+    )
+    vision_cache_dir: str = Field(
+        default="data/vision_cache",
+        description="Directory for cached Claude Vision parse results"
+    )
+    vision_cache_ttl_hours: int = Field(
+        default=720,
+        ge=1,
+        le=8760,
+        description="Cached Claude Vision results older than this are re-parsed"
+    )
+    vision_cache_max_mb: int = Field(
+        default=200,
+        ge=1,
+        le=10240,
+        description="Size budget for the Claude Vision cache; least recently used entries are evicted"
+    )
+    preview_backend: str = Field(
+        default="memory",
+        pattern="^(memory|sqlite)$",
+        description="Upload preview store: memory (per process) or sqlite (shared by all uvicorn workers)"
+    )
+    preview_db_path: str = Field(
+        default="data/previews.sqlite3",
+        description="Local SQLite file for upload previews when preview_backend=sqlite"
+    )
+    preview_cache_max_mb: int = Field(
+        default=64,
+        ge=1,
+        le=4096,
+        description="In-memory budget for upload previews (compressed); least recently used ones spill to disk"
+    )
+    preview_spill_kb: int = Field(
+        default=1024,
+        ge=0,
+        le=1048576,
+        description="Previews larger than this (compressed) are written straight to disk"
+    )
+    preview_cache_dir: str = Field(
+        default="data/preview_cache",
+        description="Directory for upload previews spilled out of memory"
+    )
+    preview_disk_max_mb: int = Field(
+        default=1024,
+        ge=1,
+        le=102400,
+        description="Disk budget for spilled previews (or the SQLite store); least recently used ones are dropped beyond it"
+    )
+    preview_sweep_seconds: int = Field(
+        default=60,
+        ge=1,
+        le=3600,
+        description="Interval of the background sweep that drops expired previews"
+    )
+
+    # ===================
+    # PLANNING
+    # ===================
+    planning_inputs_ttl_seconds: int = Field(
+        default=60,
+        ge=0,
+        le=3600,
+        description="How long planners share one fetch of boats, drafts, snapshots, sales and production (0 = no caching)"
+    )
+    horizon_batch_workers: int = Field(
+        default=2,
+        ge=0,
+        le=16,
+        description="Processes running per-factory brains for the all-factories horizon (0 = compute inline)"
+    )
+    horizon_resume_factories: int = Field(
+        default=8,
+        ge=0,
+        le=64,
+        description="Factories whose last brain run is kept to resume from after a draft save (0 = always recompute)"
+    )
+
     # ===================
     # BUSINESS SETTINGS
     # ===================
@@ -2,9 +2,17 @@
 Telegram bot integration for sending alerts.
 
 Sends formatted alert messages to a Telegram channel/chat.
+
+Messages go through an in-process outbox drained by a background task
+started in the app lifespan, so request handlers never wait on the
+Telegram API. Outside the app (scripts, tests) sends fall back to a
+blocking request.
 """
 
-from typing import Optional
+import asyncio
+import queue
+from dataclasses import dataclass, field
+from typing import Callable, Optional
 import httpx
 import structlog
 
@@ -99,10 +107,44 @@ def format_alert_message(alert: AlertResponse) -> str:
     return "\n".join(lines)
 
 
-def send_message(message: str, parse_mode: str = "Markdown") -> bool:
+def send_message(
+    message: str,
+    parse_mode: str = "Markdown",
+    on_delivered: Optional[Callable[[], None]] = None,
+) -> bool:
     """
     Send message to Telegram.
 
+    When the outbox is running the message is queued and this returns
+    immediately; delivery, batching and retries happen in the background.
+    Otherwise the message is sent with a blocking request.
+
+    Args:
+        message: Message text to send
+        parse_mode: Telegram parse mode (Markdown or HTML)
+        on_delivered: Optional callback run (in a worker thread) once
+            Telegram has accepted the message
+
+    Returns:
+        True if queued or sent successfully
+
+    Raises:
+        TelegramError: If a blocking send fails
+    """
+    outbox = get_telegram_outbox()
+    if outbox.is_running:
+        return outbox.enqueue(message, parse_mode, on_delivered)
+
+    sent = send_message_sync(message, parse_mode)
+    if sent and on_delivered is not None:
+        on_delivered()
+    return sent
+
+
+def send_message_sync(message: str, parse_mode: str = "Markdown") -> bool:
+    """
+    Send message to Telegram with a blocking request.
+
     Args:
         message: Message text to send
         parse_mode: Telegram parse mode (Markdown or HTML)
@@ -149,21 +191,25 @@ def send_message(message: str, parse_mode: str = "Markdown") -> bool:
         raise TelegramError(f"Failed to send Telegram message: {str(e)}")
 
 
-def send_alert_to_telegram(alert: AlertResponse) -> bool:
+def send_alert_to_telegram(
+    alert: AlertResponse,
+    on_delivered: Optional[Callable[[], None]] = None,
+) -> bool:
     """
     Send alert to Telegram with formatted message.
 
     Args:
         alert: Alert to send
+        on_delivered: Optional callback run once Telegram accepts the message
 
     Returns:
-        True if sent successfully
+        True if queued or sent successfully
 
     Raises:
-        TelegramError: If send fails
+        TelegramError: If a blocking send fails
     """
     message = format_alert_message(alert)
-    return send_message(message)
+    return send_message(message, on_delivered=on_delivered)
 
 
 def test_connection() -> dict:
@@ -207,7 +253,7 @@ def test_connection() -> dict:
 
         # Send test message
         test_msg = "✅ *Telegram Integration Test*\n\nConnection successful! Your floor-tile-saas alerts are now configured."
-        send_message(test_msg)
+        send_message_sync(test_msg)
 
         return {
             "configured": True,
@@ -219,4 +265,362 @@ def test_connection() -> dict:
 
     except httpx.RequestError as e:
         logger.error("telegram_connection_test_failed", error=str(e))
-        raise TelegramError(f"Failed to test Telegram connection: {str(e)}")
\ No newline at end of file
+        raise TelegramError(f"Failed to test Telegram connection: {str(e)}")
+
+# ===================
+# OUTBOX
+# ===================
+
+# Telegram rejects sendMessage texts longer than this
+TELEGRAM_MAX_MESSAGE_LENGTH = 4096
+
+DIGEST_SEPARATOR = "\n\n" + "─" * 12 + "\n\n"
+
+
+@dataclass
+class OutboxMessage:
+    """A message waiting in the outbox."""
+    text: str
+    parse_mode: str = "Markdown"
+    on_delivered: Optional[Callable[[], None]] = None
+
+
+@dataclass
+class Digest:
+    """One sendMessage call: one or more coalesced outbox messages."""
+    text: str
+    parse_mode: str
+    callbacks: list[Callable[[], None]] = field(default_factory=list)
+    message_count: int = 1
+    # The coalesced messages, so a rejected digest can be resent one by one
+    messages: list[OutboxMessage] = field(default_factory=list)
+
+
+def _split_long_text(text: str, limit: int) -> list[str]:
+    """Split text into chunks under limit, preferring line boundaries."""
+    chunks: list[str] = []
+    current = ""
+    for line in text.split("\n"):
+        while len(line) > limit:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(line[:limit])
+            line = line[limit:]
+        candidate = f"{current}\n{line}" if current else line
+        if len(candidate) > limit:
+            chunks.append(current)
+            current = line
+        else:
+            current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def build_digests(
+    messages: list[OutboxMessage],
+    limit: int = TELEGRAM_MAX_MESSAGE_LENGTH,
+) -> list[Digest]:
+    """
+    Coalesce queued messages into as few sendMessage calls as possible.
+
+    Consecutive messages with the same parse mode are joined with a
+    separator while the result stays within Telegram's length limit.
+    Order is preserved. A single message longer than the limit is split
+    into several digests; its callback fires with the last chunk.
+
+    Args:
+        messages: Messages in enqueue order
+        limit: Maximum characters per digest
+
+    Returns:
+        List of digests in send order
+    """
+    digests: list[Digest] = []
+
+    for msg in messages:
+        callbacks = [msg.on_delivered] if msg.on_delivered else []
+
+        if len(msg.text) > limit:
+            chunks = _split_long_text(msg.text, limit)
+            for i, chunk in enumerate(chunks):
+                is_last = i == len(chunks) - 1
+                digests.append(Digest(
+                    text=chunk,
+                    parse_mode=msg.parse_mode,
+                    callbacks=callbacks if is_last else [],
+                ))
+            continue
+
+        last = digests[-1] if digests else None
+        if (
+            last is not None
+            and last.parse_mode == msg.parse_mode
+            and len(last.text) + len(DIGEST_SEPARATOR) + len(msg.text) <= limit
+        ):
+            last.text = f"{last.text}{DIGEST_SEPARATOR}{msg.text}"
+            last.callbacks.extend(callbacks)
+            last.message_count += 1
+            last.messages.append(msg)
+        else:
+            digests.append(Digest(
+                text=msg.text,
+                parse_mode=msg.parse_mode,
+                callbacks=callbacks,
+                messages=[msg],
+            ))
+
+    return digests
+
+
+class TelegramOutbox:
+    """
+    Background Telegram sender.
+
+    Callers enqueue from any thread and return immediately. A task on the
+    app's event loop drains the queue, waits a short window so bursts
+    coalesce into digests, and delivers them over a shared keep-alive
+    AsyncClient, retrying transient failures with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        batch_window_seconds: float = 2.0,
+        max_retries: int = 5,
+        max_queue_size: int = 1000,
+        backoff_base_seconds: float = 1.0,
+        backoff_max_seconds: float = 60.0,
+    ):
+        self.batch_window_seconds = batch_window_seconds
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+
+        self._queue: queue.Queue[OutboxMessage] = queue.Queue(maxsize=max_queue_size)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._stopping = False
+
+        self.stats = {"queued": 0, "sent": 0, "digests": 0, "retries": 0, "dropped": 0}
+
+    @property
+    def is_running(self) -> bool:
+        """True while the drain task is alive."""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def pending(self) -> int:
+        """Messages waiting to be sent."""
+        return self._queue.qsize()
+
+    # ===================
+    # PRODUCER SIDE
+    # ===================
+
+    def enqueue(
+        self,
+        text: str,
+        parse_mode: str = "Markdown",
+        on_delivered: Optional[Callable[[], None]] = None,
+    ) -> bool:
+        """
+        Queue a message for background delivery. Thread-safe.
+
+        Returns:
+            True if queued, False if Telegram is not configured or the
+            queue is full
+        """
+        if not settings.telegram_configured:
+            logger.warning("telegram_not_configured_skipping_send")
+            return False
+
+        try:
+            self._queue.put_nowait(OutboxMessage(text, parse_mode, on_delivered))
+        except queue.Full:
+            self.stats["dropped"] += 1
+            logger.warning("telegram_outbox_full", pending=self.pending)
+            return False
+
+        self.stats["queued"] += 1
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        return True
+
+    # ===================
+    # LIFECYCLE
+    # ===================
+
+    async def start(self) -> None:
+        """Start the drain task on the running event loop."""
+        if self.is_running:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._client = httpx.AsyncClient(
+            timeout=10,
+            limits=httpx.Limits(max_connections=2, max_keepalive_connections=2, keepalive_expiry=120),
+        )
+        self._task = asyncio.create_task(self._run(), name="telegram-outbox")
+        logger.info("telegram_outbox_started")
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Flush what can be sent within timeout, then shut down."""
+        if self._task is None:
+            return
+
+        self._stopping = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            logger.warning("telegram_outbox_stop_timeout", pending=self.pending)
+
+        await self._client.aclose()
+        self._task = None
+        self._client = None
+        self._loop = None
+        self._wakeup = None
+        logger.info("telegram_outbox_stopped", **self.stats)
+
+    # ===================
+    # CONSUMER SIDE
+    # ===================
+
+    async def _run(self) -> None:
+        while True:
+            if self._queue.empty():
+                if self._stopping:
+                    return
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+
+            # Let a burst accumulate so it goes out as one digest
+            if not self._stopping and self.batch_window_seconds > 0:
+                await asyncio.sleep(self.batch_window_seconds)
+
+            batch = self._drain()
+            for digest in build_digests(batch):
+                await self._deliver(digest)
+
+    def _drain(self) -> list[OutboxMessage]:
+        batch: list[OutboxMessage] = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                return batch
+
+    async def _deliver(self, digest: Digest) -> bool:
+        bot_token, chat_id = get_telegram_config()
+        if not bot_token or not chat_id:
+            return False
+
+        url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+        payload = {
+            "chat_id": chat_id,
+            "text": digest.text,
+            "parse_mode": digest.parse_mode,
+            "disable_web_page_preview": True,
+        }
+
+        for attempt in range(self.max_retries + 1):
+            delay = min(self.backoff_base_seconds * (2 ** attempt), self.backoff_max_seconds)
+            try:
+                response = await self._client.post(url, json=payload)
+                if response.status_code == 429:
+                    retry_after = (
+                        response.json().get("parameters", {}).get("retry_after")
+                    )
+                    if retry_after:
+                        delay = float(retry_after)
+                elif response.status_code >= 500:
+                    pass
+                else:
+                    result = response.json()
+                    if not result.get("ok"):
+                        # 4xx other than rate limiting will not succeed on retry
+                        logger.error(
+                            "telegram_api_error",
+                            error=result.get("description", "Unknown error"),
+                            messages=digest.message_count,
+                        )
+                        if len(digest.messages) > 1:
+                            # Usually one message's bad Markdown: only that one is lost
+                            return await self._deliver_separately(digest)
+                        self.stats["dropped"] += digest.message_count
+                        return False
+
+                    self.stats["sent"] += digest.message_count
+                    self.stats["digests"] += 1
+                    logger.info(
+                        "telegram_message_sent",
+                        message_id=result.get("result", {}).get("message_id"),
+                        messages=digest.message_count,
+                    )
+                    await self._run_callbacks(digest)
+                    return True
+
+                logger.warning(
+                    "telegram_send_retryable",
+                    status=response.status_code,
+                    attempt=attempt + 1,
+                )
+            except (httpx.RequestError, ValueError) as e:
+                logger.warning(
+                    "telegram_request_failed",
+                    error=str(e),
+                    attempt=attempt + 1,
+                )
+
+            if attempt < self.max_retries:
+                self.stats["retries"] += 1
+                await asyncio.sleep(delay)
+
+        self.stats["dropped"] += digest.message_count
+        logger.error("telegram_send_gave_up", messages=digest.message_count)
+        return False
+
+    async def _deliver_separately(self, digest: Digest) -> bool:
+        """Resend a rejected digest's messages one per sendMessage call."""
+        logger.info("telegram_digest_split", messages=digest.message_count)
+        delivered = True
+        for msg in digest.messages:
+            single = Digest(
+                text=msg.text,
+                parse_mode=msg.parse_mode,
+                callbacks=[msg.on_delivered] if msg.on_delivered else [],
+                messages=[msg],
+            )
+            delivered = await self._deliver(single) and delivered
+        return delivered
+
+    async def _run_callbacks(self, digest: Digest) -> None:
+        # Callbacks typically hit the (blocking) database
+        for callback in digest.callbacks:
+            try:
+                await asyncio.to_thread(callback)
+            except Exception as e:
+                logger.warning("telegram_delivery_callback_failed", error=str(e))
+
+
+# Singleton instance
+_telegram_outbox: Optional[TelegramOutbox] = None
+
+
+def get_telegram_outbox() -> TelegramOutbox:
+    """Get or create TelegramOutbox instance."""
+    global _telegram_outbox
+    if _telegram_outbox is None:
+        _telegram_outbox = TelegramOutbox(
+            batch_window_seconds=settings.telegram_outbox_batch_window_seconds,
+            max_retries=settings.telegram_outbox_max_retries,
+            max_queue_size=settings.telegram_outbox_max_queue,
+        )
+    return _telegram_outbox
@@ -12,6 +12,7 @@ Production is unified into the cascade:
 - Production requests only target non-skipped boats
 """
 
+from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
 from decimal import Decimal, ROUND_UP
 from typing import Any
@@ -26,6 +27,7 @@ from .constants import (
     TIER_BUFFER_CONFIG,
 )
 from .coverage import days_of_stock as _days_of_stock
+from .telemetry import BRAIN_STEP_DURATION, StepTimer
 
 
 def _classify_tiers(
@@ -79,6 +81,60 @@ def _compute_buffer_m2(
 #
 
 
+@dataclass
+class BrainState:
+    """What the cascade carries from one boat to the next."""
+    running_stock: dict[str, Decimal]
+    factory_avail: dict[str, Decimal]
+    # Track unmet gaps per product for post-loop production requests.
+    # Gaps tracked on ALL boats (including skipped) — production needs are
+    # independent of whether any single boat is worth shipping.
+    gap_viable: dict[str, dict] = field(default_factory=dict)  # pid → first gap seen
+    viable_boat_count: int = 0
+
+    def copy(self) -> "BrainState":
+        # Values are Decimals and never-mutated gap dicts: shallow copies suffice
+        return BrainState(
+            running_stock=dict(self.running_stock),
+            factory_avail=dict(self.factory_avail),
+            gap_viable=dict(self.gap_viable),
+            viable_boat_count=self.viable_boat_count,
+        )
+
+
+@dataclass
+class _BoatResult:
+    projection: dict
+    skip_recommendation: dict | None
+    debug: dict
+
+
+@dataclass
+class _HorizonContext:
+    """Indexed inputs (steps 1–5): fixed for the whole simulation."""
+    today: date
+    product_map: dict[str, dict]
+    product_ids: list[str]
+    tier_map: dict[str, str]
+    buffer_m2_map: dict[str, Decimal]
+    inventory: dict[str, Decimal]
+    velocities: dict[str, Decimal]
+    snapshot_created_at: datetime | None
+    shipments_by_boat: dict[str, dict[str, Decimal]]
+    drafts_by_boat: dict[str, dict[str, dict]]
+    draft_status_by_boat: dict[str, str]
+    draft_id_by_boat: dict[str, str]
+    draft_ordered_at_by_boat: dict[str, datetime | None]
+    draft_boat_ids: set[str]
+    production_by_product: dict[str, list[dict]]
+    scheduled_production: dict[str, Decimal]
+    boats_with_shipments: set[str]
+    simulate_boats: list[dict]
+    boat_states: dict[str, str]
+    arriving_soon: dict[str, Decimal]
+    initial_state: BrainState
+
+
 def compute_horizon(
     *,
     products: list[dict],
@@ -108,6 +164,149 @@ def compute_horizon(
         _debug:               full math trace,
     }
     """
+    steps = StepTimer(BRAIN_STEP_DURATION)
+    ctx = _prepare(
+        products=products,
+        boats=boats,
+        inventory=inventory,
+        velocities=velocities,
+        peak_velocities=peak_velocities,
+        factory_stock=factory_stock,
+        drafts=drafts,
+        draft_headers=draft_headers,
+        shipment_items=shipment_items,
+        production_schedule=production_schedule,
+        today=today,
+        snapshot_created_at=snapshot_created_at,
+        steps=steps,
+    )
+
+    # ── STEP 6: Simulate forward ──────────────────────────────────────────
+    state = ctx.initial_state.copy()
+    boat_results = [_simulate_boat(ctx, state, i) for i in range(len(ctx.simulate_boats))]
+    steps.mark("simulate")
+
+    result = _finalize(ctx, state, boat_results, steps)
+    steps.finish()
+    return result
+
+
+@dataclass
+class HorizonRun:
+    """
+    A brain run kept so later runs can resume from it.
+
+    checkpoints[i] is the cascade state before boat i (after boat i-1);
+    the last entry is the final state.
+    """
+    ctx: _HorizonContext
+    checkpoints: list[BrainState]
+    boat_results: list[_BoatResult]
+    result: dict[str, Any]
+    resumed_at_boat: int = 0
+
+
+def run_horizon(*, today: date, **inputs) -> HorizonRun:
+    """compute_horizon, keeping the state checkpoints for resume_horizon()."""
+    steps = StepTimer(BRAIN_STEP_DURATION)
+    ctx = _prepare(**inputs, today=today, steps=steps)
+    return _run_from(ctx, ctx.initial_state, 0, [], [], steps)
+
+
+def resume_horizon(previous: HorizonRun, *, today: date, **inputs) -> HorizonRun:
+    """
+    compute_horizon on new inputs, resuming from `previous` where possible.
+
+    Boats before the first one whose inputs differ (its draft, shipment,
+    dates, or the next boat's arrival) keep their previous results; the
+    cascade restarts from the checkpoint before it. A change to anything
+    product-level (snapshots, velocities, production, ...) re-simulates
+    every boat. The result equals compute_horizon(**inputs, today=today).
+    """
+    steps = StepTimer(BRAIN_STEP_DURATION)
+    ctx = _prepare(**inputs, today=today, steps=steps)
+    k = _shared_prefix(previous.ctx, ctx)
+    # k > 0 implies the same initial state, so the previous checkpoint applies
+    start = previous.checkpoints[k] if k else ctx.initial_state
+    return _run_from(ctx, start, k, previous.checkpoints[:k], previous.boat_results[:k], steps)
+
+
+def _run_from(
+    ctx: _HorizonContext,
+    start: BrainState,
+    k: int,
+    checkpoints: list[BrainState],
+    boat_results: list[_BoatResult],
+    steps: StepTimer,
+) -> HorizonRun:
+    """STEP 6 from boat k (boats before it given), then steps 7–9."""
+    state = start.copy()
+    for i in range(k, len(ctx.simulate_boats)):
+        checkpoints.append(state.copy())
+        boat_results.append(_simulate_boat(ctx, state, i))
+    checkpoints.append(state)
+    steps.mark("simulate")
+
+    result = _finalize(ctx, state, boat_results, steps)
+    steps.finish()
+    return HorizonRun(
+        ctx=ctx,
+        checkpoints=checkpoints,
+        boat_results=boat_results,
+        result=result,
+        resumed_at_boat=k,
+    )
+
+
+def compute_horizon_variants(
+    *,
+    base: dict[str, Any],
+    variants: list[dict[str, Any]],
+    today: date,
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """
+    Run the brain on a base input set and on variants of it (what-if scenarios).
+
+    `base` and each variant take compute_horizon's keyword inputs (minus
+    today). Each variant resumes from the base run (resume_horizon) at the
+    first boat it changes. Each result equals compute_horizon(**variant),
+    plus "_resumed_at_boat" (0 when nothing could be reused).
+
+    Returns:
+        (base result, variant results in input order)
+    """
+    base_run = run_horizon(**base, today=today)
+    results = []
+    for variant in variants:
+        run = resume_horizon(base_run, **variant, today=today)
+        run.result["_resumed_at_boat"] = run.resumed_at_boat
+        results.append(run.result)
+    return base_run.result, results
+
+
+def _parse_date(value) -> date:
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _prepare(
+    *,
+    products: list[dict],
+    boats: list[dict],
+    inventory: dict[str, Decimal],
+    velocities: dict[str, Decimal],
+    factory_stock: dict[str, Decimal],
+    drafts: list[dict],
+    draft_headers: list[dict],
+    shipment_items: list[dict],
+    production_schedule: list[dict],
+    today: date,
+    peak_velocities: dict[str, Decimal] | None = None,
+    in_transit: dict[str, Decimal] | None = None,
+    snapshot_created_at: datetime | None = None,
+    steps: StepTimer | None = None,
+) -> _HorizonContext:
+    """Steps 1–5: index inputs, order and classify boats, initial stock."""
+    mark = steps.mark if steps else (lambda step: None)
 
     # ── STEP 1: Index inputs ──────────────────────────────────────────────
 
@@ -195,6 +394,8 @@ def compute_horizon(
                 requested = Decimal(str(entry.get("requested_m2") or 0))
                 scheduled_production[pid] = scheduled_production.get(pid, Decimal(0)) + requested
 
+    mark("index_inputs")
+
     # ── STEP 2: Sort and classify boats ────────────────────────────────────
     # No anchor. Every boat gets simulated. State is for display only.
 
@@ -204,26 +405,26 @@ def compute_horizon(
 
     sorted_boats = sorted(boats, key=lambda b: b["departure_date"])
 
+    mark("sort_boats")
+
     # ── STEP 3: Compute arriving_soon ─────────────────────────────────────
 
     arriving_soon: dict[str, Decimal] = {}
     for b in sorted_boats:
         if b["id"] not in shipments_by_boat:
             continue
-        arrival = b["arrival_date"]
-        if isinstance(arrival, str):
-            arrival = date.fromisoformat(arrival)
+        arrival = _parse_date(b["arrival_date"])
         if arrival >= today:
             for pid, m2 in shipments_by_boat[b["id"]].items():
                 arriving_soon[pid] = arriving_soon.get(pid, Decimal(0)) + m2
 
+    mark("arriving_soon")
+
     # ── STEP 4: Classify boats (display state only) ──────────────────────
 
     def _boat_state(b: dict) -> str:
         bid = b["id"]
-        dep = b["departure_date"]
-        if isinstance(dep, str):
-            dep = date.fromisoformat(dep)
+        dep = _parse_date(b["departure_date"])
         if bid in boats_with_shipments:
             return "DISPATCHED" if dep <= today else "CONFIRMED"
         status = draft_status_by_boat.get(bid, "")
@@ -233,10 +434,9 @@ def compute_horizon(
             return "PLANNING"
         return "FUTURE"
 
-    simulate_boats = []
-    for b in sorted_boats:
-        b["_state"] = _boat_state(b)
-        simulate_boats.append(b)
+    boat_states = {b["id"]: _boat_state(b) for b in sorted_boats}
+
+    mark("classify_boats")
 
     # ── STEP 5: Initialize running stock ──────────────────────────────────
 
@@ -246,295 +446,378 @@ def compute_horizon(
         arr = arriving_soon.get(pid, Decimal(0))
         running_stock[pid] = wh + arr
 
-    # ── STEP 6: Simulate forward ──────────────────────────────────────────
+    mark("init_stock")
+
+    return _HorizonContext(
+        today=today,
+        product_map=product_map,
+        product_ids=product_ids,
+        tier_map=tier_map,
+        buffer_m2_map=buffer_m2_map,
+        inventory=inventory,
+        velocities=velocities,
+        snapshot_created_at=snapshot_created_at,
+        shipments_by_boat=shipments_by_boat,
+        drafts_by_boat=drafts_by_boat,
+        draft_status_by_boat=draft_status_by_boat,
+        draft_id_by_boat=draft_id_by_boat,
+        draft_ordered_at_by_boat=draft_ordered_at_by_boat,
+        draft_boat_ids=draft_boat_ids,
+        production_by_product=production_by_product,
+        scheduled_production=scheduled_production,
+        boats_with_shipments=boats_with_shipments,
+        simulate_boats=sorted_boats,
+        boat_states=boat_states,
+        arriving_soon=arriving_soon,
+        initial_state=BrainState(running_stock=running_stock, factory_avail=factory_avail),
+    )
 
-    projections = []
-    skip_recommendations = []
-    debug_trace: list[dict] = []
-    # Track unmet gaps per product for post-loop production requests.
-    # Gaps tracked on ALL boats (including skipped) — production needs are
-    # independent of whether any single boat is worth shipping.
-    _gap_viable: dict[str, dict] = {}  # pid → first gap seen
-    _viable_boat_count = 0
-
-    for i, boat in enumerate(simulate_boats):
-        next_boat = simulate_boats[i + 1] if i + 1 < len(simulate_boats) else None
-        has_draft = boat["id"] in draft_boat_ids
-
-        dep = boat["departure_date"]
-        arr = boat["arrival_date"]
-        if isinstance(dep, str):
-            dep = date.fromisoformat(dep)
-        if isinstance(arr, str):
-            arr = date.fromisoformat(arr)
-
-        boat_products = []
-        boat_debug = []
-        boat_total_pallets = Decimal(0)
 
-        for pid in product_ids:
-            velocity = Decimal(str(velocities.get(pid, 0)))
-            warehouse_m2 = Decimal(str(inventory.get(pid, 0)))
-            stock = running_stock[pid]
-            factory_m2 = factory_avail.get(pid, Decimal(0))
-
-            # ── Core formula ──────────────────────────────────────────
-            if next_boat:
-                next_arr = next_boat["arrival_date"]
-                if isinstance(next_arr, str):
-                    next_arr = date.fromisoformat(next_arr)
-                days_to_next_resupply = max(1, (next_arr - today).days)
-            else:
-                days_to_next_resupply = max(1, (arr - today).days + 30)
-
-            # No velocity = no consumption = no gap. Show product but don't restock.
-            factory_max_pallets = int(factory_m2 / M2_PER_PALLET)
-
-            # Per-product buffer replaces flat SAFETY_STOCK_M2 (tier-aware).
-            buffer_m2 = buffer_m2_map.get(pid, SAFETY_STOCK_M2)
-            tier = tier_map.get(pid, "C")
-
-            if velocity <= 0:
-                stock_at_next_resupply = stock
-                coverage_gap = Decimal(0)
-                suggested_pallets = 0
-                can_ship = 0
-            else:
-                stock_at_next_resupply = stock - (velocity * days_to_next_resupply)
-                coverage_gap = max(Decimal(0), buffer_m2 - stock_at_next_resupply)
-                suggested_pallets = int(
-                    (coverage_gap / M2_PER_PALLET).to_integral_value(rounding=ROUND_UP)
-                ) if coverage_gap > 0 else 0
-                can_ship = min(suggested_pallets, factory_max_pallets)
-
-            # ── Urgency (days of stock from today) ────────────────────
-            # Single source of truth: lib/coverage.py — also used by
-            # metrics_service so Dashboard and Horizon never disagree.
-            dos = _days_of_stock(warehouse_m2, velocity)
-            days_of_stock = float(dos) if dos is not None else 999.0
-
-            if days_of_stock < 7:
-                urgency = "critical"
-            elif days_of_stock < 14:
-                urgency = "urgent"
-            elif days_of_stock < 30:
-                urgency = "soon"
-            else:
-                urgency = "ok"
-
-            # ── Track unmet gap (for any boat — used as fallback) ────
-            # Only track on first few boats — gaps on distant boats are noise.
-            # ── Cascade: allocation priority ──────────────────────────
-            # 1. Shipment exists → reality (confirmed dispatch, locked)
-            # 2. Draft exists for this boat → Ashley's pallets (0 if absent)
-            # 3. No draft, departure > today + LEAD_TIME_DAYS → brain suggests
-            # 4. No draft, departure ≤ today + LEAD_TIME_DAYS → too late, 0
-            boat_shipments = shipments_by_boat.get(boat["id"], {})
-            boat_drafts = drafts_by_boat.get(boat["id"], {})
-            too_late = (dep - today).days <= LEAD_TIME_DAYS
-            has_shipment = boat["id"] in shipments_by_boat
-
-            # Is this allocation a real commitment or just a brain suggestion?
-            # Only commitments (shipments / saved drafts) reserve SIESA for later boats.
-            # Drafts can carry fractional pallets (e.g., 0.5) — Ashley orders half
-            # pallets from SIESA when the factory has fractional remainders.
-            is_committed_alloc = False
-            if has_shipment:
-                shipped_m2 = boat_shipments.get(pid, Decimal(0))
-                allocated_pallets = (shipped_m2 / M2_PER_PALLET).quantize(Decimal("0.01"))
-                is_committed_alloc = True
-            elif has_draft:
-                raw = boat_drafts.get(pid, {}).get("selected_pallets", 0) or 0
-                allocated_pallets = Decimal(str(raw))
-                is_committed_alloc = True
-            elif too_late:
-                allocated_pallets = Decimal(0)
-            else:
-                allocated_pallets = Decimal(can_ship)  # brain suggestion only
-
-            boat_total_pallets += allocated_pallets
-
-            # ── Build product detail ──────────────────────────────────
-            boat_products.append({
-                "product_id": pid,
-                "sku": product_map[pid].get("sku", ""),
-                "daily_velocity_m2": float(velocity),
-                "current_stock_m2": float(warehouse_m2),
-                "running_stock_m2": float(stock),
-                "days_of_stock": round(days_of_stock, 1),
-                "urgency": urgency,
+def _boat_key(ctx: _HorizonContext, i: int) -> tuple:
+    """Everything about boat i (and the next boat) its simulation step reads."""
+    boat = ctx.simulate_boats[i]
+    bid = boat["id"]
+    next_boat = ctx.simulate_boats[i + 1] if i + 1 < len(ctx.simulate_boats) else None
+    return (
+        bid,
+        boat.get("name", ""),
+        boat.get("carrier", ""),
+        _parse_date(boat["departure_date"]),
+        _parse_date(boat["arrival_date"]),
+        ctx.boat_states[bid],
+        bid in ctx.boats_with_shipments,
+        ctx.shipments_by_boat.get(bid),
+        bid in ctx.draft_boat_ids,
+        ctx.drafts_by_boat.get(bid),
+        ctx.draft_status_by_boat.get(bid),
+        ctx.draft_id_by_boat.get(bid),
+        ctx.draft_ordered_at_by_boat.get(bid),
+        (next_boat.get("name", ""), _parse_date(next_boat["arrival_date"])) if next_boat else None,
+    )
+
+
+# Product-level context: a difference here changes every boat
+_SHARED_CONTEXT_FIELDS = (
+    "today", "product_map", "product_ids", "tier_map", "buffer_m2_map", "inventory",
+    "velocities", "snapshot_created_at", "production_by_product", "scheduled_production",
+    "arriving_soon", "initial_state",
+)
+
+
+def _shared_prefix(base: _HorizonContext, ctx: _HorizonContext) -> int:
+    """Number of leading boats whose simulation is identical in both contexts."""
+    for name in _SHARED_CONTEXT_FIELDS:
+        a, b = getattr(base, name), getattr(ctx, name)
+        if a is not b and a != b:
+            return 0
+    k = 0
+    while (
+        k < len(base.simulate_boats)
+        and k < len(ctx.simulate_boats)
+        and _boat_key(base, k) == _boat_key(ctx, k)
+    ):
+        k += 1
+    return k
+
+
+def _simulate_boat(ctx: _HorizonContext, state: BrainState, i: int) -> _BoatResult:
+    """STEP 6 for boat i: project every product, then apply the cascade to `state`."""
+    today = ctx.today
+    running_stock = state.running_stock
+    factory_avail = state.factory_avail
+    _gap_viable = state.gap_viable
+
+    boat = ctx.simulate_boats[i]
+    next_boat = ctx.simulate_boats[i + 1] if i + 1 < len(ctx.simulate_boats) else None
+    has_draft = boat["id"] in ctx.draft_boat_ids
+    boat_state = ctx.boat_states[boat["id"]]
+
+    dep = _parse_date(boat["departure_date"])
+    arr = _parse_date(boat["arrival_date"])
+
+    boat_products = []
+    boat_debug = []
+    boat_total_pallets = Decimal(0)
+
+    for pid in ctx.product_ids:
+        velocity = Decimal(str(ctx.velocities.get(pid, 0)))
+        warehouse_m2 = Decimal(str(ctx.inventory.get(pid, 0)))
+        stock = running_stock[pid]
+        factory_m2 = factory_avail.get(pid, Decimal(0))
+
+        # ── Core formula ──────────────────────────────────────────
+        if next_boat:
+            next_arr = _parse_date(next_boat["arrival_date"])
+            days_to_next_resupply = max(1, (next_arr - today).days)
+        else:
+            days_to_next_resupply = max(1, (arr - today).days + 30)
+
+        # No velocity = no consumption = no gap. Show product but don't restock.
+        factory_max_pallets = int(factory_m2 / M2_PER_PALLET)
+
+        # Per-product buffer replaces flat SAFETY_STOCK_M2 (tier-aware).
+        buffer_m2 = ctx.buffer_m2_map.get(pid, SAFETY_STOCK_M2)
+        tier = ctx.tier_map.get(pid, "C")
+
+        if velocity <= 0:
+            stock_at_next_resupply = stock
+            coverage_gap = Decimal(0)
+            suggested_pallets = 0
+            can_ship = 0
+        else:
+            stock_at_next_resupply = stock - (velocity * days_to_next_resupply)
+            coverage_gap = max(Decimal(0), buffer_m2 - stock_at_next_resupply)
+            suggested_pallets = int(
+                (coverage_gap / M2_PER_PALLET).to_integral_value(rounding=ROUND_UP)
+            ) if coverage_gap > 0 else 0
+            can_ship = min(suggested_pallets, factory_max_pallets)
+
+        # ── Urgency (days of stock from today) ────────────────────
+        # Single source of truth: lib/coverage.py — also used by
+        # metrics_service so Dashboard and Horizon never disagree.
+        dos = _days_of_stock(warehouse_m2, velocity)
+        days_of_stock = float(dos) if dos is not None else 999.0
+
+        if days_of_stock < 7:
+            urgency = "critical"
+        elif days_of_stock < 14:
+            urgency = "urgent"
+        elif days_of_stock < 30:
+            urgency = "soon"
+        else:
+            urgency = "ok"
+
+        # ── Track unmet gap (for any boat — used as fallback) ────
+        # Only track on first few boats — gaps on distant boats are noise.
+        # ── Cascade: allocation priority ──────────────────────────
+        # 1. Shipment exists → reality (confirmed dispatch, locked)
+        # 2. Draft exists for this boat → Ashley's pallets (0 if absent)
+        # 3. No draft, departure > today + LEAD_TIME_DAYS → brain suggests
+        # 4. No draft, departure ≤ today + LEAD_TIME_DAYS → too late, 0
+        boat_shipments = ctx.shipments_by_boat.get(boat["id"], {})
+        boat_drafts = ctx.drafts_by_boat.get(boat["id"], {})
+        too_late = (dep - today).days <= LEAD_TIME_DAYS
+        has_shipment = boat["id"] in ctx.shipments_by_boat
+
+        # Is this allocation a real commitment or just a brain suggestion?
+        # Only commitments (shipments / saved drafts) reserve SIESA for later boats.
+        # Drafts can carry fractional pallets (e.g., 0.5) — Ashley orders half
+        # pallets from SIESA when the factory has fractional remainders.
+        is_committed_alloc = False
+        if has_shipment:
+            shipped_m2 = boat_shipments.get(pid, Decimal(0))
+            allocated_pallets = (shipped_m2 / M2_PER_PALLET).quantize(Decimal("0.01"))
+            is_committed_alloc = True
+        elif has_draft:
+            raw = boat_drafts.get(pid, {}).get("selected_pallets", 0) or 0
+            allocated_pallets = Decimal(str(raw))
+            is_committed_alloc = True
+        elif too_late:
+            allocated_pallets = Decimal(0)
+        else:
+            allocated_pallets = Decimal(can_ship)  # brain suggestion only
+
+        boat_total_pallets += allocated_pallets
+
+        # ── Build product detail ──────────────────────────────────
+        boat_products.append({
+            "product_id": pid,
+            "sku": ctx.product_map[pid].get("sku", ""),
+            "daily_velocity_m2": float(velocity),
+            "current_stock_m2": float(warehouse_m2),
+            "running_stock_m2": float(stock),
+            "days_of_stock": round(days_of_stock, 1),
+            "urgency": urgency,
+            "days_to_next_resupply": days_to_next_resupply,
+            "stock_at_next_resupply": float(stock_at_next_resupply),
+            "coverage_gap_m2": float(coverage_gap),
+            "suggested_pallets": suggested_pallets,
+            "can_ship_pallets": can_ship,
+            "allocated_pallets": float(allocated_pallets),
+            "factory_available_m2": float(factory_m2),
+            "factory_max_pallets": factory_max_pallets,
+            "buffer_m2": float(buffer_m2),
+            "buffer_pallets": int(buffer_m2 / M2_PER_PALLET),
+            "tier": tier,
+            "is_shipment_locked": has_shipment,
+            "is_draft_committed": has_draft,
+            "is_past_lead_time": too_late and not has_draft and not has_shipment,
+            "_is_committed_alloc": is_committed_alloc,  # internal: cascade gate
+        })
+
+        boat_debug.append({
+            "product_id": pid,
+            "sku": ctx.product_map[pid].get("sku", ""),
+            "inputs": {
+                "warehouse_m2": float(warehouse_m2),
+                "arriving_soon_m2": float(ctx.arriving_soon.get(pid, 0)),
+                "running_stock_before": float(stock),
+                "velocity": float(velocity),
+                "factory_available_m2": float(factory_m2),
+            },
+            "math": {
                 "days_to_next_resupply": days_to_next_resupply,
                 "stock_at_next_resupply": float(stock_at_next_resupply),
+                "safety_buffer_m2": float(SAFETY_STOCK_M2),
                 "coverage_gap_m2": float(coverage_gap),
                 "suggested_pallets": suggested_pallets,
                 "can_ship_pallets": can_ship,
                 "allocated_pallets": float(allocated_pallets),
-                "factory_available_m2": float(factory_m2),
-                "factory_max_pallets": factory_max_pallets,
-                "buffer_m2": float(buffer_m2),
-                "buffer_pallets": int(buffer_m2 / M2_PER_PALLET),
-                "tier": tier,
-                "is_shipment_locked": has_shipment,
-                "is_draft_committed": has_draft,
-                "is_past_lead_time": too_late and not has_draft and not has_shipment,
-                "_is_committed_alloc": is_committed_alloc,  # internal: cascade gate
-            })
-
-            boat_debug.append({
-                "product_id": pid,
-                "sku": product_map[pid].get("sku", ""),
-                "inputs": {
-                    "warehouse_m2": float(warehouse_m2),
-                    "arriving_soon_m2": float(arriving_soon.get(pid, 0)),
-                    "running_stock_before": float(stock),
-                    "velocity": float(velocity),
-                    "factory_available_m2": float(factory_m2),
-                },
-                "math": {
-                    "days_to_next_resupply": days_to_next_resupply,
-                    "stock_at_next_resupply": float(stock_at_next_resupply),
-                    "safety_buffer_m2": float(SAFETY_STOCK_M2),
-                    "coverage_gap_m2": float(coverage_gap),
-                    "suggested_pallets": suggested_pallets,
-                    "can_ship_pallets": can_ship,
-                    "allocated_pallets": float(allocated_pallets),
-                    "too_late": too_late and not has_draft,
-                },
-                "cascade": {
-                    "running_stock_after": float(running_stock[pid]),
-                    "factory_remaining_m2": float(factory_avail.get(pid, Decimal(0))),
-                },
-            })
-
-        # ── Urgency breakdown ─────────────────────────────────────────
-        urgency_counts = {"critical": 0, "urgent": 0, "soon": 0, "ok": 0}
-        for p in boat_products:
-            if p["suggested_pallets"] > 0:
-                urgency_counts[p["urgency"]] += 1
-
-        # ── Skip-boat check ───────────────────────────────────────────
-        # Two separate concepts:
-        # 1. skip_recommended: math says this boat isn't worth shipping (advisory)
-        # 2. skip (actual): only skip cascade if no draft AND math says skip
-        # draft_boat_ids includes empty drafts (skipped boats) — Ashley's decision is locked.
-        is_locked = boat["_state"] in ("ORDERED", "DISPATCHED", "CONFIRMED") or has_draft or boat["id"] in boats_with_shipments
-
-        # Always compute the recommendation based on math
-        skip_recommended = boat_total_pallets < MIN_BOAT_PALLETS
-        skip_reason = None
-        if skip_recommended:
-            skip_reason = (
-                f"Solo {int(boat_total_pallets)} pallets "
-                f"({int(boat_total_pallets / PALLETS_PER_CONTAINER)} contenedores). "
-                f"Minimo es {MIN_BOAT_PALLETS} pallets ({MIN_BLS_PER_BOAT} contenedores)."
-            )
-
-        # Only actually skip cascade if Ashley hasn't touched it
-        skip = skip_recommended and not is_locked
-
-        # ── Track production gaps (ALL boats, regardless of skip) ─────
-        # Production needs are independent of whether a boat is worth shipping.
-        for p in boat_products:
-            pid = p["product_id"]
-            gap = Decimal(str(p["coverage_gap_m2"]))
-            fac = Decimal(str(p["factory_available_m2"]))
-            if gap > 0 and fac < gap and pid not in _gap_viable:
-                _gap_viable[pid] = {
-                    "gap_m2": gap - fac,
-                    "urgency": p["urgency"],
-                    "boat_id": boat["id"],
-                    "boat_name": boat.get("name", ""),
-                    "departure": str(dep),
-                }
-
-        # ── Apply cascade (only if boat is NOT skipped) ───────────────
-        # Two effects, gated independently:
-        #   1. running_stock += alloc_m2 — ALWAYS for committed allocs.
-        #      Pallets physically arrive at our warehouse whenever the boat
-        #      lands, regardless of when the draft was committed.
-        #   2. factory_avail -= alloc_m2 — only when the factory snapshot
-        #      doesn't already account for this allocation:
-        #        a. Shipments are already gone from the snapshot → never deduct.
-        #        b. Drafts ordered BEFORE the snapshot are already in factory's
-        #           Cant. comprometida (and therefore excluded from Disponible).
-        #           Deducting them would double-count.
-        #        c. Drafts ordered AFTER the snapshot are unknown to the
-        #           factory's last export → must be deducted to keep later
-        #           boats honest until the next SIESA upload.
-        has_shipment_data = boat["id"] in boats_with_shipments
-        boat_draft_ordered_at = draft_ordered_at_by_boat.get(boat["id"])
-        draft_is_post_snapshot = (
-            boat_draft_ordered_at is not None
-            and snapshot_created_at is not None
-            and boat_draft_ordered_at > snapshot_created_at
+                "too_late": too_late and not has_draft,
+            },
+            "cascade": {
+                "running_stock_after": float(running_stock[pid]),
+                "factory_remaining_m2": float(factory_avail.get(pid, Decimal(0))),
+            },
+        })
+
+    # ── Urgency breakdown ─────────────────────────────────────────
+    urgency_counts = {"critical": 0, "urgent": 0, "soon": 0, "ok": 0}
+    for p in boat_products:
+        if p["suggested_pallets"] > 0:
+            urgency_counts[p["urgency"]] += 1
+
+    # ── Skip-boat check ───────────────────────────────────────────
+    # Two separate concepts:
+    # 1. skip_recommended: math says this boat isn't worth shipping (advisory)
+    # 2. skip (actual): only skip cascade if no draft AND math says skip
+    # draft_boat_ids includes empty drafts (skipped boats) — Ashley's decision is locked.
+    is_locked = boat_state in ("ORDERED", "DISPATCHED", "CONFIRMED") or has_draft or boat["id"] in ctx.boats_with_shipments
+
+    # Always compute the recommendation based on math
+    skip_recommended = boat_total_pallets < MIN_BOAT_PALLETS
+    skip_reason = None
+    if skip_recommended:
+        skip_reason = (
+            f"Solo {int(boat_total_pallets)} pallets "
+            f"({int(boat_total_pallets / PALLETS_PER_CONTAINER)} contenedores). "
+            f"Minimo es {MIN_BOAT_PALLETS} pallets ({MIN_BLS_PER_BOAT} contenedores)."
         )
-        # running_stock should only grow from boats whose pallets haven't
-        # arrived yet. Past boats already landed and their goods are
-        # reflected (or absent, if sold) in the current warehouse snapshot.
-        # Adding them again would project ghost inventory forward.
-        boat_arrives_in_future = arr >= today
-        if not skip:
-            for p in boat_products:
-                pid = p["product_id"]
-                if not p.get("_is_committed_alloc"):
-                    continue  # brain suggestion — do not cascade
-                alloc_m2 = Decimal(str(p["allocated_pallets"])) * M2_PER_PALLET
-                if boat_arrives_in_future:
-                    running_stock[pid] = running_stock[pid] + alloc_m2
-                if not has_shipment_data and draft_is_post_snapshot:
-                    consumed = min(alloc_m2, factory_avail.get(pid, Decimal(0)))
-                    factory_avail[pid] = factory_avail.get(pid, Decimal(0)) - consumed
-            _viable_boat_count += 1
-        else:
-            # Skipped: zero out allocations in the product details
-            boat_total_pallets = Decimal(0)
-            for p in boat_products:
-                p["allocated_pallets"] = 0
 
-        # Strip internal cascade gate from the output
+    # Only actually skip cascade if Ashley hasn't touched it
+    skip = skip_recommended and not is_locked
+
+    # ── Track production gaps (ALL boats, regardless of skip) ─────
+    # Production needs are independent of whether a boat is worth shipping.
+    for p in boat_products:
+        pid = p["product_id"]
+        gap = Decimal(str(p["coverage_gap_m2"]))
+        fac = Decimal(str(p["factory_available_m2"]))
+        if gap > 0 and fac < gap and pid not in _gap_viable:
+            _gap_viable[pid] = {
+                "gap_m2": gap - fac,
+                "urgency": p["urgency"],
+                "boat_id": boat["id"],
+                "boat_name": boat.get("name", ""),
+                "departure": str(dep),
+            }
+
+    # ── Apply cascade (only if boat is NOT skipped) ───────────────
+    # Two effects, gated independently:
+    #   1. running_stock += alloc_m2 — ALWAYS for committed allocs.
+    #      Pallets physically arrive at our warehouse whenever the boat
+    #      lands, regardless of when the draft was committed.
+    #   2. factory_avail -= alloc_m2 — only when the factory snapshot
+    #      doesn't already account for this allocation:
+    #        a. Shipments are already gone from the snapshot → never deduct.
+    #        b. Drafts ordered BEFORE the snapshot are already in factory's
+    #           Cant. comprometida (and therefore excluded from Disponible).
+    #           Deducting them would double-count.
+    #        c. Drafts ordered AFTER the snapshot are unknown to the
+    #           factory's last export → must be deducted to keep later
+    #           boats honest until the next SIESA upload.
+    has_shipment_data = boat["id"] in ctx.boats_with_shipments
+    boat_draft_ordered_at = ctx.draft_ordered_at_by_boat.get(boat["id"])
+    draft_is_post_snapshot = (
+        boat_draft_ordered_at is not None
+        and ctx.snapshot_created_at is not None
+        and boat_draft_ordered_at > ctx.snapshot_created_at
+    )
+    # running_stock should only grow from boats whose pallets haven't
+    # arrived yet. Past boats already landed and their goods are
+    # reflected (or absent, if sold) in the current warehouse snapshot.
+    # Adding them again would project ghost inventory forward.
+    boat_arrives_in_future = arr >= today
+    if not skip:
         for p in boat_products:
-            p.pop("_is_committed_alloc", None)
-
-        days_until_dep = (dep - today).days
+            pid = p["product_id"]
+            if not p.get("_is_committed_alloc"):
+                continue  # brain suggestion — do not cascade
+            alloc_m2 = Decimal(str(p["allocated_pallets"])) * M2_PER_PALLET
+            if boat_arrives_in_future:
+                running_stock[pid] = running_stock[pid] + alloc_m2
+            if not has_shipment_data and draft_is_post_snapshot:
+                consumed = min(alloc_m2, factory_avail.get(pid, Decimal(0)))
+                factory_avail[pid] = factory_avail.get(pid, Decimal(0)) - consumed
+        state.viable_boat_count += 1
+    else:
+        # Skipped: zero out allocations in the product details
+        boat_total_pallets = Decimal(0)
+        for p in boat_products:
+            p["allocated_pallets"] = 0
+
+    # Strip internal cascade gate from the output
+    for p in boat_products:
+        p.pop("_is_committed_alloc", None)
+
+    days_until_dep = (dep - today).days
+
+    projection = {
+        "boat_id": boat["id"],
+        "boat_name": boat.get("name", ""),
+        "departure_date": str(dep),
+        "arrival_date": str(arr),
+        "days_until_departure": days_until_dep,
+        "past_lead_time": too_late and not has_draft,
+        "carrier": boat.get("carrier", ""),
+        "state": boat_state,
+        "draft_status": ctx.draft_status_by_boat.get(boat["id"]),
+        "draft_id": ctx.draft_id_by_boat.get(boat["id"]),
+        "total_pallets": int(boat_total_pallets),
+        "total_containers": int(boat_total_pallets / PALLETS_PER_CONTAINER),
+        "total_m2": float(Decimal(int(boat_total_pallets)) * M2_PER_PALLET),
+        "urgency_breakdown": urgency_counts,
+        "skip_recommended": skip_recommended,
+        "skip_reason": skip_reason,
+        "product_count": len([p for p in boat_products if p["suggested_pallets"] > 0]),
+        "products": boat_products,
+    }
 
-        projection = {
+    skip_recommendation = None
+    if skip_recommended:
+        skip_recommendation = {
             "boat_id": boat["id"],
             "boat_name": boat.get("name", ""),
             "departure_date": str(dep),
-            "arrival_date": str(arr),
-            "days_until_departure": days_until_dep,
-            "past_lead_time": too_late and not has_draft,
-            "carrier": boat.get("carrier", ""),
-            "state": boat["_state"],
-            "draft_status": draft_status_by_boat.get(boat["id"]),
-            "draft_id": draft_id_by_boat.get(boat["id"]),
             "total_pallets": int(boat_total_pallets),
-            "total_containers": int(boat_total_pallets / PALLETS_PER_CONTAINER),
-            "total_m2": float(Decimal(int(boat_total_pallets)) * M2_PER_PALLET),
-            "urgency_breakdown": urgency_counts,
-            "skip_recommended": skip_recommended,
-            "skip_reason": skip_reason,
-            "product_count": len([p for p in boat_products if p["suggested_pallets"] > 0]),
-            "products": boat_products,
+            "reason": skip_reason,
+            "consolidate_onto": next_boat["name"] if next_boat else None,
         }
 
-        projections.append(projection)
-
-        if skip_recommended:
-            skip_recommendations.append({
-                "boat_id": boat["id"],
-                "boat_name": boat.get("name", ""),
-                "departure_date": str(dep),
-                "total_pallets": int(boat_total_pallets),
-                "reason": skip_reason,
-                "consolidate_onto": next_boat["name"] if next_boat else None,
-            })
-
-        debug_trace.append({
+    return _BoatResult(
+        projection=projection,
+        skip_recommendation=skip_recommendation,
+        debug={
             "boat_id": boat["id"],
             "boat_name": boat.get("name", ""),
             "products": boat_debug,
-        })
+        },
+    )
+
+
+def _finalize(
+    ctx: _HorizonContext,
+    state: BrainState,
+    boat_results: list[_BoatResult],
+    steps: StepTimer | None = None,
+) -> dict[str, Any]:
+    """Steps 7–9: production requests, pipeline and order signal from the final state."""
+    mark = steps.mark if steps else (lambda step: None)
+    today = ctx.today
+    product_map = ctx.product_map
+    velocities = ctx.velocities
+    running_stock = state.running_stock
+    _gap_viable = state.gap_viable
 
     # ── STEP 7: Production requests (post-loop) ─────────────────────────────
     # After simulating all boats, we know every product's unmet gap.
@@ -544,7 +827,7 @@ def compute_horizon(
     production_requests = []
     for pid, gap_info in _gap_viable.items():
         unmet_m2 = gap_info["gap_m2"]
-        already_scheduled = scheduled_production.get(pid, Decimal(0))
+        already_scheduled = ctx.scheduled_production.get(pid, Decimal(0))
 
         if unmet_m2 - already_scheduled <= 0:
             continue
@@ -587,12 +870,14 @@ def compute_horizon(
     _urgency_order = {"critical": 0, "urgent": 1, "soon": 2, "ok": 3}
     production_requests.sort(key=lambda r: _urgency_order.get(r["urgency"], 5))
 
+    mark("production_requests")
+
     # ── STEP 8b: Production pipeline (grouped by product) ──────────────
     # One line per product showing total in pipeline and whether it covers the gap.
 
     production_pipeline = []
-    for pid in product_ids:
-        entries = production_by_product.get(pid, [])
+    for pid in ctx.product_ids:
+        entries = ctx.production_by_product.get(pid, [])
         if not entries:
             continue
 
@@ -612,7 +897,7 @@ def compute_horizon(
             if sd and (earliest_date is None or sd < earliest_date):
                 earliest_date = sd
 
-        total_scheduled_m2 = scheduled_production.get(pid, Decimal(0))
+        total_scheduled_m2 = ctx.scheduled_production.get(pid, Decimal(0))
         gap_info = _gap_viable.get(pid)
         unmet = gap_info["gap_m2"] if gap_info else Decimal(0)
         covers_gap = total_scheduled_m2 >= unmet
@@ -633,24 +918,29 @@ def compute_horizon(
     # Sort: in_progress first, then by earliest date
     production_pipeline.sort(key=lambda p: (0 if p["status"] == "in_progress" else 1, p["earliest_date"] or ""))
 
+    mark("production_pipeline")
+
     # ── STEP 9: Factory order signal ──────────────────────────────────────
 
     factory_order_signal = _compute_factory_order_signal(
         production_requests=production_requests,
     )
+    mark("factory_order_signal")
 
     return {
-        "projections": projections,
+        "projections": [r.projection for r in boat_results],
         "production_requests": production_requests,
         "production_pipeline": production_pipeline,
-        "skip_recommendations": skip_recommendations,
+        "skip_recommendations": [
+            r.skip_recommendation for r in boat_results if r.skip_recommendation
+        ],
         "factory_order_signal": factory_order_signal,
         "data_as_of": {
             "computed_at": str(today),
-            "product_count": len(product_ids),
-            "boat_count": len(sorted_boats),
+            "product_count": len(ctx.product_ids),
+            "boat_count": len(ctx.simulate_boats),
         },
-        "_debug": debug_trace,
+        "_debug": [r.debug for r in boat_results],
     }
 
 
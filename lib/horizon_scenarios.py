@@ -0,0 +1,136 @@
+"""
+What-if scenarios for the horizon brain.
+
+A scenario is a set of overrides on the brain inputs — boats that slip,
+boats that are skipped, SIESA with less (or more) available stock.
+apply_scenario() builds the variant inputs (sharing every untouched input
+with the base), compute_horizon_variants() runs them all while reusing the
+base cascade up to the first boat a scenario changes, and diff_horizon()
+reduces each result to what differs from the base.
+
+Pure functions. No DB.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any
+
+# Per-boat and per-product projection fields a diff reports
+BOAT_DIFF_FIELDS = (
+    "departure_date", "arrival_date", "state", "total_pallets",
+    "total_containers", "skip_recommended",
+)
+PRODUCT_DIFF_FIELDS = ("suggested_pallets", "allocated_pallets")
+PRODUCTION_DIFF_FIELDS = ("urgency", "additional_m2", "stockout_date")
+
+
+def _shift(value, days: int):
+    """Shift a date (or ISO date string, keeping the type) by `days`."""
+    if isinstance(value, str):
+        return (date.fromisoformat(value) + timedelta(days=days)).isoformat()
+    return value + timedelta(days=days)
+
+
+def apply_scenario(base: dict[str, Any], scenario: dict[str, Any]) -> dict[str, Any]:
+    """
+    Brain inputs for one scenario.
+
+    Overrides:
+        boat_delays:        {boat_id: days} — departure and arrival slip by `days`
+        skip_boat_ids:      boats taken out of the horizon
+        factory_stock_pct:  percent change of SIESA availability (-20 = 20% less)
+
+    Inputs a scenario does not touch are shared with `base`, not copied.
+    """
+    inputs = dict(base)
+    delays = {bid: days for bid, days in (scenario.get("boat_delays") or {}).items() if days}
+    skipped = set(scenario.get("skip_boat_ids") or ())
+    pct = scenario.get("factory_stock_pct") or 0
+
+    if delays or skipped:
+        boats = []
+        for b in base["boats"]:
+            if b["id"] in skipped:
+                continue
+            if b["id"] in delays:
+                days = delays[b["id"]]
+                b = {
+                    **b,
+                    "departure_date": _shift(b["departure_date"], days),
+                    "arrival_date": _shift(b["arrival_date"], days),
+                }
+            boats.append(b)
+        inputs["boats"] = boats
+
+    if pct:
+        factor = 1 + Decimal(str(pct)) / 100
+        inputs["factory_stock"] = {
+            pid: Decimal(str(m2)) * factor for pid, m2 in base["factory_stock"].items()
+        }
+
+    return inputs
+
+
+def _changes(base: dict, variant: dict, fields: tuple[str, ...]) -> dict[str, list]:
+    return {
+        f: [base.get(f), variant.get(f)]
+        for f in fields
+        if base.get(f) != variant.get(f)
+    }
+
+
+def diff_horizon(base: dict[str, Any], variant: dict[str, Any]) -> dict[str, Any]:
+    """
+    What a scenario changes relative to the base result.
+
+    Only differences are listed, each as [base, scenario]: boats whose
+    dates, totals or skip flag changed (with the products whose pallets
+    changed), boats only one side has, production requests added, removed
+    or changed, and the factory order signal when it moved.
+    """
+    base_boats = {p["boat_id"]: p for p in base["projections"]}
+    variant_boats = {p["boat_id"]: p for p in variant["projections"]}
+
+    boats = []
+    for p in variant["projections"]:
+        before = base_boats.get(p["boat_id"])
+        if before is None or before is p:
+            continue  # new boat, or reused from the base run unchanged
+        changes = _changes(before, p, BOAT_DIFF_FIELDS)
+        before_products = {bp["product_id"]: bp for bp in before["products"]}
+        products = []
+        for vp in p["products"]:
+            bp = before_products.get(vp["product_id"], {})
+            product_changes = _changes(bp, vp, PRODUCT_DIFF_FIELDS)
+            if product_changes:
+                products.append({"product_id": vp["product_id"], "sku": vp["sku"], **product_changes})
+        if changes or products:
+            boats.append({
+                "boat_id": p["boat_id"],
+                "boat_name": p["boat_name"],
+                **changes,
+                "products": products,
+            })
+
+    base_requests = {r["product_id"]: r for r in base["production_requests"]}
+    variant_requests = {r["product_id"]: r for r in variant["production_requests"]}
+    changed_requests = []
+    for pid, r in variant_requests.items():
+        if pid in base_requests:
+            changes = _changes(base_requests[pid], r, PRODUCTION_DIFF_FIELDS)
+            if changes:
+                changed_requests.append({"product_id": pid, "sku": r["sku"], **changes})
+
+    diff: dict[str, Any] = {
+        "boats": boats,
+        "boats_added": [bid for bid in variant_boats if bid not in base_boats],
+        "boats_removed": [bid for bid in base_boats if bid not in variant_boats],
+        "production_requests": {
+            "added": [r for pid, r in variant_requests.items() if pid not in base_requests],
+            "removed": [pid for pid in base_requests if pid not in variant_requests],
+            "changed": changed_requests,
+        },
+    }
+    if base["factory_order_signal"] != variant["factory_order_signal"]:
+        diff["factory_order_signal"] = [base["factory_order_signal"], variant["factory_order_signal"]]
+    return diff
@@ -0,0 +1,218 @@
+"""Per-request database query instrumentation.
+
+Every Supabase HTTP call goes through InstrumentedTransport (installed by
+config.database). While a request is being served, each call is recorded
+in a contextvar-scoped QueryStats: table, method, latency and row count.
+
+query_stats_middleware opens the scope for each request and, when it ends,
+emits a `db_request_stats` log event, adds a Server-Timing header and logs
+`db_query_alarm` if the request exceeded settings.db_query_alarm_threshold.
+
+The contextvar follows work into the DB thread pool because run_db copies
+the caller's context.
+"""
+
+import re
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+import httpx
+import structlog
+from fastapi import Request
+
+from config.settings import settings
+from lib.telemetry import DB_QUERY_DURATION
+
+logger = structlog.get_logger(__name__)
+
+# Server-Timing entries for the slowest tables (beyond the "db" total)
+SERVER_TIMING_TOP_TABLES = 5
+
+_CONTENT_RANGE_RE = re.compile(r"^(\d+)-(\d+)/")
+
+
+@dataclass
+class QueryRecord:
+    """One PostgREST / storage round trip."""
+    table: str
+    method: str
+    duration_ms: float
+    rows: Optional[int]
+    status: int
+
+
+@dataclass
+class QueryStats:
+    """All round trips made while serving one request."""
+    records: list[QueryRecord] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, record: QueryRecord) -> None:
+        # Records arrive from DB worker threads as well as the event loop
+        with self._lock:
+            self.records.append(record)
+
+    @property
+    def count(self) -> int:
+        return len(self.records)
+
+    @property
+    def total_ms(self) -> float:
+        return sum(r.duration_ms for r in self.records)
+
+    @property
+    def total_rows(self) -> int:
+        return sum(r.rows or 0 for r in self.records)
+
+    def by_table(self) -> dict[str, dict]:
+        """Aggregate count, time and rows per table, slowest first."""
+        tables: dict[str, dict] = {}
+        for r in self.records:
+            t = tables.setdefault(r.table, {"queries": 0, "ms": 0.0, "rows": 0})
+            t["queries"] += 1
+            t["ms"] += r.duration_ms
+            t["rows"] += r.rows or 0
+        for t in tables.values():
+            t["ms"] = round(t["ms"], 1)
+        return dict(sorted(tables.items(), key=lambda kv: kv[1]["ms"], reverse=True))
+
+    def server_timing(self) -> str:
+        """Render a Server-Timing header value."""
+        parts = [f'db;dur={self.total_ms:.1f};desc="{self.count} queries"']
+        for table, t in list(self.by_table().items())[:SERVER_TIMING_TOP_TABLES]:
+            name = re.sub(r"[^A-Za-z0-9_-]", "_", table)
+            parts.append(f'db-{name};dur={t["ms"]:.1f};desc="{t["queries"]}x"')
+        return ", ".join(parts)
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("db_query_stats", default=None)
+
+
+def get_current_stats() -> Optional[QueryStats]:
+    """QueryStats for the request being served, or None outside a request."""
+    return _current_stats.get()
+
+
+def start_request_stats() -> tuple[QueryStats, object]:
+    """Open a new stats scope. Returns (stats, token) — pass token to end."""
+    stats = QueryStats()
+    return stats, _current_stats.set(stats)
+
+
+def end_request_stats(token) -> None:
+    """Close a scope opened by start_request_stats()."""
+    _current_stats.reset(token)
+
+
+# ===================
+# TRANSPORT
+# ===================
+
+def _table_from_path(path: str) -> str:
+    """
+    Map a Supabase URL path to a short table label.
+
+    /rest/v1/products        → products
+    /rest/v1/rpc/fn_name     → rpc:fn_name
+    /storage/v1/object/...   → storage
+    /auth/v1/admin/users     → auth
+    """
+    parts = [p for p in path.split("/") if p]
+    if len(parts) >= 3 and parts[0] == "rest":
+        if parts[2] == "rpc" and len(parts) >= 4:
+            return f"rpc:{parts[3]}"
+        return parts[2]
+    return parts[0] if parts else "unknown"
+
+
+def _rows_from_headers(response: httpx.Response) -> Optional[int]:
+    """Row count from PostgREST's Content-Range header (e.g. 0-24/* → 25)."""
+    content_range = response.headers.get("content-range", "")
+    if content_range.startswith("*/"):
+        return 0
+    match = _CONTENT_RANGE_RE.match(content_range)
+    if match:
+        return int(match.group(2)) - int(match.group(1)) + 1
+    return None
+
+
+class InstrumentedTransport(httpx.BaseTransport):
+    """
+    httpx transport wrapper that records each call in the current QueryStats.
+
+    Latency is measured up to the response headers, which for PostgREST
+    JSON payloads is effectively the full round trip. Every call feeds the
+    db_query_duration_seconds histogram; outside a request scope nothing
+    else is recorded.
+    """
+
+    def __init__(self, wrapped: httpx.BaseTransport):
+        self.wrapped = wrapped
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        response = self.wrapped.handle_request(request)
+        elapsed = time.perf_counter() - start
+        table = _table_from_path(request.url.path)
+        DB_QUERY_DURATION.observe(elapsed, table=table, method=request.method)
+
+        stats = _current_stats.get()
+        if stats is None:
+            return response
+
+        stats.add(QueryRecord(
+            table=table,
+            method=request.method,
+            duration_ms=elapsed * 1000,
+            rows=_rows_from_headers(response),
+            status=response.status_code,
+        ))
+        return response
+
+    def close(self) -> None:
+        self.wrapped.close()
+
+
+# ===================
+# MIDDLEWARE
+# ===================
+
+async def query_stats_middleware(request: Request, call_next):
+    stats, token = start_request_stats()
+    try:
+        response = await call_next(request)
+    finally:
+        end_request_stats(token)
+
+    if stats.count == 0:
+        return response
+
+    by_table = stats.by_table()
+    response.headers["Server-Timing"] = stats.server_timing()
+
+    logger.info(
+        "db_request_stats",
+        method=request.method,
+        path=request.url.path,
+        status=response.status_code,
+        queries=stats.count,
+        db_ms=round(stats.total_ms, 1),
+        rows=stats.total_rows,
+        tables=by_table,
+    )
+
+    threshold = settings.db_query_alarm_threshold
+    if threshold and stats.count > threshold:
+        logger.warning(
+            "db_query_alarm",
+            method=request.method,
+            path=request.url.path,
+            queries=stats.count,
+            threshold=threshold,
+            tables=by_table,
+        )
+
+    return response
@@ -0,0 +1,169 @@
+"""
+Stockout risk — how likely each product runs out before each boat lands.
+
+The brain plans with average velocities and tier buffers. This samples
+demand instead: every path draws a sequence of weeks (with replacement)
+from the weekly sales history, so demand keeps the spread and the spikes
+the history actually had. Paths run through the boat arrival schedule and
+the share of paths where cumulative demand exceeds the stock on hand
+before an arrival is the stockout probability.
+
+Between arrivals stock only goes down, so a stockout before boat k shows
+up as a shortfall just before one of the arrivals up to k: demand is only
+evaluated at the arrival days (weeks are spread evenly over their days).
+All paths of a block of products are one NumPy array, blocks sized so
+the array stays under _MAX_BLOCK_ELEMENTS.
+
+Pure functions. No DB.
+"""
+
+from datetime import date
+from decimal import Decimal
+from typing import Any, Optional
+
+import numpy as np
+
+from .constants import M2_PER_PALLET
+
+DEFAULT_PATHS = 1000
+# Demand values per block of products (products × paths × boats): bounds
+# memory to a few tens of MB whatever the path count
+_MAX_BLOCK_ELEMENTS = 4_000_000
+
+
+def stockout_probabilities(
+    stock: np.ndarray,
+    weekly_sales: np.ndarray,
+    arrival_days: np.ndarray,
+    arrivals: np.ndarray,
+    paths: int = DEFAULT_PATHS,
+    seed: Optional[int] = None,
+) -> np.ndarray:
+    """
+    P(stockout before each boat arrives), per product.
+
+    Args:
+        stock: [P] m² on hand today
+        weekly_sales: [P, W] m² sold per product in each history week
+        arrival_days: [K] days from today until each boat arrives
+        arrivals: [P, K] m² each boat brings per product
+        paths: demand paths sampled
+        seed: random seed (None = fresh)
+
+    Returns:
+        [P, K] probabilities, boats in the order given
+    """
+    n_products, n_boats = arrivals.shape
+    result = np.zeros((n_products, n_boats))
+    if n_products == 0 or n_boats == 0:
+        return result
+    if weekly_sales.shape[1] == 0:
+        weekly_sales = np.zeros((n_products, 1))
+
+    # Simulate boats in arrival order, map back at the end
+    order = np.argsort(arrival_days, kind="stable")
+    days = np.maximum(np.asarray(arrival_days)[order], 0)
+    week = days // 7
+    frac = ((days % 7) / 7).astype(np.float32)
+    n_weeks = int(week.max()) + 1
+
+    # Stock just before each arrival, before any demand: today's stock
+    # plus everything earlier boats brought
+    landed = arrivals[:, order]
+    available = (stock[:, None] + np.cumsum(landed, axis=1) - landed).astype(np.float32)
+
+    # One week sequence per path, shared by all products (keeps the
+    # cross-product pattern of each history week). Demand up to an arrival
+    # is then history · (how often each history week was drawn before it,
+    # plus the arrival week's fraction): one matrix product for all paths.
+    n_history = weekly_sales.shape[1]
+    rng = np.random.default_rng(seed)
+    sampled = rng.integers(0, n_history, size=(paths, n_weeks))
+    # Draw counts are accumulated boat by boat, so memory stays at
+    # paths × boats × W whatever the horizon length
+    path_offset = n_history * np.arange(paths)[:, None]
+    drawn_before = np.zeros((paths, n_history), dtype=np.float32)
+    weights = np.empty((paths, n_boats, n_history), dtype=np.float32)
+    counted = 0
+    for k in range(n_boats):
+        if week[k] > counted:
+            segment = (sampled[:, counted:week[k]] + path_offset).ravel()
+            drawn_before += np.bincount(segment, minlength=paths * n_history).reshape(paths, n_history)
+            counted = week[k]
+        weights[:, k] = drawn_before
+        weights[np.arange(paths), k, sampled[:, week[k]]] += frac[k]
+    weights = weights.reshape(paths * n_boats, n_history).T
+    history = weekly_sales.astype(np.float32)
+
+    chunk = max(1, _MAX_BLOCK_ELEMENTS // (paths * n_boats))
+    for start in range(0, n_products, chunk):
+        stop = min(start + chunk, n_products)
+        demand = (history[start:stop] @ weights).reshape(stop - start, paths, n_boats)
+        short = demand > available[start:stop, None, :]
+        # First arrival each path falls short before (n_boats = never)
+        first = np.argmax(short, axis=2)
+        never = ~np.take_along_axis(short, first[:, :, None], axis=2)[:, :, 0]
+        first[never] = n_boats
+        # Paths short before boat k = paths whose first shortfall is at k or earlier
+        offsets = first + (n_boats + 1) * np.arange(stop - start)[:, None]
+        counts = np.bincount(offsets.ravel(), minlength=(stop - start) * (n_boats + 1))
+        counts = counts.reshape(stop - start, n_boats + 1)[:, :n_boats]
+        result[start:stop, order] = np.cumsum(counts, axis=1) / paths
+    return result
+
+
+def horizon_stockout_risk(
+    *,
+    product_ids: list[str],
+    inventory: dict[str, Decimal],
+    sales_by_week: dict[str, dict[str, Decimal]],
+    projections: list[dict],
+    today: date,
+    paths: int = DEFAULT_PATHS,
+    seed: Optional[int] = None,
+) -> dict[str, Any]:
+    """
+    Stockout risk against a brain result.
+
+    Boats still to arrive bring their allocated pallets (shipments, drafts,
+    or the brain's suggestion; skipped boats bring nothing). History weeks
+    are the week_starts with any sale in the catalog; a product without
+    sales in one of them sold 0 that week.
+
+    Returns {
+        boats:    [{boat_id, boat_name, arrival_date}] still to arrive,
+        products: {product_id: [P(stockout before boat) per boat]},
+    }
+    """
+    boats = [p for p in projections if date.fromisoformat(p["arrival_date"]) >= today]
+    weeks = sorted({w for by_week in sales_by_week.values() for w in by_week})
+    week_index = {w: i for i, w in enumerate(weeks)}
+    row = {pid: i for i, pid in enumerate(product_ids)}
+
+    stock = np.array([float(inventory.get(pid, 0)) for pid in product_ids])
+    weekly_sales = np.zeros((len(product_ids), len(weeks)))
+    for pid, by_week in sales_by_week.items():
+        if pid in row:
+            for w, m2 in by_week.items():
+                weekly_sales[row[pid], week_index[w]] = float(m2)
+
+    arrival_days = np.array(
+        [(date.fromisoformat(b["arrival_date"]) - today).days for b in boats], dtype=np.int64
+    )
+    arrivals = np.zeros((len(product_ids), len(boats)))
+    for k, b in enumerate(boats):
+        for p in b["products"]:
+            if p["product_id"] in row and p["allocated_pallets"]:
+                arrivals[row[p["product_id"]], k] = p["allocated_pallets"] * float(M2_PER_PALLET)
+
+    probabilities = stockout_probabilities(stock, weekly_sales, arrival_days, arrivals, paths, seed)
+    return {
+        "boats": [
+            {"boat_id": b["boat_id"], "boat_name": b["boat_name"], "arrival_date": b["arrival_date"]}
+            for b in boats
+        ],
+        "products": {
+            pid: [round(float(x), 4) for x in probabilities[i]]
+            for i, pid in enumerate(product_ids)
+        },
+    }
@@ -0,0 +1,365 @@
+"""In-process Prometheus-style metrics.
+
+A tiny registry of counters, gauges and histograms rendered in the
+Prometheus text exposition format at GET /metrics. No client library and
+no external service: values live in this process and reset on restart.
+
+Instrumented hot paths:
+    http_request_duration_seconds   route latency (metrics_middleware)
+    brain_step_duration_seconds     compute_horizon, per step
+    parser_duration_seconds         per parser (timed_parser decorator)
+    db_query_duration_seconds       Supabase round trips per table
+    cache_requests_total            preview / config cache hits and misses
+    preview_cache_evictions_total   previews spilled to disk, expired or dropped
+    preview_cache_bytes             preview cache size in memory and on disk
+    executor_queue_depth            DB thread pool and Telegram outbox backlog
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Iterable, Optional
+
+from fastapi import Request
+
+# Seconds. Covers sub-ms cache lookups up to minute-long PDF pipelines.
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+def _format_labels(labelnames: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [
+        f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for name, value in zip(labelnames, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    type_name = ""
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    @abstractmethod
+    def samples(self) -> list[str]:
+        """Exposition lines for every label combination."""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+    type_name = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}"
+            for key, v in items
+        ]
+
+
+class Gauge(_Metric):
+    """Point-in-time value, read from a callback at scrape time."""
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Iterable[str] = (),
+        callback: Optional[Callable[[], dict[tuple[str, ...], float]]] = None,
+    ):
+        super().__init__(name, help, labelnames)
+        self._callback = callback
+
+    def samples(self) -> list[str]:
+        values = self._callback() if self._callback else {}
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}"
+            for key, v in sorted(values.items())
+        ]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Iterable[str] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # key → ([per-bucket counts], sum, count)
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a with-block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        series = self._series.get(self._key(labels))
+        return series[2] if series else 0
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((k, [list(v[0]), v[1], v[2]]) for k, v in self._series.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class Registry:
+    """Ordered collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(m.render() for m in self._metrics.values()) + "\n"
+
+
+REGISTRY = Registry()
+
+
+# ===================
+# METRICS
+# ===================
+
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template",
+    ["method", "route", "status"],
+))
+
+BRAIN_STEP_DURATION = REGISTRY.register(Histogram(
+    "brain_step_duration_seconds",
+    "compute_horizon time per step (step=total for the whole call)",
+    ["step"],
+))
+
+PARSER_DURATION = REGISTRY.register(Histogram(
+    "parser_duration_seconds",
+    "Upload/document parser time",
+    ["parser"],
+))
+
+PDF_PAGE_EXTRACT_DURATION = REGISTRY.register(Histogram(
+    "pdf_page_extract_seconds",
+    "pdfplumber extract_text time per page (mode=inline|pool)",
+    ["mode"],
+))
+
+DB_QUERY_DURATION = REGISTRY.register(Histogram(
+    "db_query_duration_seconds",
+    "Supabase round trip latency (to response headers) per table",
+    ["table", "method"],
+))
+
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    "cache_requests_total",
+    "Cache lookups by result (hit/miss)",
+    ["cache", "result"],
+))
+
+
+def _cache_hit_ratios() -> dict[tuple[str, ...], float]:
+    caches = {key[0] for key in CACHE_REQUESTS._values}
+    ratios = {}
+    for cache in caches:
+        hits = CACHE_REQUESTS.get(cache=cache, result="hit")
+        total = hits + CACHE_REQUESTS.get(cache=cache, result="miss")
+        ratios[(cache,)] = hits / total if total else 0.0
+    return ratios
+
+
+REGISTRY.register(Gauge(
+    "cache_hit_ratio",
+    "Hits / lookups since process start",
+    ["cache"],
+    callback=_cache_hit_ratios,
+))
+
+
+PREVIEW_CACHE_EVICTIONS = REGISTRY.register(Counter(
+    "preview_cache_evictions_total",
+    "Previews moved out of memory (reason=spill) or removed (expired/capacity)",
+    ["reason"],
+))
+
+
+def _preview_cache_bytes() -> dict[tuple[str, ...], float]:
+    # Imported lazily: the preview cache imports this module
+    from services.preview_cache_service import _preview_cache
+
+    if _preview_cache is None:
+        return {}
+    return {(tier,): float(size) for tier, size in _preview_cache.stats().items()}
+
+
+REGISTRY.register(Gauge(
+    "preview_cache_bytes",
+    "Compressed preview bytes held per tier",
+    ["tier"],
+    callback=_preview_cache_bytes,
+))
+
+
+def _queue_depths() -> dict[tuple[str, ...], float]:
+    # Imported lazily: both modules import this one
+    from config.database import _db_executor
+    from integrations.telegram import get_telegram_outbox
+
+    depths = {("db",): 0.0, ("telegram_outbox",): float(get_telegram_outbox().pending)}
+    if _db_executor is not None:
+        depths[("db",)] = float(_db_executor._work_queue.qsize())
+    return depths
+
+
+REGISTRY.register(Gauge(
+    "executor_queue_depth",
+    "Work items waiting for a worker",
+    ["executor"],
+    callback=_queue_depths,
+))
+
+
+# ===================
+# HELPERS
+# ===================
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a cache lookup."""
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def timed_parser(parser: str):
+    """
+    Decorator: observe parser_duration_seconds{parser=...} for each call.
+    Works on sync and async functions.
+    """
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with PARSER_DURATION.time(parser=parser):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with PARSER_DURATION.time(parser=parser):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class StepTimer:
+    """
+    Split a function's runtime into named steps.
+
+        steps = StepTimer(BRAIN_STEP_DURATION)
+        ...                   # step 1
+        steps.mark("index")
+        ...                   # step 2
+        steps.mark("sort")
+        steps.finish()        # also records step="total"
+    """
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+        self._start = self._last = time.perf_counter()
+
+    def mark(self, step: str) -> None:
+        now = time.perf_counter()
+        self.histogram.observe(now - self._last, step=step)
+        self._last = now
+
+    def finish(self) -> None:
+        self.histogram.observe(time.perf_counter() - self._start, step="total")
+
+
+async def metrics_middleware(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        HTTP_REQUEST_DURATION.observe(
+            time.perf_counter() - start,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=status,
+        )
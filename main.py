@@ -6,12 +6,17 @@ FastAPI application entry point.
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from contextlib import asynccontextmanager
 import structlog
 from datetime import datetime
 
-from config import settings, check_connection
+from config import settings, check_connection, get_pool_stats, shutdown_db_executor
+from integrations.telegram import get_telegram_outbox
+from services.job_service import get_job_service
+from services.document_parser_service import shutdown_page_pool
+from routes.horizon import shutdown_brain_pool
+from services.preview_cache_service import get_preview_cache
 
 # Configure structured logging
 structlog.configure(
@@ -37,8 +42,11 @@ async def lifespan(app: FastAPI):
     """
     Application lifespan handler.
     
-    Startup: Check database connection
-    Shutdown: Clean up resources
+    Startup: Check database connection, start Telegram outbox, fail
+             ingestion jobs orphaned by a previous process, start the
+             preview expiry sweep
+    Shutdown: Cancel running jobs, flush Telegram outbox, stop preview
+              sweep, PDF page pool and DB thread pool
     """
     # Startup
     logger.info(
@@ -61,10 +69,20 @@ async def lifespan(app: FastAPI):
             error=db_status.get("error")
         )
     
+    await get_telegram_outbox().start()
+    get_job_service().recover()
+    await get_preview_cache().start_sweeper(settings.preview_sweep_seconds)
+
     yield
     
     # Shutdown
     logger.info("application_shutting_down")
+    await get_job_service().shutdown()
+    await get_telegram_outbox().stop()
+    await get_preview_cache().stop_sweeper()
+    shutdown_page_pool()
+    shutdown_brain_pool()
+    shutdown_db_executor()
 
 
 # Create FastAPI app
@@ -103,6 +121,15 @@ app.add_middleware(
 from lib.auth import auth_middleware
 app.middleware("http")(auth_middleware)
 
+# Query stats middleware: counts/times Supabase calls per request, adds
+# Server-Timing and alarms on N+1 patterns
+from lib.query_stats import query_stats_middleware
+app.middleware("http")(query_stats_middleware)
+
+# Metrics middleware (outermost): route latency histogram for /metrics
+from lib.telemetry import REGISTRY, metrics_middleware
+app.middleware("http")(metrics_middleware)
+
 
 # ===================
 # ROUTES
@@ -114,7 +141,8 @@ async def health_check():
     Health check endpoint.
     
     Returns:
-        Basic health status and database connection state
+        Basic health status, database connection state and
+        Supabase connection pool statistics
     """
     db_status = check_connection()
     
@@ -122,10 +150,26 @@ async def health_check():
         "status": "healthy" if db_status["status"] == "healthy" else "degraded",
         "timestamp": datetime.utcnow().isoformat(),
         "environment": settings.environment,
-        "database": db_status
+        "database": db_status,
+        "db_pool": get_pool_stats(),
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Prometheus scrape endpoint.
+
+    Returns:
+        In-process metrics (route latency, brain steps, parsers, DB round
+        trips, cache hit ratios, executor queues) in text exposition format
+    """
+    return PlainTextResponse(
+        REGISTRY.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
 @app.get("/")
 async def root():
     """
@@ -139,6 +183,7 @@ async def root():
         "version": "0.1.0",
         "docs": "/docs" if settings.debug else "Disabled in production",
         "health": "/health",
+        "metrics": "/metrics",
         "endpoints": {
             "products": "/api/products",
             "inventory": "/api/inventory",
@@ -230,6 +275,7 @@ from routes.users import router as users_router
 from routes.order_plan import router as order_plan_router
 from routes.horizon import router as horizon_router
 from routes.reconciliation import router as reconciliation_router
+from routes.jobs import router as jobs_router
 
 app.include_router(products_router, prefix="/api/products", tags=["Products"])
 app.include_router(inventory_router, prefix="/api/inventory", tags=["Inventory"])
@@ -262,6 +308,7 @@ app.include_router(horizon_router)  # Prefix already in router
 app.include_router(users_router)  # Prefix already in router
 app.include_router(order_plan_router)  # Prefix already in router
 app.include_router(reconciliation_router)  # Prefix already in router
+app.include_router(jobs_router)  # Prefix already in router
 
 
 if __name__ == "__main__":
@@ -300,6 +300,8 @@ class BoatUploadResult(BaseSchema):
     imported: int = Field(..., description="Number of new schedules imported")
     updated: int = Field(..., description="Number of existing schedules updated")
     skipped: int = Field(0, description="Number of rows skipped (unchanged)")
+    deleted: int = Field(0, description="Existing boats not in the file that were deleted")
+    kept: int = Field(0, description="Existing boats not in the file kept (sticky status, drafts or shipments)")
     skipped_rows: list[SkippedRowInfo] = Field(default_factory=list, description="Rows skipped due to bad data")
     errors: list[str] = Field(default_factory=list, description="Error messages")
 
@@ -317,6 +319,15 @@ class BoatPreviewRow(BaseSchema):
     action: str = "new"  # "new", "update", or "skip"
 
 
+class BoatPreviewOrphan(BaseSchema):
+    """Existing boat missing from the uploaded file."""
+    boat_id: str
+    vessel_name: Optional[str] = None
+    departure_date: date
+    action: str = "delete"  # "delete" or "keep"
+    reason: Optional[str] = None  # why kept: "sticky_status", "has_drafts", "has_shipments"
+
+
 class BoatModification(BaseSchema):
     """A single row modification during boat preview editing."""
     row_index: int = Field(..., description="Row index to modify")
@@ -340,10 +351,13 @@ class BoatPreview(BaseSchema):
     new_boats: int = 0
     updated_boats: int = 0
     skipped_boats: int = 0
+    deleted_boats: int = 0
+    kept_boats: int = 0
     earliest_departure: Optional[date] = None
     latest_departure: Optional[date] = None
     skipped_rows: list[SkippedRowInfo] = Field(default_factory=list)
     warnings: list[str] = Field(default_factory=list)
     sample_rows: list[BoatPreviewRow] = Field(default_factory=list)
     rows: list[BoatPreviewRow] = Field(default_factory=list, description="All rows for editing")
+    orphans: list[BoatPreviewOrphan] = Field(default_factory=list, description="Existing boats not in the file")
     expires_in_minutes: int = 30
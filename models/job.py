@@ -0,0 +1,53 @@
+"""
+Background job schemas (ingestion jobs).
+
+See STANDARDS_VALIDATION.md for patterns.
+"""
+
+from datetime import datetime
+from enum import Enum
+from typing import Any, Optional
+
+from pydantic import Field
+
+from models.base import BaseSchema
+
+
+class JobStatus(str, Enum):
+    """Lifecycle of a background job."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    @property
+    def is_finished(self) -> bool:
+        return self in (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+class JobResponse(BaseSchema):
+    """Job status as returned by the polling endpoint."""
+    id: str
+    kind: str = Field(..., description="Job type, e.g. ingest_pdf, pdf_preview, packing_list, email")
+    status: JobStatus
+    filename: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    status_code: Optional[int] = Field(None, description="HTTP status the inline endpoint would have returned")
+    result: Optional[Any] = Field(None, description="Endpoint response body once succeeded")
+    error: Optional[str] = None
+
+
+class JobSubmittedResponse(BaseSchema):
+    """Returned immediately when an ingestion endpoint is called with background=true."""
+    job_id: str
+    status: JobStatus = JobStatus.QUEUED
+    status_url: str
+
+
+class JobListResponse(BaseSchema):
+    """Recent jobs, newest first."""
+    data: list[JobResponse]
+    total: int
@@ -16,6 +16,8 @@ import structlog
 
 import pandas as pd
 
+from lib.telemetry import timed_parser
+
 logger = structlog.get_logger(__name__)
 
 
@@ -131,6 +133,7 @@ def _build_sku_mapping(products: list) -> dict[str, tuple[str, str]]:
     return mapping
 
 
+@timed_parser("dispatch")
 def parse_dispatch_excel(
     file_content: bytes,
     products: list,
@@ -18,6 +18,7 @@ import pandas as pd
 
 from exceptions import ExcelParseError
 from utils.text_utils import PRODUCT_ALIASES, normalize_product_name
+from lib.telemetry import timed_parser
 
 logger = structlog.get_logger(__name__)
 
@@ -130,6 +131,7 @@ def _detect_excel_engine(file: Union[str, Path, BytesIO, bytes], filename: Optio
     return "openpyxl"
 
 
+@timed_parser("owner_excel")
 def parse_owner_excel(
     file: Union[str, Path, BytesIO, bytes],
     known_owner_codes: dict[str, str],
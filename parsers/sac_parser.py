@@ -20,6 +20,7 @@ import pandas as pd
 
 from exceptions import SACParseError, SACMissingColumnsError
 from utils.text_utils import normalize_product_name, normalize_customer_name, clean_customer_name
+from lib.telemetry import timed_parser
 
 logger = structlog.get_logger(__name__)
 
@@ -171,6 +172,7 @@ def _detect_product_category(description: str) -> str:
 # MAIN PARSER
 # ===================
 
+@timed_parser("sac")
 def parse_sac_csv(
     file: Union[str, Path, BytesIO, bytes],
     known_sac_skus: dict[int, str],
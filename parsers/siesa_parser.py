@@ -27,6 +27,7 @@ from pathlib import Path
 
 from exceptions import SIESAParseError, SIESAMissingColumnsError
 from utils.text_utils import normalize_product_name
+from lib.telemetry import timed_parser
 
 logger = structlog.get_logger(__name__)
 
@@ -152,6 +153,7 @@ def _safe_str(value) -> Optional[str]:
     return s if s else None
 
 
+@timed_parser("siesa")
 def parse_siesa_file(
     file_path: str,
     snapshot_date: date,
@@ -373,6 +375,7 @@ def parse_siesa_file(
     return result
 
 
+@timed_parser("siesa")
 def parse_siesa_bytes(
     file_content: bytes,
     filename: str,
@@ -17,6 +17,7 @@ import structlog
 import pandas as pd
 
 from exceptions import ExcelParseError
+from lib.telemetry import timed_parser
 
 logger = structlog.get_logger(__name__)
 
@@ -107,6 +108,7 @@ class TibaParseResult:
         }
 
 
+@timed_parser("tiba")
 def parse_tiba_excel(
     file: Union[str, Path, BytesIO],
 ) -> TibaParseResult:
@@ -22,6 +22,7 @@ from models.boat_schedule import (
     BoatUploadResult,
     BoatPreview,
     BoatPreviewRow,
+    BoatPreviewOrphan,
     BoatConfirmRequest,
 )
 from services.boat_schedule_service import get_boat_schedule_service
@@ -247,17 +248,14 @@ async def preview_boat_upload(file: UploadFile = File(...)):
             for s in parse_result.skipped_rows
         ]
 
-        # Calculate preview stats — wipe-and-replace strategy
+        # Preview the exact merge plan the confirm step will apply
         service = get_boat_schedule_service()
-        sorted_schedules = sorted(
-            parse_result.schedules, key=lambda r: r.departure_date
-        )
+        plan = service.plan_merge(parse_result.schedules)
+        sorted_schedules = [record for record, _ in plan.record_actions]
         total_rows = len(sorted_schedules)
-        existing_boats = service._get_all_sorted()
-        n_existing = len(existing_boats)
-        new_boats = max(0, total_rows - n_existing)
-        updated_boats = min(total_rows, n_existing)
-        skipped_boats = 0
+        new_boats = len(plan.inserts)
+        updated_boats = len(plan.updates)
+        skipped_boats = plan.unchanged
         sample_rows = []
         warnings = []
 
@@ -265,9 +263,7 @@ async def preview_boat_upload(file: UploadFile = File(...)):
         from datetime import date as date_type
         today = date_type.today()
 
-        for idx, record in enumerate(sorted_schedules):
-            action = "update" if idx < n_existing else "new"
-
+        for idx, (record, action) in enumerate(plan.record_actions):
             sample_rows.append(BoatPreviewRow(
                 row_index=idx,
                 vessel_name=record.vessel_name,
@@ -285,11 +281,29 @@ async def preview_boat_upload(file: UploadFile = File(...)):
                     f"Boat departing {record.departure_date} has already passed"
                 )
 
-        # Warn about surplus boats that will be deleted
-        if n_existing > total_rows:
-            surplus = n_existing - total_rows
+        orphans = [
+            BoatPreviewOrphan(
+                boat_id=b["id"],
+                vessel_name=b.get("vessel_name"),
+                departure_date=b["departure_date"],
+                action="delete",
+            )
+            for b in plan.deletes
+        ] + [
+            BoatPreviewOrphan(
+                boat_id=b["id"],
+                vessel_name=b.get("vessel_name"),
+                departure_date=b["departure_date"],
+                action="keep",
+                reason=reason,
+            )
+            for b, reason in plan.kept
+        ]
+
+        # Warn about boats that will be deleted
+        if plan.deletes:
             warnings.append(
-                f"{surplus} barco(s) existente(s) serán eliminados (archivo tiene menos)"
+                f"{len(plan.deletes)} barco(s) existente(s) serán eliminados (no están en el archivo)"
             )
 
         # Calculate date range
@@ -328,7 +342,7 @@ async def preview_boat_upload(file: UploadFile = File(...)):
             "upload_type": "boats",
             "schedules": cached_schedules,
         }
-        preview_id = preview_cache_service.store_preview(cache_data)
+        preview_id = await preview_cache_service.store_preview(cache_data)
 
         logger.info(
             "boat_preview_created",
@@ -337,6 +351,8 @@ async def preview_boat_upload(file: UploadFile = File(...)):
             new_boats=new_boats,
             updated_boats=updated_boats,
             skipped_boats=skipped_boats,
+            deleted_boats=len(plan.deletes),
+            kept_boats=len(plan.kept),
         )
 
         return BoatPreview(
@@ -345,11 +361,14 @@ async def preview_boat_upload(file: UploadFile = File(...)):
             new_boats=new_boats,
             updated_boats=updated_boats,
             skipped_boats=skipped_boats,
+            deleted_boats=len(plan.deletes),
+            kept_boats=len(plan.kept),
             earliest_departure=earliest_departure,
             latest_departure=latest_departure,
             skipped_rows=skipped_rows,
             warnings=warnings[:10],  # Limit warnings
             rows=sample_rows,  # All rows for inline editing
+            orphans=orphans,
             sample_rows=sample_rows,  # Backward compat
             expires_in_minutes=30,
         )
@@ -375,7 +394,7 @@ async def confirm_boat_upload(preview_id: str, request: Optional[BoatConfirmRequ
     """Save previously previewed boat data with optional inline edits."""
     try:
         # Retrieve cached data
-        cached = preview_cache_service.retrieve_preview(preview_id)
+        cached = await preview_cache_service.retrieve_preview(preview_id)
         if cached is None:
             raise HTTPException(status_code=404, detail="Preview expired")
 
@@ -458,7 +477,7 @@ async def confirm_boat_upload(preview_id: str, request: Optional[BoatConfirmRequ
         )
 
         # Delete preview from cache
-        preview_cache_service.delete_preview(preview_id)
+        await preview_cache_service.delete_preview(preview_id)
 
         return result
 
@@ -326,7 +326,7 @@ async def preview_committed_orders(file: UploadFile = File(...)):
             "filename": file.filename,
             "upload_type": "committed_orders",
         }
-        preview_id = preview_cache_service.store_preview(cache_data)
+        preview_id = await preview_cache_service.store_preview(cache_data)
 
         logger.info(
             "committed_orders_preview_created",
@@ -385,7 +385,7 @@ async def confirm_committed_orders(
     Only matched rows (with product_id) are saved.
     """
     try:
-        cache_data = preview_cache_service.retrieve_preview(preview_id)
+        cache_data = await preview_cache_service.retrieve_preview(preview_id)
         if cache_data is None:
             raise HTTPException(status_code=404, detail="Preview expired")
 
@@ -460,7 +460,7 @@ async def confirm_committed_orders(
         )
 
         # Delete preview from cache
-        preview_cache_service.delete_preview(preview_id)
+        await preview_cache_service.delete_preview(preview_id)
 
         logger.info(
             "committed_orders_confirm_complete",
@@ -10,6 +10,7 @@ from fastapi import APIRouter, Query
 import structlog
 
 from config import get_supabase_client
+from services.data_freshness_service import SOURCES, get_data_freshness_service
 
 logger = structlog.get_logger(__name__)
 
@@ -105,54 +106,72 @@ def _latest_from_table(db, table: str, date_col: str, count: bool = False):
     return last_updated, record_count
 
 
+# Fallback probes for sources missing from the registry: (table, date column)
+_PROBES = {
+    "sales": ("sales", "week_start"),
+    "inventory": ("warehouse_snapshots", "snapshot_date"),
+    "siesa": ("factory_snapshots", "snapshot_date"),
+    "in_transit": ("transit_snapshots", "snapshot_date"),
+    "boats": ("boat_schedules", "updated_at"),
+    "production": ("production_schedule", "updated_at"),
+}
+
+
+def _source(ts: Optional[datetime], count: Optional[int] = None, source_file: Optional[str] = None) -> dict:
+    out = {
+        "last_updated": ts.isoformat() if ts else None,
+        "status": _get_freshness_status(ts),
+    }
+    if count is not None:
+        out["record_count"] = count
+    if source_file is not None:
+        out["source_file"] = source_file
+    return out
+
+
 @router.get("")
 async def get_data_freshness():
     """
     Get freshness status for all data sources.
 
-    Returns timestamps and status for:
-    - Sales (from sales table, most recent week_start)
-    - Warehouse inventory (from warehouse_snapshots)
-    - SIESA / factory inventory (from factory_snapshots)
-    - In-transit inventory (from transit_snapshots)
-    - Boats (from boat_schedules, most recent updated_at)
-    - Production schedule (from production_schedule)
+    Answers from the data_freshness registry (last upload time, rows
+    written and file per source, maintained by the upload confirm
+    endpoints) for:
+    - Sales, warehouse inventory, SIESA / factory inventory, in-transit,
+      boats and production schedule
+
+    A source with no registry row yet (never uploaded since the registry
+    was added) falls back to its table's latest timestamp, without a
+    count. If the registry can't be read, every source is probed.
     """
     db = get_supabase_client()
 
-    sales_ts, sales_count = _latest_from_table(db, "sales", "week_start", count=True)
-    warehouse_ts, warehouse_count = _latest_from_table(db, "warehouse_snapshots", "snapshot_date", count=True)
-    siesa_ts, siesa_count = _latest_from_table(db, "factory_snapshots", "snapshot_date", count=True)
-    transit_ts, transit_count = _latest_from_table(db, "transit_snapshots", "snapshot_date", count=True)
-    boats_ts, boats_count = _latest_from_table(db, "boat_schedules", "updated_at", count=True)
-    production_ts, _ = _latest_from_table(db, "production_schedule", "updated_at")
+    try:
+        registry = get_data_freshness_service().get_all()
+    except Exception as e:
+        logger.warning("data_freshness_registry_unavailable", error=str(e))
+        registry = None
+
+    sources = {}
+    for source in SOURCES:
+        row = registry.get(source) if registry is not None else None
+        if row is not None:
+            sources[source] = _source(
+                _parse_timestamp(row.get("last_uploaded_at")),
+                row.get("row_count"),
+                row.get("source_file"),
+            )
+            continue
+        table, date_col = _PROBES[source]
+        ts, count = _latest_from_table(db, table, date_col, count=registry is None and source != "production")
+        sources[source] = _source(ts, count)
 
     logger.info(
         "data_freshness_checked",
-        sales_count=sales_count,
-        warehouse_count=warehouse_count,
-        siesa_count=siesa_count,
-        transit_count=transit_count,
-        boats_count=boats_count,
+        from_registry=len(registry) if registry is not None else 0,
     )
 
-    def _source(ts, count=None):
-        out = {
-            "last_updated": ts.isoformat() if ts else None,
-            "status": _get_freshness_status(ts),
-        }
-        if count is not None:
-            out["record_count"] = count
-        return out
-
-    return {
-        "sales": _source(sales_ts, sales_count),
-        "inventory": _source(warehouse_ts, warehouse_count),
-        "siesa": _source(siesa_ts, siesa_count),
-        "in_transit": _source(transit_ts, transit_count),
-        "boats": _source(boats_ts, boats_count),
-        "production": _source(production_ts),
-    }
+    return sources
 
 
 UPLOAD_TYPE_LABELS = {
@@ -7,10 +7,10 @@ Handles processing emails forwarded from Power Automate or Make.com Mailhook.
 import base64
 import json
 from datetime import date
-from typing import Optional
+from typing import Optional, Union
 import structlog
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Query, Request
 from pydantic import ValidationError
 
 from models.ingest import (
@@ -22,6 +22,8 @@ from models.ingest import (
 from services.claude_parser_service import get_claude_parser_service, CLAUDE_AVAILABLE
 from services.ingestion_service import get_ingestion_service, IngestAction, build_confirm_request
 from services.pending_document_service import get_pending_document_service
+from models.job import JobSubmittedResponse
+from routes.jobs import submit_background_job
 from integrations.telegram import send_message
 from integrations.telegram_messages import get_message
 
@@ -230,8 +232,11 @@ def _send_error_telegram(sender: str, subject: str, error: str):
         logger.warning("telegram_notification_failed", error=str(e))
 
 
-@router.post("/email", response_model=EmailIngestResponse)
-async def ingest_email(request: Request) -> EmailIngestResponse:
+@router.post("/email", response_model=Union[EmailIngestResponse, JobSubmittedResponse])
+async def ingest_email(
+    request: Request,
+    background: bool = Query(False, description="Process in a background job and return a job id"),
+):
     """
     Process email forwarded from Power Automate or Make.com Mailhook.
 
@@ -243,6 +248,10 @@ async def ingest_email(request: Request) -> EmailIngestResponse:
     - Matched existing shipment → Auto-update (any confidence)
     - No match found → Telegram alert for manual review
 
+    With background=true, the payload is validated inline and the rest
+    runs as a job: returns 202 with a job id; poll GET /api/jobs/{job_id}
+    for the EmailIngestResponse.
+
     Returns:
         EmailIngestResponse with processing result
     """
@@ -295,6 +304,13 @@ async def ingest_email(request: Request) -> EmailIngestResponse:
             detail="Claude Vision not configured. Set ANTHROPIC_API_KEY."
         )
 
+    if background:
+        return submit_background_job("email", lambda: _process_email(data))
+    return await _process_email(data)
+
+
+async def _process_email(data: EmailIngestRequest) -> EmailIngestResponse:
+    """Parse, match and confirm a validated email (inline or as a background job)."""
     # Extract PDF attachment
     pdf_bytes, filename = _extract_pdf_from_attachments(data.attachments)
 
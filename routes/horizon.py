@@ -1,15 +1,24 @@
 """
 Horizon endpoint — the one brain.
 
+GET /api/v2/horizon                      → summary per boat for every active factory
 GET /api/v2/horizon/{factory_id}         → summary per boat (Planning View)
+GET /api/v2/horizon/{factory_id}/risk    → stockout probability per product before each boat
 GET /api/v2/horizon/{factory_id}/{boat_id} → full detail for one boat (OB)
+POST /api/v2/horizon/{factory_id}/scenarios → what-if diffs against the current horizon
 
-Route → DB queries → brain → respond. No services.
+Route → planning inputs → brain → respond.
 """
 
-from datetime import date, datetime, timedelta
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
 from decimal import Decimal
 from collections import defaultdict
+from functools import partial
+from typing import Optional
 
 
 def _parse_ts(value):
@@ -22,15 +31,101 @@ def _parse_ts(value):
     # Supabase returns timestamps like "2026-05-04T12:30:41.89762+00:00"
     return datetime.fromisoformat(str(value))
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field
 import structlog
 
-from config import get_supabase_client
-from lib.brain import compute_horizon
+from config import get_supabase_client, run_db, execute_async, settings
+from lib.brain import HorizonRun, compute_horizon, compute_horizon_variants, resume_horizon, run_horizon
+from lib.horizon_scenarios import apply_scenario, diff_horizon
+from lib.stockout_risk import DEFAULT_PATHS, horizon_stockout_risk
+from services.planning_inputs_service import (
+    PlanningInputs,
+    get_planning_inputs,
+    invalidate_planning_inputs,
+)
 
 logger = structlog.get_logger(__name__)
 router = APIRouter(prefix="/api/v2/horizon", tags=["horizon"])
 
+_FACTORY_COLUMNS = "id, name, production_lead_days, transport_to_port_days, monthly_quota_m2"
+
+
+# ===================
+# LAST RUN PER FACTORY
+# ===================
+
+# Least recently used first; at most settings.horizon_resume_factories
+# runs, all from _last_runs_day (a new day starts from scratch)
+_last_runs: dict[str, HorizonRun] = {}
+_last_runs_day: Optional[date] = None
+
+
+def _compute_horizon(factory_id: str, inputs: dict, today: date) -> dict:
+    """
+    compute_horizon for one factory, resumed from its previous run.
+
+    After an Order Builder save (DraftService.save_draft) only the edited
+    boat's draft differs, so boats before it are reused and the cascade
+    restarts from the checkpoint before it.
+    """
+    global _last_runs_day
+    if _last_runs_day != today:
+        _last_runs.clear()
+        _last_runs_day = today
+
+    previous = _last_runs.pop(factory_id, None)
+    if previous is None:
+        run = run_horizon(**inputs, today=today)
+    else:
+        run = resume_horizon(previous, **inputs, today=today)
+
+    if settings.horizon_resume_factories > 0:
+        while len(_last_runs) >= settings.horizon_resume_factories:
+            del _last_runs[next(iter(_last_runs))]
+        _last_runs[factory_id] = run
+    logger.debug(
+        "horizon_run",
+        factory_id=factory_id,
+        resumed_at_boat=run.resumed_at_boat,
+        boats=len(run.boat_results),
+    )
+    return run.result
+
+
+# ===================
+# BRAIN POOL
+# ===================
+
+_brain_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_brain_pool() -> ProcessPoolExecutor:
+    """
+    Get the process pool running per-factory brains for the batch endpoint.
+
+    compute_horizon is pure-Python CPU work, so threads would serialize on
+    the GIL. Workers are spawned (not forked) and only import lib.brain.
+    Size comes from settings.horizon_batch_workers.
+    """
+    global _brain_pool
+    if _brain_pool is None:
+        _brain_pool = ProcessPoolExecutor(
+            max_workers=settings.horizon_batch_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        logger.info("brain_pool_created", max_workers=settings.horizon_batch_workers)
+    return _brain_pool
+
+
+def shutdown_brain_pool() -> None:
+    """Stop the brain pool. Called on application shutdown."""
+    global _brain_pool
+    if _brain_pool is not None:
+        _brain_pool.shutdown(wait=False, cancel_futures=True)
+        _brain_pool = None
+
+
 
 def _merge_dispatched_dupes(projections: list[dict]) -> list[dict]:
     """
@@ -83,148 +178,94 @@ def _merge_dispatched_dupes(projections: list[dict]) -> list[dict]:
 
 def _query_inputs(factory_id: str, today: date) -> dict:
     """
-    Fetch the 9 inputs the brain needs. Direct table queries, no services.
+    Build the 9 inputs the brain needs from the shared planning inputs.
     Returns inputs dict + data_freshness dict for traceability.
     """
-    db = get_supabase_client()
+    planning = get_planning_inputs(today)
+    return _factory_inputs(planning, _shared_inputs(planning), factory_id)
+
+
+def _sales_by_week(planning: PlanningInputs) -> dict[str, dict[str, Decimal]]:
+    """m² sold per product per week_start in the sales window."""
+    sales_by_week: dict[str, dict[str, Decimal]] = defaultdict(lambda: defaultdict(Decimal))
+    for sale in planning.sales:
+        sales_by_week[sale.product_id][sale.week_start] += sale.quantity_m2
+    return sales_by_week
+
+
+def _shared_inputs(planning: PlanningInputs) -> dict:
+    """Inputs 1-7, the same for every factory (drafts are per factory)."""
     freshness = {}
 
     # 1. Products (active tiles only — exclude furniture, sinks, surcharges)
     # Include `tier` so brain can use frozen A/B/C classification.
-    tile_categories = ["MADERAS", "MARMOLIZADOS", "EXTERIORES"]
-    products_res = db.table("products").select(
-        "id, sku, category, active, tier"
-    ).eq("active", True).in_("category", tile_categories).execute()
     products = [
         {
-            "id": p["id"],
-            "sku": p["sku"],
-            "active": p.get("active", True),
-            "tier": p.get("tier"),  # may be None — brain falls back to runtime classification
+            "id": p.id,
+            "sku": p.sku,
+            "active": True,
+            "tier": p.tier,  # may be None — brain falls back to runtime classification
         }
-        for p in products_res.data
+        for p in planning.products
+        if p.is_tile
     ]
     freshness["products"] = len(products)
 
-    # 2. Boat schedules — only boats that haven't departed yet and aren't ignored
-    boats_res = db.table("boat_schedules").select(
-        "id, vessel_name, departure_date, arrival_date, carrier, status"
-    ).gte("departure_date", today.isoformat()).neq(
-        "status", "ignored"
-    ).order("departure_date").execute()
-
-    # Also fetch boats with shipment_items (anchor candidates, may have departed)
-    shipment_boat_ids_res = db.table("shipment_items").select("boat_id").execute()
-    anchor_boat_ids = {row["boat_id"] for row in shipment_boat_ids_res.data}
-
-    if anchor_boat_ids:
-        anchor_boats_res = db.table("boat_schedules").select(
-            "id, vessel_name, departure_date, arrival_date, carrier"
-        ).in_("id", list(anchor_boat_ids)).execute()
-        anchor_boats_data = anchor_boats_res.data
-    else:
-        anchor_boats_data = []
-
-    # Merge: anchor boats + upcoming boats, deduplicate by DB id
+    # 2. Boat schedules — boats with shipment_items (anchor candidates, may
+    # have departed) + boats that haven't departed yet and aren't ignored.
+    # Deduplicated by DB id.
+    anchor_boat_ids = dict.fromkeys(item.boat_id for item in planning.shipment_items)
+    upcoming = [b for b in planning.upcoming_boats if b.status != "ignored"]
     seen_ids = set()
     boats = []
-    for b in anchor_boats_data + boats_res.data:
-        if b["id"] in seen_ids:
+    for b in planning.boats_by_ids(anchor_boat_ids) + upcoming:
+        if b.id in seen_ids:
             continue
-        seen_ids.add(b["id"])
+        seen_ids.add(b.id)
         boats.append({
-            "id": b["id"],
-            "name": b["vessel_name"],
-            "departure_date": b["departure_date"],
-            "arrival_date": b["arrival_date"],
-            "carrier": b.get("carrier", ""),
-            "factory_id": factory_id,
+            "id": b.id,
+            "name": b.vessel_name,
+            "departure_date": b.departure_date,
+            "arrival_date": b.arrival_date,
+            "carrier": b.carrier,
         })
     freshness["boats"] = len(boats)
 
-    # 3. Warehouse snapshots (latest per product)
-    # Fetch only the most recent snapshot_date, then filter to that date
-    latest_wh = db.table("warehouse_snapshots").select(
-        "snapshot_date"
-    ).order("snapshot_date", desc=True).limit(1).execute()
+    # 3-4b. Latest warehouse / factory / transit snapshots, one call.
+    # Factory created_at is pulled as well: the brain needs to know WHEN the
+    # snapshot was uploaded, so it can decide which drafts the factory already
+    # accounted for (pre-snapshot) vs which ones it doesn't know about yet
+    # (post-snapshot).
+    snapshots = planning.snapshots
 
     inventory: dict[str, Decimal] = {}
-    if latest_wh.data:
-        wh_date = latest_wh.data[0]["snapshot_date"]
-        warehouse_res = db.table("warehouse_snapshots").select(
-            "product_id, warehouse_qty"
-        ).eq("snapshot_date", wh_date).execute()
-        for row in warehouse_res.data:
-            pid = row["product_id"]
-            inventory[pid] = Decimal(str(row.get("warehouse_qty") or 0))
-        freshness["warehouse_snapshot_date"] = wh_date
-    else:
-        freshness["warehouse_snapshot_date"] = None
-
-    # 4. Factory snapshots (latest per product)
-    # Pull created_at as well: the brain needs to know WHEN the snapshot was
-    # uploaded, so it can decide which drafts the factory already accounted for
-    # (pre-snapshot) vs which ones it doesn't know about yet (post-snapshot).
-    latest_fs = db.table("factory_snapshots").select(
-        "snapshot_date, created_at"
-    ).order("snapshot_date", desc=True).limit(1).execute()
+    for row in snapshots.warehouse.rows:
+        pid = row["product_id"]
+        inventory[pid] = Decimal(str(row.get("warehouse_qty") or 0))
+    freshness["warehouse_snapshot_date"] = snapshots.warehouse.snapshot_date
 
     factory_stock: dict[str, Decimal] = {}
-    snapshot_created_at = None
-    if latest_fs.data:
-        fs_date = latest_fs.data[0]["snapshot_date"]
-        snapshot_created_at = _parse_ts(latest_fs.data[0].get("created_at"))
-        factory_res = db.table("factory_snapshots").select(
-            "product_id, factory_available_m2"
-        ).eq("snapshot_date", fs_date).execute()
-        for row in factory_res.data:
-            pid = row["product_id"]
-            factory_stock[pid] = Decimal(str(row.get("factory_available_m2") or 0))
-        freshness["factory_snapshot_date"] = fs_date
-        freshness["factory_snapshot_uploaded_at"] = snapshot_created_at
-    else:
-        freshness["factory_snapshot_date"] = None
-        freshness["factory_snapshot_uploaded_at"] = None
-
-    # 4b. Transit snapshots (latest per product — stock on the way)
-    latest_tr = db.table("transit_snapshots").select(
-        "snapshot_date"
-    ).order("snapshot_date", desc=True).limit(1).execute()
+    snapshot_created_at = _parse_ts(snapshots.factory.created_at)
+    for row in snapshots.factory.rows:
+        pid = row["product_id"]
+        factory_stock[pid] = Decimal(str(row.get("factory_available_m2") or 0))
+    freshness["factory_snapshot_date"] = snapshots.factory.snapshot_date
+    freshness["factory_snapshot_uploaded_at"] = snapshot_created_at
 
     in_transit: dict[str, Decimal] = {}
-    if latest_tr.data:
-        tr_date = latest_tr.data[0]["snapshot_date"]
-        transit_res = db.table("transit_snapshots").select(
-            "product_id, in_transit_qty"
-        ).eq("snapshot_date", tr_date).execute()
-        for row in transit_res.data:
-            pid = row["product_id"]
-            qty = Decimal(str(row.get("in_transit_qty") or 0))
-            if qty > 0:
-                in_transit[pid] = qty
-        freshness["transit_snapshot_date"] = tr_date
-    else:
-        freshness["transit_snapshot_date"] = None
+    for row in snapshots.in_transit.rows:
+        pid = row["product_id"]
+        qty = Decimal(str(row.get("in_transit_qty") or 0))
+        if qty > 0:
+            in_transit[pid] = qty
+    freshness["transit_snapshot_date"] = snapshots.in_transit.snapshot_date
 
     # 5. Sales → velocity (90-day simple average) + peak velocity (for tier A buffer)
-    sales_start = (today - timedelta(days=90)).isoformat()
-    sales_res = db.table("sales").select(
-        "product_id, quantity_m2, week_start"
-    ).gte("week_start", sales_start).execute()
-    sales_totals: dict[str, Decimal] = defaultdict(Decimal)
     # Per-week aggregates for peak detection
-    sales_by_week: dict[str, dict[str, Decimal]] = defaultdict(lambda: defaultdict(Decimal))
-    for row in sales_res.data:
-        pid = row.get("product_id")
-        if not pid:
-            continue
-        qty = Decimal(str(row.get("quantity_m2") or 0))
-        sales_totals[pid] += qty
-        wk = str(row.get("week_start") or "")
-        sales_by_week[pid][wk] += qty
+    sales_by_week = _sales_by_week(planning)
     velocities: dict[str, Decimal] = {
-        pid: (total / 90).quantize(Decimal("0.01"))
-        for pid, total in sales_totals.items()
+        pid: (sum(weeks.values(), Decimal(0)) / 90).quantize(Decimal("0.01"))
+        for pid, weeks in sales_by_week.items()
     }
     # Peak velocity (m²/day equivalent of the highest-volume week in the 90d window).
     # Used for tier A buffer to absorb demand spikes — average velocity isn't enough
@@ -234,95 +275,146 @@ def _query_inputs(factory_id: str, today: date) -> dict:
         if weeks:
             peak_week_m2 = max(weeks.values())
             peak_velocities[pid] = (peak_week_m2 / 7).quantize(Decimal("0.01"))
-    freshness["sales_records"] = len(sales_res.data)
-    freshness["sales_window_start"] = sales_start
+    freshness["sales_records"] = len(planning.sales)
+    freshness["sales_window_start"] = planning.sales_window_start
 
     # 6. Shipment items (per-boat dispatch reality)
-    shipment_res = db.table("shipment_items").select(
-        "boat_id, product_id, shipped_m2"
-    ).execute()
     shipment_items = [
         {
-            "boat_id": row["boat_id"],
-            "product_id": row["product_id"],
-            "shipped_m2": str(row.get("shipped_m2") or 0),
+            "boat_id": item.boat_id,
+            "product_id": item.product_id,
+            "shipped_m2": str(item.shipped_m2),
         }
-        for row in shipment_res.data
+        for item in planning.shipment_items
     ]
     freshness["shipment_items"] = len(shipment_items)
 
     # 7. Production schedule
-    production_res = db.table("production_schedule").select(
-        "product_id, status, requested_m2, completed_m2, scheduled_start_date"
-    ).in_("status", ["scheduled", "in_progress", "requested"]).execute()
     production_schedule = [
         {
-            "product_id": row["product_id"],
-            "status": row["status"],
-            "requested_m2": str(row.get("requested_m2") or 0),
-            "completed_m2": str(row.get("completed_m2") or 0),
-            "scheduled_date": row.get("scheduled_start_date"),
+            "product_id": row.product_id,
+            "status": row.status,
+            "requested_m2": str(row.requested_m2),
+            "completed_m2": str(row.completed_m2),
+            "scheduled_date": row.scheduled_start_date,
         }
-        for row in production_res.data
+        for row in planning.production
     ]
     freshness["production_records"] = len(production_schedule)
 
+    return {
+        "products": products,
+        "boats": boats,
+        "inventory": inventory,
+        "in_transit": in_transit,
+        "velocities": velocities,
+        "peak_velocities": peak_velocities,
+        "factory_stock": factory_stock,
+        "shipment_items": shipment_items,
+        "production_schedule": production_schedule,
+        "snapshot_created_at": snapshot_created_at,
+        "_freshness": freshness,
+    }
+
+
+def _factory_inputs(planning: PlanningInputs, shared: dict, factory_id: str) -> dict:
+    """One factory's brain inputs: the shared inputs plus its drafts (input 8)."""
+    freshness = dict(shared["_freshness"])
+
     # 8. Drafts — ALL drafts for this factory. No status filter.
     #    The brain decides what to do based on draft existence, not status.
     #    Status is a UI/notification concern, not a simulation concern.
-    drafts_res = db.table("boat_factory_drafts").select(
-        "id, boat_id, factory_id, status, ordered_at"
-    ).eq("factory_id", factory_id).execute()
+    factory_drafts = [d for d in planning.drafts if d.factory_id == factory_id]
 
     # Draft headers: tells the brain which boats have drafts (even empty ones).
     # ordered_at lets the brain decide whether the snapshot already accounted
     # for this draft's commitments.
     draft_headers = [
         {
-            "boat_id": d["boat_id"],
-            "status": d["status"],
-            "draft_id": d["id"],
-            "ordered_at": _parse_ts(d.get("ordered_at")),
+            "boat_id": d.boat_id,
+            "status": d.status,
+            "draft_id": d.id,
+            "ordered_at": _parse_ts(d.ordered_at),
         }
-        for d in drafts_res.data
+        for d in factory_drafts
     ]
 
+    draft_lookup = {d.id: d for d in factory_drafts}
     drafts: list[dict] = []
-    draft_ids = [d["id"] for d in drafts_res.data]
-    if draft_ids:
-        items_res = db.table("draft_items").select(
-            "draft_id, product_id, selected_pallets"
-        ).in_("draft_id", draft_ids).execute()
-
-        draft_lookup = {d["id"]: d for d in drafts_res.data}
-        for item in items_res.data:
-            draft = draft_lookup[item["draft_id"]]
-            drafts.append({
-                "boat_id": draft["boat_id"],
-                "product_id": item["product_id"],
-                "selected_pallets": item["selected_pallets"],
-                "status": draft["status"],
-                "draft_id": draft["id"],
-            })
+    for item in planning.draft_items(draft_lookup):
+        draft = draft_lookup[item.draft_id]
+        drafts.append({
+            "boat_id": draft.boat_id,
+            "product_id": item.product_id,
+            "selected_pallets": item.selected_pallets,
+            "status": draft.status,
+            "draft_id": draft.id,
+        })
     freshness["drafts"] = len(drafts)
 
     return {
-        "products": products,
-        "boats": boats,
-        "inventory": inventory,
-        "in_transit": in_transit,
-        "velocities": velocities,
-        "peak_velocities": peak_velocities,
-        "factory_stock": factory_stock,
+        **shared,
+        "boats": [{**b, "factory_id": factory_id} for b in shared["boats"]],
         "drafts": drafts,
         "draft_headers": draft_headers,
-        "shipment_items": shipment_items,
-        "production_schedule": production_schedule,
-        "snapshot_created_at": snapshot_created_at,
         "_freshness": freshness,
     }
 
 
+def _batch_inputs(today: date) -> tuple[list[dict], dict[str, dict]]:
+    """Active factories and each one's brain inputs, built from one shared fetch."""
+    db = get_supabase_client()
+    factories = db.table("factories").select(_FACTORY_COLUMNS).eq(
+        "active", True
+    ).order("sort_order").execute().data or []
+    planning = get_planning_inputs(today)
+    shared = _shared_inputs(planning)
+    return factories, {f["id"]: _factory_inputs(planning, shared, f["id"]) for f in factories}
+
+
+@router.get("")
+async def get_horizons():
+    """
+    The brain for every active factory in one request, keyed by factory_id.
+
+    Inputs are fetched once and shared; the per-factory brain runs go to
+    the brain process pool (settings.horizon_batch_workers, 0 = inline).
+    """
+    today = date.today()
+
+    try:
+        factories, inputs_by_factory = await run_db(_batch_inputs, today)
+    except Exception as e:
+        logger.error("horizon_batch_query_failed", error=str(e))
+        raise HTTPException(status_code=500, detail=f"Failed to query inputs: {e}")
+
+    freshness = {fid: inputs.pop("_freshness") for fid, inputs in inputs_by_factory.items()}
+    started = time.perf_counter()
+    if settings.horizon_batch_workers > 0 and len(factories) > 1:
+        loop = asyncio.get_running_loop()
+        pool = get_brain_pool()
+        results = await asyncio.gather(*(
+            loop.run_in_executor(pool, partial(compute_horizon, **inputs_by_factory[f["id"]], today=today))
+            for f in factories
+        ))
+    else:
+        results = [compute_horizon(**inputs_by_factory[f["id"]], today=today) for f in factories]
+
+    logger.info(
+        "horizon_batch_computed",
+        factories=len(factories),
+        duration_ms=round((time.perf_counter() - started) * 1000, 1),
+    )
+
+    return {
+        "generated_at": today.isoformat(),
+        "factories": {
+            f["id"]: _horizon_response(f["id"], f, today, result, freshness[f["id"]])
+            for f, result in zip(factories, results)
+        },
+    }
+
+
 @router.get("/{factory_id}")
 async def get_horizon(factory_id: str):
     """
@@ -331,14 +423,27 @@ async def get_horizon(factory_id: str):
     today = date.today()
 
     try:
-        inputs = _query_inputs(factory_id, today)
+        inputs = await run_db(_query_inputs, factory_id, today)
     except Exception as e:
         logger.error("horizon_query_failed", factory_id=factory_id, error=str(e))
         raise HTTPException(status_code=500, detail=f"Failed to query inputs: {e}")
 
     freshness = inputs.pop("_freshness")
-    result = compute_horizon(**inputs, today=today)
+    result = _compute_horizon(factory_id, inputs, today)
+
+    # Fetch factory info for the response envelope
+    db = get_supabase_client()
+    factory_res = await execute_async(db.table("factories").select(
+        _FACTORY_COLUMNS
+    ).eq("id", factory_id))
 
+    factory = factory_res.data[0] if factory_res.data else {}
+
+    return _horizon_response(factory_id, factory, today, result, freshness)
+
+
+def _horizon_response(factory_id: str, factory: dict, today: date, result: dict, freshness: dict) -> dict:
+    """Planning View envelope around one factory's brain result."""
     # Merge freshness into data_as_of
     result["data_as_of"].update(freshness)
 
@@ -346,14 +451,6 @@ async def get_horizon(factory_id: str):
     # Multiple BLs on one ship → one card in the UI.
     result["projections"] = _merge_dispatched_dupes(result["projections"])
 
-    # Fetch factory info for the response envelope
-    db = get_supabase_client()
-    factory_res = db.table("factories").select(
-        "id, name, production_lead_days, transport_to_port_days, monthly_quota_m2"
-    ).eq("id", factory_id).execute()
-
-    factory = factory_res.data[0] if factory_res.data else {}
-
     return {
         "factory_id": factory_id,
         "factory_name": factory.get("name", ""),
@@ -370,6 +467,71 @@ async def get_horizon(factory_id: str):
     }
 
 
+def _risk_inputs(factory_id: str, today: date) -> tuple[dict, dict[str, dict[str, Decimal]]]:
+    """Brain inputs plus the weekly sales history, from one planning bundle."""
+    planning = get_planning_inputs(today)
+    inputs = _factory_inputs(planning, _shared_inputs(planning), factory_id)
+    return inputs, _sales_by_week(planning)
+
+
+@router.get("/{factory_id}/risk")
+async def get_stockout_risk(
+    factory_id: str,
+    paths: int = Query(DEFAULT_PATHS, ge=100, le=10000, description="Demand paths sampled"),
+    seed: Optional[int] = Query(None, description="Random seed, for reproducible results"),
+):
+    """
+    Probability each product runs out before each boat still to arrive.
+
+    Demand paths are bootstrapped from the weekly sales history and run
+    through the horizon's arrivals (lib/stockout_risk.py).
+    """
+    today = date.today()
+
+    try:
+        inputs, sales_by_week = await run_db(_risk_inputs, factory_id, today)
+    except Exception as e:
+        logger.error("horizon_risk_query_failed", factory_id=factory_id, error=str(e))
+        raise HTTPException(status_code=500, detail=f"Failed to query inputs: {e}")
+
+    freshness = inputs.pop("_freshness")
+    result = _compute_horizon(factory_id, inputs, today)
+
+    # Seconds of NumPy work at high path counts: keep it off the event loop
+    started = time.perf_counter()
+    risk = await asyncio.to_thread(
+        horizon_stockout_risk,
+        product_ids=[p["id"] for p in inputs["products"]],
+        inventory=inputs["inventory"],
+        sales_by_week=sales_by_week,
+        projections=result["projections"],
+        today=today,
+        paths=paths,
+        seed=seed,
+    )
+    logger.info(
+        "horizon_risk_computed",
+        factory_id=factory_id,
+        products=len(risk["products"]),
+        boats=len(risk["boats"]),
+        paths=paths,
+        duration_ms=round((time.perf_counter() - started) * 1000, 1),
+    )
+
+    skus = {p["id"]: p["sku"] for p in inputs["products"]}
+    return {
+        "factory_id": factory_id,
+        "generated_at": today.isoformat(),
+        "paths": paths,
+        "boats": risk["boats"],
+        "products": [
+            {"product_id": pid, "sku": skus[pid], "stockout_probability": probabilities}
+            for pid, probabilities in risk["products"].items()
+        ],
+        "data_as_of": freshness,
+    }
+
+
 @router.get("/{factory_id}/{boat_id}")
 async def get_horizon_detail(factory_id: str, boat_id: str):
     """
@@ -379,13 +541,13 @@ async def get_horizon_detail(factory_id: str, boat_id: str):
     today = date.today()
 
     try:
-        inputs = _query_inputs(factory_id, today)
+        inputs = await run_db(_query_inputs, factory_id, today)
     except Exception as e:
         logger.error("horizon_detail_query_failed", factory_id=factory_id, error=str(e))
         raise HTTPException(status_code=500, detail=f"Failed to query inputs: {e}")
 
     freshness = inputs.pop("_freshness")
-    result = compute_horizon(**inputs, today=today)
+    result = _compute_horizon(factory_id, inputs, today)
     result["data_as_of"].update(freshness)
 
     # For dispatched/confirmed boats, find all projections with same vessel+date
@@ -440,9 +602,9 @@ async def get_horizon_detail(factory_id: str, boat_id: str):
             break
 
     db = get_supabase_client()
-    factory_res = db.table("factories").select(
-        "id, name, production_lead_days, transport_to_port_days, monthly_quota_m2"
-    ).eq("id", factory_id).execute()
+    factory_res = await execute_async(db.table("factories").select(
+        _FACTORY_COLUMNS
+    ).eq("id", factory_id))
     factory = factory_res.data[0] if factory_res.data else {}
 
     return {
@@ -458,15 +620,86 @@ async def get_horizon_detail(factory_id: str, boat_id: str):
     }
 
 
+class HorizonScenario(BaseModel):
+    """One what-if: overrides applied on top of the current inputs."""
+    name: str = Field(..., min_length=1, max_length=100)
+    boat_delays: dict[str, int] = Field(
+        default_factory=dict, description="Days each boat slips (boat_id → days, negative = earlier)"
+    )
+    skip_boat_ids: list[str] = Field(default_factory=list, description="Boats taken out of the horizon")
+    factory_stock_pct: float = Field(
+        default=0, ge=-100, le=100, description="Percent change of SIESA availability (-20 = 20% less)"
+    )
+
+
+class HorizonScenarioRequest(BaseModel):
+    scenarios: list[HorizonScenario] = Field(..., min_length=1, max_length=20)
+
+
+@router.post("/{factory_id}/scenarios")
+async def run_horizon_scenarios(factory_id: str, request: HorizonScenarioRequest):
+    """
+    What-if scenarios against one fetch of the inputs.
+
+    Each scenario comes back as a diff against the current horizon, not as
+    full projections. Scenarios reuse the base cascade up to the first boat
+    they change (resumed_at_boat).
+    """
+    today = date.today()
+
+    try:
+        inputs = await run_db(_query_inputs, factory_id, today)
+    except Exception as e:
+        logger.error("horizon_scenarios_query_failed", factory_id=factory_id, error=str(e))
+        raise HTTPException(status_code=500, detail=f"Failed to query inputs: {e}")
+
+    freshness = inputs.pop("_freshness")
+    variants = [apply_scenario(inputs, s.model_dump()) for s in request.scenarios]
+    base, results = compute_horizon_variants(base=inputs, variants=variants, today=today)
+    base["data_as_of"].update(freshness)
+
+    logger.info(
+        "horizon_scenarios_computed",
+        factory_id=factory_id,
+        scenarios=len(results),
+        resumed_at=[r["_resumed_at_boat"] for r in results],
+    )
+
+    return {
+        "factory_id": factory_id,
+        "generated_at": today.isoformat(),
+        "base": [
+            {
+                "boat_id": p["boat_id"],
+                "boat_name": p["boat_name"],
+                "departure_date": p["departure_date"],
+                "total_pallets": p["total_pallets"],
+                "skip_recommended": p["skip_recommended"],
+            }
+            for p in base["projections"]
+        ],
+        "scenarios": [
+            {
+                "name": s.name,
+                "resumed_at_boat": r["_resumed_at_boat"],
+                "diff": diff_horizon(base, r),
+            }
+            for s, r in zip(request.scenarios, results)
+        ],
+        "data_as_of": base["data_as_of"],
+    }
+
+
 @router.patch("/boats/{boat_id}/ignore")
 async def ignore_boat(boat_id: str):
     """Mark a boat as ignored. Brain will skip it and cascade products to next boats."""
     db = get_supabase_client()
-    result = db.table("boat_schedules").update(
+    result = await execute_async(db.table("boat_schedules").update(
         {"status": "ignored"}
-    ).eq("id", boat_id).execute()
+    ).eq("id", boat_id))
     if not result.data:
         raise HTTPException(status_code=404, detail="Boat not found")
+    invalidate_planning_inputs("boat_ignored")
     return {"success": True, "boat_id": boat_id, "status": "ignored"}
 
 
@@ -474,9 +707,10 @@ async def ignore_boat(boat_id: str):
 async def restore_boat(boat_id: str):
     """Restore an ignored boat back to available."""
     db = get_supabase_client()
-    result = db.table("boat_schedules").update(
+    result = await execute_async(db.table("boat_schedules").update(
         {"status": "available"}
-    ).eq("id", boat_id).execute()
+    ).eq("id", boat_id))
     if not result.data:
         raise HTTPException(status_code=404, detail="Boat not found")
+    invalidate_planning_inputs("boat_restored")
     return {"success": True, "boat_id": boat_id, "status": "available"}
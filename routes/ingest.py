@@ -5,7 +5,8 @@ Handles uploading and parsing shipment documents from various sources.
 """
 
 from fastapi import APIRouter, UploadFile, File, HTTPException, Form
-from typing import Optional
+from typing import Optional, Union
+import asyncio
 import hashlib
 import structlog
 
@@ -46,6 +47,8 @@ from services.ingestion_service import get_ingestion_service
 from services.factory_order_service import get_factory_order_service
 from models.alert import AlertType, AlertSeverity, AlertCreate
 from models.container import ContainerCreate
+from models.job import JobSubmittedResponse
+from routes.jobs import submit_background_job
 from exceptions import NotFoundError, DatabaseError
 from integrations.telegram_messages import get_message
 
@@ -416,17 +419,63 @@ def _check_cross_reference_discrepancies(
     return discrepancies
 
 
-@router.post("/pdf", response_model=IngestResponse)
+async def _parse_shipment_pdf(pdf_bytes: bytes, filename: str) -> tuple[ParsedDocumentData, str]:
+    """
+    Parse a shipment PDF: pdfplumber first, Claude Vision for scanned PDFs.
+
+    pdfplumber runs in a worker thread so it doesn't block the event loop.
+
+    Returns:
+        (parsed data, parser used: "pdfplumber" or "claude_vision")
+    """
+    # Try pdfplumber first (fast, free for native text PDFs)
+    try:
+        parser = get_parser_service()
+        parsed_data = await asyncio.to_thread(parser.parse_pdf, pdf_bytes)
+        logger.info("pdf_parsed_with_pdfplumber", filename=filename)
+        return parsed_data, "pdfplumber"
+
+    except PDFParseError as parse_error:
+        # Check if we should fall back to Claude Vision
+        if not (parse_error.details and parse_error.details.get("use_claude_vision")):
+            # Re-raise other PDFParseErrors
+            raise
+
+        logger.info(
+            "falling_back_to_claude_vision",
+            filename=filename,
+            reason="insufficient_text"
+        )
+
+        if not CLAUDE_AVAILABLE:
+            raise HTTPException(
+                status_code=400,
+                detail="PDF appears to be scanned but Claude Vision is not configured. "
+                       "Set ANTHROPIC_API_KEY environment variable to enable."
+            )
+
+        # Use Claude Vision for scanned PDFs
+        claude_parser = get_claude_parser_service()
+        parsed_data = await claude_parser.parse_pdf(pdf_bytes)
+        logger.info("pdf_parsed_with_claude_vision", filename=filename)
+        return parsed_data, "claude_vision"
+
+
+@router.post("/pdf", response_model=Union[IngestResponse, JobSubmittedResponse])
 async def ingest_pdf(
     file: UploadFile = File(..., description="PDF document to parse"),
-    source: str = Form("pdf_upload", description="Source of upload")
-) -> IngestResponse:
+    source: str = Form("pdf_upload", description="Source of upload"),
+    background: bool = Form(False, description="Parse in a background job and return a job id"),
+):
     """
     Upload and parse a shipment PDF document.
 
     Returns parsed data with confidence scores for user review.
     User must then call /confirm endpoint to create/update shipment.
 
+    With background=true, returns 202 with a job id at once; poll
+    GET /api/jobs/{job_id} for the same IngestResponse.
+
     Supported document types:
     - Booking confirmations
     - Departure notices
@@ -436,6 +485,7 @@ async def ingest_pdf(
     Args:
         file: PDF file upload
         source: Source of upload (pdf_upload or email_forward)
+        background: Run as a background job
 
     Returns:
         IngestResponse with parsed data and confidence scores
@@ -457,53 +507,30 @@ async def ingest_pdf(
             detail="File must be a PDF"
         )
 
-    try:
-        # Read file contents
-        pdf_bytes = await file.read()
+    pdf_bytes = await file.read()
+    filename = file.filename
+
+    if background:
+        return submit_background_job(
+            "ingest_pdf", lambda: _ingest_pdf(pdf_bytes, filename, source), filename=filename
+        )
+    return await _ingest_pdf(pdf_bytes, filename, source)
 
+
+async def _ingest_pdf(pdf_bytes: bytes, filename: str, source: str) -> IngestResponse:
+    """Parse pipeline behind ingest_pdf (inline or as a background job)."""
+    try:
         if len(pdf_bytes) == 0:
             raise HTTPException(
                 status_code=400,
                 detail="Uploaded file is empty"
             )
 
-        parsed_data = None
-        parser_used = "pdfplumber"
-
-        # Try pdfplumber first (fast, free for native text PDFs)
-        try:
-            parser = get_parser_service()
-            parsed_data = parser.parse_pdf(pdf_bytes)
-            logger.info("pdf_parsed_with_pdfplumber", filename=file.filename)
-
-        except PDFParseError as parse_error:
-            # Check if we should fall back to Claude Vision
-            if parse_error.details and parse_error.details.get("use_claude_vision"):
-                logger.info(
-                    "falling_back_to_claude_vision",
-                    filename=file.filename,
-                    reason="insufficient_text"
-                )
-
-                if not CLAUDE_AVAILABLE:
-                    raise HTTPException(
-                        status_code=400,
-                        detail="PDF appears to be scanned but Claude Vision is not configured. "
-                               "Set ANTHROPIC_API_KEY environment variable to enable."
-                    )
-
-                # Use Claude Vision for scanned PDFs
-                claude_parser = get_claude_parser_service()
-                parsed_data = await claude_parser.parse_pdf(pdf_bytes)
-                parser_used = "claude_vision"
-                logger.info("pdf_parsed_with_claude_vision", filename=file.filename)
-            else:
-                # Re-raise other PDFParseErrors
-                raise
+        parsed_data, parser_used = await _parse_shipment_pdf(pdf_bytes, filename)
 
         logger.info(
             "pdf_parsed_successfully",
-            filename=file.filename,
+            filename=filename,
             parser_used=parser_used,
             document_type=parsed_data.document_type,
             overall_confidence=parsed_data.overall_confidence,
@@ -522,19 +549,19 @@ async def ingest_pdf(
         )
 
     except PDFParseError as e:
-        logger.error("pdf_parsing_failed", filename=file.filename, error=str(e))
+        logger.error("pdf_parsing_failed", filename=filename, error=str(e))
         raise HTTPException(
             status_code=400,
             detail=f"Failed to parse PDF: {str(e)}"
         )
     except ValueError as e:
-        logger.error("pdf_parsing_failed", filename=file.filename, error=str(e))
+        logger.error("pdf_parsing_failed", filename=filename, error=str(e))
         raise HTTPException(
             status_code=400,
             detail=f"Failed to parse PDF: {str(e)}"
         )
     except Exception as e:
-        logger.error("pdf_ingest_error", filename=file.filename, error=str(e))
+        logger.error("pdf_ingest_error", filename=filename, error=str(e))
         raise HTTPException(
             status_code=500,
             detail=f"Error processing PDF: {str(e)}"
@@ -1141,11 +1168,12 @@ async def confirm_ingest(data: ConfirmIngestRequest) -> IngestResponse:
         )
 
 
-@router.post("/pdf/preview", response_model=IngestPreviewResponse)
+@router.post("/pdf/preview", response_model=Union[IngestPreviewResponse, JobSubmittedResponse])
 async def preview_pdf_upload(
     file: UploadFile = File(..., description="PDF document to parse"),
-    source: str = Form("pdf_upload", description="Source of upload")
-) -> IngestPreviewResponse:
+    source: str = Form("pdf_upload", description="Source of upload"),
+    background: bool = Form(False, description="Parse in a background job and return a job id"),
+):
     """
     Upload and parse a shipment PDF document (preview only - nothing is saved).
 
@@ -1153,6 +1181,9 @@ async def preview_pdf_upload(
     The parsed result is cached with a preview_id. User must then call
     /pdf/confirm/{preview_id} endpoint to create/update shipment.
 
+    With background=true, returns 202 with a job id at once; poll
+    GET /api/jobs/{job_id} for the same IngestPreviewResponse.
+
     Supported document types:
     - Booking confirmations
     - Departure notices
@@ -1162,6 +1193,7 @@ async def preview_pdf_upload(
     Args:
         file: PDF file upload
         source: Source of upload (pdf_upload or email_forward)
+        background: Run as a background job
 
     Returns:
         IngestPreviewResponse with parsed data, confidence scores, and preview_id
@@ -1183,9 +1215,19 @@ async def preview_pdf_upload(
             detail="File must be a PDF"
         )
 
+    pdf_bytes = await file.read()
+    filename = file.filename
+
+    if background:
+        return submit_background_job(
+            "pdf_preview", lambda: _preview_pdf(pdf_bytes, filename, source), filename=filename
+        )
+    return await _preview_pdf(pdf_bytes, filename, source)
+
+
+async def _preview_pdf(pdf_bytes: bytes, filename: str, source: str) -> IngestPreviewResponse:
+    """Parse-and-cache pipeline behind preview_pdf_upload (inline or as a background job)."""
     try:
-        # Read file contents
-        pdf_bytes = await file.read()
         pdf_file_hash = hashlib.sha256(pdf_bytes).hexdigest()
 
         # Check for duplicate upload
@@ -1197,43 +1239,11 @@ async def preview_pdf_upload(
                 detail="Uploaded file is empty"
             )
 
-        parsed_data = None
-        parser_used = "pdfplumber"
-
-        # Try pdfplumber first (fast, free for native text PDFs)
-        try:
-            parser = get_parser_service()
-            parsed_data = parser.parse_pdf(pdf_bytes)
-            logger.info("pdf_parsed_with_pdfplumber", filename=file.filename)
-
-        except PDFParseError as parse_error:
-            # Check if we should fall back to Claude Vision
-            if parse_error.details and parse_error.details.get("use_claude_vision"):
-                logger.info(
-                    "falling_back_to_claude_vision",
-                    filename=file.filename,
-                    reason="insufficient_text"
-                )
-
-                if not CLAUDE_AVAILABLE:
-                    raise HTTPException(
-                        status_code=400,
-                        detail="PDF appears to be scanned but Claude Vision is not configured. "
-                               "Set ANTHROPIC_API_KEY environment variable to enable."
-                    )
-
-                # Use Claude Vision for scanned PDFs
-                claude_parser = get_claude_parser_service()
-                parsed_data = await claude_parser.parse_pdf(pdf_bytes)
-                parser_used = "claude_vision"
-                logger.info("pdf_parsed_with_claude_vision", filename=file.filename)
-            else:
-                # Re-raise other PDFParseErrors
-                raise
+        parsed_data, parser_used = await _parse_shipment_pdf(pdf_bytes, filename)
 
         logger.info(
             "pdf_parsed_successfully",
-            filename=file.filename,
+            filename=filename,
             parser_used=parser_used,
             document_type=parsed_data.document_type,
             overall_confidence=parsed_data.overall_confidence,
@@ -1246,18 +1256,18 @@ async def preview_pdf_upload(
         cache_data = {
             "parsed_data": parsed_data.model_dump(),
             "parser_used": parser_used,
-            "filename": file.filename,
+            "filename": filename,
             "source": source,
             "pdf_bytes": pdf_bytes.hex(),  # Store as hex string
             "file_hash": pdf_file_hash,
             "upload_type": "shipment_pdf",
         }
-        preview_id = preview_cache_service.store_preview(cache_data)
+        preview_id = await preview_cache_service.store_preview(cache_data)
 
         logger.info(
             "pdf_preview_cached",
             preview_id=preview_id,
-            filename=file.filename
+            filename=filename
         )
 
         duplicate_msg = ""
@@ -1276,10 +1286,10 @@ async def preview_pdf_upload(
         )
 
     except PDFParseError as e:
-        logger.error("pdf_parsing_failed", filename=file.filename, error=str(e))
+        logger.error("pdf_parsing_failed", filename=filename, error=str(e))
         get_upload_history_service().record_failed_upload(
             upload_type="shipment_pdf",
-            filename=file.filename or "unknown",
+            filename=filename or "unknown",
             error_message=str(e),
         )
         raise HTTPException(
@@ -1287,10 +1297,10 @@ async def preview_pdf_upload(
             detail=f"Failed to parse PDF: {str(e)}"
         )
     except ValueError as e:
-        logger.error("pdf_parsing_failed", filename=file.filename, error=str(e))
+        logger.error("pdf_parsing_failed", filename=filename, error=str(e))
         get_upload_history_service().record_failed_upload(
             upload_type="shipment_pdf",
-            filename=file.filename or "unknown",
+            filename=filename or "unknown",
             error_message=str(e),
         )
         raise HTTPException(
@@ -1298,10 +1308,10 @@ async def preview_pdf_upload(
             detail=f"Failed to parse PDF: {str(e)}"
         )
     except Exception as e:
-        logger.error("pdf_preview_error", filename=file.filename, error=str(e))
+        logger.error("pdf_preview_error", filename=filename, error=str(e))
         get_upload_history_service().record_failed_upload(
             upload_type="shipment_pdf",
-            filename=file.filename or "unknown",
+            filename=filename or "unknown",
             error_message=str(e),
         )
         raise HTTPException(
@@ -1341,7 +1351,7 @@ async def confirm_pdf_preview(preview_id: str, data: ConfirmIngestRequest) -> In
     )
 
     # Retrieve from cache
-    cached = preview_cache_service.retrieve_preview(preview_id)
+    cached = await preview_cache_service.retrieve_preview(preview_id)
     if not cached:
         raise HTTPException(
             status_code=400,
@@ -1368,7 +1378,7 @@ async def confirm_pdf_preview(preview_id: str, data: ConfirmIngestRequest) -> In
         )
 
         # Delete from cache after successful confirmation
-        preview_cache_service.delete_preview(preview_id)
+        await preview_cache_service.delete_preview(preview_id)
         logger.info("preview_cache_deleted", preview_id=preview_id)
 
         return result
@@ -1441,18 +1451,23 @@ async def ingest_structured(data: StructuredIngestRequest) -> IngestResponse:
 # PACKING LIST ENDPOINTS
 # ===================
 
-@router.post("/packing-list", response_model=PackingListIngestResponse)
+@router.post("/packing-list", response_model=Union[PackingListIngestResponse, JobSubmittedResponse])
 async def ingest_packing_list(
-    file: UploadFile = File(..., description="Excel packing list file (.xlsx)")
-) -> PackingListIngestResponse:
+    file: UploadFile = File(..., description="Excel packing list file (.xlsx)"),
+    background: bool = Form(False, description="Parse in a background job and return a job id"),
+):
     """
     Upload and parse a factory packing list (Excel).
 
     Extracts PV number, line items, container assignments, and totals.
     Auto-links to matching FactoryOrder if PV number is found.
 
+    With background=true, returns 202 with a job id at once; poll
+    GET /api/jobs/{job_id} for the same PackingListIngestResponse.
+
     Args:
         file: Excel file upload (.xlsx)
+        background: Run as a background job
 
     Returns:
         PackingListIngestResponse with parsed data and factory order match
@@ -1473,10 +1488,19 @@ async def ingest_packing_list(
             detail="File must be an Excel file (.xlsx)"
         )
 
-    try:
-        # Read file contents
-        file_bytes = await file.read()
+    file_bytes = await file.read()
+    filename = file.filename
 
+    if background:
+        return submit_background_job(
+            "packing_list", lambda: _ingest_packing_list(file_bytes, filename), filename=filename
+        )
+    return await _ingest_packing_list(file_bytes, filename)
+
+
+async def _ingest_packing_list(file_bytes: bytes, filename: str) -> PackingListIngestResponse:
+    """Parse pipeline behind ingest_packing_list (inline or as a background job)."""
+    try:
         if len(file_bytes) == 0:
             raise HTTPException(
                 status_code=400,
@@ -1485,7 +1509,7 @@ async def ingest_packing_list(
 
         # Parse packing list
         parser = get_packing_list_parser_service()
-        parsed = parser.parse(file_bytes, file.filename)
+        parsed = await asyncio.to_thread(parser.parse, file_bytes, filename)
 
         # Convert to response model
         parsed_response = ParsedPackingListResponse(
@@ -1555,7 +1579,7 @@ async def ingest_packing_list(
 
         logger.info(
             "packing_list_parsed_successfully",
-            filename=file.filename,
+            filename=filename,
             pv_number=parsed.pv_number,
             line_items=len(parsed.line_items),
             containers=len(parsed.containers),
@@ -1585,7 +1609,7 @@ async def ingest_packing_list(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error("packing_list_ingest_error", filename=file.filename, error=str(e))
+        logger.error("packing_list_ingest_error", filename=filename, error=str(e))
         raise HTTPException(
             status_code=500,
             detail=f"Error processing packing list: {str(e)}"
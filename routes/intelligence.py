@@ -8,6 +8,7 @@ from typing import List, Literal, Optional
 
 from fastapi import APIRouter, Query
 
+from config import run_db
 from models.trends import (
     CountryTrend,
     CustomerTrend,
@@ -47,7 +48,8 @@ async def get_product_trends(
     - `sparkline`: 12-point time series for visualization
     """
     service = get_trend_service()
-    return service.get_product_trends(
+    return await run_db(
+        service.get_product_trends,
         period_days=period_days,
         comparison_period_days=comparison_days,
         sort_by=sort_by,
@@ -71,7 +73,8 @@ async def get_country_trends(
     - `direction`: Overall trend direction
     """
     service = get_trend_service()
-    return service.get_country_trends(
+    return await run_db(
+        service.get_country_trends,
         period_days=period_days,
         comparison_period_days=comparison_days,
     )
@@ -96,7 +99,8 @@ async def get_customer_trends(
     - `sparkline`: 12-point revenue time series
     """
     service = get_trend_service()
-    return service.get_customer_trends(
+    return await run_db(
+        service.get_customer_trends,
         period_days=period_days,
         comparison_period_days=comparison_days,
         limit=limit,
@@ -121,7 +125,7 @@ async def get_intelligence_dashboard(
     - `country_breakdown`: Revenue distribution by country
     """
     service = get_trend_service()
-    return service.get_intelligence_dashboard(period_days=period_days)
+    return await run_db(service.get_intelligence_dashboard, period_days=period_days)
 
 
 # =======================
@@ -150,7 +154,7 @@ async def get_category_metrics(
     - `products_at_risk`: Products with < 30 days stock
     """
     service = get_metrics_service()
-    categories = service.get_category_metrics(period_days=period_days)
+    categories = await run_db(service.get_category_metrics, period_days=period_days)
     return [
         {
             "category": c.category,
@@ -189,7 +193,7 @@ async def get_category_insights(
     - `severity`: INFO, WARNING, or CRITICAL
     """
     service = get_metrics_service()
-    insights = service.get_category_insights(period_days=period_days)
+    insights = await run_db(service.get_category_insights, period_days=period_days)
     return [
         {
             "category": i.category,
@@ -221,7 +225,7 @@ async def refresh_customer_patterns():
     Returns the count of patterns updated.
     """
     service = get_customer_pattern_service()
-    count = service.refresh_patterns()
+    count = await run_db(service.refresh_patterns)
     return {"success": True, "patterns_updated": count}
 
 
@@ -245,7 +249,8 @@ async def get_overdue_customers(
     - `tier`: A (top 20%), B (next 30%), or C (bottom 50%)
     """
     service = get_customer_pattern_service()
-    patterns = service.get_overdue_customers(
+    patterns = await run_db(
+        service.get_overdue_customers,
         min_days_overdue=min_days,
         tier=tier,
         limit=limit,
@@ -289,7 +294,7 @@ async def get_overdue_summary():
     - `most_overdue`: Customer with highest days_overdue
     """
     service = get_customer_pattern_service()
-    summary = service.get_overdue_summary()
+    summary = await run_db(service.get_overdue_summary)
     return {
         "total_overdue": summary["total_overdue"],
         "total_value_at_risk": float(summary["total_value_at_risk"]),
@@ -319,7 +324,8 @@ async def get_customers_due_soon(
     - `tier`: A (top 20%), B (next 30%), or C (bottom 50%)
     """
     service = get_customer_pattern_service()
-    patterns = service.get_due_soon(
+    patterns = await run_db(
+        service.get_due_soon,
         days_ahead=days_ahead,
         tier=tier,
         limit=limit,
@@ -63,10 +63,12 @@ from config.shipping import (
     CONTAINER_WEIGHT_LIMIT_KG,
 )
 from utils.text_utils import normalize_product_name
-from config import get_supabase_client
+from config import get_supabase_client, run_db, execute_async
 from services import preview_cache_service
 from services.upload_history_service import get_upload_history_service
 from services.inventory_ledger_service import get_ledger_service
+from services.planning_inputs_service import invalidate_planning_inputs
+from services.snapshot_service import refresh_current_inventory
 
 logger = structlog.get_logger(__name__)
 
@@ -110,7 +112,7 @@ async def get_latest_inventory():
     """
     try:
         service = get_inventory_service()
-        return service.get_latest()
+        return await run_db(service.get_latest)
     except Exception as e:
         return handle_error(e)
 
@@ -124,7 +126,7 @@ async def get_current_inventory():
     """
     try:
         service = get_inventory_service()
-        snapshots = service.get_latest()
+        snapshots = await run_db(service.get_latest)
 
         # Find the most recent date
         as_of = date.today()
@@ -151,7 +153,7 @@ async def preview_inventory_upload(file: UploadFile = File(...)):
         file_obj = BytesIO(content)
 
         # Check for duplicate upload
-        inv_duplicate = get_upload_history_service().check_duplicate("inventory", file_hash)
+        inv_duplicate = await run_db(get_upload_history_service().check_duplicate, "inventory", file_hash)
 
         product_service = get_product_service()
 
@@ -160,8 +162,8 @@ async def preview_inventory_upload(file: UploadFile = File(...)):
 
         # Determine which products will be auto-created
         # Get ALL products (including inactive) to distinguish "new" from "deactivated"
-        products, _ = product_service.get_all(page=1, page_size=1000, active_only=True)
-        all_products, _ = product_service.get_all(page=1, page_size=1000, active_only=False)
+        products, _ = await run_db(product_service.get_all, page=1, page_size=1000, active_only=True)
+        all_products, _ = await run_db(product_service.get_all, page=1, page_size=1000, active_only=False)
 
         # Build lookup: owner_code -> product
         known_owner_codes = {
@@ -326,7 +328,7 @@ async def preview_inventory_upload(file: UploadFile = File(...)):
             "filename": file.filename,
             "upload_type": "inventory",
         }
-        preview_id = preview_cache_service.store_preview(cache_data)
+        preview_id = await preview_cache_service.store_preview(cache_data)
 
         logger.info(
             "inventory_preview_created",
@@ -356,7 +358,8 @@ async def preview_inventory_upload(file: UploadFile = File(...)):
         )
 
     except (InventoryUploadError, AppError) as e:
-        get_upload_history_service().record_failed_upload(
+        await run_db(
+            get_upload_history_service().record_failed_upload,
             upload_type="inventory",
             filename=file.filename or "unknown",
             error_message=str(e),
@@ -364,7 +367,8 @@ async def preview_inventory_upload(file: UploadFile = File(...)):
         return handle_error(e)
     except Exception as e:
         logger.error("inventory_preview_failed", error=str(e))
-        get_upload_history_service().record_failed_upload(
+        await run_db(
+            get_upload_history_service().record_failed_upload,
             upload_type="inventory",
             filename=file.filename or "unknown",
             error_message=str(e),
@@ -376,7 +380,7 @@ async def preview_inventory_upload(file: UploadFile = File(...)):
 async def confirm_inventory_upload(preview_id: str, request: Optional[InventoryConfirmRequest] = None):
     """Save previously previewed inventory data with optional inline edits."""
     try:
-        cache_data = preview_cache_service.retrieve_preview(preview_id)
+        cache_data = await preview_cache_service.retrieve_preview(preview_id)
         if cache_data is None:
             raise HTTPException(status_code=404, detail="Preview expired")
 
@@ -415,14 +419,14 @@ async def confirm_inventory_upload(preview_id: str, request: Optional[InventoryC
 
         # Bulk upsert auto-created products
         if products_to_upsert:
-            created, updated = product_service.bulk_upsert(products_to_upsert)
+            created, updated = await run_db(product_service.bulk_upsert, products_to_upsert)
             logger.info("products_auto_created", created=created, updated=updated)
 
         # Zero-fill missing active products so brain sees complete snapshot
         if snapshots_to_create:
             snapshot_date = snapshots_to_create[0].snapshot_date
             uploaded_product_ids = {s.product_id for s in snapshots_to_create}
-            products_all, _ = product_service.get_all(page=1, page_size=1000, active_only=True)
+            products_all, _ = await run_db(product_service.get_all, page=1, page_size=1000, active_only=True)
             missing_products = [p for p in products_all if p.id not in uploaded_product_ids]
             if missing_products:
                 for p in missing_products:
@@ -451,12 +455,13 @@ async def confirm_inventory_upload(preview_id: str, request: Optional[InventoryC
             chunk_size = 100
             for i in range(0, len(rows), chunk_size):
                 chunk = rows[i:i + chunk_size]
-                db.table("warehouse_snapshots").upsert(
+                await execute_async(db.table("warehouse_snapshots").upsert(
                     chunk, on_conflict="product_id,snapshot_date"
-                ).execute()
+                ))
 
         # Record upload history
-        get_upload_history_service().record_upload(
+        await run_db(
+            get_upload_history_service().record_upload,
             upload_type=cache_data.get("upload_type", "inventory"),
             file_hash=cache_data.get("file_hash", ""),
             filename=cache_data.get("filename", "unknown"),
@@ -468,7 +473,8 @@ async def confirm_inventory_upload(preview_id: str, request: Optional[InventoryC
             ledger = get_ledger_service()
             recon_items = []
             for s in snapshots_to_create:
-                result = ledger.reconcile_warehouse(
+                result = await run_db(
+                    ledger.reconcile_warehouse,
                     product_id=s.product_id,
                     actual_m2=Decimal(str(s.warehouse_qty)),
                     source_filename=cache_data.get("filename"),
@@ -481,12 +487,12 @@ async def confirm_inventory_upload(preview_id: str, request: Optional[InventoryC
                         "discrepancy_m2": float(result.get("discrepancy_m2", 0) or 0),
                     })
             if recon_items:
-                ledger.generate_reconciliation_report("warehouse", recon_items, cache_data.get("filename"))
+                await run_db(ledger.generate_reconciliation_report, "warehouse", recon_items, cache_data.get("filename"))
         except Exception as ledger_err:
             logger.warning("ledger_warehouse_hook_failed", error=str(ledger_err))
 
         # Delete preview from cache
-        preview_cache_service.delete_preview(preview_id)
+        await preview_cache_service.delete_preview(preview_id)
 
         logger.info(
             "inventory_confirm_complete",
@@ -507,7 +513,8 @@ async def confirm_inventory_upload(preview_id: str, request: Optional[InventoryC
     except Exception as e:
         logger.error("inventory_confirm_failed", error=str(e), preview_id=preview_id)
         _cd = locals().get("cache_data")
-        get_upload_history_service().record_failed_upload(
+        await run_db(
+            get_upload_history_service().record_failed_upload,
             upload_type="inventory",
             filename=_cd.get("filename", "unknown") if _cd else "unknown",
             error_message=str(e),
@@ -558,11 +565,11 @@ async def upload_inventory(file: UploadFile = File(...)):
                     continue
 
             # Upsert products
-            created, updated = product_service.bulk_upsert(products_to_upsert)
+            created, updated = await run_db(product_service.bulk_upsert, products_to_upsert)
             logger.info("products_seeded", created=created, updated=updated)
 
         # STEP 2: Re-fetch products to get updated mappings
-        products, _ = product_service.get_all(page=1, page_size=1000, active_only=True)
+        products, _ = await run_db(product_service.get_all, page=1, page_size=1000, active_only=True)
 
         # Build lookup: owner_code -> product_id
         known_owner_codes = {
@@ -673,9 +680,12 @@ async def upload_inventory(file: UploadFile = File(...)):
             chunk_size = 100
             for i in range(0, len(rows), chunk_size):
                 chunk = rows[i:i + chunk_size]
-                db.table("warehouse_snapshots").upsert(
+                await execute_async(db.table("warehouse_snapshots").upsert(
                     chunk, on_conflict="product_id,snapshot_date"
-                ).execute()
+                ))
+
+        await run_db(refresh_current_inventory, get_supabase_client())
+        invalidate_planning_inputs("inventory_upload")
 
         logger.info(
             "inventory_upload_completed",
@@ -692,7 +702,8 @@ async def upload_inventory(file: UploadFile = File(...)):
         raise
     except Exception as e:
         logger.error("inventory_upload_failed", error=str(e))
-        get_upload_history_service().record_failed_upload(
+        await run_db(
+            get_upload_history_service().record_failed_upload,
             upload_type="inventory",
             filename=file.filename or "unknown",
             error_message=str(e),
@@ -718,11 +729,11 @@ async def preview_siesa_upload(
         siesa_file_hash = hashlib.sha256(content).hexdigest()
 
         # Check for duplicate upload
-        siesa_duplicate = get_upload_history_service().check_duplicate("siesa", siesa_file_hash)
+        siesa_duplicate = await run_db(get_upload_history_service().check_duplicate, "siesa", siesa_file_hash)
 
         # Build product lookup dictionaries
         product_service = get_product_service()
-        products, _ = product_service.get_all(page=1, page_size=10000, active_only=False)
+        products, _ = await run_db(product_service.get_all, page=1, page_size=10000, active_only=False)
 
         # siesa_item -> (product_id, sku)
         products_by_siesa_item: dict[int, tuple[str, str]] = {}
@@ -866,7 +877,7 @@ async def preview_siesa_upload(
             "filename": file.filename,
             "upload_type": "siesa",
         }
-        preview_id = preview_cache_service.store_preview(cache_data)
+        preview_id = await preview_cache_service.store_preview(cache_data)
 
         logger.info(
             "siesa_preview_created",
@@ -899,7 +910,8 @@ async def preview_siesa_upload(
 
     except SIESAMissingColumnsError as e:
         logger.error("siesa_preview_missing_columns", missing=e.details.get("missing_columns"))
-        get_upload_history_service().record_failed_upload(
+        await run_db(
+            get_upload_history_service().record_failed_upload,
             upload_type="siesa",
             filename=file.filename or "unknown",
             error_message=str(e),
@@ -907,7 +919,8 @@ async def preview_siesa_upload(
         return handle_error(e)
     except SIESAParseError as e:
         logger.error("siesa_preview_error", error=str(e))
-        get_upload_history_service().record_failed_upload(
+        await run_db(
+            get_upload_history_service().record_failed_upload,
             upload_type="siesa",
             filename=file.filename or "unknown",
             error_message=str(e),
@@ -915,7 +928,8 @@ async def preview_siesa_upload(
         return handle_error(e)
     except Exception as e:
         logger.error("siesa_preview_failed", error=str(e), type=type(e).__name__)
-        get_upload_history_service().record_failed_upload(
+        await run_db(
+            get_upload_history_service().record_failed_upload,
             upload_type="siesa",
             filename=file.filename or "unknown",
             error_message=str(e),
@@ -930,7 +944,7 @@ async def confirm_siesa_upload(
 ):
     """Save previously previewed SIESA data. Optionally resolve unmatched items and apply inline edits."""
     try:
-        cache_data = preview_cache_service.retrieve_preview(preview_id)
+        cache_data = await preview_cache_service.retrieve_preview(preview_id)
         if cache_data is None:
             raise HTTPException(status_code=404, detail="Preview expired")
 
@@ -983,9 +997,9 @@ async def confirm_siesa_upload(
         db = get_supabase_client()
 
         # Delete existing lots for this snapshot_date (idempotent)
-        delete_result = db.table("inventory_lots").delete().eq(
+        delete_result = await execute_async(db.table("inventory_lots").delete().eq(
             "snapshot_date", actual_date.isoformat()
-        ).execute()
+        ))
         deleted_count = len(delete_result.data) if delete_result.data else 0
         if deleted_count > 0:
             logger.info("siesa_deleted_existing_lots", count=deleted_count, date=actual_date)
@@ -996,7 +1010,7 @@ async def confirm_siesa_upload(
             chunk_size = 100
             for i in range(0, len(lots_to_insert), chunk_size):
                 chunk = lots_to_insert[i:i + chunk_size]
-                db.table("inventory_lots").insert(chunk).execute()
+                await execute_async(db.table("inventory_lots").insert(chunk))
                 lots_created += len(chunk)
 
         # Sync to factory_snapshots (independent table — no carry-forward needed)
@@ -1031,7 +1045,7 @@ async def confirm_siesa_upload(
 
             synced_count = 0
             for pid, stats in product_stats.items():
-                db.table("factory_snapshots").upsert({
+                await execute_async(db.table("factory_snapshots").upsert({
                     "product_id": pid,
                     "snapshot_date": actual_date.isoformat(),
                     "factory_available_m2": stats["total_m2"],
@@ -1040,7 +1054,7 @@ async def confirm_siesa_upload(
                     "factory_lot_count": stats["lot_count"],
                     "factory_largest_lot_m2": stats["largest_lot_m2"],
                     "factory_largest_lot_code": stats["largest_lot_code"],
-                }, on_conflict="product_id,snapshot_date").execute()
+                }, on_conflict="product_id,snapshot_date"))
                 synced_count += 1
 
             logger.info(
@@ -1053,21 +1067,21 @@ async def confirm_siesa_upload(
         # SIESA file is a complete snapshot — absence means zero stock.
         updated_pids = set(product_stats.keys()) if lots_created > 0 else set()
         try:
-            prev_result = db.table("factory_snapshots").select("product_id").neq(
+            prev_result = await execute_async(db.table("factory_snapshots").select("product_id").neq(
                 "factory_available_m2", 0
-            ).execute()
+            ))
             prev_pids = {r["product_id"] for r in (prev_result.data or [])}
             stale_pids = prev_pids - updated_pids
             zero_filled = 0
             for pid in stale_pids:
-                db.table("factory_snapshots").upsert({
+                await execute_async(db.table("factory_snapshots").upsert({
                     "product_id": pid,
                     "snapshot_date": actual_date.isoformat(),
                     "factory_available_m2": 0,
                     "factory_lot_count": 0,
                     "factory_largest_lot_m2": None,
                     "factory_largest_lot_code": None,
-                }, on_conflict="product_id,snapshot_date").execute()
+                }, on_conflict="product_id,snapshot_date"))
                 zero_filled += 1
             if zero_filled > 0:
                 logger.info(
@@ -1079,7 +1093,8 @@ async def confirm_siesa_upload(
             logger.warning("siesa_zero_fill_failed", error=str(e))
 
         # Record upload history
-        get_upload_history_service().record_upload(
+        await run_db(
+            get_upload_history_service().record_upload,
             upload_type=cache_data.get("upload_type", "siesa"),
             file_hash=cache_data.get("file_hash", ""),
             filename=cache_data.get("filename", "unknown"),
@@ -1092,7 +1107,8 @@ async def confirm_siesa_upload(
             recon_items = []
             if lots_created > 0:
                 for pid, stats in product_stats.items():
-                    result = ledger.reconcile_factory(
+                    result = await run_db(
+                        ledger.reconcile_factory,
                         product_id=pid,
                         actual_m2=Decimal(str(stats["total_m2"])),
                         source_filename=cache_data.get("filename"),
@@ -1105,12 +1121,12 @@ async def confirm_siesa_upload(
                             "discrepancy_m2": float(result.get("discrepancy_m2", 0) or 0),
                         })
             if recon_items:
-                ledger.generate_reconciliation_report("factory", recon_items, cache_data.get("filename"))
+                await run_db(ledger.generate_reconciliation_report, "factory", recon_items, cache_data.get("filename"))
         except Exception as ledger_err:
             logger.warning("ledger_factory_hook_failed", error=str(ledger_err))
 
         # Delete preview from cache
-        preview_cache_service.delete_preview(preview_id)
+        await preview_cache_service.delete_preview(preview_id)
 
         logger.info(
             "siesa_confirm_complete",
@@ -1146,7 +1162,8 @@ async def confirm_siesa_upload(
     except Exception as e:
         logger.error("siesa_confirm_failed", error=str(e), preview_id=preview_id)
         _cd = locals().get("cache_data")
-        get_upload_history_service().record_failed_upload(
+        await run_db(
+            get_upload_history_service().record_failed_upload,
             upload_type="siesa",
             filename=_cd.get("filename", "unknown") if _cd else "unknown",
             error_message=str(e),
@@ -1186,7 +1203,7 @@ async def upload_siesa_inventory(
 
         # Build product lookup dictionaries
         product_service = get_product_service()
-        products, _ = product_service.get_all(page=1, page_size=10000, active_only=False)
+        products, _ = await run_db(product_service.get_all, page=1, page_size=10000, active_only=False)
 
         # siesa_item -> (product_id, sku)
         products_by_siesa_item: dict[int, tuple[str, str]] = {}
@@ -1214,9 +1231,9 @@ async def upload_siesa_inventory(
         db = get_supabase_client()
 
         # Delete existing lots for this snapshot_date (idempotent)
-        delete_result = db.table("inventory_lots").delete().eq(
+        delete_result = await execute_async(db.table("inventory_lots").delete().eq(
             "snapshot_date", actual_date.isoformat()
-        ).execute()
+        ))
         deleted_count = len(delete_result.data) if delete_result.data else 0
         if deleted_count > 0:
             logger.info("siesa_deleted_existing_lots", count=deleted_count, date=actual_date)
@@ -1246,7 +1263,7 @@ async def upload_siesa_inventory(
             chunk_size = 100
             for i in range(0, len(lots_to_insert), chunk_size):
                 chunk = lots_to_insert[i:i + chunk_size]
-                db.table("inventory_lots").insert(chunk).execute()
+                await execute_async(db.table("inventory_lots").insert(chunk))
                 lots_created += len(chunk)
 
         # ===================
@@ -1287,7 +1304,7 @@ async def upload_siesa_inventory(
 
             synced_count = 0
             for pid, stats in product_stats.items():
-                db.table("factory_snapshots").upsert({
+                await execute_async(db.table("factory_snapshots").upsert({
                     "product_id": pid,
                     "snapshot_date": actual_date.isoformat(),
                     "factory_available_m2": stats["total_m2"],
@@ -1296,7 +1313,7 @@ async def upload_siesa_inventory(
                     "factory_lot_count": stats["lot_count"],
                     "factory_largest_lot_m2": stats["largest_lot_m2"],
                     "factory_largest_lot_code": stats["largest_lot_code"],
-                }, on_conflict="product_id,snapshot_date").execute()
+                }, on_conflict="product_id,snapshot_date"))
                 synced_count += 1
 
             logger.info(
@@ -1309,21 +1326,21 @@ async def upload_siesa_inventory(
         # SIESA file is a complete snapshot — absence means zero stock.
         updated_pids = set(product_stats.keys()) if lots_created > 0 else set()
         try:
-            prev_result = db.table("factory_snapshots").select("product_id").neq(
+            prev_result = await execute_async(db.table("factory_snapshots").select("product_id").neq(
                 "factory_available_m2", 0
-            ).execute()
+            ))
             prev_pids = {r["product_id"] for r in (prev_result.data or [])}
             stale_pids = prev_pids - updated_pids
             zero_filled = 0
             for pid in stale_pids:
-                db.table("factory_snapshots").upsert({
+                await execute_async(db.table("factory_snapshots").upsert({
                     "product_id": pid,
                     "snapshot_date": actual_date.isoformat(),
                     "factory_available_m2": 0,
                     "factory_lot_count": 0,
                     "factory_largest_lot_m2": None,
                     "factory_largest_lot_code": None,
-                }, on_conflict="product_id,snapshot_date").execute()
+                }, on_conflict="product_id,snapshot_date"))
                 zero_filled += 1
             if zero_filled > 0:
                 logger.info(
@@ -1375,6 +1392,9 @@ async def upload_siesa_inventory(
             for m in parse_result.unmatched_lots
         ))[:20]  # Limit to 20
 
+        await run_db(refresh_current_inventory, db)
+        invalidate_planning_inputs("siesa_upload")
+
         logger.info(
             "siesa_upload_complete",
             lots_created=lots_created,
@@ -1410,7 +1430,8 @@ async def upload_siesa_inventory(
 
     except SIESAMissingColumnsError as e:
         logger.error("siesa_missing_columns", missing=e.details.get("missing_columns"))
-        get_upload_history_service().record_failed_upload(
+        await run_db(
+            get_upload_history_service().record_failed_upload,
             upload_type="siesa",
             filename=file.filename or "unknown",
             error_message=str(e),
@@ -1418,7 +1439,8 @@ async def upload_siesa_inventory(
         return handle_error(e)
     except SIESAParseError as e:
         logger.error("siesa_parse_error", error=str(e))
-        get_upload_history_service().record_failed_upload(
+        await run_db(
+            get_upload_history_service().record_failed_upload,
             upload_type="siesa",
             filename=file.filename or "unknown",
             error_message=str(e),
@@ -1426,7 +1448,8 @@ async def upload_siesa_inventory(
         return handle_error(e)
     except Exception as e:
         logger.error("siesa_upload_failed", error=str(e), type=type(e).__name__)
-        get_upload_history_service().record_failed_upload(
+        await run_db(
+            get_upload_history_service().record_failed_upload,
             upload_type="siesa",
             filename=file.filename or "unknown",
             error_message=str(e),
@@ -1562,7 +1585,7 @@ async def parse_in_transit(
 
         # Get active products for SKU matching
         product_service = get_product_service()
-        products, _ = product_service.get_all(page=1, page_size=1000, active_only=True)
+        products, _ = await run_db(product_service.get_all, page=1, page_size=1000, active_only=True)
 
         # Parse the dispatch file
         from parsers.dispatch_parser import parse_dispatch_excel, normalize_unmatched_sku
@@ -1581,12 +1604,12 @@ async def parse_in_transit(
                     ProductCreate(sku=normalize_unmatched_sku(raw), category=Category.MADERAS)
                     for raw in tile_skus
                 ]
-                created, _ = product_service.bulk_upsert(new_products)
+                created, _ = await run_db(product_service.bulk_upsert, new_products)
                 if created > 0:
                     logger.info("dispatch_auto_created_products", count=created,
                                 skus=[p.sku for p in new_products])
                     # Re-parse with expanded product list so new products get matched
-                    products, _ = product_service.get_all(page=1, page_size=1000, active_only=True)
+                    products, _ = await run_db(product_service.get_all, page=1, page_size=1000, active_only=True)
                     parse_result = parse_dispatch_excel(content, products, [])
 
         # Auto-match dispatch orders to boats via booking_number
@@ -1606,9 +1629,9 @@ async def parse_in_transit(
             normalized_codes = list({_extract_booking_code(b) for b in raw_bookings})
             boat_lookup: dict[str, dict] = {}
             if normalized_codes:
-                boats_result = db.table("boat_schedules").select(
+                boats_result = await execute_async(db.table("boat_schedules").select(
                     "id, vessel_name, departure_date, booking_number"
-                ).in_("booking_number", normalized_codes).execute()
+                ).in_("booking_number", normalized_codes))
                 for boat in (boats_result.data or []):
                     bn = boat.get("booking_number", "")
                     if bn:
@@ -1647,7 +1670,8 @@ async def parse_in_transit(
 
     except ValueError as e:
         logger.error("in_transit_parse_error", error=str(e))
-        get_upload_history_service().record_failed_upload(
+        await run_db(
+            get_upload_history_service().record_failed_upload,
             upload_type="in_transit",
             filename=file.filename or "unknown",
             error_message=str(e),
@@ -1658,7 +1682,8 @@ async def parse_in_transit(
         )
     except Exception as e:
         logger.error("in_transit_parse_failed", error=str(e), type=type(e).__name__)
-        get_upload_history_service().record_failed_upload(
+        await run_db(
+            get_upload_history_service().record_failed_upload,
             upload_type="in_transit",
             filename=file.filename or "unknown",
             error_message=str(e),
@@ -1710,7 +1735,7 @@ async def upload_in_transit(
 
         # Get active products for SKU matching
         product_service = get_product_service()
-        products, _ = product_service.get_all(page=1, page_size=1000, active_only=True)
+        products, _ = await run_db(product_service.get_all, page=1, page_size=1000, active_only=True)
 
         # Parse the dispatch file
         from parsers.dispatch_parser import parse_dispatch_excel, normalize_unmatched_sku
@@ -1729,12 +1754,12 @@ async def upload_in_transit(
                     ProductCreate(sku=normalize_unmatched_sku(raw), category=Category.MADERAS)
                     for raw in tile_skus
                 ]
-                created, _ = product_service.bulk_upsert(new_products)
+                created, _ = await run_db(product_service.bulk_upsert, new_products)
                 if created > 0:
                     logger.info("dispatch_auto_created_products", count=created,
                                 skus=[p.sku for p in new_products])
                     # Re-parse with expanded product list
-                    products, _ = product_service.get_all(page=1, page_size=1000, active_only=True)
+                    products, _ = await run_db(product_service.get_all, page=1, page_size=1000, active_only=True)
                     parse_result = parse_dispatch_excel(content, products, excluded)
 
         # Get database client
@@ -1750,22 +1775,22 @@ async def upload_in_transit(
         reset_pids = all_active_pids - in_transit_pids
         reset_count = 0
         for pid in reset_pids:
-            db.table("transit_snapshots").upsert({
+            await execute_async(db.table("transit_snapshots").upsert({
                 "product_id": pid,
                 "snapshot_date": snapshot_date.isoformat(),
                 "in_transit_qty": 0,
-            }, on_conflict="product_id,snapshot_date").execute()
+            }, on_conflict="product_id,snapshot_date"))
             reset_count += 1
 
         # Upsert in_transit_qty for products in the dispatch file
         updated_count = 0
         details = []
         for product in parse_result.products:
-            db.table("transit_snapshots").upsert({
+            await execute_async(db.table("transit_snapshots").upsert({
                 "product_id": product.product_id,
                 "snapshot_date": snapshot_date.isoformat(),
                 "in_transit_qty": product.in_transit_m2,
-            }, on_conflict="product_id,snapshot_date").execute()
+            }, on_conflict="product_id,snapshot_date"))
             updated_count += 1
             details.append({"sku": product.sku, "in_transit_m2": product.in_transit_m2})
 
@@ -1783,9 +1808,9 @@ async def upload_in_transit(
             normalized_codes = list({_extract_booking_code(b) for b in raw_bookings})
             boat_lookup: dict[str, str] = {}
             if normalized_codes:
-                boats_result = db.table("boat_schedules").select("id,booking_number").in_(
+                boats_result = await execute_async(db.table("boat_schedules").select("id,booking_number").in_(
                     "booking_number", normalized_codes
-                ).execute()
+                ))
                 for boat in boats_result.data:
                     if boat.get("booking_number"):
                         boat_lookup[boat["booking_number"].strip()] = boat["id"]
@@ -1802,13 +1827,13 @@ async def upload_in_transit(
                 if matched_boat_id:
                     for item in order.items:
                         pallets = math.ceil(item.m2 / float(M2_PER_PALLET)) if item.m2 > 0 else 0
-                        db.table("shipment_items").upsert({
+                        await execute_async(db.table("shipment_items").upsert({
                             "boat_id": matched_boat_id,
                             "product_id": item.product_id,
                             "shipped_m2": item.m2,
                             "shipped_pallets": pallets,
                             "snapshot_date": snapshot_date.isoformat(),
-                        }, on_conflict="boat_id,product_id").execute()
+                        }, on_conflict="boat_id,product_id"))
                     booking_matches += 1
 
             logger.info("shipment_items_auto_matched",
@@ -1820,13 +1845,13 @@ async def upload_in_transit(
         if booking_matches == 0 and boat_id:
             for product in parse_result.products:
                 pallets = math.ceil(product.in_transit_m2 / float(M2_PER_PALLET)) if product.in_transit_m2 > 0 else 0
-                db.table("shipment_items").upsert({
+                await execute_async(db.table("shipment_items").upsert({
                     "boat_id": boat_id,
                     "product_id": product.product_id,
                     "shipped_m2": product.in_transit_m2,
                     "shipped_pallets": pallets,
                     "snapshot_date": snapshot_date.isoformat(),
-                }, on_conflict="boat_id,product_id").execute()
+                }, on_conflict="boat_id,product_id"))
             logger.info("shipment_items_saved_fallback", boat_id=boat_id, products=len(parse_result.products))
 
         logger.info(
@@ -1838,7 +1863,8 @@ async def upload_in_transit(
         )
 
         # Record upload history
-        get_upload_history_service().record_upload(
+        await run_db(
+            get_upload_history_service().record_upload,
             upload_type="in_transit",
             file_hash=hashlib.md5(content).hexdigest(),
             filename=file.filename or "in_transit.xlsx",
@@ -1850,7 +1876,8 @@ async def upload_in_transit(
             ledger = get_ledger_service()
             recon_items = []
             for product in parse_result.products:
-                result = ledger.reconcile_transit(
+                result = await run_db(
+                    ledger.reconcile_transit,
                     product_id=product.product_id,
                     actual_m2=Decimal(str(product.in_transit_m2)),
                     source_filename=file.filename,
@@ -1863,7 +1890,8 @@ async def upload_in_transit(
                         "discrepancy_m2": float(result.get("discrepancy_m2", 0) or 0),
                     })
             for pid in reset_pids:
-                result = ledger.reconcile_transit(
+                result = await run_db(
+                    ledger.reconcile_transit,
                     product_id=pid,
                     actual_m2=Decimal("0"),
                     source_filename=file.filename,
@@ -1876,12 +1904,12 @@ async def upload_in_transit(
                         "discrepancy_m2": float(result.get("discrepancy_m2", 0) or 0),
                     })
             if recon_items:
-                ledger.generate_reconciliation_report("transit", recon_items, file.filename)
+                await run_db(ledger.generate_reconciliation_report, "transit", recon_items, file.filename)
         except Exception as ledger_err:
             logger.warning("ledger_transit_hook_failed", error=str(ledger_err))
 
         # --- Reconciliation: compare dispatch vs ordered/confirmed drafts ---
-        reconciliation = _reconcile_dispatch_vs_drafts(db, parse_result, products)
+        reconciliation = await run_db(_reconcile_dispatch_vs_drafts, db, parse_result, products)
 
         # --- Draft promotion: if boat_id provided, promote its draft to "ordered" ---
         promoted_draft_id = None
@@ -1889,23 +1917,21 @@ async def upload_in_transit(
         if boat_id:
             try:
                 from services.draft_service import DraftService
-                draft_result = (
+                draft_result = await execute_async(
                     db.table("boat_factory_drafts")
                     .select("id, status")
                     .eq("boat_id", boat_id)
                     .in_("status", ["drafting", "action_needed"])
-                    .execute()
                 )
                 if draft_result.data:
                     draft = draft_result.data[0]
-                    DraftService().update_status(draft["id"], "ordered")
+                    await run_db(DraftService().update_status, draft["id"], "ordered")
                     promoted_draft_id = draft["id"]
                     # Get boat name for response
-                    boat_result = (
+                    boat_result = await execute_async(
                         db.table("boat_schedules")
                         .select("vessel_name")
                         .eq("id", boat_id)
-                        .execute()
                     )
                     if boat_result.data:
                         promoted_boat_name = boat_result.data[0].get("vessel_name")
@@ -1934,7 +1960,8 @@ async def upload_in_transit(
 
     except ValueError as e:
         logger.error("in_transit_parse_error", error=str(e))
-        get_upload_history_service().record_failed_upload(
+        await run_db(
+            get_upload_history_service().record_failed_upload,
             upload_type="in_transit",
             filename=file.filename or "unknown",
             error_message=str(e),
@@ -1945,7 +1972,8 @@ async def upload_in_transit(
         )
     except Exception as e:
         logger.error("in_transit_upload_failed", error=str(e), type=type(e).__name__)
-        get_upload_history_service().record_failed_upload(
+        await run_db(
+            get_upload_history_service().record_failed_upload,
             upload_type="in_transit",
             filename=file.filename or "unknown",
             error_message=str(e),
@@ -1984,7 +2012,7 @@ async def list_inventory_lots(
         offset = (page - 1) * page_size
         query = query.range(offset, offset + page_size - 1)
 
-        result = query.execute()
+        result = await execute_async(query)
         total = result.count or 0
         total_pages = (total + page_size - 1) // page_size if total > 0 else 0
 
@@ -2035,9 +2063,9 @@ async def estimate_containers(
         # Get snapshot date
         if snapshot_date is None:
             # Get most recent date
-            result = db.table("inventory_lots").select("snapshot_date").order(
+            result = await execute_async(db.table("inventory_lots").select("snapshot_date").order(
                 "snapshot_date", desc=True
-            ).limit(1).execute()
+            ).limit(1))
             if not result.data:
                 return ContainerEstimateResponse(
                     weight_kg=0,
@@ -2048,9 +2076,9 @@ async def estimate_containers(
             snapshot_date = result.data[0]["snapshot_date"]
 
         # Sum weights for date
-        result = db.table("inventory_lots").select("weight_kg").eq(
+        result = await execute_async(db.table("inventory_lots").select("weight_kg").eq(
             "snapshot_date", snapshot_date if isinstance(snapshot_date, str) else snapshot_date.isoformat()
-        ).execute()
+        ))
 
         total_weight = sum(
             float(row["weight_kg"] or 0)
@@ -2084,7 +2112,7 @@ async def get_inventory_history(
     """
     try:
         service = get_inventory_service()
-        return service.get_history(product_id, limit=limit)
+        return await run_db(service.get_history, product_id, limit=limit)
 
     except Exception as e:
         return handle_error(e)
@@ -2104,7 +2132,8 @@ async def list_inventory(
     try:
         service = get_inventory_service()
 
-        snapshots, total = service.get_all(
+        snapshots, total = await run_db(
+            service.get_all,
             page=page,
             page_size=page_size,
             product_id=product_id
@@ -2134,7 +2163,7 @@ async def get_inventory_snapshot(snapshot_id: str):
     """
     try:
         service = get_inventory_service()
-        return service.get_by_id(snapshot_id)
+        return await run_db(service.get_by_id, snapshot_id)
 
     except InventoryNotFoundError as e:
         return handle_error(e)
@@ -2152,7 +2181,7 @@ async def create_inventory_snapshot(data: InventorySnapshotCreate):
     """
     try:
         service = get_inventory_service()
-        return service.create(data)
+        return await run_db(service.create, data)
 
     except Exception as e:
         return handle_error(e)
@@ -2171,7 +2200,7 @@ async def update_inventory_snapshot(snapshot_id: str, data: InventorySnapshotUpd
     """
     try:
         service = get_inventory_service()
-        return service.update(snapshot_id, data)
+        return await run_db(service.update, snapshot_id, data)
 
     except InventoryNotFoundError as e:
         return handle_error(e)
@@ -2189,7 +2218,7 @@ async def delete_inventory_snapshot(snapshot_id: str):
     """
     try:
         service = get_inventory_service()
-        service.delete(snapshot_id)
+        await run_db(service.delete, snapshot_id)
         return None  # 204 No Content
 
     except InventoryNotFoundError as e:
@@ -2209,7 +2238,7 @@ async def count_inventory_snapshots(
     """Get total inventory snapshot count."""
     try:
         service = get_inventory_service()
-        count = service.count(product_id=product_id)
+        count = await run_db(service.count, product_id=product_id)
         return {"count": count}
 
     except Exception as e:
@@ -0,0 +1,70 @@
+"""
+Background job API routes.
+
+Status polling and cancellation for ingestion jobs submitted with
+background=true (see services/job_service.py).
+"""
+
+from typing import Optional
+
+import structlog
+from fastapi import APIRouter, Query
+from fastapi.responses import JSONResponse
+
+from models.job import JobListResponse, JobResponse, JobStatus, JobSubmittedResponse
+from services.job_service import get_job_service
+from exceptions import NotFoundError
+
+logger = structlog.get_logger(__name__)
+
+router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
+
+
+def _not_found(job_id: str) -> JSONResponse:
+    error = NotFoundError("Job", job_id)
+    return JSONResponse(status_code=error.status_code, content=error.to_dict())
+
+
+@router.get("", response_model=JobListResponse)
+async def list_jobs(
+    status: Optional[JobStatus] = Query(None, description="Filter by status"),
+    limit: int = Query(50, ge=1, le=500, description="Max jobs to return"),
+):
+    """List recent jobs, newest first."""
+    jobs = get_job_service().list(limit=limit, status=status)
+    return JobListResponse(data=jobs, total=len(jobs))
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    """
+    Poll a job.
+
+    Once status is "succeeded", `result` holds the response the inline
+    endpoint would have returned. On "failed", `status_code` and `error`
+    hold the HTTP status and detail it would have raised.
+    """
+    job = get_job_service().get(job_id)
+    if job is None:
+        return _not_found(job_id)
+    return job
+
+
+@router.post("/{job_id}/cancel", response_model=JobResponse)
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job. Finished jobs are returned unchanged."""
+    service = get_job_service()
+    if service.get(job_id) is None:
+        return _not_found(job_id)
+    service.cancel(job_id)
+    return service.get(job_id)
+
+
+def submit_background_job(kind: str, run, filename: Optional[str] = None) -> JSONResponse:
+    """
+    Queue `run` (zero-arg coroutine factory) as a job and build the 202
+    response ingestion endpoints return for background=true.
+    """
+    job_id = get_job_service().submit(kind, run, filename=filename)
+    body = JobSubmittedResponse(job_id=job_id, status_url=f"{router.prefix}/{job_id}")
+    return JSONResponse(status_code=202, content=body.model_dump(mode="json"))
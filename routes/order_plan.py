@@ -15,7 +15,7 @@ from typing import Literal, Optional
 import structlog
 from fastapi import APIRouter, HTTPException
 
-from config import get_supabase_client
+from config import run_db
 from fastapi.responses import Response
 from pydantic import BaseModel, Field
 
@@ -31,6 +31,7 @@ from services.order_plan_service import (
     PALLETS_PER_CONTAINER,
 )
 from services.plan_narrative_service import generate_narrative
+from services.planning_inputs_service import get_planning_inputs
 from services.plan_pdf_service import render_plan_pdf
 
 
@@ -208,6 +209,28 @@ class AvailableBoat(BaseModel):
     reason: Optional[str] = None
 
 
+def _boat_commitments():
+    """Upcoming non-ignored boats, boats with a committed draft, and pallets drafted per committed boat."""
+    planning = get_planning_inputs()
+
+    # Boats that haven't departed and aren't ignored
+    boats = [b for b in planning.upcoming_boats if b.status != "ignored"]
+
+    # Boats with a committed draft (ordered or confirmed)
+    committed_boat_ids = {d.boat_id for d in planning.drafts if d.is_committed}
+
+    # Pallet counts per committed boat (all of its drafts)
+    pallets_by_boat: dict[str, int] = {}
+    draft_id_to_boat = {
+        d.id: d.boat_id for d in planning.drafts if d.boat_id in committed_boat_ids
+    }
+    for it in planning.draft_items(draft_id_to_boat):
+        bid = draft_id_to_boat[it.draft_id]
+        pallets_by_boat[bid] = pallets_by_boat.get(bid, 0) + it.selected_pallets
+
+    return boats, committed_boat_ids, pallets_by_boat
+
+
 @router.get("/available-boats", response_model=list[AvailableBoat])
 async def list_available_boats():
     """List upcoming boats with planning eligibility flags.
@@ -216,70 +239,22 @@ async def list_available_boats():
     - `committed`:        has an ordered/confirmed draft — already locked
     - `before_committed`: earlier than a committed boat, planning it is illogical
     """
-    db = get_supabase_client()
-    today = date.today()
-
-    # Boats that haven't departed and aren't ignored
-    boats = (
-        db.table("boat_schedules")
-        .select("id, vessel_name, departure_date, arrival_date, status")
-        .gte("departure_date", today.isoformat())
-        .neq("status", "ignored")
-        .order("departure_date")
-        .execute()
-        .data or []
-    )
-
-    # Committed drafts (ordered or confirmed) with their total pallets
-    drafts = (
-        db.table("boat_factory_drafts")
-        .select("boat_id, status")
-        .in_("status", ["ordered", "confirmed"])
-        .execute()
-        .data or []
-    )
-    committed_boat_ids = {d["boat_id"] for d in drafts}
-
-    # Pallet counts per committed boat
-    pallets_by_boat: dict[str, int] = {}
-    if committed_boat_ids:
-        draft_rows = (
-            db.table("boat_factory_drafts")
-            .select("id, boat_id")
-            .in_("boat_id", list(committed_boat_ids))
-            .execute()
-            .data or []
-        )
-        draft_id_to_boat = {d["id"]: d["boat_id"] for d in draft_rows}
-        if draft_id_to_boat:
-            items = (
-                db.table("draft_items")
-                .select("draft_id, selected_pallets")
-                .in_("draft_id", list(draft_id_to_boat.keys()))
-                .execute()
-                .data or []
-            )
-            for it in items:
-                bid = draft_id_to_boat.get(it["draft_id"])
-                if bid:
-                    pallets_by_boat[bid] = pallets_by_boat.get(bid, 0) + int(
-                        it.get("selected_pallets") or 0
-                    )
+    boats, committed_boat_ids, pallets_by_boat = await run_db(_boat_commitments)
 
     # Find latest committed departure date — any boat before this is "before_committed"
     committed_latest_date: Optional[date] = None
     for b in boats:
-        if b["id"] in committed_boat_ids:
-            dep = date.fromisoformat(b["departure_date"])
+        if b.id in committed_boat_ids:
+            dep = date.fromisoformat(b.departure_date)
             if committed_latest_date is None or dep > committed_latest_date:
                 committed_latest_date = dep
 
     result: list[AvailableBoat] = []
     for b in boats:
-        dep = date.fromisoformat(b["departure_date"])
-        if b["id"] in committed_boat_ids:
+        dep = date.fromisoformat(b.departure_date)
+        if b.id in committed_boat_ids:
             status = "committed"
-            reason = f"Ya ordenado ({pallets_by_boat.get(b['id'], 0)} pallets)"
+            reason = f"Ya ordenado ({pallets_by_boat.get(b.id, 0)} pallets)"
         elif committed_latest_date and dep < committed_latest_date:
             status = "before_committed"
             reason = f"Sale antes de un buque ya comprometido"
@@ -287,11 +262,11 @@ async def list_available_boats():
             status = "available"
             reason = None
         result.append(AvailableBoat(
-            boat_id=b["id"],
-            vessel_name=b["vessel_name"],
-            departure_date=b["departure_date"],
-            arrival_date=b["arrival_date"],
-            committed_pallets=pallets_by_boat.get(b["id"], 0),
+            boat_id=b.id,
+            vessel_name=b.vessel_name,
+            departure_date=b.departure_date,
+            arrival_date=b.arrival_date,
+            committed_pallets=pallets_by_boat.get(b.id, 0),
             status=status,
             reason=reason,
         ))
@@ -306,7 +281,8 @@ async def list_available_boats():
 async def generate_plan(body: GenerateRequest):
     """Compute a velocity-optimized order plan + AI narrative."""
     try:
-        result = compute_plan(
+        result = await run_db(
+            compute_plan,
             boat_ids=body.boat_ids,
             max_containers=body.max_containers,
             warehouse_buffer_pct=body.warehouse_buffer_pct,
@@ -317,7 +293,8 @@ async def generate_plan(body: GenerateRequest):
         logger.error("plan_compute_failed", error=str(exc))
         raise HTTPException(status_code=500, detail=f"Failed to compute plan: {exc}") from exc
 
-    narrative = generate_narrative(result)
+    # Narrative is a blocking Anthropic call — keep it off the event loop too
+    narrative = await run_db(generate_narrative, result)
     return _result_to_response(result, narrative)
 
 
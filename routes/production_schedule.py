@@ -362,13 +362,14 @@ async def rematch_products():
     """
     try:
         service = get_production_schedule_service()
-        processed, matched = service.rematch_products()
+        processed, matched, matched_by_code = service.rematch_products()
 
         return {
             "success": True,
             "message": f"Processed {processed} unmatched items, {matched} newly matched",
             "total_processed": processed,
-            "newly_matched": matched
+            "newly_matched": matched,
+            "matched_by_factory_code": matched_by_code,
         }
 
     except Exception as e:
@@ -553,7 +554,7 @@ async def preview_production_upload(
             "upload_type": "production_schedule",
             "unmatched_referencias": unmatched_referencias,
         }
-        preview_id = preview_cache_service.store_preview(preview_data)
+        preview_id = await preview_cache_service.store_preview(preview_data)
 
         logger.info(
             "production_preview_created",
@@ -760,7 +761,7 @@ async def confirm_production_upload(
     """Save previously previewed production data (wipe and replace). Optionally resolve unmatched items and apply inline edits."""
     try:
         # Retrieve from cache
-        cached = preview_cache_service.retrieve_preview(preview_id)
+        cached = await preview_cache_service.retrieve_preview(preview_id)
         if cached is None:
             raise HTTPException(status_code=404, detail="Preview expired or not found")
 
@@ -887,7 +888,7 @@ async def confirm_production_upload(
             logger.warning("ledger_production_hook_failed", error=str(ledger_err))
 
         # Delete preview from cache
-        preview_cache_service.delete_preview(preview_id)
+        await preview_cache_service.delete_preview(preview_id)
 
         logger.info(
             "production_schedule_confirm_complete",
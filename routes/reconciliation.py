@@ -13,13 +13,13 @@ Pure observation surface. Does not feed the cascade. Brain ignores it.
 """
 
 from decimal import Decimal
-from datetime import date
 
 from fastapi import APIRouter, HTTPException
 import structlog
 
-from config import get_supabase_client
+from config import run_db
 from lib.constants import M2_PER_PALLET
+from services.planning_inputs_service import get_planning_inputs
 
 logger = structlog.get_logger(__name__)
 router = APIRouter(prefix="/api/v2/reconciliation", tags=["reconciliation"])
@@ -35,31 +35,21 @@ async def factory_commits_reconciliation(factory_id: str):
     Only future boats count for "our_committed_m2" — past boats either shipped
     (their pallets are gone from the snapshot) or are zombies (separate problem).
     """
-    db = get_supabase_client()
-    today = date.today()
+    return await run_db(_reconcile_factory_commits, factory_id)
+
+
+def _reconcile_factory_commits(factory_id: str) -> dict:
+    planning = get_planning_inputs()
 
     # 1. Latest factory snapshot — committed view by product
-    fs = (
-        db.table("factory_snapshots")
-        .select("snapshot_date, created_at")
-        .order("snapshot_date", desc=True)
-        .limit(1)
-        .execute()
-        .data
-    )
-    if not fs:
+    factory = planning.snapshots.factory
+    if factory.snapshot_date is None:
         return {"factory_id": factory_id, "products": [], "snapshot_date": None}
 
-    snapshot_date = fs[0]["snapshot_date"]
-    snapshot_uploaded_at = fs[0].get("created_at")
+    snapshot_date = factory.snapshot_date
+    snapshot_uploaded_at = factory.created_at
+    snap_rows = factory.rows
 
-    snap_rows = (
-        db.table("factory_snapshots")
-        .select("product_id, factory_existencia_m2, factory_committed_m2, factory_available_m2")
-        .eq("snapshot_date", snapshot_date)
-        .execute()
-        .data or []
-    )
     factory_commit_by_pid: dict[str, Decimal] = {
         r["product_id"]: Decimal(str(r.get("factory_committed_m2") or 0))
         for r in snap_rows
@@ -70,53 +60,23 @@ async def factory_commits_reconciliation(factory_id: str):
     }
 
     # 2. Our committed drafts on FUTURE boats for this factory
-    future_boats = (
-        db.table("boat_schedules")
-        .select("id")
-        .gte("departure_date", today.isoformat())
-        .neq("status", "ignored")
-        .execute()
-        .data or []
-    )
-    future_boat_ids = {b["id"] for b in future_boats}
-
-    drafts = (
-        db.table("boat_factory_drafts")
-        .select("id, boat_id, status")
-        .eq("factory_id", factory_id)
-        .in_("status", ["ordered", "confirmed"])
-        .execute()
-        .data or []
-    )
-    active_draft_ids = [d["id"] for d in drafts if d["boat_id"] in future_boat_ids]
+    future_boat_ids = {b.id for b in planning.upcoming_boats if b.status != "ignored"}
+    active_draft_ids = [
+        d.id for d in planning.drafts
+        if d.factory_id == factory_id and d.is_committed and d.boat_id in future_boat_ids
+    ]
 
     our_commit_by_pid: dict[str, Decimal] = {}
-    if active_draft_ids:
-        items = (
-            db.table("draft_items")
-            .select("draft_id, product_id, selected_pallets")
-            .in_("draft_id", active_draft_ids)
-            .execute()
-            .data or []
-        )
-        for it in items:
-            pid = it["product_id"]
-            pallets = Decimal(str(it.get("selected_pallets") or 0))
-            our_commit_by_pid[pid] = our_commit_by_pid.get(pid, Decimal(0)) + pallets * M2_PER_PALLET
+    for it in planning.draft_items(active_draft_ids):
+        pid = it.product_id
+        our_commit_by_pid[pid] = our_commit_by_pid.get(pid, Decimal(0)) + it.selected_pallets * M2_PER_PALLET
 
     # 3. Build per-product reconciliation rows
-    products = (
-        db.table("products")
-        .select("id, sku, factory_id, active")
-        .eq("factory_id", factory_id)
-        .eq("active", True)
-        .execute()
-        .data or []
-    )
+    products = [p for p in planning.products if p.factory_id == factory_id]
 
     rows = []
     for p in products:
-        pid = p["id"]
+        pid = p.id
         ours = our_commit_by_pid.get(pid, Decimal(0))
         theirs = factory_commit_by_pid.get(pid, Decimal(0))
         existencia = factory_existencia_by_pid.get(pid, Decimal(0))
@@ -131,7 +91,7 @@ async def factory_commits_reconciliation(factory_id: str):
 
         rows.append({
             "product_id": pid,
-            "sku": p["sku"],
+            "sku": p.sku,
             "factory_existencia_m2": float(existencia),
             "our_committed_m2": float(ours),
             "factory_committed_m2": float(theirs),
@@ -31,6 +31,7 @@ from models.sales import (
     SACPreview,
     SACPreviewRow,
 )
+from config import run_db, execute_async
 from services.sales_service import get_sales_service
 from services.product_service import get_product_service
 from services import preview_cache_service
@@ -133,9 +134,9 @@ async def preview_sales_upload(file: UploadFile = File(...)):
 
         # Check for duplicate upload
         history_service = get_upload_history_service()
-        duplicate = history_service.check_duplicate("sales", file_hash)
+        duplicate = await run_db(history_service.check_duplicate, "sales", file_hash)
 
-        sales_records, warnings, parse_result = _parse_sales_file(contents, filename=file.filename)
+        sales_records, warnings, parse_result = await run_db(_parse_sales_file, contents, filename=file.filename)
 
         if duplicate:
             warnings.insert(0, f"Este archivo ya fue subido el {duplicate['uploaded_at'][:10]} ({duplicate['filename']})")
@@ -171,7 +172,7 @@ async def preview_sales_upload(file: UploadFile = File(...)):
             for i, r in enumerate(sales_records)
         ]
 
-        preview_id = preview_cache_service.store_preview({
+        preview_id = await preview_cache_service.store_preview({
             "records": sales_records,
             "file_hash": file_hash,
             "filename": file.filename,
@@ -199,7 +200,8 @@ async def preview_sales_upload(file: UploadFile = File(...)):
         )
 
     except (ExcelParseError, AppError) as e:
-        get_upload_history_service().record_failed_upload(
+        await run_db(
+            get_upload_history_service().record_failed_upload,
             upload_type="sales",
             filename=file.filename or "unknown",
             error_message=str(e),
@@ -207,7 +209,8 @@ async def preview_sales_upload(file: UploadFile = File(...)):
         return handle_error(e)
     except Exception as e:
         logger.error("sales_preview_failed", error=str(e))
-        get_upload_history_service().record_failed_upload(
+        await run_db(
+            get_upload_history_service().record_failed_upload,
             upload_type="sales",
             filename=file.filename or "unknown",
             error_message=str(e),
@@ -219,7 +222,7 @@ async def preview_sales_upload(file: UploadFile = File(...)):
 async def confirm_sales_upload(preview_id: str, request: Optional[SalesConfirmRequest] = None):
     """Save previously previewed sales data with optional inline edits."""
     try:
-        cached_data = preview_cache_service.retrieve_preview(preview_id)
+        cached_data = await preview_cache_service.retrieve_preview(preview_id)
         if cached_data is None:
             raise HTTPException(status_code=404, detail="Preview expired")
 
@@ -257,11 +260,11 @@ async def confirm_sales_upload(preview_id: str, request: Optional[SalesConfirmRe
             dates = [r.week_start for r in sales_records]
             min_date = min(dates)
             max_date = max(dates)
-            deleted = sales_service.delete_by_date_range(min_date, max_date)
+            deleted = await run_db(sales_service.delete_by_date_range, min_date, max_date)
             if deleted > 0:
                 logger.info("sales_deleted_before_upload", count=deleted)
 
-        created = sales_service.bulk_create(sales_records)
+        created = await run_db(sales_service.bulk_create, sales_records)
 
         logger.info(
             "sales_confirm_complete",
@@ -282,12 +285,11 @@ async def confirm_sales_upload(preview_id: str, request: Optional[SalesConfirmRe
             excel_product_count = len(excel_m2_by_product)
 
             db = sales_service.db
-            db_rows = (
+            db_rows = await execute_async(
                 db.table("sales")
                 .select("product_id, quantity_m2")
                 .gte("week_start", min_date.isoformat())
                 .lte("week_start", max_date.isoformat())
-                .execute()
             )
             db_m2_by_product: dict[str, float] = defaultdict(float)
             for row in db_rows.data:
@@ -326,7 +328,8 @@ async def confirm_sales_upload(preview_id: str, request: Optional[SalesConfirmRe
                 warnings.append(f"Deleted {deleted} rows but only inserted {len(sales_records)} — check if correct file was uploaded")
 
         # Record upload history
-        get_upload_history_service().record_upload(
+        await run_db(
+            get_upload_history_service().record_upload,
             upload_type=cached_data.get("upload_type", "sales"),
             file_hash=cached_data.get("file_hash", ""),
             filename=cached_data.get("filename", "unknown"),
@@ -340,7 +343,8 @@ async def confirm_sales_upload(preview_id: str, request: Optional[SalesConfirmRe
                 agg: dict[str, float] = defaultdict(float)
                 for r in sales_records:
                     agg[r.product_id] += float(r.quantity_m2)
-                ledger.record_sales_batch(
+                await run_db(
+                    ledger.record_sales_batch,
                     items=[
                         {"product_id": pid, "quantity_m2": qty, "event_date": max_date}
                         for pid, qty in agg.items()
@@ -350,7 +354,7 @@ async def confirm_sales_upload(preview_id: str, request: Optional[SalesConfirmRe
         except Exception as ledger_err:
             logger.warning("ledger_sales_hook_failed", error=str(ledger_err))
 
-        preview_cache_service.delete_preview(preview_id)
+        await preview_cache_service.delete_preview(preview_id)
 
         return SalesUploadResponse(
             success=True,
@@ -365,7 +369,8 @@ async def confirm_sales_upload(preview_id: str, request: Optional[SalesConfirmRe
         raise
     except (AppError,) as e:
         _cd = locals().get("cached_data")
-        get_upload_history_service().record_failed_upload(
+        await run_db(
+            get_upload_history_service().record_failed_upload,
             upload_type="sales",
             filename=_cd.get("filename", "unknown") if _cd else "unknown",
             error_message=str(e),
@@ -374,7 +379,8 @@ async def confirm_sales_upload(preview_id: str, request: Optional[SalesConfirmRe
     except Exception as e:
         logger.error("sales_confirm_failed", error=str(e), preview_id=preview_id)
         _cd = locals().get("cached_data")
-        get_upload_history_service().record_failed_upload(
+        await run_db(
+            get_upload_history_service().record_failed_upload,
             upload_type="sales",
             filename=_cd.get("filename", "unknown") if _cd else "unknown",
             error_message=str(e),
@@ -395,7 +401,7 @@ async def upload_sales(file: UploadFile = File(...)):
     """
     try:
         contents = await file.read()
-        sales_records, warnings, parse_result = _parse_sales_file(contents, filename=file.filename)
+        sales_records, warnings, parse_result = await run_db(_parse_sales_file, contents, filename=file.filename)
 
         sales_service = get_sales_service()
         deleted = 0
@@ -406,12 +412,12 @@ async def upload_sales(file: UploadFile = File(...)):
             dates = [r.week_start for r in sales_records]
             min_date = min(dates)
             max_date = max(dates)
-            deleted = sales_service.delete_by_date_range(min_date, max_date)
+            deleted = await run_db(sales_service.delete_by_date_range, min_date, max_date)
             if deleted > 0:
                 logger.info("sales_deleted_before_upload", count=deleted)
 
         # Bulk create
-        created = sales_service.bulk_create(sales_records)
+        created = await run_db(sales_service.bulk_create, sales_records)
 
         logger.info(
             "sales_upload_complete",
@@ -431,12 +437,11 @@ async def upload_sales(file: UploadFile = File(...)):
 
             # DB-side totals
             db = sales_service.db
-            db_rows = (
+            db_rows = await execute_async(
                 db.table("sales")
                 .select("product_id, quantity_m2")
                 .gte("week_start", min_date.isoformat())
                 .lte("week_start", max_date.isoformat())
-                .execute()
             )
             db_m2_by_product: dict[str, float] = defaultdict(float)
             for row in db_rows.data:
@@ -490,7 +495,8 @@ async def upload_sales(file: UploadFile = File(...)):
         )
 
     except (ExcelParseError, AppError) as e:
-        get_upload_history_service().record_failed_upload(
+        await run_db(
+            get_upload_history_service().record_failed_upload,
             upload_type="sales",
             filename=file.filename or "unknown",
             error_message=str(e),
@@ -498,7 +504,8 @@ async def upload_sales(file: UploadFile = File(...)):
         return handle_error(e)
     except Exception as e:
         logger.error("sales_upload_failed", error=str(e))
-        get_upload_history_service().record_failed_upload(
+        await run_db(
+            get_upload_history_service().record_failed_upload,
             upload_type="sales",
             filename=file.filename or "unknown",
             error_message=str(e),
@@ -512,7 +519,7 @@ async def preview_sac_upload(file: UploadFile = File(...)):
     try:
         # Get products with sac_sku and name mappings
         product_service = get_product_service()
-        products, _ = product_service.get_all(page=1, page_size=1000, active_only=False)
+        products, _ = await run_db(product_service.get_all, page=1, page_size=1000, active_only=False)
 
         # Build lookup: sac_sku (int) -> product_id
         known_sac_skus = {
@@ -534,7 +541,7 @@ async def preview_sac_upload(file: UploadFile = File(...)):
 
         # Check for duplicate upload
         history_service = get_upload_history_service()
-        sac_duplicate = history_service.check_duplicate("sac_sales", file_hash)
+        sac_duplicate = await run_db(history_service.check_duplicate, "sac_sales", file_hash)
 
         parse_result = parse_sac_csv(contents, known_sac_skus, known_product_names, filename=file.filename)
 
@@ -588,7 +595,7 @@ async def preview_sac_upload(file: UploadFile = File(...)):
             "filename": file.filename,
             "upload_type": "sac_sales",
         }
-        preview_id = preview_cache_service.store_preview(cache_data)
+        preview_id = await preview_cache_service.store_preview(cache_data)
 
         logger.info(
             "sac_preview_created",
@@ -619,7 +626,8 @@ async def preview_sac_upload(file: UploadFile = File(...)):
         )
 
     except (SACParseError, SACMissingColumnsError, AppError) as e:
-        get_upload_history_service().record_failed_upload(
+        await run_db(
+            get_upload_history_service().record_failed_upload,
             upload_type="sac_sales",
             filename=file.filename or "unknown",
             error_message=str(e),
@@ -627,7 +635,8 @@ async def preview_sac_upload(file: UploadFile = File(...)):
         return handle_error(e)
     except Exception as e:
         logger.error("sac_preview_failed", error=str(e))
-        get_upload_history_service().record_failed_upload(
+        await run_db(
+            get_upload_history_service().record_failed_upload,
             upload_type="sac_sales",
             filename=file.filename or "unknown",
             error_message=str(e),
@@ -640,7 +649,7 @@ async def confirm_sac_upload(preview_id: str):
     """Save previously previewed SAC sales data."""
     try:
         # Retrieve from cache
-        cached_data = preview_cache_service.retrieve_preview(preview_id)
+        cached_data = await preview_cache_service.retrieve_preview(preview_id)
         if cached_data is None:
             raise HTTPException(status_code=404, detail="Preview expired")
 
@@ -655,12 +664,12 @@ async def confirm_sac_upload(preview_id: str):
             # Make upload idempotent: delete existing records in date range
             min_date, max_date = parse_result.date_range
             if min_date and max_date:
-                deleted = sales_service.delete_by_date_range(min_date, max_date)
+                deleted = await run_db(sales_service.delete_by_date_range, min_date, max_date)
                 if deleted > 0:
                     logger.info("sac_sales_deleted_before_upload", count=deleted)
 
         # Bulk create
-        created = sales_service.bulk_create(sales_records)
+        created = await run_db(sales_service.bulk_create, sales_records)
 
         logger.info(
             "sac_confirm_complete",
@@ -671,7 +680,8 @@ async def confirm_sac_upload(preview_id: str):
         )
 
         # Record upload history
-        get_upload_history_service().record_upload(
+        await run_db(
+            get_upload_history_service().record_upload,
             upload_type=cached_data.get("upload_type", "sac_sales"),
             file_hash=cached_data.get("file_hash", ""),
             filename=cached_data.get("filename", "unknown"),
@@ -679,7 +689,7 @@ async def confirm_sac_upload(preview_id: str):
         )
 
         # Delete preview from cache
-        preview_cache_service.delete_preview(preview_id)
+        await preview_cache_service.delete_preview(preview_id)
 
         return SACUploadResponse(
             created=len(created),
@@ -705,7 +715,8 @@ async def confirm_sac_upload(preview_id: str):
         raise
     except (AppError,) as e:
         _cd = locals().get("cached_data")
-        get_upload_history_service().record_failed_upload(
+        await run_db(
+            get_upload_history_service().record_failed_upload,
             upload_type="sac_sales",
             filename=_cd.get("filename", "unknown") if _cd else "unknown",
             error_message=str(e),
@@ -714,7 +725,8 @@ async def confirm_sac_upload(preview_id: str):
     except Exception as e:
         logger.error("sac_confirm_failed", error=str(e), preview_id=preview_id)
         _cd = locals().get("cached_data")
-        get_upload_history_service().record_failed_upload(
+        await run_db(
+            get_upload_history_service().record_failed_upload,
             upload_type="sac_sales",
             filename=_cd.get("filename", "unknown") if _cd else "unknown",
             error_message=str(e),
@@ -741,7 +753,7 @@ async def upload_sac_sales(file: UploadFile = File(...)):
     try:
         # Get products with sac_sku and name mappings
         product_service = get_product_service()
-        products, _ = product_service.get_all(page=1, page_size=1000, active_only=False)
+        products, _ = await run_db(product_service.get_all, page=1, page_size=1000, active_only=False)
 
         # Build lookup: sac_sku (int) -> product_id
         known_sac_skus = {
@@ -792,12 +804,12 @@ async def upload_sac_sales(file: UploadFile = File(...)):
             # Make upload idempotent: delete existing records in date range
             min_date, max_date = parse_result.date_range
             if min_date and max_date:
-                deleted = sales_service.delete_by_date_range(min_date, max_date)
+                deleted = await run_db(sales_service.delete_by_date_range, min_date, max_date)
                 if deleted > 0:
                     logger.info("sac_sales_deleted_before_upload", count=deleted)
 
         # Bulk create
-        created = sales_service.bulk_create(sales_records)
+        created = await run_db(sales_service.bulk_create, sales_records)
 
         logger.info(
             "sac_upload_complete",
@@ -828,7 +840,8 @@ async def upload_sac_sales(file: UploadFile = File(...)):
         )
 
     except (SACParseError, SACMissingColumnsError, AppError) as e:
-        get_upload_history_service().record_failed_upload(
+        await run_db(
+            get_upload_history_service().record_failed_upload,
             upload_type="sac_sales",
             filename=file.filename or "unknown",
             error_message=str(e),
@@ -836,7 +849,8 @@ async def upload_sac_sales(file: UploadFile = File(...)):
         return handle_error(e)
     except Exception as e:
         logger.error("sac_upload_failed", error=str(e))
-        get_upload_history_service().record_failed_upload(
+        await run_db(
+            get_upload_history_service().record_failed_upload,
             upload_type="sac_sales",
             filename=file.filename or "unknown",
             error_message=str(e),
@@ -860,7 +874,7 @@ async def get_sales_history(
     """
     try:
         service = get_sales_service()
-        records = service.get_history(product_id, limit)
+        records = await run_db(service.get_history, product_id, limit)
 
         total_m2 = sum(r.quantity_m2 for r in records)
 
@@ -880,7 +894,7 @@ async def get_weekly_sales(week_start: date):
     """Get all sales for a specific week."""
     try:
         service = get_sales_service()
-        records = service.get_weekly_totals(week_start)
+        records = await run_db(service.get_weekly_totals, week_start)
 
         total_m2 = sum(r.quantity_m2 for r in records)
 
@@ -910,7 +924,8 @@ async def list_sales(
     try:
         service = get_sales_service()
 
-        records, total = service.get_all(
+        records, total = await run_db(
+            service.get_all,
             page=page,
             page_size=page_size,
             product_id=product_id,
@@ -941,7 +956,7 @@ async def get_sales_record(record_id: str):
     """
     try:
         service = get_sales_service()
-        return service.get_by_id(record_id)
+        return await run_db(service.get_by_id, record_id)
 
     except SalesNotFoundError as e:
         return handle_error(e)
@@ -963,7 +978,7 @@ async def create_sales_record(data: SalesRecordCreate):
     """
     try:
         service = get_sales_service()
-        return service.create(data)
+        return await run_db(service.create, data)
 
     except Exception as e:
         return handle_error(e)
@@ -980,7 +995,7 @@ async def update_sales_record(record_id: str, data: SalesRecordUpdate):
     """
     try:
         service = get_sales_service()
-        return service.update(record_id, data)
+        return await run_db(service.update, record_id, data)
 
     except SalesNotFoundError as e:
         return handle_error(e)
@@ -998,7 +1013,7 @@ async def delete_sales_record(record_id: str):
     """
     try:
         service = get_sales_service()
-        service.delete(record_id)
+        await run_db(service.delete, record_id)
         return None
 
     except SalesNotFoundError as e:
@@ -1018,7 +1033,7 @@ async def count_sales(
     """Get total sales record count."""
     try:
         service = get_sales_service()
-        count = service.count(product_id=product_id)
+        count = await run_db(service.count, product_id=product_id)
         return {"count": count}
 
     except Exception as e:
@@ -248,7 +248,7 @@ async def preview_unfulfilled_demand(file: UploadFile = File(...)):
             "filename": file.filename,
             "upload_type": "unfulfilled_demand",
         }
-        preview_id = preview_cache_service.store_preview(cache_data)
+        preview_id = await preview_cache_service.store_preview(cache_data)
 
         logger.info(
             "unfulfilled_demand_preview_created",
@@ -307,7 +307,7 @@ async def confirm_unfulfilled_demand(
     Only matched rows (with product_id) are saved.
     """
     try:
-        cache_data = preview_cache_service.retrieve_preview(preview_id)
+        cache_data = await preview_cache_service.retrieve_preview(preview_id)
         if cache_data is None:
             raise HTTPException(status_code=404, detail="Preview expired")
 
@@ -380,7 +380,7 @@ async def confirm_unfulfilled_demand(
         )
 
         # Delete preview from cache
-        preview_cache_service.delete_preview(preview_id)
+        await preview_cache_service.delete_preview(preview_id)
 
         logger.info(
             "unfulfilled_demand_confirm_complete",
@@ -0,0 +1,120 @@
+"""
+Benchmark DocumentParserService field extraction.
+
+Times text extraction and the regex field parsers per document,
+compares the precompiled PatternSet lookups against the naive
+re.search-per-pattern loop (checking both give the same result), and
+times the all-fields hit scan.
+
+Usage:
+    python scripts/benchmark_document_parser.py                 # every PDF in data/
+    python scripts/benchmark_document_parser.py a.pdf b.pdf     # specific PDFs
+    python scripts/benchmark_document_parser.py --repeat 200
+
+With no PDFs available, runs on a synthetic multi-container HBL text.
+"""
+import argparse
+import glob
+import logging
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import structlog
+
+structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+from services.document_parser_service import DocumentParserService, _pattern_set  # noqa: E402
+
+SYNTHETIC_HBL = "\n".join(
+    ["HOUSE BILL OF LADING", "B/L No.: SHP0045642", "Vessel  Voyage No.", "HANSA SIEGBURG   0YKATN1MA",
+     "Port of Loading", "SHANGHAI, CHINA", "Port of Discharge", "PUERTO QUETZAL",
+     "Shipped on Board 20-NOV-2025", "FREIGHT PREPAID"]
+    + [f"TCLU{1000000 + i:07d} {100000 + i} 20GP" for i in range(40)]
+    + ["Type|" + "|".join(["20GP"] * 40) + "|"]
+    + [f"TCLU{1000000 + i:07d}|14 PALLETS|NET WEIGHT 2{i:04d}|18.9 M3" for i in range(40)]
+    + ["Terms and conditions " * 200]
+)
+
+
+def naive_search(text: str, patterns: list[str]):
+    """Reference: first pattern that matches wins."""
+    for pattern in patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            return match.group(1).strip()
+    return None
+
+
+def timeit(func, repeat: int) -> float:
+    """Mean milliseconds per call."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def benchmark(name: str, text: str, service: DocumentParserService, repeat: int) -> None:
+    field_lists = {
+        "shp_number": service.SHP_PATTERNS,
+        "booking_number": service.BOOKING_PATTERNS,
+        "pv_number": service.PV_PATTERNS,
+        "vessel": service.VESSEL_PATTERNS,
+        "voyage": service.VOYAGE_PATTERNS,
+    }
+
+    for field, patterns in field_lists.items():
+        hit = _pattern_set(field, tuple(patterns)).search(text)
+        assert (hit.value.strip() if hit else None) == naive_search(text, patterns), field
+
+    pattern_sets = [_pattern_set(f, tuple(p)) for f, p in field_lists.items()]
+    containers, _ = service.parse_containers(text)
+    hits = service.extract_field_hits(text)
+
+    phases = {
+        "field lookups x5 (naive)": timeit(lambda: [naive_search(text, p) for p in field_lists.values()], repeat),
+        "field lookups x5 (compiled)": timeit(lambda: [ps.search(text) for ps in pattern_sets], repeat),
+        f"all-fields scan ({len(hits)} hits)": timeit(lambda: service.extract_field_hits(text), repeat),
+        "parse_containers": timeit(lambda: service.parse_containers(text), repeat),
+        "parse_dates": timeit(lambda: service.parse_dates(text), repeat),
+        "parse_ports": timeit(lambda: service.parse_ports(text), repeat),
+        "parse_container_details": timeit(
+            lambda: service.parse_container_details(text.upper(), containers), repeat
+        ),
+    }
+
+    print(f"\n{name}: {len(text):,} chars, {len(containers)} containers")
+    for phase, ms in phases.items():
+        print(f"  {phase:<28} {ms:8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pdfs", nargs="*", help="PDF files (default: data/*.pdf)")
+    parser.add_argument("--repeat", type=int, default=50, help="Iterations per measurement")
+    args = parser.parse_args()
+
+    service = DocumentParserService()
+    data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+    pdfs = args.pdfs or sorted(glob.glob(os.path.join(data_dir, "*.pdf")))
+
+    if not pdfs:
+        print("No PDFs found in data/; using synthetic HBL text")
+        benchmark("synthetic_hbl", SYNTHETIC_HBL, service, args.repeat)
+        return
+
+    for path in pdfs:
+        with open(path, "rb") as f:
+            pdf_bytes = f.read()
+        started = time.perf_counter()
+        text = service._extract_with_pdfplumber(pdf_bytes)
+        extract_ms = (time.perf_counter() - started) * 1000
+        print(f"\n{os.path.basename(path)}: pdfplumber extraction {extract_ms:.1f} ms")
+        benchmark(os.path.basename(path), text, service, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -210,16 +210,17 @@ class AlertService:
 
             # Send to Telegram if requested
             if send_telegram:
-                try:
-                    if send_alert_to_telegram(alert):
-                        # Mark as sent
-                        self.db.table(self.table).update({
-                            "is_sent": True
-                        }).eq("id", alert_id).execute()
-
-                        alert.is_sent = True
+                def mark_sent():
+                    self.db.table(self.table).update({
+                        "is_sent": True
+                    }).eq("id", alert_id).execute()
+                    alert.is_sent = True
+                    logger.info("alert_sent_to_telegram", alert_id=alert_id)
 
-                        logger.info("alert_sent_to_telegram", alert_id=alert_id)
+                try:
+                    # Queued for background delivery; is_sent flips once
+                    # Telegram accepts it
+                    send_alert_to_telegram(alert, on_delivered=mark_sent)
                 except TelegramError as e:
                     logger.warning(
                         "telegram_send_failed",
@@ -5,6 +5,7 @@ See STANDARDS_LOGGING.md for logging patterns.
 See STANDARDS_ERRORS.md for error handling patterns.
 """
 
+from dataclasses import dataclass, field
 from typing import Optional
 from datetime import date, timedelta
 from io import BytesIO
@@ -30,10 +31,26 @@ from exceptions import (
     BoatScheduleUploadError,
     DatabaseError,
 )
+from services.planning_inputs_service import invalidate_planning_inputs
+from utils.db_batch import IN_CHUNK_SIZE, WRITE_CHUNK_SIZE, chunked, select_in
 
 logger = structlog.get_logger(__name__)
 
 
+@dataclass
+class BoatMergePlan:
+    """What a TIBA import will do, computed before anything is written."""
+    # existing boat id → (existing row, new record)
+    updates: dict[str, tuple[dict, BoatScheduleRecord]] = field(default_factory=dict)
+    inserts: list[BoatScheduleRecord] = field(default_factory=list)
+    unchanged: int = 0
+    deletes: list[dict] = field(default_factory=list)
+    # (existing row, reason) for orphans that survive
+    kept: list[tuple[dict, str]] = field(default_factory=list)
+    # (record, "new" | "update" | "skip") in departure order
+    record_actions: list[tuple[BoatScheduleRecord, str]] = field(default_factory=list)
+
+
 class BoatScheduleService:
     """
     Boat schedule business logic.
@@ -474,6 +491,7 @@ class BoatScheduleService:
                 .insert(insert_data)
                 .execute()
             )
+            invalidate_planning_inputs("boat_created")
 
             logger.info(
                 "boat_schedule_created",
@@ -545,6 +563,7 @@ class BoatScheduleService:
                 .eq("id", schedule_id)
                 .execute()
             )
+            invalidate_planning_inputs("boat_updated")
 
             logger.info("boat_schedule_updated", schedule_id=schedule_id)
 
@@ -608,6 +627,7 @@ class BoatScheduleService:
                 .eq("id", schedule_id)
                 .execute()
             )
+            invalidate_planning_inputs("boat_status_updated")
 
             logger.info(
                 "boat_schedule_status_updated",
@@ -647,6 +667,7 @@ class BoatScheduleService:
 
         try:
             self.db.table(self.table).delete().eq("id", schedule_id).execute()
+            invalidate_planning_inputs("boat_deleted")
 
             logger.info("boat_schedule_deleted", schedule_id=schedule_id)
             return True
@@ -726,15 +747,22 @@ class BoatScheduleService:
         """
         return self._wipe_and_replace(records, filename, [])
 
-    def _wipe_and_replace(
-        self,
-        new_records: list[BoatScheduleRecord],
-        filename: str,
-        skipped_rows: list[SkippedRowInfo],
-    ) -> BoatUploadResult:
+    def plan_merge(self, new_records: list[BoatScheduleRecord]) -> "BoatMergePlan":
         """
-        Identity-based merge: match by (vessel_name, departure_date) so boat IDs
-        stay stable and drafts/shipments don't drift when TIBA shifts positions.
+        Compute the identity-based merge of a TIBA file against existing boats.
+
+        Matches by (vessel_name, departure_date). Nothing is written; the
+        same plan drives the upload preview and _wipe_and_replace.
+
+        Orphans (existing boats not in the file) are deleted unless they have
+        a sticky status, drafts or shipment items. Draft and shipment
+        membership is fetched for all orphans in two queries.
+
+        Args:
+            new_records: Parsed records (any order)
+
+        Returns:
+            BoatMergePlan with per-record actions in departure order
         """
         new_boats = sorted(new_records, key=lambda r: r.departure_date)
         existing_boats = self._get_all_sorted()
@@ -747,85 +775,144 @@ class BoatScheduleService:
             if key not in existing_by_key:
                 existing_by_key[key] = b
 
+        plan = BoatMergePlan()
         matched_existing_ids: set[str] = set()
 
+        for record in new_boats:
+            key = (record.vessel_name, record.departure_date.isoformat())
+            existing = existing_by_key.get(key)
+
+            if existing is None:
+                plan.inserts.append(record)
+                plan.record_actions.append((record, "new"))
+            elif self._needs_update(existing, record):
+                # Same boat listed twice in the file: last row wins
+                matched_existing_ids.add(existing["id"])
+                plan.updates[existing["id"]] = (existing, record)
+                plan.record_actions.append((record, "update"))
+            else:
+                matched_existing_ids.add(existing["id"])
+                plan.unchanged += 1
+                plan.record_actions.append((record, "skip"))
+
+        orphans = [
+            b for b in existing_boats
+            if b["id"] not in matched_existing_ids
+            and b.get("status") not in self.STICKY_STATUSES
+        ]
+        for b in existing_boats:
+            if b["id"] not in matched_existing_ids and b.get("status") in self.STICKY_STATUSES:
+                plan.kept.append((b, "sticky_status"))
+
+        orphan_ids = [b["id"] for b in orphans]
+        with_drafts = {
+            row["boat_id"]
+            for row in select_in(self.db, "boat_factory_drafts", "boat_id", orphan_ids, columns="boat_id")
+        }
+        with_shipments = {
+            row["boat_id"]
+            for row in select_in(self.db, "shipment_items", "boat_id", orphan_ids, columns="boat_id")
+        }
+
+        for b in orphans:
+            if b["id"] in with_drafts:
+                # Don't delete Ashley's work
+                plan.kept.append((b, "has_drafts"))
+            elif b["id"] in with_shipments:
+                # Horizon dedup merges at query time
+                plan.kept.append((b, "has_shipments"))
+            else:
+                plan.deletes.append(b)
+
+        return plan
+
+    def _wipe_and_replace(
+        self,
+        new_records: list[BoatScheduleRecord],
+        filename: str,
+        skipped_rows: list[SkippedRowInfo],
+    ) -> BoatUploadResult:
+        """
+        Identity-based merge: match by (vessel_name, departure_date) so boat IDs
+        stay stable and drafts/shipments don't drift when TIBA shifts positions.
+
+        The plan is computed in memory (plan_merge) and applied with chunked
+        bulk statements: one upsert per chunk of updates, one insert per chunk
+        of new boats and one cascade per chunk of deleted orphans.
+        """
+        plan = self.plan_merge(new_records)
+
         logger.info(
             "identity_merge_start",
-            new_count=len(new_boats),
-            existing_count=len(existing_boats),
+            new_count=len(new_records),
+            updates=len(plan.updates),
+            inserts=len(plan.inserts),
+            deletes=len(plan.deletes),
+            kept=len(plan.kept),
             filename=filename,
         )
 
-        imported = 0
-        updated = 0
-        skipped = 0
+        for b, reason in plan.kept:
+            logger.info("boat_kept_orphan", boat_id=b["id"], vessel=b["vessel_name"], reason=reason)
+
         errors = []
 
-        # Phase 1: For each new record, find existing match or insert
-        for record in new_boats:
-            key = (record.vessel_name, record.departure_date.isoformat())
-            existing = existing_by_key.get(key)
+        # Updates: full rows keyed by id, so one upsert per chunk (ID preserved, drafts safe)
+        updated = 0
+        update_rows = [
+            {"id": boat_id, **self._record_to_row(record, filename, existing=existing)}
+            for boat_id, (existing, record) in plan.updates.items()
+        ]
+        for chunk in chunked(update_rows, WRITE_CHUNK_SIZE):
+            try:
+                self.db.table(self.table).upsert(list(chunk), on_conflict="id").execute()
+                updated += len(chunk)
+            except Exception as e:
+                errors.append(f"Failed to update {len(chunk)} boats: {e}")
+                logger.error("boat_update_failed", boat_ids=[r["id"] for r in chunk], error=str(e))
+
+        imported = 0
+        insert_rows = [self._record_to_row(record, filename) for record in plan.inserts]
+        for chunk in chunked(insert_rows, WRITE_CHUNK_SIZE):
+            try:
+                self.db.table(self.table).insert(list(chunk)).execute()
+                imported += len(chunk)
+            except Exception as e:
+                errors.append(f"Failed to insert {len(chunk)} boats: {e}")
+                logger.error(
+                    "boat_insert_failed",
+                    vessels=[r["vessel_name"] for r in chunk],
+                    error=str(e),
+                )
 
-            if existing:
-                # Match found — update in place (ID preserved, drafts safe)
-                matched_existing_ids.add(existing["id"])
-                if self._needs_update(existing, record):
-                    try:
-                        self._replace_boat(existing["id"], record, filename)
-                        updated += 1
-                    except Exception as e:
-                        errors.append(f"Failed to update {record.vessel_name} {record.departure_date}: {e}")
-                        logger.error("boat_update_failed", boat_id=existing["id"], error=str(e))
-                else:
-                    skipped += 1
-            else:
-                # New boat — insert
-                try:
-                    self._insert_from_record(record, filename)
-                    imported += 1
-                except Exception as e:
-                    errors.append(f"Failed to insert {record.vessel_name} {record.departure_date}: {e}")
-                    logger.error("boat_insert_failed", vessel=record.vessel_name, error=str(e))
-
-        # Phase 2: Existing boats not in new file — orphans.
-        # Delete unless they have sticky status or drafts (Ashley's work).
         deleted = 0
-        for b in existing_boats:
-            if b["id"] in matched_existing_ids:
-                continue
-            if b.get("status") in self.STICKY_STATUSES:
-                logger.info("boat_kept_sticky", boat_id=b["id"], vessel=b["vessel_name"], status=b["status"])
-                continue
-            # Check if boat has any drafts — don't delete Ashley's work
-            drafts = self.db.table("boat_factory_drafts").select("id").eq("boat_id", b["id"]).limit(1).execute()
-            if drafts.data:
-                logger.info("boat_kept_has_drafts", boat_id=b["id"], vessel=b["vessel_name"])
-                continue
-            # If boat has shipment_items, keep it — horizon dedup merges at query time
-            has_shipments = self.db.table("shipment_items").select("id").eq("boat_id", b["id"]).limit(1).execute()
-            if has_shipments.data:
-                logger.info("boat_kept_has_shipments", boat_id=b["id"], vessel=b["vessel_name"])
-                continue
+        delete_ids = [b["id"] for b in plan.deletes]
+        for chunk in chunked(delete_ids, IN_CHUNK_SIZE):
             try:
-                self._delete_boat_cascade(b["id"])
-                deleted += 1
+                self._delete_boats_cascade(list(chunk))
+                deleted += len(chunk)
             except Exception as e:
-                errors.append(f"Failed to delete orphan {b['vessel_name']}: {e}")
-                logger.error("boat_delete_failed", boat_id=b["id"], error=str(e))
+                errors.append(f"Failed to delete {len(chunk)} orphan boats: {e}")
+                logger.error("boat_delete_failed", boat_ids=list(chunk), error=str(e))
 
         logger.info(
             "identity_merge_complete",
             imported=imported,
             updated=updated,
-            skipped=skipped,
+            skipped=plan.unchanged,
             deleted=deleted,
+            kept=len(plan.kept),
             errors=len(errors),
         )
+        # Even a partly failed merge may have written boats
+        invalidate_planning_inputs("boat_schedule_import")
 
         return BoatUploadResult(
             imported=imported,
             updated=updated,
-            skipped=skipped,
+            skipped=plan.unchanged,
+            deleted=deleted,
+            kept=len(plan.kept),
             skipped_rows=skipped_rows,
             errors=errors,
         )
@@ -847,13 +934,19 @@ class BoatScheduleService:
     # Statuses set by Ashley that TIBA uploads must not overwrite.
     STICKY_STATUSES = {"ordered", "confirmed", "ignored"}
 
-    def _replace_boat(
+    def _record_to_row(
         self,
-        boat_id: str,
         record: BoatScheduleRecord,
         source_file: str,
-    ) -> None:
-        """Replace all fields of an existing boat (preserving ID for FK safety)."""
+        existing: Optional[dict] = None,
+    ) -> dict:
+        """
+        Build a full boat row from a parsed record.
+
+        With `existing`, sticky statuses and a booking number missing from
+        the file are carried over, so every update row has the same columns
+        and can go into one bulk upsert.
+        """
         today = date.today()
 
         # Auto-assign status based on dates
@@ -864,7 +957,11 @@ class BoatScheduleService:
         else:
             status = "available"
 
-        update_data = {
+        # Preserve sticky statuses (Ashley's decisions survive uploads)
+        if existing and existing.get("status") in self.STICKY_STATUSES:
+            status = existing["status"]
+
+        row = {
             "vessel_name": record.vessel_name,
             "shipping_line": record.shipping_line,
             "departure_date": record.departure_date.isoformat(),
@@ -874,43 +971,32 @@ class BoatScheduleService:
             "destination_port": record.destination_port,
             "route_type": record.route_type,
             "booking_deadline": record.booking_deadline.isoformat(),
+            "status": status,
             "source_file": source_file,
             "carrier": "TIBA",
         }
-
-        # Preserve sticky statuses (Ashley's decisions survive uploads)
-        current = self.db.table(self.table).select("status").eq("id", boat_id).execute()
-        current_status = current.data[0]["status"] if current.data else None
-        if current_status not in self.STICKY_STATUSES:
-            update_data["status"] = status
-        if record.booking_number:
-            update_data["booking_number"] = record.booking_number
-
-        self.db.table(self.table).update(update_data).eq("id", boat_id).execute()
-
-    def _delete_boat_cascade(self, boat_id: str, remap_to: str | None = None) -> None:
-        """Delete a boat and its child references.
-
-        If remap_to is provided, shipment_items are moved to that boat instead of deleted.
-        """
+        if existing is not None:
+            row["booking_number"] = record.booking_number or existing.get("booking_number")
+        elif record.booking_number:
+            row["booking_number"] = record.booking_number
+        return row
+
+    def _delete_boats_cascade(self, boat_ids: list[str]) -> None:
+        """Delete boats and their child references in one statement per table."""
+        if not boat_ids:
+            return
         # Delete child records that have NOT NULL FK
-        self.db.table("boat_factory_drafts").delete().eq("boat_id", boat_id).execute()
-        # Remap or delete shipment_items (NOT NULL FK)
-        if remap_to:
-            self.db.table("shipment_items").update(
-                {"boat_id": remap_to}
-            ).eq("boat_id", boat_id).execute()
-        else:
-            self.db.table("shipment_items").delete().eq("boat_id", boat_id).execute()
+        self.db.table("boat_factory_drafts").delete().in_("boat_id", boat_ids).execute()
+        self.db.table("shipment_items").delete().in_("boat_id", boat_ids).execute()
         # Null out nullable FK references
         self.db.table("shipments").update(
             {"boat_schedule_id": None}
-        ).eq("boat_schedule_id", boat_id).execute()
+        ).in_("boat_schedule_id", boat_ids).execute()
         self.db.table("warehouse_orders").update(
             {"boat_id": None}
-        ).eq("boat_id", boat_id).execute()
-        # Now delete the boat
-        self.db.table(self.table).delete().eq("id", boat_id).execute()
+        ).in_("boat_id", boat_ids).execute()
+        # Now delete the boats
+        self.db.table(self.table).delete().in_("id", boat_ids).execute()
 
     def _upsert_schedule(
         self,
@@ -1054,18 +1140,19 @@ class BoatScheduleService:
             .execute()
         )
 
+        draft_ids = [draft["id"] for draft in (drafts.data or [])]
         flagged = 0
-        for draft in (drafts.data or []):
+        if draft_ids:
             try:
                 self.db.table("boat_factory_drafts").update({
                     "status": "action_needed",
                     "notes": f"Barco reprogramado: {old_departure} → {new_departure}",
-                }).eq("id", draft["id"]).execute()
-                flagged += 1
+                }).in_("id", draft_ids).execute()
+                flagged = len(draft_ids)
             except Exception as e:
                 logger.warning(
-                    "draft_flag_individual_failed",
-                    draft_id=draft["id"],
+                    "draft_flag_failed",
+                    draft_ids=draft_ids,
                     error=str(e),
                 )
 
@@ -9,8 +9,9 @@ import os
 import base64
 import json
 import re
-from typing import Optional
+from typing import Optional, Tuple
 import structlog
+from pydantic import ValidationError
 
 # Load .env file for ANTHROPIC_API_KEY
 from dotenv import load_dotenv
@@ -21,6 +22,8 @@ from models.ingest import (
     ParsedFieldConfidence,
     ParsedContainerDetails,
 )
+from lib.telemetry import timed_parser
+from services.vision_cache_service import get_vision_cache, prompt_fingerprint
 
 logger = structlog.get_logger(__name__)
 
@@ -186,6 +189,7 @@ Return JSON in this exact structure:
             logger.warning("pdf_to_image_conversion_failed", error=str(e))
             return []
 
+    @timed_parser("claude_vision")
     async def parse_pdf(
         self,
         pdf_bytes: bytes,
@@ -209,6 +213,23 @@ Return JSON in this exact structure:
 
         logger.info("claude_parsing_started", pdf_size=len(pdf_bytes))
 
+        # Prompt is part of the cache key: email context changes the parse
+        prompt = "Parse this shipping document and extract all relevant data."
+        if email_context:
+            prompt += f"\n\nAdditional context from email:\n{email_context[:1000]}"
+
+        # Cached result skips both rasterization and the API call
+        cache = get_vision_cache()
+        cache_key = cache.make_key(pdf_bytes, prompt_fingerprint(self.SYSTEM_PROMPT, prompt), self.MODEL)
+        cached = cache.get(cache_key, "claude_vision")
+        if cached is not None:
+            try:
+                return ParsedDocumentData.model_validate(cached["parsed"])
+            except (ValidationError, KeyError, TypeError) as e:
+                # Entry from an older model shape: drop it and parse again
+                logger.warning("vision_cache_entry_invalid", key=cache_key[:12], error=str(e))
+                cache.delete(cache_key)
+
         try:
             # Build message content
             content = []
@@ -239,11 +260,6 @@ Return JSON in this exact structure:
                     }
                 })
 
-            # Add context if provided
-            prompt = "Parse this shipping document and extract all relevant data."
-            if email_context:
-                prompt += f"\n\nAdditional context from email:\n{email_context[:1000]}"
-
             content.append({
                 "type": "text",
                 "text": prompt
@@ -265,7 +281,10 @@ Return JSON in this exact structure:
             logger.debug("claude_response_received", response_length=len(response_text))
 
             # Parse JSON response
-            parsed_data = self._parse_claude_response(response_text)
+            parsed_data, decoded = self._parse_claude_response(response_text)
+            # A reply that wasn't JSON is retried on the next upload, not replayed
+            if decoded:
+                cache.put(cache_key, response_text, parsed_data.model_dump(mode="json"))
 
             logger.info(
                 "claude_parsing_completed",
@@ -287,7 +306,7 @@ Return JSON in this exact structure:
             logger.error("claude_parsing_failed", error=str(e))
             raise ValueError(f"Claude parsing failed: {str(e)}")
 
-    def _parse_claude_response(self, response_text: str) -> ParsedDocumentData:
+    def _parse_claude_response(self, response_text: str) -> Tuple[ParsedDocumentData, bool]:
         """
         Parse Claude's JSON response into ParsedDocumentData.
 
@@ -295,7 +314,7 @@ Return JSON in this exact structure:
             response_text: Raw response from Claude
 
         Returns:
-            ParsedDocumentData model
+            (ParsedDocumentData model, whether the response was valid JSON)
         """
         # Clean response - remove markdown code blocks if present
         cleaned = response_text.strip()
@@ -320,7 +339,7 @@ Return JSON in this exact structure:
                 document_type_confidence=0.0,
                 raw_text=response_text[:5000],
                 overall_confidence=0.0
-            )
+            ), False
 
         # DEBUG: Log what Claude returned for freight fields
         print(f"=== CLAUDE FREIGHT FIELDS ===")
@@ -459,7 +478,7 @@ Return JSON in this exact structure:
             freight_terms_value=parsed_data.freight_terms.value if parsed_data.freight_terms else None
         )
 
-        return parsed_data
+        return parsed_data, True
 
 
 # Singleton instance
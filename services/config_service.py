@@ -7,6 +7,7 @@ from typing import Optional
 from decimal import Decimal
 import structlog
 from config.database import get_supabase_client
+from lib.telemetry import record_cache
 
 logger = structlog.get_logger(__name__)
 
@@ -40,6 +41,7 @@ class ConfigService:
         self._loaded = False
 
     def _ensure_loaded(self):
+        record_cache("config", hit=self._loaded)
         if not self._loaded:
             self.reload()
 
@@ -0,0 +1,71 @@
+"""
+Data freshness registry for the Data Hub.
+
+One row per data source in the data_freshness table (see
+sql/2026-10-18_data_freshness.sql): when it was last uploaded, how many
+rows that upload wrote, and from which file. Upload confirm endpoints
+update it through UploadHistoryService.record_upload, so the freshness
+endpoint answers from a single small read instead of probing (and
+counting) the sales and snapshot tables.
+"""
+
+from datetime import datetime, timezone
+from typing import Optional
+
+import structlog
+
+from config import get_supabase_client
+
+logger = structlog.get_logger(__name__)
+
+# upload_history.upload_type -> Data Hub source
+SOURCE_BY_UPLOAD_TYPE = {
+    "sales": "sales",
+    "sac_sales": "sales",
+    "inventory": "inventory",
+    "siesa": "siesa",
+    "in_transit": "in_transit",
+    "boats": "boats",
+    "production_schedule": "production",
+}
+
+SOURCES = ("sales", "inventory", "siesa", "in_transit", "boats", "production")
+
+
+class DataFreshnessService:
+    def __init__(self):
+        self.db = get_supabase_client()
+        self.table = "data_freshness"
+
+    def record_upload(self, upload_type: str, filename: str, row_count: int) -> None:
+        """Mark the source fed by upload_type as refreshed now. Other upload types are ignored."""
+        source = SOURCE_BY_UPLOAD_TYPE.get(upload_type)
+        if source is None:
+            return
+        self.db.table(self.table).upsert({
+            "source": source,
+            "upload_type": upload_type,
+            "last_uploaded_at": datetime.now(timezone.utc).isoformat(),
+            "row_count": row_count,
+            "source_file": filename,
+        }, on_conflict="source").execute()
+        logger.info("data_freshness_recorded", source=source, row_count=row_count)
+
+    def get_all(self) -> dict[str, dict]:
+        """Registry rows keyed by source (sources never uploaded are absent)."""
+        result = (
+            self.db.table(self.table)
+            .select("source, last_uploaded_at, row_count, source_file")
+            .execute()
+        )
+        return {row["source"]: row for row in (result.data or [])}
+
+
+_service: Optional[DataFreshnessService] = None
+
+
+def get_data_freshness_service() -> DataFreshnessService:
+    global _service
+    if _service is None:
+        _service = DataFreshnessService()
+    return _service
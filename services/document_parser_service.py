@@ -7,21 +7,136 @@ Falls back to Claude Vision for scanned PDFs that pdfplumber cannot extract.
 
 import re
 import os
-from typing import Optional, Tuple
+import bisect
+import multiprocessing
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional, Tuple
 import pdfplumber
 import structlog
-from io import BytesIO
 
+from config.settings import settings
 from models.ingest import (
     ParsedDocumentData,
     ParsedFieldConfidence,
     ParsedContainerDetails,
 )
 from exceptions.errors import PDFParseError
+from lib.telemetry import PDF_PAGE_EXTRACT_DURATION, timed_parser
+from utils.pdf_pages import PageText, count_pages, extract_page_range, iter_pages, page_ranges
+from utils.field_extractor import FieldExtractor, FieldHit, PatternSet
 
 logger = structlog.get_logger(__name__)
 
 
+# ===================
+# PAGE EXTRACTION POOL
+# ===================
+
+_page_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_page_pool() -> ProcessPoolExecutor:
+    """
+    Get the process pool used for page-parallel pdfplumber extraction.
+
+    extract_text is pure-Python CPU work, so threads would serialize on
+    the GIL. Workers are spawned (not forked) so they don't inherit the
+    app's threads and locks. Size comes from settings.pdf_extract_workers.
+    """
+    global _page_pool
+    if _page_pool is None:
+        _page_pool = ProcessPoolExecutor(
+            max_workers=settings.pdf_extract_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        logger.info("pdf_page_pool_created", max_workers=settings.pdf_extract_workers)
+    return _page_pool
+
+
+def shutdown_page_pool() -> None:
+    """Stop the page extraction pool. Called on application shutdown."""
+    global _page_pool
+    if _page_pool is not None:
+        _page_pool.shutdown(wait=False, cancel_futures=True)
+        _page_pool = None
+
+
+# ===================
+# COMPILED PATTERNS
+# ===================
+# Compiled once at import (see utils/field_extractor.py). Lookups keep
+# the original "first pattern that matches wins" order.
+
+_DATE = r'(\d{1,2}[-/]\w{3}[-/]\d{2,4})'
+_ETD = PatternSet("etd", [rf'ETD[:\s]+{_DATE}'])
+_ETA = PatternSet("eta", [rf'ETA[:\s]+{_DATE}'])
+_ATD = PatternSet("atd", [
+    rf'ATD[:\s]+{_DATE}',
+    rf'On\s+Board[:\s]+{_DATE}',  # "On Board: 19-Nov-25"
+    r'Shipped\s+on\s+Board[^\n]*?(\d{1,2}[-/]\w{3}[-/]\d{4})',  # "Shipped on Board ... 20-NOV-2025"
+])
+_ATA = PatternSet("ata", [rf'ATA[:\s]+{_DATE}'])
+
+_POL = PatternSet("pol", [
+    r'POL[:\s]+([A-Za-z\s,]+?)(?=\n|POD|MODE|$)',
+    r'Port\s+of\s+Loading[:\s]*\n?\s*([A-Za-z\s,]+?)(?=\n|Port|Vessel|$)',
+    r'Puerto\s+de\s+Carga[:\s]*\n?\s*([A-Za-z\s,]+?)(?=\n|Puerto|Terminal|$)',
+])
+_POD = PatternSet("pod", [
+    r'POD[:\s]+([A-Za-z\s,]+?)(?=\n|MODE|ATD|ETA|$)',
+    r'Port\s+of\s+Discharge[:\s]*\n?\s*([A-Za-z\s,]+?)(?=\n|Place|Final|$)',
+    r'Puerto\s+de\s+Descarga[:\s]*\n?\s*([A-Za-z\s,]+?)(?=\n|Lugar|Destino|$)',
+])
+
+_TYPE_HEADER_RE = re.compile(r'TYPE[\s|]+(\d{2}[A-Z]{2}(?:[\s|]+\d{2}[A-Z]{2})*)', re.IGNORECASE)
+_CONTAINER_TYPE_RE = re.compile(r'(\d{2}[A-Z]{2})')
+_CARGO_HINT_RE = re.compile(r'PALLET|WEIGHT|NET\s*W|KGS?|M[³3]|CBM|\d+\.\d+', re.IGNORECASE)
+# Not "STC X Pallet" (shipment total)
+_CARGO_PALLETS_RE = re.compile(r'(?<!STC\s)(?<!STC\s\s)(\d{1,3})\s*(?:PALLETS?|PLT)\b', re.IGNORECASE)
+_INLINE_PALLETS_RE = re.compile(r'(?<!STC\s)(\d{1,3})\s*(?:PALLETS?|PLT|PKG)\b', re.IGNORECASE)
+_KG_RE = re.compile(r'(\d+(?:,\d{3})*(?:\.\d+)?)\s*(?:KGS?|KG)\b', re.IGNORECASE)
+_WEIGHT_RES = (
+    re.compile(r'NET\s*(?:WEIGHT|WT?)[\s:]*(\d+(?:,\d{3})*(?:\.\d+)?)', re.IGNORECASE),
+    _KG_RE,
+    re.compile(r'WEIGHT[\s:]*(\d+(?:,\d{3})*(?:\.\d+)?)\s*(?:KGS?)?', re.IGNORECASE),
+)
+# "18.9 M3", "18.9 CBM", "18.9M3", "18,9 M3", "18 M3", "VOLUME: 18.9"
+_VOLUME_RES = (
+    re.compile(r'(\d+[.,]\d+)\s*(?:M[³3]|CBM)\b', re.IGNORECASE),
+    re.compile(r'(\d+)\s*(?:M[³3]|CBM)\b', re.IGNORECASE),
+    re.compile(r'(?:VOL(?:UME)?|CBM)[\s:]*(\d+[.,]?\d*)', re.IGNORECASE),
+)
+# Type right after a container number (matched at the end of the number)
+_INLINE_TYPE_RES = (
+    re.compile(r'[\s|]+(\d{2}[A-Z]{2})\b', re.IGNORECASE),
+    re.compile(r'[\s|]+\d{5,8}[\s|]+(\d{2}[A-Z]{2})\b', re.IGNORECASE),
+    re.compile(r'[\s\S]{0,30}?(\d{2}[A-Z]{2})\b', re.IGNORECASE),
+)
+
+
+_field_extractor: Optional[FieldExtractor] = None
+
+
+@lru_cache(maxsize=64)
+def _pattern_set(field_name: str, patterns: tuple[str, ...]) -> PatternSet:
+    """Compiled PatternSet for a parse_field() pattern list (built once per list)."""
+    return PatternSet(field_name, patterns)
+
+
+def _occurrences(text: str, containers: list[str]) -> list[tuple[int, str]]:
+    """
+    Every occurrence of every container number, sorted by position.
+
+    Container numbers (4 letters + 7 digits) can't overlap each other, so
+    one alternation scan finds the same positions as repeated str.find.
+    """
+    if not containers:
+        return []
+    pattern = re.compile("|".join(re.escape(c) for c in sorted(set(containers), key=len, reverse=True)))
+    return [(m.start(), m.group(0)) for m in pattern.finditer(text)]
+
+
 class DocumentParserService:
     """
     Parse shipping documents (PDFs) to extract structured data.
@@ -58,6 +173,8 @@ class DocumentParserService:
         r'\b([A-Z]{4}\s?\d{7})\b',  # OOLU0352586 or OOLU 0352586
     ]
 
+    _CONTAINER_RES = tuple(re.compile(p) for p in CONTAINER_PATTERNS)
+
     # Date patterns - multiple formats
     DATE_PATTERNS = [
         (r'(\d{1,2}[-/]\w{3}[-/]\d{2,4})', '%d-%b-%Y'),  # 22-JAN-2026
@@ -139,23 +256,132 @@ class DocumentParserService:
         r'([A-Z]{4}\d{7})\s+(\d{2}[A-Z]{2})',  # Container + Type only
     ]
 
-    def _extract_with_pdfplumber(self, pdf_bytes: bytes) -> str:
+    # Fields that make a document usable, per detected type. With
+    # settings.pdf_early_exit, extraction stops once all are found.
+    REQUIRED_FIELDS = {
+        "booking": ("booking_number", "vessel", "etd"),
+        "departure": ("booking_number", "containers", "etd"),
+        "arrival": ("booking_number", "containers", "eta"),
+        "hbl": ("shp_number", "containers", "vessel"),
+        "mbl": ("containers", "vessel", "freight_terms"),
+    }
+
+    def _has_required_fields(self, text: str) -> bool:
+        """True if the text's document type is known and all its REQUIRED_FIELDS parse."""
+        doc_type, _ = self.detect_document_type(text)
+        required = self.REQUIRED_FIELDS.get(doc_type)
+        if not required:
+            return False
+
+        dates = None
+        for field in required:
+            if field == "containers":
+                found = bool(self.parse_containers(text)[0])
+            elif field in ("etd", "eta"):
+                dates = dates or self.parse_dates(text)
+                found = dates[field] is not None
+            elif field == "freight_terms":
+                found = self._extract_freight_terms(text) is not None
+            else:
+                patterns = {
+                    "shp_number": self.SHP_PATTERNS,
+                    "booking_number": self.BOOKING_PATTERNS,
+                    "vessel": self.VESSEL_PATTERNS,
+                }[field]
+                found = self.parse_field(text, patterns, field) is not None
+            if not found:
+                return False
+        return True
+
+    def _extract_pages(
+        self,
+        pdf_bytes: bytes,
+        page_count: int,
+        stop_when: Optional[Callable[[str], bool]],
+    ) -> tuple[list[PageText], str]:
+        """
+        Extract pages in order, on the process pool when the PDF is long enough.
+
+        Inline, the PDF is opened once. Without stop_when, pages are split
+        into one contiguous range per worker. With it, pages go out one per task in waves of
+        `workers`, and stop_when sees the text so far after each wave.
+
+        Returns:
+            (pages read, mode: "inline" or "pool")
+        """
+        workers = settings.pdf_extract_workers
+        if workers == 0 or page_count < settings.pdf_parallel_min_pages:
+            if stop_when is None:
+                return extract_page_range(pdf_bytes, 0, page_count), "inline"
+            pages: list[PageText] = []
+            page_iter = iter_pages(pdf_bytes, 0, page_count)
+            try:
+                for page in page_iter:
+                    pages.append(page)
+                    if stop_when(self._join_pages(pages)):
+                        break
+            finally:
+                page_iter.close()
+            return pages, "inline"
+
+        chunk = 1 if stop_when else -(-page_count // workers)
+        ranges = page_ranges(page_count, chunk)
+        pool = get_page_pool()
+        pages = []
+        for wave_start in range(0, len(ranges), workers):
+            futures = [
+                pool.submit(extract_page_range, pdf_bytes, start, stop)
+                for start, stop in ranges[wave_start:wave_start + workers]
+            ]
+            for future in futures:
+                pages.extend(future.result())
+            if stop_when and stop_when(self._join_pages(pages)):
+                break
+        return pages, "pool"
+
+    @staticmethod
+    def _join_pages(pages: list[PageText]) -> str:
+        return "".join(text + "\n" for _, text, _ in pages if text)
+
+    def _extract_with_pdfplumber(
+        self,
+        pdf_bytes: bytes,
+        stop_when: Optional[Callable[[str], bool]] = None,
+    ) -> str:
         """
         Extract text using pdfplumber (for native PDFs).
 
+        Multi-page PDFs are extracted page-parallel on a process pool
+        (see _extract_pages); the joined text is identical to a
+        sequential read. Falls back to inline extraction if the pool fails.
+
         Args:
             pdf_bytes: PDF file content as bytes
+            stop_when: Optional early-exit check on the text read so far
 
         Returns:
             Extracted text as string
         """
-        all_text = ""
-        with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    all_text += page_text + "\n"
-        return all_text
+        page_count = count_pages(pdf_bytes)
+        try:
+            pages, mode = self._extract_pages(pdf_bytes, page_count, stop_when)
+        except Exception as e:
+            if settings.pdf_extract_workers == 0 or page_count < settings.pdf_parallel_min_pages:
+                raise
+            logger.warning("pdf_page_pool_failed", error=str(e), page_count=page_count)
+            shutdown_page_pool()
+            pages, mode = extract_page_range(pdf_bytes, 0, page_count), "inline"
+
+        for _, _, seconds in pages:
+            PDF_PAGE_EXTRACT_DURATION.observe(seconds, mode=mode)
+        logger.info(
+            "pdf_pages_extracted",
+            mode=mode,
+            page_count=page_count,
+            pages_read=len(pages),
+            page_seconds=[round(seconds, 3) for _, _, seconds in pages],
+        )
+        return self._join_pages(pages)
 
     def extract_text_from_pdf(self, pdf_bytes: bytes) -> str:
         """
@@ -175,7 +401,8 @@ class DocumentParserService:
         """
         try:
             # Try pdfplumber (fast, works for native PDFs)
-            all_text = self._extract_with_pdfplumber(pdf_bytes)
+            stop_when = self._has_required_fields if settings.pdf_early_exit else None
+            all_text = self._extract_with_pdfplumber(pdf_bytes, stop_when=stop_when)
             print(f"pdfplumber extracted: {len(all_text.strip())} chars")
 
             # If too little text, signal that Claude Vision should be used
@@ -292,6 +519,25 @@ class DocumentParserService:
 
         return ("unknown", 0.0)
 
+    def extract_field_hits(self, text: str) -> list[FieldHit]:
+        """
+        Every identifier/vessel/date/port hit with offsets.
+
+        Diagnostic view of what the field patterns see in a document; the
+        parse_* methods pick the winning hit per field.
+        """
+        global _field_extractor
+        if _field_extractor is None:
+            _field_extractor = FieldExtractor({
+                "shp_number": self.SHP_PATTERNS,
+                "booking_number": self.BOOKING_PATTERNS,
+                "pv_number": self.PV_PATTERNS,
+                "vessel": self.VESSEL_PATTERNS,
+                "voyage": self.VOYAGE_PATTERNS,
+                **{ps.field: ps.patterns for ps in (_ETD, _ETA, _ATD, _ATA, _POL, _POD)},
+            })
+        return _field_extractor.scan(text)
+
     def parse_field(
         self,
         text: str,
@@ -309,24 +555,23 @@ class DocumentParserService:
         Returns:
             ParsedFieldConfidence if found, None otherwise
         """
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                value = match.group(1).strip()
-                source_text = match.group(0)[:100]  # First 100 chars of match
-
-                logger.debug(
-                    "field_parsed",
-                    field=field_name,
-                    value=value,
-                    pattern=pattern
-                )
+        hit = _pattern_set(field_name, tuple(patterns)).search(text)
+        if hit:
+            value = hit.value.strip()
+            source_text = hit.source_text[:100]  # First 100 chars of match
 
-                return ParsedFieldConfidence(
-                    value=value,
-                    confidence=0.9,  # High confidence for regex match
-                    source_text=source_text
-                )
+            logger.debug(
+                "field_parsed",
+                field=field_name,
+                value=value,
+                pattern=patterns[hit.pattern_index]
+            )
+
+            return ParsedFieldConfidence(
+                value=value,
+                confidence=0.9,  # High confidence for regex match
+                source_text=source_text
+            )
 
         logger.debug("field_not_found", field=field_name)
         return None
@@ -343,8 +588,8 @@ class DocumentParserService:
         """
         containers = set()
 
-        for pattern in self.CONTAINER_PATTERNS:
-            matches = re.findall(pattern, text)
+        for pattern in self._CONTAINER_RES:
+            matches = pattern.findall(text)
             for match in matches:
                 # Clean and validate
                 container = match.replace(" ", "").upper()
@@ -375,46 +620,20 @@ class DocumentParserService:
             "ata": None,
         }
 
-        # Look for labeled dates first
-        etd_match = re.search(r'ETD[:\s]+(\d{1,2}[-/]\w{3}[-/]\d{2,4})', text, re.IGNORECASE)
-        if etd_match:
-            dates["etd"] = ParsedFieldConfidence(
-                value=etd_match.group(1),
-                confidence=0.9,
-                source_text=etd_match.group(0)
-            )
-
-        eta_match = re.search(r'ETA[:\s]+(\d{1,2}[-/]\w{3}[-/]\d{2,4})', text, re.IGNORECASE)
-        if eta_match:
-            dates["eta"] = ParsedFieldConfidence(
-                value=eta_match.group(1),
-                confidence=0.9,
-                source_text=eta_match.group(0)
-            )
-
-        # ATD patterns - multiple formats
-        atd_patterns = [
-            r'ATD[:\s]+(\d{1,2}[-/]\w{3}[-/]\d{2,4})',
-            r'On\s+Board[:\s]+(\d{1,2}[-/]\w{3}[-/]\d{2,4})',  # "On Board: 19-Nov-25"
-            r'Shipped\s+on\s+Board[^\n]*?(\d{1,2}[-/]\w{3}[-/]\d{4})',  # "Shipped on Board ... 20-NOV-2025"
-        ]
-        for pattern in atd_patterns:
-            atd_match = re.search(pattern, text, re.IGNORECASE)
-            if atd_match:
-                dates["atd"] = ParsedFieldConfidence(
-                    value=atd_match.group(1),
-                    confidence=0.95,
-                    source_text=atd_match.group(0)[:100]
+        # Labeled dates; ATD also accepts "On Board" / "Shipped on Board"
+        for field, pattern_set, confidence, max_source in (
+            ("etd", _ETD, 0.9, None),
+            ("eta", _ETA, 0.9, None),
+            ("atd", _ATD, 0.95, 100),
+            ("ata", _ATA, 0.95, None),
+        ):
+            hit = pattern_set.search(text)
+            if hit:
+                dates[field] = ParsedFieldConfidence(
+                    value=hit.value,
+                    confidence=confidence,
+                    source_text=hit.source_text[:max_source]
                 )
-                break
-
-        ata_match = re.search(r'ATA[:\s]+(\d{1,2}[-/]\w{3}[-/]\d{2,4})', text, re.IGNORECASE)
-        if ata_match:
-            dates["ata"] = ParsedFieldConfidence(
-                value=ata_match.group(1),
-                confidence=0.95,
-                source_text=ata_match.group(0)
-            )
 
         return dates
 
@@ -434,37 +653,21 @@ class DocumentParserService:
         pol = None
         pod = None
 
-        # POL patterns (try multiple formats)
-        pol_patterns = [
-            r'POL[:\s]+([A-Za-z\s,]+?)(?=\n|POD|MODE|$)',
-            r'Port\s+of\s+Loading[:\s]*\n?\s*([A-Za-z\s,]+?)(?=\n|Port|Vessel|$)',
-            r'Puerto\s+de\s+Carga[:\s]*\n?\s*([A-Za-z\s,]+?)(?=\n|Puerto|Terminal|$)',
-        ]
-        for pattern in pol_patterns:
-            pol_match = re.search(pattern, text, re.IGNORECASE)
-            if pol_match:
-                pol = ParsedFieldConfidence(
-                    value=pol_match.group(1).strip(),
-                    confidence=0.85,
-                    source_text=pol_match.group(0)[:100]
-                )
-                break
+        pol_hit = _POL.search(text)
+        if pol_hit:
+            pol = ParsedFieldConfidence(
+                value=pol_hit.value.strip(),
+                confidence=0.85,
+                source_text=pol_hit.source_text[:100]
+            )
 
-        # POD patterns (try multiple formats)
-        pod_patterns = [
-            r'POD[:\s]+([A-Za-z\s,]+?)(?=\n|MODE|ATD|ETA|$)',
-            r'Port\s+of\s+Discharge[:\s]*\n?\s*([A-Za-z\s,]+?)(?=\n|Place|Final|$)',
-            r'Puerto\s+de\s+Descarga[:\s]*\n?\s*([A-Za-z\s,]+?)(?=\n|Lugar|Destino|$)',
-        ]
-        for pattern in pod_patterns:
-            pod_match = re.search(pattern, text, re.IGNORECASE)
-            if pod_match:
-                pod = ParsedFieldConfidence(
-                    value=pod_match.group(1).strip(),
-                    confidence=0.85,
-                    source_text=pod_match.group(0)[:100]
-                )
-                break
+        pod_hit = _POD.search(text)
+        if pod_hit:
+            pod = ParsedFieldConfidence(
+                value=pod_hit.value.strip(),
+                confidence=0.85,
+                source_text=pod_hit.source_text[:100]
+            )
 
         return (pol, pod)
 
@@ -697,16 +900,12 @@ class DocumentParserService:
         Maps each type to corresponding container by order.
         """
         # Find "Type|" followed by container types
-        type_header_match = re.search(
-            r'TYPE[\s|]+(\d{2}[A-Z]{2}(?:[\s|]+\d{2}[A-Z]{2})*)',
-            text,
-            re.IGNORECASE
-        )
+        type_header_match = _TYPE_HEADER_RE.search(text)
 
         if type_header_match:
             # Extract all types after "Type|"
             types_text = type_header_match.group(1)
-            types = re.findall(r'(\d{2}[A-Z]{2})', types_text)
+            types = _CONTAINER_TYPE_RE.findall(types_text)
 
             logger.debug("header_types_found", types=types, container_count=len(containers))
 
@@ -753,38 +952,36 @@ class DocumentParserService:
         Also handles inline table format:
         CMAU0630730 000100 20GP 26963 KG 18.9 M3 14 PLT
         """
+        # All container occurrences, found once instead of a str.find per
+        # (container, occurrence, other container)
+        occurrences = _occurrences(text, containers)
+        positions = [pos for pos, _ in occurrences]
+
         for container_num in containers:
             # Simpler approach: find container and extract next ~300 chars as cargo block
-            idx = text.find(container_num)
-            block_count = 0
-            while idx >= 0 and block_count < 5:  # Check up to 5 occurrences
-                block_count += 1
+            own = [pos for pos, c in occurrences if c == container_num]
+            for idx in own[:5]:  # Check up to 5 occurrences
                 block_end = min(len(text), idx + 300)
 
                 # Find where next container starts (to limit block)
                 next_container_pos = block_end
-                for other_c in containers:
+                for pos, other_c in occurrences[bisect.bisect_left(positions, idx + len(container_num)):]:
+                    if pos >= next_container_pos:
+                        break
                     if other_c != container_num:
-                        other_pos = text.find(other_c, idx + len(container_num))
-                        if other_pos > idx and other_pos < next_container_pos:
-                            next_container_pos = other_pos
+                        next_container_pos = pos
+                        break
 
                 cargo_block = text[idx:next_container_pos]
 
                 # Check if this block has cargo details (not just header mention)
-                has_cargo_details = bool(
-                    re.search(r'PALLET|WEIGHT|NET\s*W|KGS?|M[³3]|CBM|\d+\.\d+', cargo_block, re.IGNORECASE)
-                )
+                has_cargo_details = bool(_CARGO_HINT_RE.search(cargo_block))
 
                 if has_cargo_details:
                     # Extract pallets - but NOT from "STC X Pallet" (shipment total)
                     # Valid: "14 PALLETS", "14 PLT"
                     # Invalid: "STC 70 Pallet(s)" - this is total
-                    pallets_match = re.search(
-                        r'(?<!STC\s)(?<!STC\s\s)(\d{1,3})\s*(?:PALLETS?|PLT)\b',
-                        cargo_block,
-                        re.IGNORECASE
-                    )
+                    pallets_match = _CARGO_PALLETS_RE.search(cargo_block)
                     if pallets_match and not details_map[container_num].pallets:
                         try:
                             pallets = int(pallets_match.group(1))
@@ -796,13 +993,8 @@ class DocumentParserService:
                             pass
 
                     # Extract weight - "NET WEIGHT 27062" or "27062 KG"
-                    weight_patterns = [
-                        r'NET\s*(?:WEIGHT|WT?)[\s:]*(\d+(?:,\d{3})*(?:\.\d+)?)',
-                        r'(\d+(?:,\d{3})*(?:\.\d+)?)\s*(?:KGS?|KG)\b',
-                        r'WEIGHT[\s:]*(\d+(?:,\d{3})*(?:\.\d+)?)\s*(?:KGS?)?',
-                    ]
-                    for wp in weight_patterns:
-                        weight_match = re.search(wp, cargo_block, re.IGNORECASE)
+                    for wp in _WEIGHT_RES:
+                        weight_match = wp.search(cargo_block)
                         if weight_match and not details_map[container_num].weight_kg:
                             try:
                                 weight_str = weight_match.group(1).replace(',', '')
@@ -816,15 +1008,9 @@ class DocumentParserService:
                                 pass
 
                     # Extract volume - multiple patterns for different formats
-                    # "18.9 M3", "18.9 CBM", "18.9M3", "18,9 M3"
-                    volume_patterns = [
-                        r'(\d+[.,]\d+)\s*(?:M[³3]|CBM)\b',  # 18.9 M3 or 18,9 M3
-                        r'(\d+)\s*(?:M[³3]|CBM)\b',  # 18 M3 (integer)
-                        r'(?:VOL(?:UME)?|CBM)[\s:]*(\d+[.,]?\d*)',  # VOLUME: 18.9
-                    ]
                     if not details_map[container_num].volume_m3:
-                        for vp in volume_patterns:
-                            volume_match = re.search(vp, cargo_block, re.IGNORECASE)
+                        for vp in _VOLUME_RES:
+                            volume_match = vp.search(cargo_block)
                             if volume_match:
                                 try:
                                     vol_str = volume_match.group(1).replace(',', '.')
@@ -837,9 +1023,6 @@ class DocumentParserService:
                                 except ValueError:
                                     pass
 
-                # Look for next occurrence of this container
-                idx = text.find(container_num, idx + len(container_num))
-
     def _parse_inline_details(
         self,
         text: str,
@@ -861,15 +1044,15 @@ class DocumentParserService:
         context_end = min(len(text), container_idx + 200)
         context = text[context_start:context_end]
 
-        # Type: Allow seal/other text between container and type
+        # Type: Allow seal/other text between container and type. Same as
+        # searching "{container}<tail>" in context, without building a regex per container
         if not detail.container_type:
-            type_patterns = [
-                rf'{container_num}[\s|]+(\d{{2}}[A-Z]{{2}})\b',
-                rf'{container_num}[\s|]+\d{{5,8}}[\s|]+(\d{{2}}[A-Z]{{2}})\b',
-                rf'{container_num}[\s\S]{{0,30}}?(\d{{2}}[A-Z]{{2}})\b',
-            ]
-            for tp in type_patterns:
-                type_match = re.search(tp, context, re.IGNORECASE)
+            for tail in _INLINE_TYPE_RES:
+                type_match = None
+                pos = context.find(container_num)
+                while pos >= 0 and type_match is None:
+                    type_match = tail.match(context, pos + len(container_num))
+                    pos = context.find(container_num, pos + 1)
                 if type_match:
                     detail.container_type = type_match.group(1)
                     detail.confidence = 0.7
@@ -877,11 +1060,7 @@ class DocumentParserService:
 
         # Weight (if not already found)
         if not detail.weight_kg:
-            weight_match = re.search(
-                r'(\d+(?:,\d{3})*(?:\.\d+)?)\s*(?:KGS?|KG)\b',
-                context,
-                re.IGNORECASE
-            )
+            weight_match = _KG_RE.search(context)
             if weight_match:
                 try:
                     weight_str = weight_match.group(1).replace(',', '')
@@ -893,13 +1072,8 @@ class DocumentParserService:
 
         # Volume (if not already found) - multiple patterns
         if not detail.volume_m3:
-            volume_patterns = [
-                r'(\d+[.,]\d+)\s*(?:M[³3]|CBM)\b',  # 18.9 M3 or 18,9 M3
-                r'(\d+)\s*(?:M[³3]|CBM)\b',  # 18 M3 (integer)
-                r'(?:VOL(?:UME)?|CBM)[\s:]*(\d+[.,]?\d*)',  # VOLUME: 18.9
-            ]
-            for vp in volume_patterns:
-                volume_match = re.search(vp, context, re.IGNORECASE)
+            for vp in _VOLUME_RES:
+                volume_match = vp.search(context)
                 if volume_match:
                     try:
                         vol_str = volume_match.group(1).replace(',', '.')
@@ -912,11 +1086,7 @@ class DocumentParserService:
 
         # Pallets (if not already found) - exclude STC totals
         if not detail.pallets:
-            pallets_match = re.search(
-                r'(?<!STC\s)(\d{1,3})\s*(?:PALLETS?|PLT|PKG)\b',
-                context,
-                re.IGNORECASE
-            )
+            pallets_match = _INLINE_PALLETS_RE.search(context)
             if pallets_match:
                 try:
                     pallets = int(pallets_match.group(1))
@@ -974,6 +1144,7 @@ class DocumentParserService:
                 )
         return None
 
+    @timed_parser("document_pdf")
     def parse_pdf(self, pdf_bytes: bytes) -> ParsedDocumentData:
         """
         Parse PDF and extract all shipment data.
@@ -15,6 +15,8 @@ import structlog
 
 from config import get_supabase_client
 from exceptions import DatabaseError
+from services.planning_inputs_service import invalidate_planning_inputs
+from utils.db_batch import IN_CHUNK_SIZE, WRITE_CHUNK_SIZE, chunked
 
 logger = structlog.get_logger(__name__)
 
@@ -31,24 +33,6 @@ class DraftService:
         self.drafts_table = "boat_factory_drafts"
         self.items_table = "draft_items"
 
-    def _fetch_items(self, draft_id: str) -> list[dict]:
-        """
-        Fetch all draft_items for a given draft_id.
-
-        Args:
-            draft_id: Draft UUID
-
-        Returns:
-            List of item dicts
-        """
-        result = (
-            self.db.table(self.items_table)
-            .select("*")
-            .eq("draft_id", draft_id)
-            .execute()
-        )
-        return result.data
-
     @staticmethod
     def _compute_items_hash(items: list[dict]) -> str:
         """
@@ -77,18 +61,99 @@ class DraftService:
         content = json.dumps(normalized, sort_keys=True)
         return hashlib.md5(content.encode()).hexdigest()
 
-    def _attach_items(self, draft: dict) -> dict:
+    def _select_drafts_with_items(self):
+        """
+        Query builder for drafts with their items embedded.
+
+        draft_items.draft_id is a FK to boat_factory_drafts, so PostgREST
+        returns each draft with an "items" array in the same round trip
+        instead of one items query per draft.
         """
-        Attach items list to a draft dict.
+        return self.db.table(self.drafts_table).select(f"*, items:{self.items_table}(*)")
+
+    @staticmethod
+    def _normalize_embedded(drafts: list[dict]) -> list[dict]:
+        """Ensure every draft has an "items" list (empty when it has none)."""
+        for draft in drafts:
+            draft["items"] = draft.get("items") or []
+        return drafts
+
+    # Item columns written on save — the diff compares exactly these
+    ITEM_FIELDS = ("selected_pallets", "bl_number", "notes", "snapshot_data", "suggested_pallets")
+
+    @staticmethod
+    def _build_item_rows(draft_id: str, items: list[dict], auto_bl: bool) -> list[dict]:
+        """
+        Convert incoming payload items to draft_items rows.
+
+        Args:
+            draft_id: Draft UUID
+            items: Payload dicts with product_id, selected_pallets, notes, ...
+            auto_bl: Default bl_number to 1 (unit-based factories)
+
+        Returns:
+            Rows ready for insert/upsert (without id)
+        """
+        rows = []
+        for item in items:
+            bl = item.get("bl_number")
+            if bl is None and auto_bl:
+                bl = 1
+            # Every row carries every column so a bulk upsert of mixed rows
+            # overwrites the same set of fields (like the old delete + insert).
+            rows.append({
+                "draft_id": draft_id,
+                "product_id": item["product_id"],
+                "selected_pallets": item["selected_pallets"],
+                "bl_number": bl,
+                "notes": item.get("notes"),
+                "snapshot_data": item.get("snapshot_data"),
+                # Audit trail: capture brain's suggestion at save time so we can
+                # observe how often Ashley overrides and on which products.
+                # Brain ignores this — it's pure observation.
+                "suggested_pallets": item.get("suggested_pallets"),
+            })
+        return rows
+
+    @classmethod
+    def _diff_items(
+        cls, stored: list[dict], rows: list[dict]
+    ) -> tuple[list[dict], list[dict], list[str]]:
+        """
+        Diff incoming rows against stored draft_items by product_id.
 
         Args:
-            draft: Draft dict
+            stored: Current draft_items rows (with id)
+            rows: Incoming rows from _build_item_rows
 
         Returns:
-            Draft dict with "items" key added
+            (rows to upsert — changed ones carry the stored id,
+             stored rows left untouched,
+             ids of stored rows to delete)
         """
-        draft["items"] = self._fetch_items(draft["id"])
-        return draft
+        def same(a, b) -> bool:
+            if isinstance(a, (int, float, Decimal)) and isinstance(b, (int, float, Decimal)):
+                return Decimal(str(a)) == Decimal(str(b))
+            return a == b
+
+        stored_by_product: dict[str, list[dict]] = {}
+        for row in stored:
+            stored_by_product.setdefault(row["product_id"], []).append(row)
+
+        to_upsert, unchanged = [], []
+        for row in rows:
+            matches = stored_by_product.get(row["product_id"])
+            if not matches:
+                to_upsert.append(row)
+                continue
+            old = matches.pop(0)
+            if all(same(old.get(f), row.get(f)) for f in cls.ITEM_FIELDS):
+                unchanged.append(old)
+            else:
+                to_upsert.append({**row, "id": old["id"]})
+
+        to_delete = [row["id"] for rows_left in stored_by_product.values() for row in rows_left]
+        return to_upsert, unchanged, to_delete
 
     def _flag_later_drafts(self, boat_id: str, factory_id: str, reason: str) -> int:
         """
@@ -114,10 +179,10 @@ class DraftService:
                 return 0
             this_departure = boat_result.data[0]["departure_date"]
 
-            # Find all drafts for this factory
+            # Find all drafts for this factory, with their boat's departure embedded
             drafts_result = (
                 self.db.table(self.drafts_table)
-                .select("id, boat_id, status")
+                .select("id, boat_id, status, boat_schedules(departure_date)")
                 .eq("factory_id", factory_id)
                 .neq("boat_id", boat_id)
                 .execute()
@@ -125,31 +190,24 @@ class DraftService:
             if not drafts_result.data:
                 return 0
 
-            # Get departure dates for those boats
-            other_boat_ids = [d["boat_id"] for d in drafts_result.data]
-            boats_result = (
-                self.db.table("boat_schedules")
-                .select("id, departure_date")
-                .in_("id", other_boat_ids)
-                .execute()
-            )
-            departure_by_boat = {b["id"]: b["departure_date"] for b in boats_result.data}
+            # Later drafts, skipping ordered/confirmed — they're already committed
+            to_flag = [
+                draft["id"]
+                for draft in drafts_result.data
+                if ((draft.get("boat_schedules") or {}).get("departure_date") or "") > this_departure
+                and draft.get("status") not in ("ordered", "confirmed")
+            ]
 
-            # Flag later drafts
+            # Flag them in one statement
             flagged = 0
-            now = datetime.now(timezone.utc).isoformat()
-            for draft in drafts_result.data:
-                draft_departure = departure_by_boat.get(draft["boat_id"], "")
-                if draft_departure > this_departure:
-                    # Skip ordered/confirmed drafts — they're already committed
-                    if draft.get("status") in ("ordered", "confirmed"):
-                        continue
-                    self.db.table(self.drafts_table).update({
-                        "status": "action_needed",
-                        "notes": reason,
-                        "updated_at": now,
-                    }).eq("id", draft["id"]).execute()
-                    flagged += 1
+            if to_flag:
+                now = datetime.now(timezone.utc).isoformat()
+                self.db.table(self.drafts_table).update({
+                    "status": "action_needed",
+                    "notes": reason,
+                    "updated_at": now,
+                }).in_("id", to_flag).execute()
+                flagged = len(to_flag)
 
             if flagged > 0:
                 logger.info(
@@ -184,8 +242,7 @@ class DraftService:
 
         try:
             result = (
-                self.db.table(self.drafts_table)
-                .select("*")
+                self._select_drafts_with_items()
                 .eq("boat_id", boat_id)
                 .eq("factory_id", factory_id)
                 .execute()
@@ -194,8 +251,7 @@ class DraftService:
             if not result.data:
                 return None
 
-            draft = result.data[0]
-            self._attach_items(draft)
+            draft = self._normalize_embedded(result.data[:1])[0]
 
             logger.info(
                 "draft_retrieved",
@@ -227,15 +283,12 @@ class DraftService:
 
         try:
             result = (
-                self.db.table(self.drafts_table)
-                .select("*")
+                self._select_drafts_with_items()
                 .eq("boat_id", boat_id)
                 .execute()
             )
 
-            drafts = result.data
-            for draft in drafts:
-                self._attach_items(draft)
+            drafts = self._normalize_embedded(result.data)
 
             logger.info(
                 "drafts_listed",
@@ -264,7 +317,9 @@ class DraftService:
         Save (create or update) a draft for a boat + factory.
 
         Upsert logic:
-        - If draft exists: update notes + last_edited_at, then replace items
+        - If draft exists: update notes + last_edited_at, then apply the item
+          diff (one chunked upsert for new/changed rows, one delete for
+          removed rows). Nothing is written when notes and items are unchanged.
         - If not: insert new draft, then insert items
 
         Args:
@@ -314,17 +369,24 @@ class DraftService:
             logger.warning("boat_status_check_failed", boat_id=boat_id, error=str(e))
 
         try:
-            # Check if draft already exists
+            # Check if draft already exists (stored items embedded for the diff)
             existing = (
-                self.db.table(self.drafts_table)
-                .select("*")
+                self._select_drafts_with_items()
                 .eq("boat_id", boat_id)
                 .eq("factory_id", factory_id)
                 .execute()
             )
 
+            # Auto-assign BL 1 for unit-based factories (e.g. Muebles — low volume, no container split)
+            auto_bl = self._is_unit_based_factory(factory_id)
+
+            # NOTE: No server-side capping on save. Drafts are sacred — save
+            # exactly what Ashley typed. Validation happens at Confirm time.
+            warnings = []
+
             if existing.data:
-                current_status = existing.data[0].get("status", "")
+                current = self._normalize_embedded(existing.data[:1])[0]
+                current_status = current.get("status", "")
                 if current_status in ("ordered", "confirmed"):
                     raise DatabaseError(
                         "update",
@@ -333,7 +395,7 @@ class DraftService:
 
                 # Optimistic locking: reject if updated_at doesn't match (5m)
                 if expected_updated_at:
-                    current_updated_at = existing.data[0].get("updated_at")
+                    current_updated_at = current.get("updated_at")
                     if current_updated_at and current_updated_at != expected_updated_at:
                         from exceptions import ConflictError
                         raise ConflictError(
@@ -342,13 +404,29 @@ class DraftService:
                             details={
                                 "expected": expected_updated_at,
                                 "current": current_updated_at,
-                                "draft_id": existing.data[0]["id"],
+                                "draft_id": current["id"],
                             },
                         )
 
-                # Update existing draft
-                draft_id = existing.data[0]["id"]
+                draft_id = current["id"]
+                old_items = current.pop("items")
+                old_hash = self._compute_items_hash(old_items)
+                rows = self._build_item_rows(draft_id, items, auto_bl)
+                to_upsert, unchanged, to_delete = self._diff_items(old_items, rows)
+
+                # No-op autosave: same selection, no field changes, same notes
+                if (
+                    old_hash == self._compute_items_hash(items)
+                    and not to_upsert
+                    and not to_delete
+                    and current.get("notes") == notes
+                ):
+                    current["items"] = old_items
+                    current["warnings"] = warnings
+                    logger.debug("draft_save_noop", draft_id=draft_id)
+                    return current
 
+                # Update existing draft
                 result = (
                     self.db.table(self.drafts_table)
                     .update({
@@ -381,61 +459,40 @@ class DraftService:
 
                 logger.info("draft_created", draft_id=draft_id)
 
-            # Save old items for rollback and change detection
-            old_items = self._fetch_items(draft_id)
-            old_hash = self._compute_items_hash(old_items)
-
-            # Replace items: delete old, insert new
-            self.db.table(self.items_table).delete().eq(
-                "draft_id", draft_id
-            ).execute()
-
-            # Auto-assign BL 1 for unit-based factories (e.g. Muebles — low volume, no container split)
-            auto_bl = self._is_unit_based_factory(factory_id)
-
-            # NOTE: No server-side capping on save. Drafts are sacred — save
-            # exactly what Ashley typed. Validation happens at Confirm time.
-            warnings = []
+                old_hash = self._compute_items_hash([])
+                to_upsert = self._build_item_rows(draft_id, items, auto_bl)
+                unchanged, to_delete = [], []
+
+            # Apply the diff. New and changed rows are written before removed
+            # rows are deleted, so concurrent readers never see an empty draft.
+            saved_rows = []
+            try:
+                for chunk in chunked(to_upsert, WRITE_CHUNK_SIZE):
+                    result = (
+                        self.db.table(self.items_table)
+                        .upsert(list(chunk), on_conflict="id", default_to_null=False)
+                        .execute()
+                    )
+                    saved_rows.extend(result.data or [])
+                for chunk in chunked(to_delete, IN_CHUNK_SIZE):
+                    self.db.table(self.items_table).delete().in_("id", list(chunk)).execute()
+            except Exception as write_err:
+                logger.error("draft_items_save_failed", error=str(write_err), draft_id=draft_id)
+                raise DatabaseError("upsert", f"Failed to save draft items: {write_err}")
 
-            if items:
-                rows = []
-                for item in items:
-                    bl = item.get("bl_number")
-                    if bl is None and auto_bl:
-                        bl = 1
-                    item_data = {
-                        "draft_id": draft_id,
-                        "product_id": item["product_id"],
-                        "selected_pallets": item["selected_pallets"],
-                        "bl_number": bl,
-                        "notes": item.get("notes"),
-                    }
-                    if item.get("snapshot_data") is not None:
-                        item_data["snapshot_data"] = item["snapshot_data"]
-                    # Audit trail: capture brain's suggestion at save time so we can
-                    # observe how often Ashley overrides and on which products.
-                    # Brain ignores this — it's pure observation.
-                    if item.get("suggested_pallets") is not None:
-                        item_data["suggested_pallets"] = item["suggested_pallets"]
-                    rows.append(item_data)
-                try:
-                    self.db.table(self.items_table).insert(rows).execute()
-                except Exception as insert_err:
-                    # Best-effort rollback: re-insert old items
-                    logger.error("draft_items_insert_failed", error=str(insert_err), draft_id=draft_id)
-                    if old_items:
-                        try:
-                            rollback_rows = [{k: v for k, v in item.items() if k != "id"} for item in old_items]
-                            self.db.table(self.items_table).insert(rollback_rows).execute()
-                        except Exception:
-                            logger.error("draft_items_rollback_failed", draft_id=draft_id)
-                    raise DatabaseError("insert", f"Failed to save draft items: {insert_err}")
+            logger.info(
+                "draft_items_diff_applied",
+                draft_id=draft_id,
+                upserted=len(to_upsert),
+                unchanged=len(unchanged),
+                deleted=len(to_delete),
+            )
+            invalidate_planning_inputs("draft_saved")
 
             # Return full draft with items and any validation warnings
-            self._attach_items(draft)
+            draft["items"] = unchanged + saved_rows
             draft["warnings"] = warnings
 
-
             # Soft cascade: flag later drafts ONLY if content actually changed
             new_hash = self._compute_items_hash(items)
             if old_hash != new_hash:
@@ -528,6 +585,7 @@ class DraftService:
                 )
 
             draft = result.data[0]
+            invalidate_planning_inputs("draft_status_updated")
 
             # If transitioning to ordered/confirmed, flag later drafts
             if status in ("ordered", "confirmed"):
@@ -596,6 +654,7 @@ class DraftService:
                 return False
 
             logger.info("draft_deleted", draft_id=draft_id)
+            invalidate_planning_inputs("draft_deleted")
 
             # Soft cascade: flag later drafts
             self._flag_later_drafts(
@@ -29,6 +29,7 @@ from exceptions import (
 )
 from models.alert import AlertType, AlertSeverity, AlertCreate
 from services.alert_service import get_alert_service
+from utils.db_batch import group_by, select_in
 from integrations.telegram_messages import get_message
 
 logger = structlog.get_logger(__name__)
@@ -96,34 +97,12 @@ class FactoryOrderService:
             # Execute
             result = query.execute()
 
-            orders = []
-            for row in result.data:
-                # Get item count and total for each order
-                items_result = (
-                    self.db.table(self.items_table)
-                    .select("quantity_ordered")
-                    .eq("factory_order_id", row["id"])
-                    .execute()
-                )
-
-                item_count = len(items_result.data)
-                total_m2 = sum(
-                    Decimal(str(item["quantity_ordered"]))
-                    for item in items_result.data
-                )
-
-                orders.append(FactoryOrderResponse(
-                    id=row["id"],
-                    pv_number=row.get("pv_number"),
-                    order_date=row["order_date"],
-                    status=row["status"],
-                    notes=row.get("notes"),
-                    active=row.get("active", True),
-                    created_at=row["created_at"],
-                    updated_at=row.get("updated_at"),
-                    total_m2=total_m2,
-                    item_count=item_count,
-                ))
+            # Item count and total for every order in one batched lookup
+            items_by_order = self._load_items_by_order([row["id"] for row in result.data])
+            orders = [
+                self._row_to_response(row, items_by_order.get(row["id"], []))
+                for row in result.data
+            ]
 
             total = result.count or 0
 
@@ -712,34 +691,12 @@ class FactoryOrderService:
 
             result = query_builder.execute()
 
-            orders = []
-            for row in result.data:
-                # Get item count and total for each order
-                items_result = (
-                    self.db.table(self.items_table)
-                    .select("quantity_ordered")
-                    .eq("factory_order_id", row["id"])
-                    .execute()
-                )
-
-                item_count = len(items_result.data)
-                total_m2 = sum(
-                    Decimal(str(item["quantity_ordered"]))
-                    for item in items_result.data
-                )
-
-                orders.append(FactoryOrderResponse(
-                    id=row["id"],
-                    pv_number=row.get("pv_number"),
-                    order_date=row["order_date"],
-                    status=row["status"],
-                    notes=row.get("notes"),
-                    active=row.get("active", True),
-                    created_at=row["created_at"],
-                    updated_at=row.get("updated_at"),
-                    total_m2=total_m2,
-                    item_count=item_count,
-                ))
+            # Item count and total for every order in one batched lookup
+            items_by_order = self._load_items_by_order([row["id"] for row in result.data])
+            orders = [
+                self._row_to_response(row, items_by_order.get(row["id"], []))
+                for row in result.data
+            ]
 
             logger.debug(
                 "factory_orders_search_complete",
@@ -753,6 +710,43 @@ class FactoryOrderService:
             logger.error("search_factory_orders_failed", query=query, error=str(e))
             raise DatabaseError("select", str(e))
 
+    def _load_items_by_order(self, order_ids: list[str]) -> dict[str, list[dict]]:
+        """
+        Load item quantities for many orders in batched in_ queries.
+
+        Args:
+            order_ids: Factory order UUIDs
+
+        Returns:
+            {order_id: [item rows]} — orders without items are absent
+        """
+        rows = select_in(
+            self.db,
+            self.items_table,
+            "factory_order_id",
+            order_ids,
+            columns="factory_order_id, quantity_ordered",
+        )
+        return group_by(rows, "factory_order_id")
+
+    def _row_to_response(self, row: dict, items: list[dict]) -> FactoryOrderResponse:
+        """Convert an order row plus its item rows to a list response."""
+        return FactoryOrderResponse(
+            id=row["id"],
+            pv_number=row.get("pv_number"),
+            order_date=row["order_date"],
+            status=row["status"],
+            notes=row.get("notes"),
+            active=row.get("active", True),
+            created_at=row["created_at"],
+            updated_at=row.get("updated_at"),
+            total_m2=sum(
+                (Decimal(str(item["quantity_ordered"])) for item in items),
+                Decimal("0"),
+            ),
+            item_count=len(items),
+        )
+
     def count(self, status: Optional[OrderStatus] = None, active_only: bool = True) -> int:
         """Count total factory orders."""
         try:
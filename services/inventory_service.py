@@ -21,6 +21,7 @@ from exceptions import (
     DatabaseError,
     ValidationError,
 )
+from services.snapshot_service import get_current_inventory, refresh_current_inventory
 
 logger = structlog.get_logger(__name__)
 
@@ -180,7 +181,8 @@ class InventoryService:
         Get the most recent inventory for each product.
 
         Uses the inventory_current view which composes the latest value
-        from each independent source table (warehouse, factory, transit).
+        from each independent source table (warehouse, factory, transit),
+        via its materialized copy (see services/snapshot_service.py).
 
         Returns:
             List of latest snapshots with product details
@@ -197,17 +199,16 @@ class InventoryService:
             table = "inventory_projected_current" if use_projected else "inventory_current"
 
             # Query the view — one row per product, no dedup needed
-            inv_result = (
-                self.db.table(table)
-                .select("*")
-                .execute()
-            )
+            if use_projected:
+                inv_rows = self.db.table(table).select("*").execute().data or []
+            else:
+                inv_rows = get_current_inventory(self.db)
 
-            if not inv_result.data:
+            if not inv_rows:
                 return []
 
             # Get product details separately (view doesn't support FK joins)
-            product_ids = [row["product_id"] for row in inv_result.data]
+            product_ids = [row["product_id"] for row in inv_rows]
             products_result = (
                 self.db.table("products")
                 .select("id, sku, category, rotation")
@@ -218,7 +219,7 @@ class InventoryService:
 
             # Convert to response objects — skip products with no data at all
             snapshots = []
-            for row in inv_result.data:
+            for row in inv_rows:
                 # Products with no inventory in any source table have NULL snapshot_date
                 if not row.get("snapshot_date"):
                     continue
@@ -290,6 +291,7 @@ class InventoryService:
                 product_id=snapshot.product_id
             )
 
+            refresh_current_inventory(self.db)
             return snapshot
 
         except Exception as e:
@@ -329,6 +331,7 @@ class InventoryService:
 
             logger.info("warehouse_deleted_by_dates", count=deleted)
 
+            refresh_current_inventory(self.db)
             return deleted
 
         except Exception as e:
@@ -376,6 +379,7 @@ class InventoryService:
                 count=len(all_created)
             )
 
+            refresh_current_inventory(self.db)
             return []  # Callers don't use the return value
 
         except Exception as e:
@@ -444,6 +448,7 @@ class InventoryService:
                 }, on_conflict="product_id,snapshot_date").execute()
 
             # Return the updated view
+            refresh_current_inventory(self.db)
             return existing  # Caller can re-fetch if needed
 
         except Exception as e:
@@ -477,6 +482,7 @@ class InventoryService:
 
             logger.info("inventory_snapshot_deleted", snapshot_id=snapshot_id)
 
+            refresh_current_inventory(self.db)
             return True
 
         except Exception as e:
@@ -0,0 +1,271 @@
+"""
+Background job runner for document ingestion.
+
+Ingestion endpoints (PDF parse/preview, packing list, email webhook) can
+hand their pipeline to this service and return a job id immediately.
+Jobs run as asyncio tasks in this process; a semaphore bounds how many
+run at once (settings.ingest_max_concurrency) so a burst of uploads
+doesn't saturate CPU with pdfplumber or fan out Claude Vision calls.
+
+Job status and results live in a local SQLite file
+(settings.ingest_jobs_db_path) so any uvicorn worker on the host can
+answer status polls. Cancellation stops the asyncio task; a parse already
+running in a worker thread finishes but its result is discarded.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional
+
+import structlog
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+
+from config.settings import settings
+from models.job import JobResponse, JobStatus
+from utils.process import pid_alive
+
+logger = structlog.get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    filename TEXT,
+    worker_pid INTEGER,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    status_code INTEGER,
+    result TEXT,
+    error TEXT
+)
+"""
+
+_ACTIVE = (JobStatus.QUEUED.value, JobStatus.RUNNING.value)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class JobService:
+    """
+    In-process job runner with a SQLite-backed status store.
+    """
+
+    def __init__(self, db_path: str, max_concurrency: int, retention_hours: int):
+        self.db_path = db_path
+        self.max_concurrency = max_concurrency
+        self.retention = timedelta(hours=retention_hours)
+        self._lock = threading.Lock()
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+
+    # ===================
+    # STORE
+    # ===================
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def _row_to_response(self, row: sqlite3.Row) -> JobResponse:
+        return JobResponse(
+            id=row["id"],
+            kind=row["kind"],
+            status=row["status"],
+            filename=row["filename"],
+            created_at=row["created_at"],
+            started_at=row["started_at"],
+            finished_at=row["finished_at"],
+            status_code=row["status_code"],
+            result=json.loads(row["result"]) if row["result"] else None,
+            error=row["error"],
+        )
+
+    def _finish(
+        self,
+        job_id: str,
+        status: JobStatus,
+        status_code: Optional[int] = None,
+        result: Any = None,
+        error: Optional[str] = None,
+    ) -> bool:
+        """Record a terminal state unless the job already has one (e.g. cancelled)."""
+        cursor = self._execute(
+            "UPDATE jobs SET status = ?, finished_at = ?, status_code = ?, result = ?, error = ?"
+            " WHERE id = ? AND status IN (?, ?)",
+            (
+                status.value,
+                _now(),
+                status_code,
+                json.dumps(jsonable_encoder(result)) if result is not None else None,
+                error,
+                job_id,
+                *_ACTIVE,
+            ),
+        )
+        return cursor.rowcount > 0
+
+    def _prune(self) -> None:
+        cutoff = (datetime.now(timezone.utc) - self.retention).isoformat()
+        self._execute(
+            "DELETE FROM jobs WHERE status NOT IN (?, ?) AND finished_at < ?",
+            (*_ACTIVE, cutoff),
+        )
+
+    # ===================
+    # PUBLIC API
+    # ===================
+
+    def submit(
+        self,
+        kind: str,
+        run: Callable[[], Awaitable[Any]],
+        filename: Optional[str] = None,
+    ) -> str:
+        """
+        Queue a job. Must be called from the event loop.
+
+        Args:
+            kind: Job type label
+            run: Zero-arg coroutine factory returning the endpoint response
+            filename: Uploaded file name, for display
+
+        Returns:
+            Job id
+        """
+        self._prune()
+        job_id = str(uuid.uuid4())
+        self._execute(
+            "INSERT INTO jobs (id, kind, status, filename, worker_pid, created_at)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, kind, JobStatus.QUEUED.value, filename, os.getpid(), _now()),
+        )
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        task = asyncio.create_task(self._run(job_id, kind, run), name=f"job-{kind}-{job_id}")
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+
+        logger.info("job_submitted", job_id=job_id, kind=kind, filename=filename, active=len(self._tasks))
+        return job_id
+
+    def get(self, job_id: str) -> Optional[JobResponse]:
+        row = self._execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_response(row) if row else None
+
+    def list(self, limit: int = 50, status: Optional[JobStatus] = None) -> list[JobResponse]:
+        if status:
+            rows = self._execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?",
+                (status.value, limit),
+            ).fetchall()
+        else:
+            rows = self._execute(
+                "SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [self._row_to_response(r) for r in rows]
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job.
+
+        Returns:
+            True if the job was active and is now cancelled
+        """
+        cancelled = self._finish(job_id, JobStatus.CANCELLED, error="Cancelled by user")
+        task = self._tasks.get(job_id)
+        if task is not None:
+            task.cancel()
+        if cancelled:
+            logger.info("job_cancelled", job_id=job_id)
+        return cancelled
+
+    def recover(self) -> int:
+        """
+        Mark jobs whose worker process is gone as failed. Call at startup.
+
+        Jobs owned by other live workers on the host are left alone.
+        """
+        rows = self._execute(
+            "SELECT id, worker_pid FROM jobs WHERE status IN (?, ?)", _ACTIVE
+        ).fetchall()
+        orphaned = [r["id"] for r in rows if not pid_alive(r["worker_pid"]) or r["worker_pid"] == os.getpid()]
+        for job_id in orphaned:
+            self._finish(job_id, JobStatus.FAILED, error="Interrupted by server restart")
+        if orphaned:
+            logger.warning("jobs_interrupted", count=len(orphaned))
+        return len(orphaned)
+
+    async def shutdown(self) -> None:
+        """Cancel this process's jobs and wait for them to unwind."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    # ===================
+    # RUNNER
+    # ===================
+
+    async def _run(self, job_id: str, kind: str, run: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            async with self._semaphore:
+                cursor = self._execute(
+                    "UPDATE jobs SET status = ?, started_at = ? WHERE id = ? AND status = ?",
+                    (JobStatus.RUNNING.value, _now(), job_id, JobStatus.QUEUED.value),
+                )
+                if cursor.rowcount == 0:
+                    return  # cancelled while queued
+
+                logger.info("job_started", job_id=job_id, kind=kind)
+                result = await run()
+
+            self._finish(job_id, JobStatus.SUCCEEDED, status_code=200, result=result)
+            logger.info("job_succeeded", job_id=job_id, kind=kind)
+
+        except asyncio.CancelledError:
+            self._finish(job_id, JobStatus.CANCELLED, error="Cancelled")
+            raise
+        except HTTPException as e:
+            self._finish(
+                job_id, JobStatus.FAILED, status_code=e.status_code, error=str(e.detail)
+            )
+            logger.warning("job_failed", job_id=job_id, kind=kind, status_code=e.status_code, error=str(e.detail))
+        except Exception as e:
+            self._finish(job_id, JobStatus.FAILED, status_code=500, error=str(e))
+            logger.error("job_failed", job_id=job_id, kind=kind, error=str(e))
+
+
+# Singleton instance
+_job_service: Optional[JobService] = None
+
+
+def get_job_service() -> JobService:
+    """Get or create JobService instance."""
+    global _job_service
+    if _job_service is None:
+        _job_service = JobService(
+            db_path=settings.ingest_jobs_db_path,
+            max_concurrency=settings.ingest_max_concurrency,
+            retention_hours=settings.ingest_job_retention_hours,
+        )
+    return _job_service
@@ -29,6 +29,7 @@ from config import get_supabase_client
 from lib.coverage import days_of_stock as _days_of_stock
 from models.metrics import StockCoverage, ProductMetrics, CategoryMetrics, CategoryInsight
 from models.product import TILE_CATEGORIES
+from services.snapshot_service import get_current_inventory
 
 logger = structlog.get_logger(__name__)
 
@@ -79,12 +80,13 @@ class MetricsService:
         products_by_id = {p["id"]: p for p in products_result.data}
 
         # Inventory from inventory_current view (latest per source, no dedup needed)
-        inventory_result = self.db.table("inventory_current").select(
-            "product_id, warehouse_qty, in_transit_qty, factory_available_m2, factory_lot_count, snapshot_date"
-        ).execute()
+        inventory_rows = get_current_inventory(
+            self.db,
+            "product_id, warehouse_qty, in_transit_qty, factory_available_m2, factory_lot_count, snapshot_date",
+        )
 
         inventory_by_product: Dict[str, dict] = {
-            snap["product_id"]: snap for snap in inventory_result.data
+            snap["product_id"]: snap for snap in inventory_rows
             if snap.get("product_id")
         }
 
@@ -9,13 +9,14 @@ from __future__ import annotations
 
 from collections import defaultdict
 from dataclasses import dataclass, field
-from datetime import date, timedelta
+from datetime import date
 from decimal import Decimal
 from typing import Optional
 
+import numpy as np
 import structlog
 
-from config import get_supabase_client
+from services.planning_inputs_service import get_planning_inputs
 
 
 logger = structlog.get_logger(__name__)
@@ -33,33 +34,61 @@ _TIER_CONFIG = {
 }
 
 
-def _classify_tier(velocity_wk: Decimal, all_velocities_wk: list[Decimal]) -> str:
-    """Classify a product by velocity quartile.
-    Top 25% = A, mid 50% = B, bottom 25% (or zero velocity) = C.
+# Per-tier buffer parameters as arrays indexed like TIERS
+TIERS = np.array(["A", "B", "C"])
+_TIER_WEEKS = np.array([_TIER_CONFIG[t]["weeks"] for t in TIERS], dtype=float)
+_TIER_FLOOR_M2 = np.array([_TIER_CONFIG[t]["floor_pallets"] for t in TIERS], dtype=float) * float(M2_PER_PALLET)
+_TIER_CEIL_M2 = np.array([_TIER_CONFIG[t]["ceiling_pallets"] for t in TIERS], dtype=float) * float(M2_PER_PALLET)
+
+# Float slack when rounding pallet counts, so 20.000000000000004 pallets
+# stays 20 (matches the Decimal math this replaced)
+_PALLET_EPS = 1e-9
+
+
+def _classify_tiers(velocities_wk: np.ndarray) -> np.ndarray:
+    """Classify products by velocity quartile, all at once.
+
+    Top 25% = A, mid 50% = B, bottom 25% (or zero velocity) = C. The two
+    cut velocities are read from one descending sort of the positive
+    velocities (rank 25% and 75%).
+
+    Returns:
+        Index into TIERS per product (0 = A, 1 = B, 2 = C)
     """
-    if velocity_wk <= 0:
-        return "C"
-    sorted_vels = sorted([v for v in all_velocities_wk if v > 0], reverse=True)
-    n = len(sorted_vels)
+    tiers = np.full(len(velocities_wk), 2)
+    ranked = np.sort(velocities_wk[velocities_wk > 0])[::-1]
+    n = len(ranked)
     if n == 0:
-        return "C"
+        return tiers
     a_cut_idx = max(1, int(n * 0.25)) - 1
     c_cut_idx = max(a_cut_idx + 1, int(n * 0.75)) - 1
-    a_threshold = sorted_vels[min(a_cut_idx, n - 1)]
-    c_threshold = sorted_vels[min(c_cut_idx, n - 1)]
-    if velocity_wk >= a_threshold:
-        return "A"
-    if velocity_wk >= c_threshold:
-        return "B"
-    return "C"
+    a_threshold = ranked[min(a_cut_idx, n - 1)]
+    c_threshold = ranked[min(c_cut_idx, n - 1)]
+    positive = velocities_wk > 0
+    tiers[positive & (velocities_wk >= c_threshold)] = 1
+    tiers[positive & (velocities_wk >= a_threshold)] = 0
+    return tiers
 
 
-def _buffer_m2_for(velocity_wk: Decimal, tier: str) -> Decimal:
-    cfg = _TIER_CONFIG[tier]
-    raw = velocity_wk * Decimal(cfg["weeks"])
-    floor_m2 = Decimal(cfg["floor_pallets"]) * M2_PER_PALLET
-    ceil_m2 = Decimal(cfg["ceiling_pallets"]) * M2_PER_PALLET
-    return max(floor_m2, min(raw, ceil_m2))
+def _buffers_m2(velocities_wk: np.ndarray, tiers: np.ndarray) -> np.ndarray:
+    """Tier buffer per product: `weeks` of velocity, clamped to the tier's pallet floor/ceiling."""
+    raw = velocities_wk * _TIER_WEEKS[tiers]
+    return np.maximum(_TIER_FLOOR_M2[tiers], np.minimum(raw, _TIER_CEIL_M2[tiers]))
+
+
+def _allocate_boat(
+    target_pallets: np.ndarray, available_pallets: np.ndarray, capacity: int,
+) -> np.ndarray:
+    """Whole pallets each product gets on one boat, in queue order.
+
+    Each product wants min(target, available) rounded down; products get
+    their want in queue order until the boat's capacity runs out (the one
+    crossing the limit gets what is left, everyone after gets nothing).
+    """
+    want = np.floor(np.minimum(target_pallets, available_pallets) + _PALLET_EPS)
+    want[want < 0] = 0
+    before = np.cumsum(want) - want
+    return np.clip(capacity - before, 0, want).astype(int)
 
 
 @dataclass
@@ -164,103 +193,59 @@ def compute_plan(
     Returns:
         PlanResult with structured boats, lines, ranking, and capacity check.
     """
-    db = get_supabase_client()
-
-    # 1. Fetch selected boats, ordered by departure date
-    boats_res = db.table("boat_schedules").select(
-        "id, vessel_name, departure_date, arrival_date"
-    ).in_("id", boat_ids).order("departure_date").execute()
-    boats_data = boats_res.data or []
-
-    # 2. Fetch active tile products (with frozen tier from DB)
-    tile_categories = ["MADERAS", "MARMOLIZADOS", "EXTERIORES"]
-    prods_q = db.table("products").select("id, sku, factory_id, tier").eq(
-        "active", True
-    ).in_("category", tile_categories)
-    if factory_id:
-        prods_q = prods_q.eq("factory_id", factory_id)
-    products = prods_q.execute().data or []
-    pid_to_sku: dict[str, str] = {p["id"]: p["sku"] for p in products}
-    pid_to_tier: dict[str, str] = {p["id"]: p.get("tier") for p in products if p.get("tier")}
+    planning = get_planning_inputs()
+
+    # 1. Selected boats, ordered by departure date
+    boats_data = sorted(planning.boats_by_ids(boat_ids), key=lambda b: b.departure_date)
+
+    # 2. Active tile products (with frozen tier from DB)
+    products = [
+        p for p in planning.products
+        if p.is_tile and (not factory_id or p.factory_id == factory_id)
+    ]
+    pid_to_sku: dict[str, str] = {p.id: p.sku for p in products}
+    pid_to_tier: dict[str, str] = {p.id: p.tier for p in products if p.tier}
     active_product_ids = set(pid_to_sku.keys())
 
-    # 3. Latest SIESA (factory) inventory.
+    # 3. Latest SIESA (factory) inventory — with warehouse + transit (step 5)
+    # in the same call.
     # We also need created_at — the brain's snapshot-aware cascade rule
     # applies here too: the snapshot's Cant. disponible already excludes
     # drafts the factory knew about at upload time.
-    latest_fs = db.table("factory_snapshots").select(
-        "snapshot_date, created_at"
-    ).order("snapshot_date", desc=True).limit(1).execute()
+    snapshots = planning.snapshots
     siesa: dict[str, Decimal] = {}
-    snapshot_created_at_str: str | None = None
-    if latest_fs.data:
-        fs_date = latest_fs.data[0]["snapshot_date"]
-        snapshot_created_at_str = latest_fs.data[0].get("created_at")
-        rows = db.table("factory_snapshots").select(
-            "product_id, factory_available_m2"
-        ).eq("snapshot_date", fs_date).execute().data or []
-        for r in rows:
-            if r["product_id"] in active_product_ids:
-                siesa[r["product_id"]] = siesa.get(
-                    r["product_id"], Decimal(0)
-                ) + Decimal(str(r.get("factory_available_m2") or 0))
+    snapshot_created_at_str: str | None = snapshots.factory.created_at
+    for r in snapshots.factory.rows:
+        if r["product_id"] in active_product_ids:
+            siesa[r["product_id"]] = siesa.get(
+                r["product_id"], Decimal(0)
+            ) + Decimal(str(r.get("factory_available_m2") or 0))
 
     # 3b. Subtract committed drafts on boats NOT being planned — but ONLY
     # drafts ordered AFTER the snapshot was uploaded. Pre-snapshot commitments
     # are already netted out of factory's Cant. disponible; deducting them
     # again would double-count (the bug we just fixed in the brain).
-    today_iso = date.today().isoformat()
-    future_boats = (
-        db.table("boat_schedules")
-        .select("id")
-        .gte("departure_date", today_iso)
-        .execute()
-        .data or []
-    )
-    future_boat_ids = {b["id"] for b in future_boats}
+    future_boat_ids = {b.id for b in planning.upcoming_boats}
 
     selected_set = set(boat_ids)
-    committed_drafts = (
-        db.table("boat_factory_drafts")
-        .select("id, boat_id, status, ordered_at")
-        .in_("status", ["ordered", "confirmed"])
-        .execute()
-        .data or []
-    )
     other_committed_draft_ids = [
-        d["id"] for d in committed_drafts
-        if d["boat_id"] not in selected_set
-        and d["boat_id"] in future_boat_ids
+        d.id for d in planning.drafts
+        if d.is_committed
+        and d.boat_id not in selected_set
+        and d.boat_id in future_boat_ids
         and snapshot_created_at_str is not None
-        and d.get("ordered_at") is not None
-        and d["ordered_at"] > snapshot_created_at_str  # ISO 8601 strings sort lexicographically
+        and d.ordered_at is not None
+        and d.ordered_at > snapshot_created_at_str  # ISO 8601 strings sort lexicographically
     ]
-    if other_committed_draft_ids:
-        committed_items = (
-            db.table("draft_items")
-            .select("draft_id, product_id, selected_pallets")
-            .in_("draft_id", other_committed_draft_ids)
-            .execute()
-            .data or []
-        )
-        for it in committed_items:
-            pid = it["product_id"]
-            pallets = Decimal(str(it.get("selected_pallets") or 0))
-            consume = pallets * M2_PER_PALLET
-            current = siesa.get(pid, Decimal(0))
-            siesa[pid] = max(Decimal(0), current - consume)
+    for it in planning.draft_items(other_committed_draft_ids):
+        consume = Decimal(it.selected_pallets) * M2_PER_PALLET
+        current = siesa.get(it.product_id, Decimal(0))
+        siesa[it.product_id] = max(Decimal(0), current - consume)
 
     # 4. 90-day velocity from sales table (same method as brain.py — new middle)
-    today_d = date.today()
-    sales_start = (today_d - timedelta(days=90)).isoformat()
-    sales_res = db.table("sales").select(
-        "product_id, quantity_m2"
-    ).gte("week_start", sales_start).execute().data or []
     sales_totals: dict[str, Decimal] = defaultdict(Decimal)
-    for row in sales_res:
-        pid = row.get("product_id")
-        if pid:
-            sales_totals[pid] += Decimal(str(row.get("quantity_m2") or 0))
+    for sale in planning.sales:
+        sales_totals[sale.product_id] += sale.quantity_m2
     # Convert 90-day total to weekly velocity (m²/wk)
     velocity_wk: dict[str, Decimal] = {
         pid: (total / Decimal("90") * Decimal("7")).quantize(Decimal("0.01"))
@@ -268,55 +253,35 @@ def compute_plan(
     }
 
     # 5. Warehouse + transit (for coverage calc)
-    latest_wh = db.table("warehouse_snapshots").select(
-        "snapshot_date"
-    ).order("snapshot_date", desc=True).limit(1).execute()
     wh: dict[str, Decimal] = {}
-    if latest_wh.data:
-        wh_date = latest_wh.data[0]["snapshot_date"]
-        rows = db.table("warehouse_snapshots").select(
-            "product_id, warehouse_qty"
-        ).eq("snapshot_date", wh_date).execute().data or []
-        for r in rows:
-            wh[r["product_id"]] = Decimal(str(r.get("warehouse_qty") or 0))
-
-    latest_tr = db.table("transit_snapshots").select(
-        "snapshot_date"
-    ).order("snapshot_date", desc=True).limit(1).execute()
+    for r in snapshots.warehouse.rows:
+        wh[r["product_id"]] = Decimal(str(r.get("warehouse_qty") or 0))
+
     transit: dict[str, Decimal] = {}
-    if latest_tr.data:
-        tr_date = latest_tr.data[0]["snapshot_date"]
-        rows = db.table("transit_snapshots").select(
-            "product_id, in_transit_qty"
-        ).eq("snapshot_date", tr_date).execute().data or []
-        for r in rows:
-            transit[r["product_id"]] = Decimal(str(r.get("in_transit_qty") or 0))
+    for r in snapshots.in_transit.rows:
+        transit[r["product_id"]] = Decimal(str(r.get("in_transit_qty") or 0))
 
     # 6. Optional: include factory production scheduled to finish before each boat
     prod_ready_by_pid_and_date: dict[str, list[tuple[date, Decimal]]] = {}
     if include_production:
-        pipeline = db.table("production_schedule").select(
-            "product_id, estimated_delivery_date, completed_m2, requested_m2, status"
-        ).in_("status", ["in_progress", "requested"]).execute().data or []
-        for row in pipeline:
-            pid = row["product_id"]
-            est = row.get("estimated_delivery_date")
+        for row in planning.production:
+            if row.status not in ("in_progress", "requested"):
+                continue
+            est = row.estimated_delivery_date
             if not est:
                 continue
             try:
                 est_date = date.fromisoformat(est)
             except (TypeError, ValueError):
                 continue
-            req = Decimal(str(row.get("requested_m2") or 0))
-            comp = Decimal(str(row.get("completed_m2") or 0))
-            contrib = max(Decimal(0), req - comp)
+            contrib = max(Decimal(0), row.requested_m2 - row.completed_m2)
             if contrib > 0:
-                prod_ready_by_pid_and_date.setdefault(pid, []).append((est_date, contrib))
+                prod_ready_by_pid_and_date.setdefault(row.product_id, []).append((est_date, contrib))
 
     # 7. Build velocity ranking AND skipped list
     # Ranking is for products with meaningful demand + enough SIESA to ship (>=1 pallet)
     # Skipped covers: no-velocity items OR sub-pallet leftovers that can't ship
-    ranking: list[VelocityRankingRow] = []
+    ranked: list[tuple[str, VelocityRankingRow]] = []
     skipped: list[SkippedProduct] = []
     for pid, siesa_m2 in siesa.items():
         if siesa_m2 <= 0:
@@ -350,134 +315,111 @@ def compute_plan(
             + siesa_m2
         )
         cov = float(total_pipeline / v)
-        ranking.append(VelocityRankingRow(
+        ranked.append((pid, VelocityRankingRow(
             sku=pid_to_sku.get(pid, "?"),
             velocity_m2_wk=float(v),
             siesa_pallets=round(siesa_pallets_exact, 1),
             siesa_m2=float(siesa_m2),
             coverage_weeks=round(cov, 1),
             is_urgent=cov < 4.0,
-        ))
+        )))
     # Display ranking: sorted by velocity (what "velocity ranking" means)
-    ranking.sort(key=lambda r: r.velocity_m2_wk, reverse=True)
+    ranked.sort(key=lambda pr: pr[1].velocity_m2_wk, reverse=True)
+    ranking = [row for _, row in ranked]
 
     # Allocation queue: urgent SKUs jump the queue so stockouts get first dibs,
     # then by velocity descending within each tier.
     allocation_queue = sorted(
-        ranking, key=lambda r: (not r.is_urgent, -r.velocity_m2_wk)
+        ranked, key=lambda pr: (not pr[1].is_urgent, -pr[1].velocity_m2_wk)
+    )
+    queue_pids = [pid for pid, _ in allocation_queue]
+    queue_rows = [row for _, row in allocation_queue]
+    position = {pid: i for i, pid in enumerate(queue_pids)}
+
+    # 8. Product-indexed arrays, in allocation queue order. Tier comes from
+    # DB (frozen) with runtime quartile fallback when products.tier hasn't
+    # been set; quartiles are computed once over the whole ranking.
+    velocities = np.array([row.velocity_m2_wk for row in queue_rows], dtype=float)
+    tier_index = {str(t): i for i, t in enumerate(TIERS)}
+    runtime_tiers = _classify_tiers(velocities)
+    tiers = np.array([
+        tier_index.get(pid_to_tier.get(pid), runtime)
+        for pid, runtime in zip(queue_pids, runtime_tiers)
+    ], dtype=int)
+    buffers_m2 = _buffers_m2(velocities, tiers)
+    available = np.array(
+        [float(siesa[pid] / M2_PER_PALLET) for pid in queue_pids], dtype=float
     )
 
+    # Production batches of queued products, released into `available`
+    # once their estimated delivery is on or before a boat's departure
+    batch_pos, batch_ready, batch_pallets = [], [], []
+    for pid, batches in prod_ready_by_pid_and_date.items():
+        if pid in position:
+            for est_date, contrib in batches:
+                batch_pos.append(position[pid])
+                batch_ready.append(est_date.toordinal())
+                batch_pallets.append(float(contrib / M2_PER_PALLET))
+    batch_pos = np.array(batch_pos, dtype=int)
+    batch_ready = np.array(batch_ready, dtype=int)
+    batch_pallets = np.array(batch_pallets, dtype=float)
+    pending = np.ones(len(batch_pos), dtype=bool)
+
     # 9. Cascade allocation across boats in departure order — BUFFER-ANCHORED.
     # Per (boat, product), take only enough to keep stock above buffer through
     # the next boat's arrival. This naturally distributes products across boats
     # instead of greedy-filling the first boat.
-    available: dict[str, Decimal] = {
-        pid: Decimal(str(m2)) for pid, m2 in siesa.items()
-    }
-    # Pre-compute tier + buffer per product. Tier comes from DB (frozen) with
-    # runtime fallback when products.tier hasn't been set.
-    sku_to_pid = {sku: pid for pid, sku in pid_to_sku.items()}
-    all_weekly_vels = [Decimal(str(r.velocity_m2_wk)) for r in ranking]
-    product_tier: dict[str, str] = {}
-    product_buffer_m2: dict[str, Decimal] = {}
-    for r in ranking:
-        pid = sku_to_pid.get(r.sku)
-        if not pid:
-            continue
-        v = Decimal(str(r.velocity_m2_wk))
-        tier = pid_to_tier.get(pid) or _classify_tier(v, all_weekly_vels)
-        product_tier[pid] = tier
-        product_buffer_m2[pid] = _buffer_m2_for(v, tier)
-
-    # Track running warehouse projection per product across boat arrivals so
-    # we don't double-allocate (each boat's take adds to the next-arrival pool).
-    warehouse_projection: dict[str, Decimal] = {
-        pid: Decimal(str(m2)) for pid, m2 in (
-            list(map(lambda x: (x[0], x[1]), [(pid, 0) for pid in pid_to_sku.keys()]))
-        )
-    }
-    # Note: we don't have warehouse data here; simplification — boat take is
-    # capped by buffer + sales-between-boats, that's the constraint that matters.
-
     plan_boats: list[PlanBoat] = []
     today = date.today()
+    max_pallets = max_containers * int(PALLETS_PER_CONTAINER)
 
     for i, boat in enumerate(boats_data):
-        dep = date.fromisoformat(boat["departure_date"]) \
-            if isinstance(boat["departure_date"], str) else boat["departure_date"]
-        arr = date.fromisoformat(boat["arrival_date"]) \
-            if isinstance(boat["arrival_date"], str) else boat["arrival_date"]
+        dep = date.fromisoformat(boat.departure_date)
+        arr = date.fromisoformat(boat.arrival_date)
 
         # Compute "weeks until next boat" — how long this boat's stock must last.
         if i + 1 < len(boats_data):
-            nxt = boats_data[i + 1]
-            next_arr = date.fromisoformat(nxt["arrival_date"]) \
-                if isinstance(nxt["arrival_date"], str) else nxt["arrival_date"]
-            weeks_to_next = max(Decimal("1"), Decimal(str((next_arr - arr).days)) / Decimal("7"))
+            next_arr = date.fromisoformat(boats_data[i + 1].arrival_date)
+            weeks_to_next = max(1.0, (next_arr - arr).days / 7)
         else:
-            weeks_to_next = Decimal("6")  # default coverage horizon for last boat
+            weeks_to_next = 6.0  # default coverage horizon for last boat
 
         # Add production that will be ready before this boat's departure
-        if include_production:
-            for pid, batches in prod_ready_by_pid_and_date.items():
-                remaining = []
-                for est_date, contrib in batches:
-                    if est_date <= dep:
-                        available[pid] = available.get(pid, Decimal(0)) + contrib
-                    else:
-                        remaining.append((est_date, contrib))
-                prod_ready_by_pid_and_date[pid] = remaining
-
-        max_pallets = max_containers * int(PALLETS_PER_CONTAINER)
-        remaining_pallets = Decimal(max_pallets)
+        ready = pending & (batch_ready <= dep.toordinal())
+        np.add.at(available, batch_pos[ready], batch_pallets[ready])
+        pending &= ~ready
 
         plan_boat = PlanBoat(
-            boat_id=boat["id"],
-            vessel_name=boat["vessel_name"],
+            boat_id=boat.id,
+            vessel_name=boat.vessel_name,
             departure_date=str(dep),
             arrival_date=str(arr),
             max_containers=max_containers,
             max_pallets=max_pallets,
         )
 
-        # Take from allocation queue (urgent first, then by velocity desc)
-        for row in allocation_queue:
-            if remaining_pallets <= 0:
-                break
-            pid = sku_to_pid.get(row.sku)
-            if pid is None:
-                continue
-            avail_m2 = available.get(pid, Decimal(0))
-            if avail_m2 <= 0:
-                continue
-
-            # Buffer-anchored take: enough to cover sales until next boat + buffer
-            # for THIS product. Caps at SIESA available and remaining boat capacity.
-            buffer_m2 = product_buffer_m2.get(pid, Decimal("403.2"))  # legacy fallback
-            weekly_vel = Decimal(str(row.velocity_m2_wk))
-            target_m2 = buffer_m2 + (weekly_vel * weeks_to_next)
-            target_pallets = (target_m2 / M2_PER_PALLET).to_integral_value(rounding="ROUND_UP")
-
-            avail_pallets = avail_m2 / M2_PER_PALLET
-            take = min(target_pallets, avail_pallets, remaining_pallets)
-            take_pallets = int(take)  # round down to whole pallets
-            if take_pallets <= 0:
-                continue
-            take_m2 = Decimal(take_pallets) * M2_PER_PALLET
-            available[pid] = avail_m2 - take_m2
-            remaining_pallets -= take_pallets
+        # Buffer-anchored take: enough to cover sales until next boat + buffer
+        # for each product, capped at SIESA available and remaining boat
+        # capacity (urgent first, then by velocity desc).
+        target_pallets = np.ceil(
+            (buffers_m2 + velocities * weeks_to_next) / float(M2_PER_PALLET) - _PALLET_EPS
+        )
+        take = _allocate_boat(target_pallets, available, max_pallets)
+        available -= take
 
-            note = _build_line_note(row)
+        for j in np.flatnonzero(take):
+            row = queue_rows[j]
+            take_pallets = int(take[j])
             plan_boat.lines.append(PlanProductLine(
-                product_id=pid,
+                product_id=queue_pids[j],
                 sku=row.sku,
                 pallets=take_pallets,
-                m2=float(take_m2),
+                m2=float(Decimal(take_pallets) * M2_PER_PALLET),
                 velocity_m2_wk=row.velocity_m2_wk,
                 siesa_m2=row.siesa_m2,
                 coverage_weeks=row.coverage_weeks,
                 is_urgent=row.is_urgent,
-                note_es=note,
+                note_es=_build_line_note(row),
             ))
 
         plan_boats.append(plan_boat)
@@ -486,21 +428,14 @@ def compute_plan(
     current_wh_pallets = int(sum(wh.values()) / M2_PER_PALLET) if wh else 0
 
     # Rough "incoming" = shipment_items not yet delivered (future boats only)
-    incoming_res = db.table("shipment_items").select(
-        "shipped_m2, boat_id"
-    ).execute().data or []
-    incoming_boat_ids = {row["boat_id"] for row in incoming_res}
-    incoming_boats = db.table("boat_schedules").select(
-        "id, arrival_date"
-    ).in_("id", list(incoming_boat_ids)).execute().data or []
+    shipments = planning.shipment_items
     future_incoming_boat_ids = {
-        b["id"] for b in incoming_boats
-        if date.fromisoformat(b["arrival_date"]) > today
+        b.id for b in planning.boats_by_ids(dict.fromkeys(item.boat_id for item in shipments))
+        if date.fromisoformat(b.arrival_date) > today
     }
     incoming_m2 = sum(
-        Decimal(str(row.get("shipped_m2") or 0))
-        for row in incoming_res
-        if row["boat_id"] in future_incoming_boat_ids
+        item.shipped_m2 for item in shipments
+        if item.boat_id in future_incoming_boat_ids
     )
     incoming_pallets = int(incoming_m2 / M2_PER_PALLET)
 
@@ -13,6 +13,7 @@ import structlog
 import pandas as pd
 
 from models.ingest import ParsedFieldConfidence
+from lib.telemetry import timed_parser
 
 logger = structlog.get_logger(__name__)
 
@@ -165,6 +166,7 @@ class PackingListParserService:
     def __init__(self):
         self.logger = logger.bind(service="packing_list_parser")
 
+    @timed_parser("packing_list")
     def parse(self, file_content: bytes, filename: str) -> ParsedPackingList:
         """
         Parse packing list Excel file.
@@ -0,0 +1,344 @@
+"""Shared, cached inputs for the planners.
+
+The horizon brain, the order plan, the order-plan boat picker and the
+factory-commits reconciliation all read the same tables: boat_schedules,
+boat_factory_drafts, draft_items, the latest snapshots, sales,
+shipment_items and production_schedule. get_planning_inputs() returns one
+PlanningInputs bundle per day that loads each source on first use and
+keeps it, so opening the Planning View and then generating an order plan
+fetches every table once.
+
+Sources are factory-independent (callers filter by factory), typed and
+parsed once. A bundle lives settings.planning_inputs_ttl_seconds; the
+service-layer writers of these tables (drafts, boat schedules, production
+schedule, snapshot uploads) call invalidate_planning_inputs() so the next
+read sees their changes. The cache is per process — other uvicorn
+workers pick changes up when their TTL runs out.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Iterable, Optional
+
+import structlog
+
+from config import get_supabase_client, settings
+from lib.telemetry import record_cache
+from services.snapshot_service import LatestSnapshots, get_latest_snapshots
+from utils.db_batch import select_in
+
+logger = structlog.get_logger(__name__)
+
+TILE_CATEGORIES = ("MADERAS", "MARMOLIZADOS", "EXTERIORES")
+COMMITTED_DRAFT_STATUSES = ("ordered", "confirmed")
+# Statuses any planner reads from production_schedule
+PRODUCTION_STATUSES = ("scheduled", "in_progress", "requested")
+SALES_WINDOW_DAYS = 90
+
+_BOAT_COLUMNS = "id, vessel_name, departure_date, arrival_date, carrier, status"
+
+
+def _decimal(value: Any) -> Decimal:
+    return Decimal(str(value or 0))
+
+
+@dataclass(frozen=True)
+class PlanningProduct:
+    id: str
+    sku: str
+    category: Optional[str]
+    factory_id: Optional[str]
+    tier: Optional[str]
+
+    @property
+    def is_tile(self) -> bool:
+        return self.category in TILE_CATEGORIES
+
+
+@dataclass(frozen=True)
+class PlanningBoat:
+    id: str
+    vessel_name: str
+    departure_date: str
+    arrival_date: str
+    carrier: str
+    status: Optional[str]
+
+
+@dataclass(frozen=True)
+class PlanningDraft:
+    id: str
+    boat_id: str
+    factory_id: Optional[str]
+    status: str
+    ordered_at: Optional[str]
+
+    @property
+    def is_committed(self) -> bool:
+        return self.status in COMMITTED_DRAFT_STATUSES
+
+
+@dataclass(frozen=True)
+class PlanningDraftItem:
+    draft_id: str
+    product_id: str
+    selected_pallets: int
+
+
+@dataclass(frozen=True)
+class SalesWeek:
+    product_id: str
+    week_start: str
+    quantity_m2: Decimal
+
+
+@dataclass(frozen=True)
+class ShipmentItem:
+    boat_id: str
+    product_id: str
+    shipped_m2: Decimal
+
+
+@dataclass(frozen=True)
+class ProductionRow:
+    product_id: Optional[str]
+    status: str
+    requested_m2: Decimal
+    completed_m2: Decimal
+    scheduled_start_date: Optional[str]
+    estimated_delivery_date: Optional[str]
+
+
+def _boat(row: dict) -> PlanningBoat:
+    return PlanningBoat(
+        id=row["id"],
+        vessel_name=row["vessel_name"],
+        departure_date=row["departure_date"],
+        arrival_date=row["arrival_date"],
+        carrier=row.get("carrier") or "",
+        status=row.get("status"),
+    )
+
+
+class PlanningInputs:
+    """
+    Planner inputs as of `today`, loaded lazily and shared between callers.
+
+    Each source is fetched at most once per bundle (thread-safe: requests
+    run the loaders on the DB executor). Draft items and boats outside the
+    upcoming window are fetched by id on demand and memoized.
+    """
+
+    def __init__(self, db, today: date):
+        self.db = db
+        self.today = today
+        self.created_at = time.monotonic()
+        self._lock = threading.RLock()
+        self._loaded: dict[str, Any] = {}
+        self._boats_by_id: dict[str, PlanningBoat] = {}
+        self._items_by_draft: dict[str, list[PlanningDraftItem]] = {}
+
+    def _get(self, name: str, loader: Callable[[], Any]) -> Any:
+        with self._lock:
+            if name not in self._loaded:
+                started = time.perf_counter()
+                self._loaded[name] = loader()
+                logger.debug(
+                    "planning_input_loaded",
+                    source=name,
+                    duration_ms=round((time.perf_counter() - started) * 1000, 1),
+                )
+            return self._loaded[name]
+
+    # ===================
+    # SOURCES
+    # ===================
+
+    @property
+    def sales_window_start(self) -> str:
+        return (self.today - timedelta(days=SALES_WINDOW_DAYS)).isoformat()
+
+    @property
+    def products(self) -> list[PlanningProduct]:
+        """Active products of every category and factory."""
+        def load():
+            rows = self.db.table("products").select(
+                "id, sku, category, factory_id, tier"
+            ).eq("active", True).execute().data or []
+            return [
+                PlanningProduct(
+                    id=r["id"],
+                    sku=r["sku"],
+                    category=r.get("category"),
+                    factory_id=r.get("factory_id"),
+                    tier=r.get("tier"),
+                )
+                for r in rows
+            ]
+        return self._get("products", load)
+
+    @property
+    def upcoming_boats(self) -> list[PlanningBoat]:
+        """Boats departing today or later (ignored ones included), by departure date."""
+        def load():
+            rows = self.db.table("boat_schedules").select(_BOAT_COLUMNS).gte(
+                "departure_date", self.today.isoformat()
+            ).order("departure_date").execute().data or []
+            boats = [_boat(r) for r in rows]
+            self._boats_by_id.update((b.id, b) for b in boats)
+            return boats
+        return self._get("upcoming_boats", load)
+
+    def boats_by_ids(self, boat_ids: Iterable[str]) -> list[PlanningBoat]:
+        """Boats with these ids (any departure date), in the order given; unknown ids are skipped."""
+        boat_ids = list(boat_ids)
+        with self._lock:
+            self.upcoming_boats
+            missing = [bid for bid in boat_ids if bid not in self._boats_by_id]
+            if missing:
+                for row in select_in(self.db, "boat_schedules", "id", missing, _BOAT_COLUMNS):
+                    self._boats_by_id[row["id"]] = _boat(row)
+            return [self._boats_by_id[bid] for bid in boat_ids if bid in self._boats_by_id]
+
+    @property
+    def snapshots(self) -> LatestSnapshots:
+        return self._get("snapshots", lambda: get_latest_snapshots(self.db))
+
+    @property
+    def sales(self) -> list[SalesWeek]:
+        """Sales rows with week_start in the last SALES_WINDOW_DAYS (rows without product skipped)."""
+        def load():
+            rows = self.db.table("sales").select(
+                "product_id, quantity_m2, week_start"
+            ).gte("week_start", self.sales_window_start).execute().data or []
+            return [
+                SalesWeek(
+                    product_id=r["product_id"],
+                    week_start=str(r.get("week_start") or ""),
+                    quantity_m2=_decimal(r.get("quantity_m2")),
+                )
+                for r in rows
+                if r.get("product_id")
+            ]
+        return self._get("sales", load)
+
+    @property
+    def shipment_items(self) -> list[ShipmentItem]:
+        def load():
+            rows = self.db.table("shipment_items").select(
+                "boat_id, product_id, shipped_m2"
+            ).execute().data or []
+            return [
+                ShipmentItem(
+                    boat_id=r["boat_id"],
+                    product_id=r["product_id"],
+                    shipped_m2=_decimal(r.get("shipped_m2")),
+                )
+                for r in rows
+            ]
+        return self._get("shipment_items", load)
+
+    @property
+    def production(self) -> list[ProductionRow]:
+        """Production schedule rows still to deliver (PRODUCTION_STATUSES)."""
+        def load():
+            rows = self.db.table("production_schedule").select(
+                "product_id, status, requested_m2, completed_m2, "
+                "scheduled_start_date, estimated_delivery_date"
+            ).in_("status", list(PRODUCTION_STATUSES)).execute().data or []
+            return [
+                ProductionRow(
+                    product_id=r.get("product_id"),
+                    status=r["status"],
+                    requested_m2=_decimal(r.get("requested_m2")),
+                    completed_m2=_decimal(r.get("completed_m2")),
+                    scheduled_start_date=r.get("scheduled_start_date"),
+                    estimated_delivery_date=r.get("estimated_delivery_date"),
+                )
+                for r in rows
+            ]
+        return self._get("production", load)
+
+    @property
+    def drafts(self) -> list[PlanningDraft]:
+        """Draft headers of every factory and status."""
+        def load():
+            rows = self.db.table("boat_factory_drafts").select(
+                "id, boat_id, factory_id, status, ordered_at"
+            ).execute().data or []
+            return [
+                PlanningDraft(
+                    id=r["id"],
+                    boat_id=r["boat_id"],
+                    factory_id=r.get("factory_id"),
+                    status=r["status"],
+                    ordered_at=r.get("ordered_at"),
+                )
+                for r in rows
+            ]
+        return self._get("drafts", load)
+
+    def draft_items(self, draft_ids: Iterable[str]) -> list[PlanningDraftItem]:
+        """Items of these drafts, in draft order. Only drafts not seen yet are queried."""
+        draft_ids = list(dict.fromkeys(draft_ids))
+        with self._lock:
+            missing = [did for did in draft_ids if did not in self._items_by_draft]
+            if missing:
+                for did in missing:
+                    self._items_by_draft[did] = []
+                for row in select_in(
+                    self.db, "draft_items", "draft_id", missing,
+                    "draft_id, product_id, selected_pallets",
+                ):
+                    self._items_by_draft[row["draft_id"]].append(PlanningDraftItem(
+                        draft_id=row["draft_id"],
+                        product_id=row["product_id"],
+                        selected_pallets=int(row.get("selected_pallets") or 0),
+                    ))
+            return [item for did in draft_ids for item in self._items_by_draft[did]]
+
+
+# ===================
+# CACHE
+# ===================
+
+_cache_lock = threading.Lock()
+_cached: Optional[PlanningInputs] = None
+
+
+def get_planning_inputs(today: Optional[date] = None) -> PlanningInputs:
+    """
+    The current PlanningInputs bundle for `today`, creating one when the
+    cached bundle is for another day, older than the TTL, or invalidated.
+    """
+    global _cached
+    today = today or date.today()
+    ttl = settings.planning_inputs_ttl_seconds
+    with _cache_lock:
+        cached = _cached
+        hit = (
+            cached is not None
+            and cached.today == today
+            and time.monotonic() - cached.created_at < ttl
+        )
+        record_cache("planning_inputs", hit=hit)
+        if not hit:
+            cached = PlanningInputs(get_supabase_client(), today)
+            if ttl > 0:
+                _cached = cached
+        return cached
+
+
+def invalidate_planning_inputs(reason: str = "") -> None:
+    """Drop the cached bundle so the next planner call reloads (after draft saves and uploads)."""
+    global _cached
+    with _cache_lock:
+        had_bundle = _cached is not None
+        _cached = None
+    if had_bundle:
+        logger.info("planning_inputs_invalidated", reason=reason)
@@ -1,45 +1,423 @@
 """
 Temporary storage for upload previews.
-Stores parsed data in memory with TTL expiration.
-Single-server only (Ashley is the only user).
+
+Parsed uploads wait here between /upload (preview) and
+/upload/confirm/{preview_id}. Entries are pickled and zlib-compressed.
+Two backends, chosen by settings.preview_backend:
+
+    memory  Per-process LRU within settings.preview_cache_max_mb. Previews
+            larger than settings.preview_spill_kb, or pushed out of memory
+            by newer ones, spill to a per-process directory under
+            settings.preview_cache_dir. Fastest, but a confirm must reach
+            the worker that served the preview.
+    sqlite  One SQLite file (settings.preview_db_path) shared by every
+            uvicorn worker on the host, so `uvicorn --workers N` works
+            without sticky sessions.
+
+Either way, previews beyond settings.preview_disk_max_mb on disk are
+dropped least recently used first, and expired entries are removed on
+access and by a background sweep every settings.preview_sweep_seconds
+(started in the app lifespan).
 """
+import asyncio
+import os
+import pickle
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
 import uuid
-from datetime import datetime, timedelta
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Any, Optional
 
-_cache: dict[str, tuple[datetime, Any]] = {}
+import structlog
+
+from config.settings import settings
+from lib.telemetry import PREVIEW_CACHE_EVICTIONS, record_cache
+from utils.process import pid_alive
+
+logger = structlog.get_logger(__name__)
+
 DEFAULT_TTL_MINUTES = 30
+SPILL_SUFFIX = ".preview"
+
+
+def _encode(data: Any) -> bytes:
+    return zlib.compress(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL), 1)
+
+
+def _decode(blob: bytes) -> Any:
+    return pickle.loads(zlib.decompress(blob))
+
+
+class PreviewBackend(ABC):
+    """
+    Preview store interface. Subclasses implement store/retrieve/delete/
+    sweep/stats; the expiry sweep task is shared.
+    """
+
+    _sweep_task: Optional[asyncio.Task] = None
+
+    @abstractmethod
+    def store(self, data: Any, ttl_minutes: int = DEFAULT_TTL_MINUTES) -> str:
+        """Store data, return preview_id."""
+
+    @abstractmethod
+    def retrieve(self, preview_id: str) -> Optional[Any]:
+        """Return a copy of the stored data, or None if expired/not found."""
+
+    @abstractmethod
+    def delete(self, preview_id: str) -> None:
+        """Remove preview after confirm or cancel."""
+
+    @abstractmethod
+    def sweep(self) -> int:
+        """Drop every expired entry. Returns how many were removed."""
+
+    @abstractmethod
+    def stats(self) -> dict[str, int]:
+        """Compressed bytes held per tier, for the preview_cache_bytes gauge."""
+
+    async def start_sweeper(self, interval_seconds: float) -> None:
+        """Start the periodic expiry sweep on the running event loop."""
+        if self._sweep_task is not None and not self._sweep_task.done():
+            return
+        self._sweep_task = asyncio.create_task(self._sweep_loop(interval_seconds), name="preview-sweep")
+
+    async def stop_sweeper(self) -> None:
+        if self._sweep_task is None:
+            return
+        self._sweep_task.cancel()
+        try:
+            await self._sweep_task
+        except asyncio.CancelledError:
+            pass
+        self._sweep_task = None
+
+    async def _sweep_loop(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                removed = await asyncio.to_thread(self.sweep)
+            except Exception as e:
+                logger.warning("preview_cache_sweep_failed", error=str(e))
+                continue
+            if removed:
+                logger.info("preview_cache_swept", backend=type(self).__name__, expired=removed)
+
+
+@dataclass
+class _Entry:
+    """One preview: compressed pickle in memory (blob) or on disk (path)."""
+    expires_at: float
+    size: int
+    blob: Optional[bytes] = None
+    path: Optional[str] = None
+
+
+class MemoryPreviewBackend(PreviewBackend):
+    """
+    Byte-bounded, per-process LRU of compressed previews with disk spill.
+    """
+
+    def __init__(self, directory: str, max_memory_bytes: int, spill_bytes: int, max_disk_bytes: int):
+        self.root = directory
+        self.directory = os.path.join(directory, str(os.getpid()))
+        self.max_memory_bytes = max_memory_bytes
+        self.spill_bytes = spill_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.memory_bytes = 0
+        self.disk_bytes = 0
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._remove_orphans()
+        os.makedirs(self.directory, exist_ok=True)
+
+    @property
+    def count(self) -> int:
+        return len(self._entries)
+
+    # ===================
+    # PUBLIC API
+    # ===================
+
+    def store(self, data: Any, ttl_minutes: int = DEFAULT_TTL_MINUTES) -> str:
+        """Store data, return preview_id."""
+        preview_id = str(uuid.uuid4())
+        blob = _encode(data)
+        entry = _Entry(expires_at=time.time() + ttl_minutes * 60, size=len(blob))
+
+        with self._lock:
+            if entry.size > self.spill_bytes:
+                self._write_spill(preview_id, entry, blob)
+            else:
+                entry.blob = blob
+                self.memory_bytes += entry.size
+            self._entries[preview_id] = entry
+            self._enforce_budgets()
+
+        logger.debug("preview_stored", preview_id=preview_id, bytes=entry.size, on_disk=entry.path is not None)
+        return preview_id
+
+    def retrieve(self, preview_id: str) -> Optional[Any]:
+        """Return a copy of the stored data, or None if expired/not found."""
+        with self._lock:
+            entry = self._entries.get(preview_id)
+            if entry is not None and time.time() > entry.expires_at:
+                self._drop(preview_id, "expired")
+                entry = None
+            if entry is None:
+                record_cache("preview", hit=False)
+                return None
+
+            self._entries.move_to_end(preview_id)
+            blob = entry.blob if entry.blob is not None else self._read_spill(preview_id, entry)
+            if blob is None:
+                record_cache("preview", hit=False)
+                return None
+            if entry.blob is None and entry.size <= self.spill_bytes:
+                self._promote(entry, blob)
+
+        record_cache("preview", hit=True)
+        return _decode(blob)
 
+    def delete(self, preview_id: str) -> None:
+        with self._lock:
+            if preview_id in self._entries:
+                self._drop(preview_id, None)
 
-def store_preview(data: Any, ttl_minutes: int = DEFAULT_TTL_MINUTES) -> str:
+    def sweep(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [k for k, e in self._entries.items() if now > e.expires_at]
+            for preview_id in expired:
+                self._drop(preview_id, "expired")
+        return len(expired)
+
+    def stats(self) -> dict[str, int]:
+        return {"memory": self.memory_bytes, "disk": self.disk_bytes}
+
+    # ===================
+    # INTERNALS (caller holds _lock)
+    # ===================
+
+    def _enforce_budgets(self) -> None:
+        """Spill least recently used entries out of memory, then drop spilled ones over the disk budget."""
+        if self.memory_bytes > self.max_memory_bytes:
+            for preview_id, entry in list(self._entries.items()):
+                if self.memory_bytes <= self.max_memory_bytes:
+                    break
+                if entry.blob is not None:
+                    blob = entry.blob
+                    self.memory_bytes -= entry.size
+                    entry.blob = None
+                    self._write_spill(preview_id, entry, blob)
+                    PREVIEW_CACHE_EVICTIONS.inc(reason="spill")
+
+        if self.disk_bytes > self.max_disk_bytes:
+            for preview_id, entry in list(self._entries.items()):
+                if self.disk_bytes <= self.max_disk_bytes:
+                    break
+                if entry.path is not None:
+                    self._drop(preview_id, "capacity")
+                    logger.warning("preview_evicted", preview_id=preview_id, bytes=entry.size)
+
+    def _promote(self, entry: _Entry, blob: bytes) -> None:
+        """Move a spilled entry back into memory after a read."""
+        self._remove_file(entry.path)
+        self.disk_bytes -= entry.size
+        entry.path = None
+        entry.blob = blob
+        self.memory_bytes += entry.size
+        self._enforce_budgets()
+
+    def _drop(self, preview_id: str, reason: Optional[str]) -> None:
+        entry = self._entries.pop(preview_id)
+        if entry.blob is not None:
+            self.memory_bytes -= entry.size
+        if entry.path is not None:
+            self._remove_file(entry.path)
+            self.disk_bytes -= entry.size
+        if reason:
+            PREVIEW_CACHE_EVICTIONS.inc(reason=reason)
+
+    def _write_spill(self, preview_id: str, entry: _Entry, blob: bytes) -> None:
+        """Move blob to disk; on a write error it stays in memory over budget."""
+        path = os.path.join(self.directory, f"{preview_id}{SPILL_SUFFIX}")
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("preview_spill_write_failed", preview_id=preview_id, error=str(e))
+            entry.blob = blob
+            self.memory_bytes += entry.size
+            return
+        entry.path = path
+        self.disk_bytes += entry.size
+
+    def _read_spill(self, preview_id: str, entry: _Entry) -> Optional[bytes]:
+        try:
+            with open(entry.path, "rb") as f:
+                return f.read()
+        except OSError as e:
+            logger.warning("preview_spill_read_failed", preview_id=preview_id, error=str(e))
+            entry.path = None
+            self.disk_bytes -= entry.size
+            self._entries.pop(preview_id, None)
+            return None
+
+    def _remove_orphans(self) -> None:
+        """Delete spill directories of processes that are gone (their index went with them)."""
+        if not os.path.isdir(self.root):
+            return
+        for item in os.scandir(self.root):
+            if not item.is_dir() or not item.name.isdigit():
+                continue
+            pid = int(item.name)
+            if pid == os.getpid() or not pid_alive(pid):
+                shutil.rmtree(item.path, ignore_errors=True)
+
+    @staticmethod
+    def _remove_file(path: Optional[str]) -> None:
+        try:
+            os.remove(path)
+        except (FileNotFoundError, TypeError):
+            pass
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS previews (
+    id TEXT PRIMARY KEY,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL
+)
+"""
+
+
+class SqlitePreviewBackend(PreviewBackend):
+    """
+    Previews in a local SQLite file that every worker on the host shares.
+    """
+
+    def __init__(self, db_path: str, max_bytes: int):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS previews_accessed ON previews (accessed_at)")
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def store(self, data: Any, ttl_minutes: int = DEFAULT_TTL_MINUTES) -> str:
+        preview_id = str(uuid.uuid4())
+        blob = _encode(data)
+        now = time.time()
+        self._execute(
+            "INSERT INTO previews (id, expires_at, accessed_at, size, data) VALUES (?, ?, ?, ?, ?)",
+            (preview_id, now + ttl_minutes * 60, now, len(blob), blob),
+        )
+        self._enforce_budget()
+        logger.debug("preview_stored", preview_id=preview_id, bytes=len(blob), backend="sqlite")
+        return preview_id
+
+    def retrieve(self, preview_id: str) -> Optional[Any]:
+        now = time.time()
+        row = self._execute(
+            "SELECT expires_at, data FROM previews WHERE id = ?", (preview_id,)
+        ).fetchone()
+        if row is not None and now > row[0]:
+            if self._execute("DELETE FROM previews WHERE id = ?", (preview_id,)).rowcount:
+                PREVIEW_CACHE_EVICTIONS.inc(reason="expired")
+            row = None
+        if row is None:
+            record_cache("preview", hit=False)
+            return None
+
+        self._execute("UPDATE previews SET accessed_at = ? WHERE id = ?", (now, preview_id))
+        record_cache("preview", hit=True)
+        return _decode(row[1])
+
+    def delete(self, preview_id: str) -> None:
+        self._execute("DELETE FROM previews WHERE id = ?", (preview_id,))
+
+    def sweep(self) -> int:
+        removed = self._execute("DELETE FROM previews WHERE expires_at < ?", (time.time(),)).rowcount
+        if removed:
+            PREVIEW_CACHE_EVICTIONS.inc(removed, reason="expired")
+        return removed
+
+    def stats(self) -> dict[str, int]:
+        total = self._execute("SELECT COALESCE(SUM(size), 0) FROM previews").fetchone()[0]
+        return {"sqlite": total}
+
+    def _enforce_budget(self) -> None:
+        """Drop least recently used previews until the file's payload is under max_bytes."""
+        total = self.stats()["sqlite"]
+        if total <= self.max_bytes:
+            return
+        rows = self._execute("SELECT id, size FROM previews ORDER BY accessed_at, rowid").fetchall()
+        for preview_id, size in rows[:-1]:  # never the preview just stored
+            if total <= self.max_bytes:
+                break
+            if self._execute("DELETE FROM previews WHERE id = ?", (preview_id,)).rowcount:
+                PREVIEW_CACHE_EVICTIONS.inc(reason="capacity")
+                logger.warning("preview_evicted", preview_id=preview_id, bytes=size)
+            total -= size
+
+
+# Singleton instance
+_preview_cache: Optional[PreviewBackend] = None
+
+
+def get_preview_cache() -> PreviewBackend:
+    """Get or create the preview backend selected by settings.preview_backend."""
+    global _preview_cache
+    if _preview_cache is None:
+        if settings.preview_backend == "sqlite":
+            _preview_cache = SqlitePreviewBackend(
+                db_path=settings.preview_db_path,
+                max_bytes=settings.preview_disk_max_mb * 1024 * 1024,
+            )
+        else:
+            _preview_cache = MemoryPreviewBackend(
+                directory=settings.preview_cache_dir,
+                max_memory_bytes=settings.preview_cache_max_mb * 1024 * 1024,
+                spill_bytes=settings.preview_spill_kb * 1024,
+                max_disk_bytes=settings.preview_disk_max_mb * 1024 * 1024,
+            )
+        logger.info("preview_backend_selected", backend=settings.preview_backend)
+    return _preview_cache
+
+
+# The backends block on disk and SQLite locks (a shared file can wait up to
+# its busy timeout), so the route helpers run them on a worker thread.
+
+async def store_preview(data: Any, ttl_minutes: int = DEFAULT_TTL_MINUTES) -> str:
     """Store parsed data, return preview_id."""
-    preview_id = str(uuid.uuid4())
-    expires_at = datetime.now() + timedelta(minutes=ttl_minutes)
-    _cache[preview_id] = (expires_at, data)
-    _cleanup_expired()
-    return preview_id
+    return await asyncio.to_thread(get_preview_cache().store, data, ttl_minutes)
 
 
-def retrieve_preview(preview_id: str) -> Optional[Any]:
+async def retrieve_preview(preview_id: str) -> Optional[Any]:
     """Retrieve parsed data by preview_id. Returns None if expired/not found."""
-    entry = _cache.get(preview_id)
-    if entry is None:
-        return None
-    expires_at, data = entry
-    if datetime.now() > expires_at:
-        del _cache[preview_id]
-        return None
-    return data
+    return await asyncio.to_thread(get_preview_cache().retrieve, preview_id)
 
 
-def delete_preview(preview_id: str) -> None:
+async def delete_preview(preview_id: str) -> None:
     """Remove preview after confirm or cancel."""
-    _cache.pop(preview_id, None)
-
-
-def _cleanup_expired() -> None:
-    """Remove all expired entries."""
-    now = datetime.now()
-    expired = [k for k, (exp, _) in _cache.items() if now > exp]
-    for k in expired:
-        del _cache[k]
+    await asyncio.to_thread(get_preview_cache().delete, preview_id)
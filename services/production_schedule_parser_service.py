@@ -21,6 +21,7 @@ from datetime import date, datetime
 from decimal import Decimal
 from io import BytesIO
 import structlog
+from pydantic import ValidationError
 
 import pandas as pd
 
@@ -34,6 +35,8 @@ from models.production_schedule import (
     ProductionStatus,
     ProductionImportResult,
 )
+from lib.telemetry import timed_parser
+from services.vision_cache_service import get_vision_cache, prompt_fingerprint
 
 logger = structlog.get_logger(__name__)
 
@@ -158,6 +161,8 @@ Return JSON in this exact structure:
   "parsing_notes": "Successfully parsed 52 line items from 2 plants. Found 3 maintenance entries that were skipped."
 }"""
 
+    USER_PROMPT = "Parse this production schedule and extract all production line items with their dates, factory codes, and m² quantities."
+
     def __init__(self):
         """Initialize parser service."""
         if CLAUDE_AVAILABLE:
@@ -226,6 +231,7 @@ Return JSON in this exact structure:
             logger.error("pdf_to_image_conversion_failed", error=str(e))
             return []
 
+    @timed_parser("production_schedule_pdf")
     async def parse_pdf(self, pdf_bytes: bytes, filename: Optional[str] = None) -> ParsedProductionSchedule:
         """
         Parse production schedule PDF using Claude Vision.
@@ -245,6 +251,20 @@ Return JSON in this exact structure:
 
         logger.info("production_schedule_parsing_started", pdf_size=len(pdf_bytes), filename=filename)
 
+        # Cached result skips both rasterization and the API call
+        cache = get_vision_cache()
+        cache_key = cache.make_key(
+            pdf_bytes, prompt_fingerprint(self.SYSTEM_PROMPT, self.USER_PROMPT), self.MODEL
+        )
+        cached = cache.get(cache_key, "production_schedule_vision")
+        if cached is not None:
+            try:
+                return ParsedProductionSchedule.model_validate(cached["parsed"])
+            except (ValidationError, KeyError, TypeError) as e:
+                # Entry from an older model shape: drop it and parse again
+                logger.warning("vision_cache_entry_invalid", key=cache_key[:12], error=str(e))
+                cache.delete(cache_key)
+
         try:
             # Build message content
             content = []
@@ -276,7 +296,7 @@ Return JSON in this exact structure:
 
             content.append({
                 "type": "text",
-                "text": "Parse this production schedule and extract all production line items with their dates, factory codes, and m² quantities."
+                "text": self.USER_PROMPT
             })
 
             # Call Claude API
@@ -294,7 +314,10 @@ Return JSON in this exact structure:
             logger.debug("claude_response_received", response_length=len(response_text))
 
             # Parse JSON response
-            parsed_data = self._parse_claude_response(response_text)
+            parsed_data, decoded = self._parse_claude_response(response_text)
+            # A reply that wasn't JSON is retried on the next upload, not replayed
+            if decoded:
+                cache.put(cache_key, response_text, parsed_data.model_dump(mode="json"))
 
             logger.info(
                 "production_schedule_parsing_completed",
@@ -312,7 +335,7 @@ Return JSON in this exact structure:
             logger.error("production_schedule_parsing_failed", error=str(e))
             raise ValueError(f"Production schedule parsing failed: {str(e)}")
 
-    def _parse_claude_response(self, response_text: str) -> ParsedProductionSchedule:
+    def _parse_claude_response(self, response_text: str) -> Tuple[ParsedProductionSchedule, bool]:
         """
         Parse Claude's JSON response into ParsedProductionSchedule.
 
@@ -320,7 +343,7 @@ Return JSON in this exact structure:
             response_text: Raw response from Claude
 
         Returns:
-            ParsedProductionSchedule model
+            (ParsedProductionSchedule model, whether the response was valid JSON)
         """
         # Clean response - remove markdown code blocks if present
         cleaned = response_text.strip()
@@ -339,7 +362,7 @@ Return JSON in this exact structure:
                 schedule_date=date.today(),
                 parsing_confidence=0.0,
                 parsing_notes=f"JSON parsing failed: {str(e)}"
-            )
+            ), False
 
         # Parse schedule date
         schedule_date_str = data.get("schedule_date")
@@ -406,9 +429,10 @@ Return JSON in this exact structure:
             total_m2_plant2=Decimal(str(data.get("total_m2_plant2"))) if data.get("total_m2_plant2") else None,
             parsing_confidence=float(data.get("parsing_confidence", 0.5)),
             parsing_notes=data.get("parsing_notes")
-        )
+        ), True
 
 
+    @timed_parser("production_schedule_excel")
     async def parse_excel(
         self,
         excel_bytes: bytes,
@@ -31,8 +31,11 @@ from models.production_schedule import (
     ProductionImportResult,
     CanAddMoreAlert,
 )
+from services.planning_inputs_service import invalidate_planning_inputs
 from services.product_service import get_product_service
 from exceptions import DatabaseError
+from lib.telemetry import timed_parser
+from utils.db_batch import IN_CHUNK_SIZE, chunked
 
 # Excel parsing
 try:
@@ -217,6 +220,7 @@ class ProductionScheduleService:
             products_matched=products_matched,
             unmatched_count=len(unmatched_codes)
         )
+        invalidate_planning_inputs("production_schedule_saved")
 
         return items_saved, products_matched, list(unmatched_codes)
 
@@ -459,14 +463,16 @@ class ProductionScheduleService:
     # UTILITY OPERATIONS
     # ===================
 
-    def rematch_products(self) -> tuple[int, int]:
+    def rematch_products(self) -> tuple[int, int, dict[str, int]]:
         """
         Re-match all schedule items to products by factory code.
 
-        Useful after updating factory_code on products.
+        Useful after updating factory_code on products. Matches are
+        written set-based: one update per product covering all of its
+        factory codes, instead of one update per schedule row.
 
         Returns:
-            Tuple of (total_processed, newly_matched)
+            Tuple of (total_processed, newly_matched, matched_by_factory_code)
         """
         logger.info("rematching_products")
 
@@ -480,29 +486,42 @@ class ProductionScheduleService:
             )
 
             if not unmatched_result.data:
-                return 0, 0
+                return 0, 0, {}
 
             # Get unique factory codes
-            factory_codes = list(set(row["factory_code"] for row in unmatched_result.data))
+            factory_codes = list(set(row["factory_code"] for row in unmatched_result.data if row["factory_code"]))
             products = self.product_service.get_by_factory_codes(factory_codes)
-            products_by_code = {p.factory_code: p for p in products if p.factory_code}
 
-            newly_matched = 0
-            for row in unmatched_result.data:
-                product = products_by_code.get(row["factory_code"])
-                if product:
-                    self.db.table(self.table).update(
-                        {"product_id": product.id}
-                    ).eq("id", row["id"]).execute()
-                    newly_matched += 1
+            codes_by_product: dict[str, list[str]] = defaultdict(list)
+            for product in products:
+                if product.factory_code:
+                    codes_by_product[product.id].append(product.factory_code)
+
+            matched_by_code: dict[str, int] = defaultdict(int)
+            for product_id, codes in codes_by_product.items():
+                for chunk in chunked(codes, IN_CHUNK_SIZE):
+                    result = (
+                        self.db.table(self.table)
+                        .update({"product_id": product_id})
+                        .in_("factory_code", list(chunk))
+                        .is_("product_id", "null")
+                        .execute()
+                    )
+                    for row in result.data or []:
+                        matched_by_code[row["factory_code"]] += 1
+
+            newly_matched = sum(matched_by_code.values())
 
             logger.info(
                 "products_rematched",
                 total_processed=len(unmatched_result.data),
-                newly_matched=newly_matched
+                newly_matched=newly_matched,
+                products=len(codes_by_product),
+                factory_codes=len(matched_by_code),
             )
+            invalidate_planning_inputs("production_rematched")
 
-            return len(unmatched_result.data), newly_matched
+            return len(unmatched_result.data), newly_matched, dict(matched_by_code)
 
         except Exception as e:
             logger.error("rematch_products_failed", error=str(e))
@@ -847,6 +866,7 @@ class ProductionScheduleService:
                 product_id=product_id,
                 rows_updated=rows_updated
             )
+            invalidate_planning_inputs("production_code_mapped")
 
             return rows_updated
 
@@ -864,6 +884,21 @@ class ProductionScheduleService:
     COLOR_LIGHT_BLUE = 'FF00B0F0'  # In Progress
     COLOR_ORANGE = 'FFFFC000'      # Attention (treat as scheduled)
 
+    # Schedule rows and per-plant columns of the monthly sheet
+    SCHEDULE_START_ROW = 18
+    SCHEDULE_END_ROW = 50
+    PLANT_LAYOUTS = (
+        # Plant 1: Item Code = col 5, Referencia = col 11, Programa = col 17, Real = col 19
+        # Dates: Fecha Inicio = col 1, Fecha Fin = col 2, Est Entrega = col 3
+        dict(item_col=5, ref_col=11, programa_col=17, real_col=19,
+             fecha_inicio_col=1, fecha_fin_col=2, fecha_entrega_col=3),
+        # Plant 2: Item Code = col 20, Referencia = col 28, Programa = col 34, Real = col 36
+        # Dates: Fecha Inicio = col 23, Fecha Fin = col 24 (no delivery column for Plant 2)
+        dict(item_col=20, ref_col=28, programa_col=34, real_col=36,
+             fecha_inicio_col=23, fecha_fin_col=24, fecha_entrega_col=None),
+    )
+
+    @timed_parser("production_excel")
     def parse_production_excel(
         self,
         file_path: str,
@@ -890,111 +925,102 @@ class ProductionScheduleService:
 
         logger.info("parsing_production_excel", file_path=file_path)
 
-        # Load workbook - need both data and formatting
-        wb_data = load_workbook(file_path, data_only=True)
-        wb_format = load_workbook(file_path, data_only=False)
-
-        # Find the monthly sheet (e.g., "ENERO-26")
-        sheet_name = None
-        for name in wb_data.sheetnames:
-            if "-26" in name or "-25" in name:  # Year suffix
-                sheet_name = name
-                break
-
-        if not sheet_name:
-            # Fallback to first sheet that looks like a month
-            for name in wb_data.sheetnames:
-                if any(month in name.upper() for month in [
-                    'ENERO', 'FEBRERO', 'MARZO', 'ABRIL', 'MAYO', 'JUNIO',
-                    'JULIO', 'AGOSTO', 'SEPTIEMBRE', 'OCTUBRE', 'NOVIEMBRE', 'DICIEMBRE'
-                ]):
-                    sheet_name = name
-                    break
-
-        if not sheet_name:
-            sheet_name = wb_data.sheetnames[1] if len(wb_data.sheetnames) > 1 else wb_data.sheetnames[0]
-
-        ws_data = wb_data[sheet_name]
-        ws_format = wb_format[sheet_name]
-
-        if source_month is None:
-            source_month = sheet_name
-
-        logger.info("parsing_sheet", sheet_name=sheet_name)
+        # One read-only load: cached values and cell fills come from the same
+        # parse (data_only only changes formula cells to their cached values)
+        wb = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            sheet_name = self._find_month_sheet(wb.sheetnames)
+            ws = wb[sheet_name]
+
+            if source_month is None:
+                source_month = sheet_name
+
+            logger.info("parsing_sheet", sheet_name=sheet_name)
+
+            # Only the plant column block of the schedule rows is read
+            first_col = min(col for layout in self.PLANT_LAYOUTS for col in layout.values() if col)
+            last_col = max(col for layout in self.PLANT_LAYOUTS for col in layout.values() if col)
+            rows = {
+                row_num: cells
+                for row_num, cells in enumerate(
+                    ws.iter_rows(
+                        min_row=self.SCHEDULE_START_ROW,
+                        max_row=self.SCHEDULE_END_ROW,
+                        min_col=first_col,
+                        max_col=last_col,
+                    ),
+                    start=self.SCHEDULE_START_ROW,
+                )
+            }
+        finally:
+            wb.close()
 
-        records = []
         import os
         filename = os.path.basename(file_path)
 
-        # Parse Plant 1 (columns 5, 11, 17, 19)
-        # Item Code = col 5, Referencia = col 11, Programa = col 17, Real = col 19
-        # Dates: Fecha Inicio = col 1, Fecha Fin = col 2, Est Entrega = col 3
-        plant1_records = self._parse_plant_data(
-            ws_data, ws_format,
-            plant="plant_1",
-            item_col=5,
-            ref_col=11,
-            programa_col=17,
-            real_col=19,
-            start_row=18,
-            end_row=50,
-            source_file=filename,
-            source_month=source_month,
-            fecha_inicio_col=1,
-            fecha_fin_col=2,
-            fecha_entrega_col=3,
-        )
-        records.extend(plant1_records)
+        # Status per fill (style fillId), resolved once per distinct fill
+        status_by_fill: dict[int, ProductionStatus] = {}
 
-        # Parse Plant 2 (columns 20, 28, 34, 36)
-        # Item Code = col 20, Referencia = col 28, Programa = col 34, Real = col 36
-        # Dates: Fecha Inicio = col 23, Fecha Fin = col 24 (no delivery column for Plant 2)
-        plant2_records = self._parse_plant_data(
-            ws_data, ws_format,
-            plant="plant_2",
-            item_col=20,
-            ref_col=28,
-            programa_col=34,
-            real_col=36,
-            start_row=18,
-            end_row=50,
-            source_file=filename,
-            source_month=source_month,
-            fecha_inicio_col=23,
-            fecha_fin_col=24,
-            fecha_entrega_col=None,  # Plant 2 doesn't have delivery date column
-        )
-        records.extend(plant2_records)
+        plant_records = {}
+        for plant, layout in zip(("plant_1", "plant_2"), self.PLANT_LAYOUTS):
+            plant_records[plant] = self._parse_plant_data(
+                rows,
+                first_col,
+                status_by_fill,
+                plant=plant,
+                source_file=filename,
+                source_month=source_month,
+                **layout,
+            )
+
+        records = plant_records["plant_1"] + plant_records["plant_2"]
 
         logger.info(
             "excel_parsed",
             total_records=len(records),
-            plant1_count=len(plant1_records),
-            plant2_count=len(plant2_records)
+            plant1_count=len(plant_records["plant_1"]),
+            plant2_count=len(plant_records["plant_2"])
         )
 
         return records
 
+    def _find_month_sheet(self, sheetnames: list[str]) -> str:
+        """Pick the monthly sheet (e.g., "ENERO-26")."""
+        for name in sheetnames:
+            if "-26" in name or "-25" in name:  # Year suffix
+                return name
+
+        # Fallback to first sheet that looks like a month
+        for name in sheetnames:
+            if any(month in name.upper() for month in [
+                'ENERO', 'FEBRERO', 'MARZO', 'ABRIL', 'MAYO', 'JUNIO',
+                'JULIO', 'AGOSTO', 'SEPTIEMBRE', 'OCTUBRE', 'NOVIEMBRE', 'DICIEMBRE'
+            ]):
+                return name
+
+        return sheetnames[1] if len(sheetnames) > 1 else sheetnames[0]
+
     def _parse_plant_data(
         self,
-        ws_data,
-        ws_format,
+        rows: dict[int, tuple],
+        first_col: int,
+        status_by_fill: dict[int, ProductionStatus],
         plant: str,
         item_col: int,
         ref_col: int,
         programa_col: int,
         real_col: int,
-        start_row: int,
-        end_row: int,
         source_file: str,
         source_month: str,
         fecha_inicio_col: int = None,
         fecha_fin_col: int = None,
         fecha_entrega_col: int = None,
     ) -> list[ProductionScheduleCreate]:
-        """Parse data for one plant from Excel worksheet.
+        """Parse data for one plant from the schedule rows.
 
         Args:
+            rows: Row number -> cells from column first_col onwards
+            status_by_fill: Shared fillId -> status memo (filled as colors are seen)
             fecha_inicio_col: Column for Fecha Inicio (start date)
             fecha_fin_col: Column for Fecha Fin (end date)
             fecha_entrega_col: Column for Fecha estimada entrega (delivery date)
@@ -1003,10 +1029,14 @@ class ProductionScheduleService:
 
         records = []
 
-        for row_num in range(start_row, end_row + 1):
-            ref_value = ws_data.cell(row=row_num, column=ref_col).value
-            programa_value = ws_data.cell(row=row_num, column=programa_col).value
-            real_value = ws_data.cell(row=row_num, column=real_col).value
+        for row_num, cells in rows.items():
+            def value(col: int):
+                index = col - first_col
+                return cells[index].value if index < len(cells) else None
+
+            ref_value = value(ref_col)
+            programa_value = value(programa_col)
+            real_value = value(real_col)
 
             # Skip rows without referencia or without Guatemala data
             if ref_value is None:
@@ -1030,13 +1060,15 @@ class ProductionScheduleService:
                 continue
 
             # Get item code
-            item_code = ws_data.cell(row=row_num, column=item_col).value
+            item_code = value(item_col)
             item_code_str = str(item_code) if item_code else None
 
             # Detect status from cell color
-            status = self._get_status_from_color(
-                ws_format.cell(row=row_num, column=ref_col)
-            )
+            ref_cell = cells[ref_col - first_col]
+            fill_id = ref_cell.style_array.fillId
+            status = status_by_fill.get(fill_id)
+            if status is None:
+                status = status_by_fill[fill_id] = self._get_status_from_color(ref_cell)
 
             # Parse m² values
             programa_m2 = Decimal(str(programa_value)) if programa_value else Decimal("0")
@@ -1048,21 +1080,21 @@ class ProductionScheduleService:
             estimated_delivery_date = None
 
             if fecha_inicio_col:
-                val = ws_data.cell(row=row_num, column=fecha_inicio_col).value
+                val = value(fecha_inicio_col)
                 if isinstance(val, dt):
                     scheduled_start_date = val.date()
                 elif isinstance(val, date):
                     scheduled_start_date = val
 
             if fecha_fin_col:
-                val = ws_data.cell(row=row_num, column=fecha_fin_col).value
+                val = value(fecha_fin_col)
                 if isinstance(val, dt):
                     scheduled_end_date = val.date()
                 elif isinstance(val, date):
                     scheduled_end_date = val
 
             if fecha_entrega_col:
-                val = ws_data.cell(row=row_num, column=fecha_entrega_col).value
+                val = value(fecha_entrega_col)
                 if isinstance(val, dt):
                     estimated_delivery_date = val.date()
                 elif isinstance(val, date):
@@ -1276,6 +1308,8 @@ class ProductionScheduleService:
             warnings.append(f"Failed to save history snapshot: {e}")
             logger.warning("history_snapshot_save_failed", error=str(e))
 
+        invalidate_planning_inputs("production_schedule_import")
+
         return ProductionImportResult(
             filename=filename,
             source_month=source_month,
@@ -1867,6 +1901,7 @@ class ProductionScheduleService:
                 "production_from_ob_created",
                 created=len(result.data),
             )
+            invalidate_planning_inputs("production_from_order_builder")
             return result.data
         except Exception as e:
             logger.error("production_from_ob_failed", error=str(e))
@@ -1892,6 +1927,7 @@ class ProductionScheduleService:
             "requested_m2": new_requested,
             "updated_at": datetime.now(timezone.utc).isoformat(),
         }).eq("id", row["id"]).execute()
+        invalidate_planning_inputs("piggyback_confirmed")
 
         # 3. Record in piggyback_history
         history_entry = self.db.table("piggyback_history").insert({
@@ -1973,6 +2009,8 @@ class ProductionScheduleService:
                 )
 
         logger.info("piggyback_complete", updated=updated)
+        if updated:
+            invalidate_planning_inputs("piggyback_updated")
         return updated
 
 
@@ -0,0 +1,154 @@
+"""Latest inventory snapshot reads shared by the planners.
+
+Horizon, order plan and reconciliation all need the rows of the most
+recent warehouse / factory / transit snapshot_date. get_latest_snapshots()
+fetches all three in one call through the latest_snapshots() SQL function
+(sql/2026-10-18_latest_snapshots.sql) instead of two round trips per
+table (max snapshot_date, then that date's rows).
+
+get_current_inventory() reads inventory_current_mv, a materialized copy
+of the inventory_current view, which refresh_current_inventory() updates
+after uploads and manual snapshot edits.
+
+Until the migration is applied both fall back to the direct table/view
+queries, so behavior never depends on it. Only a "does not exist" error
+switches a path off for the process; a timeout or dropped connection falls
+back for that one call.
+"""
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Columns each snapshot source returns per row (same as the direct queries)
+SNAPSHOT_TABLES = {
+    "warehouse": ("warehouse_snapshots", "product_id, warehouse_qty"),
+    "factory": (
+        "factory_snapshots",
+        "product_id, factory_available_m2, factory_existencia_m2, factory_committed_m2",
+    ),
+    "in_transit": ("transit_snapshots", "product_id, in_transit_qty"),
+}
+
+# None = not tried yet; False = migration not applied, use direct queries
+_rpc_available: Optional[bool] = None
+_mv_available: Optional[bool] = None
+
+# PostgREST / Postgres codes for a missing function, table or view
+_NOT_FOUND_CODES = {"PGRST202", "PGRST205", "42P01", "42883"}
+
+
+def _is_missing(error: Exception) -> bool:
+    """True when the error says the migration's object doesn't exist."""
+    return getattr(error, "code", None) in _NOT_FOUND_CODES
+
+
+@dataclass
+class Snapshot:
+    """Rows of one table's latest snapshot_date (rows=[] and date None if the table is empty)."""
+    snapshot_date: Optional[str] = None
+    created_at: Optional[str] = None
+    rows: list[dict] = field(default_factory=list)
+
+
+@dataclass
+class LatestSnapshots:
+    warehouse: Snapshot
+    factory: Snapshot
+    in_transit: Snapshot
+
+
+def _from_json(doc: Optional[dict]) -> Snapshot:
+    if not doc:
+        return Snapshot()
+    return Snapshot(
+        snapshot_date=doc.get("snapshot_date"),
+        created_at=doc.get("created_at"),
+        rows=doc.get("rows") or [],
+    )
+
+
+def _query_latest(db, source: str) -> Snapshot:
+    """Two-query path: latest snapshot_date, then that date's rows."""
+    table, columns = SNAPSHOT_TABLES[source]
+    head_columns = "snapshot_date, created_at" if source == "factory" else "snapshot_date"
+    latest = db.table(table).select(head_columns).order(
+        "snapshot_date", desc=True
+    ).limit(1).execute()
+    if not latest.data:
+        return Snapshot()
+
+    snapshot_date = latest.data[0]["snapshot_date"]
+    rows = db.table(table).select(columns).eq("snapshot_date", snapshot_date).execute().data or []
+    return Snapshot(
+        snapshot_date=snapshot_date,
+        created_at=latest.data[0].get("created_at"),
+        rows=rows,
+    )
+
+
+def get_latest_snapshots(db) -> LatestSnapshots:
+    """
+    Latest warehouse, factory and transit snapshot rows.
+
+    Args:
+        db: Supabase client instance
+
+    Returns:
+        LatestSnapshots; factory.created_at is the upload time of the
+        factory snapshot (used by the snapshot-aware draft cascade)
+    """
+    global _rpc_available
+    if _rpc_available is not False:
+        try:
+            doc = db.rpc("latest_snapshots", {}).execute().data or {}
+            _rpc_available = True
+            return LatestSnapshots(
+                warehouse=_from_json(doc.get("warehouse")),
+                factory=_from_json(doc.get("factory")),
+                in_transit=_from_json(doc.get("in_transit")),
+            )
+        except Exception as e:
+            if _is_missing(e):
+                _rpc_available = False
+            logger.warning("latest_snapshots_rpc_failed", error=str(e), fallback="direct_queries")
+
+    return LatestSnapshots(
+        warehouse=_query_latest(db, "warehouse"),
+        factory=_query_latest(db, "factory"),
+        in_transit=_query_latest(db, "in_transit"),
+    )
+
+
+def get_current_inventory(db, columns: str = "*") -> list[dict]:
+    """
+    Latest warehouse/factory/transit values per product (one row per product).
+
+    Reads inventory_current_mv, falling back to the inventory_current view.
+    """
+    global _mv_available
+    if _mv_available is not False:
+        try:
+            rows = db.table("inventory_current_mv").select(columns).execute().data or []
+            _mv_available = True
+            return rows
+        except Exception as e:
+            if _is_missing(e):
+                _mv_available = False
+            logger.warning("inventory_current_mv_failed", error=str(e), fallback="inventory_current")
+
+    return db.table("inventory_current").select(columns).execute().data or []
+
+
+def refresh_current_inventory(db) -> None:
+    """Refresh inventory_current_mv after snapshot tables change. Never raises."""
+    if _mv_available is False:
+        return
+    try:
+        db.rpc("refresh_inventory_current", {}).execute()
+        logger.info("inventory_current_refreshed")
+    except Exception as e:
+        logger.warning("inventory_current_refresh_failed", error=str(e))
@@ -1,13 +1,23 @@
 """
 Tracks upload file hashes to detect duplicate uploads.
+
+Successful uploads also refresh the Data Hub freshness registry and,
+for snapshot uploads, the materialized current inventory; every upload
+drops the cached planner inputs.
 """
 import structlog
 from typing import Optional
 
 from config import get_supabase_client
+from services.data_freshness_service import get_data_freshness_service
+from services.planning_inputs_service import invalidate_planning_inputs
+from services.snapshot_service import refresh_current_inventory
 
 logger = structlog.get_logger(__name__)
 
+# Uploads that write warehouse / factory / transit snapshots
+SNAPSHOT_UPLOAD_TYPES = {"inventory", "siesa", "in_transit"}
+
 
 class UploadHistoryService:
     def __init__(self):
@@ -34,7 +44,7 @@ class UploadHistoryService:
         filename: str,
         row_count: int = 0,
     ) -> None:
-        """Record a successful upload for future duplicate detection."""
+        """Record a successful upload for future duplicate detection and data freshness."""
         self.db.table(self.table).insert({
             "upload_type": upload_type,
             "file_hash": file_hash,
@@ -48,6 +58,14 @@ class UploadHistoryService:
             filename=filename,
             row_count=row_count,
         )
+        try:
+            get_data_freshness_service().record_upload(upload_type, filename, row_count)
+        except Exception as e:
+            # The upload itself succeeded; a stale Data Hub badge is not worth failing it
+            logger.warning("data_freshness_record_failed", upload_type=upload_type, error=str(e))
+        if upload_type in SNAPSHOT_UPLOAD_TYPES:
+            refresh_current_inventory(self.db)
+        invalidate_planning_inputs(f"{upload_type}_upload")
 
     def record_failed_upload(
         self,
@@ -0,0 +1,171 @@
+"""
+Disk cache for Claude Vision parse results.
+
+A re-uploaded PDF, the same attachment forwarded twice, or a preview
+followed by a confirm would otherwise pay for rasterization and a full
+Claude call again. Entries are keyed by (PDF SHA-256, prompt fingerprint,
+model): changing the prompt text or the model makes old entries
+unreachable, and they age out.
+
+One JSON file per entry holding the raw Claude response and the parsed
+result. Writes are atomic (temp file + rename) so several uvicorn
+workers can share the directory. Entries expire after
+settings.vision_cache_ttl_hours; when the directory grows past
+settings.vision_cache_max_mb, least recently used entries are evicted.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Optional
+
+import structlog
+
+from config.settings import settings
+from lib.telemetry import record_cache
+
+logger = structlog.get_logger(__name__)
+
+
+def prompt_fingerprint(*parts: Optional[str]) -> str:
+    """Short hash of the prompt text sent to Claude (system prompt, user prompt, context)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update((part or "").encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()[:16]
+
+
+class VisionCache:
+    """
+    Content-addressed, size-bounded disk cache for vision parse results.
+    """
+
+    def __init__(self, directory: str, ttl_seconds: float, max_bytes: int):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(pdf_bytes: bytes, prompt_version: str, model: str) -> str:
+        """Cache key for a PDF under a given prompt and model."""
+        pdf_hash = hashlib.sha256(pdf_bytes).hexdigest()
+        return hashlib.sha256(f"{pdf_hash}:{prompt_version}:{model}".encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str, namespace: str) -> Optional[dict]:
+        """
+        Look up an entry.
+
+        Args:
+            key: From make_key()
+            namespace: Caller label for metrics (e.g. "claude_vision")
+
+        Returns:
+            {"raw_response": str, "parsed": dict} or None on miss/expiry
+        """
+        path = self._path(key)
+        try:
+            stat = os.stat(path)
+            if time.time() - stat.st_mtime > self.ttl_seconds:
+                os.remove(path)
+                raise FileNotFoundError(path)
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            # Refresh atime for LRU eviction; mtime stays the creation time for TTL
+            os.utime(path, (time.time(), stat.st_mtime))
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            record_cache(namespace, hit=False)
+            return None
+
+        record_cache(namespace, hit=True)
+        logger.info("vision_cache_hit", namespace=namespace, key=key[:12])
+        return entry
+
+    def put(self, key: str, raw_response: str, parsed: Any) -> None:
+        """
+        Store an entry, then evict down to the size budget.
+
+        Args:
+            key: From make_key()
+            raw_response: Claude's response text
+            parsed: JSON-serializable parse result (model_dump(mode="json"))
+        """
+        payload = json.dumps({"raw_response": raw_response, "parsed": parsed})
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp_path, self._path(key))
+            tmp_path = None
+            self._evict()
+        except OSError as e:
+            logger.warning("vision_cache_write_failed", key=key[:12], error=str(e))
+            if tmp_path is not None:
+                self._remove(tmp_path)
+
+    def delete(self, key: str) -> None:
+        """Drop an entry (e.g. one the caller can no longer read)."""
+        self._remove(self._path(key))
+
+    def _evict(self) -> None:
+        """Drop expired entries, then least recently used ones until under max_bytes."""
+        with self._lock:
+            now = time.time()
+            entries = []
+            total = 0
+            for item in os.scandir(self.directory):
+                if not item.name.endswith(".json"):
+                    continue
+                try:
+                    stat = item.stat()
+                except FileNotFoundError:
+                    continue
+                if now - stat.st_mtime > self.ttl_seconds:
+                    self._remove(item.path)
+                    continue
+                entries.append((stat.st_atime, stat.st_size, item.path))
+                total += stat.st_size
+
+            if total <= self.max_bytes:
+                return
+
+            evicted = 0
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+                evicted += 1
+            logger.info("vision_cache_evicted", count=evicted, remaining_bytes=total)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+# Singleton instance
+_vision_cache: Optional[VisionCache] = None
+
+
+def get_vision_cache() -> VisionCache:
+    """Get or create VisionCache instance."""
+    global _vision_cache
+    if _vision_cache is None:
+        _vision_cache = VisionCache(
+            directory=settings.vision_cache_dir,
+            ttl_seconds=settings.vision_cache_ttl_hours * 3600,
+            max_bytes=settings.vision_cache_max_mb * 1024 * 1024,
+        )
+    return _vision_cache
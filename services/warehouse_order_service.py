@@ -18,6 +18,7 @@ import structlog
 from config import get_supabase_client
 from config.shipping import M2_PER_PALLET, CONTAINER_MAX_PALLETS, WAREHOUSE_BUFFER_DAYS
 from exceptions import DatabaseError, WarehouseOrderNotFoundError
+from utils.db_batch import group_by, select_in
 from models.warehouse_order import (
     WarehouseOrderCreate,
     WarehouseOrderUpdate,
@@ -96,18 +97,11 @@ class WarehouseOrderService:
 
             result = query.execute()
 
-            orders = []
-            for row in result.data:
-                # Get item count
-                items_result = (
-                    self.db.table(self.items_table)
-                    .select("id", count="exact")
-                    .eq("warehouse_order_id", row["id"])
-                    .execute()
-                )
-                item_count = items_result.count or 0
-
-                orders.append(self._row_to_response(row, item_count=item_count))
+            item_counts = self._count_items([row["id"] for row in result.data])
+            orders = [
+                self._row_to_response(row, item_count=item_counts.get(row["id"], 0))
+                for row in result.data
+            ]
 
             total = result.count or 0
 
@@ -212,18 +206,11 @@ class WarehouseOrderService:
 
             result = query.execute()
 
-            orders = []
-            for row in result.data:
-                items_result = (
-                    self.db.table(self.items_table)
-                    .select("id", count="exact")
-                    .eq("warehouse_order_id", row["id"])
-                    .execute()
-                )
-                item_count = items_result.count or 0
-                orders.append(self._row_to_response(row, item_count=item_count))
-
-            return orders
+            item_counts = self._count_items([row["id"] for row in result.data])
+            return [
+                self._row_to_response(row, item_count=item_counts.get(row["id"], 0))
+                for row in result.data
+            ]
 
         except Exception as e:
             logger.error(
@@ -307,16 +294,11 @@ class WarehouseOrderService:
             order_boat_map = {row["id"]: row["boat_id"] for row in orders_result.data}
 
             # Get all items for pending orders
-            items_result = (
-                self.db.table(self.items_table)
-                .select("*")
-                .in_("warehouse_order_id", order_ids)
-                .execute()
-            )
+            items = self._load_items(order_ids)
 
             # Group by SKU
             sku_data: dict[str, dict] = {}
-            for item in items_result.data:
+            for item in items:
                 sku = item["sku"]
                 if sku not in sku_data:
                     sku_data[sku] = {
@@ -408,16 +390,11 @@ class WarehouseOrderService:
             }
 
             # Get all items for pending orders
-            items_result = (
-                self.db.table(self.items_table)
-                .select("*")
-                .in_("warehouse_order_id", order_ids)
-                .execute()
-            )
+            items = self._load_items(order_ids)
 
             # Group by SKU with full details
             by_sku: dict[str, dict] = {}
-            for item in items_result.data:
+            for item in items:
                 sku = item["sku"]
                 order_id = item["warehouse_order_id"]
                 order_info = order_info_map.get(order_id, {})
@@ -777,6 +754,30 @@ class WarehouseOrderService:
             logger.error("get_pending_m2_for_sku_failed", sku=sku, error=str(e))
             return Decimal("0")
 
+    def _load_items(self, order_ids: list[str], columns: str = "*") -> list[dict]:
+        """
+        Load items for many orders in batched in_ queries.
+
+        Args:
+            order_ids: Warehouse order UUIDs
+            columns: Columns to select (must include warehouse_order_id
+                     when the caller groups by order)
+
+        Returns:
+            Item rows for all given orders
+        """
+        return select_in(
+            self.db, self.items_table, "warehouse_order_id", order_ids, columns=columns
+        )
+
+    def _count_items(self, order_ids: list[str]) -> dict[str, int]:
+        """Item count per order id, from one batched lookup instead of one count per order."""
+        rows = self._load_items(order_ids, columns="warehouse_order_id")
+        return {
+            order_id: len(items)
+            for order_id, items in group_by(rows, "warehouse_order_id").items()
+        }
+
     def _row_to_response(
         self, row: dict, item_count: Optional[int] = None
     ) -> WarehouseOrderResponse:
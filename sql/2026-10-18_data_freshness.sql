@@ -0,0 +1,34 @@
+-- Data freshness registry for the Data Hub
+-- One row per data source, upserted by the upload confirm endpoints
+-- (UploadHistoryService.record_upload) so GET /api/data-freshness reads
+-- this table instead of counting sales and snapshot tables on every load.
+
+CREATE TABLE IF NOT EXISTS data_freshness (
+    source TEXT PRIMARY KEY,              -- sales, inventory, siesa, in_transit, boats, production
+    upload_type TEXT NOT NULL,            -- upload_history.upload_type of the last upload
+    last_uploaded_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    row_count INT NOT NULL DEFAULT 0,     -- rows written by the last upload
+    source_file TEXT                      -- filename of the last upload
+);
+
+-- Seed from the latest successful upload per source
+INSERT INTO data_freshness (source, upload_type, last_uploaded_at, row_count, source_file)
+SELECT DISTINCT ON (source) source, upload_type, uploaded_at, row_count, filename
+FROM (
+    SELECT
+        CASE upload_type
+            WHEN 'sales' THEN 'sales'
+            WHEN 'sac_sales' THEN 'sales'
+            WHEN 'inventory' THEN 'inventory'
+            WHEN 'siesa' THEN 'siesa'
+            WHEN 'in_transit' THEN 'in_transit'
+            WHEN 'boats' THEN 'boats'
+            WHEN 'production_schedule' THEN 'production'
+        END AS source,
+        upload_type, uploaded_at, row_count, filename
+    FROM upload_history
+    WHERE status = 'success'
+) uploads
+WHERE source IS NOT NULL
+ORDER BY source, uploaded_at DESC
+ON CONFLICT (source) DO NOTHING;
@@ -0,0 +1,108 @@
+-- Latest-snapshot reads in one call
+-- Used by services/snapshot_service.py (horizon, order plan, reconciliation,
+-- InventoryService.get_latest, MetricsService). Each planner used to make two
+-- round trips per snapshot table: max(snapshot_date), then that date's rows.
+
+-- ===================
+-- INDEXES
+-- ===================
+CREATE INDEX IF NOT EXISTS idx_warehouse_snapshots_date ON warehouse_snapshots(snapshot_date DESC);
+CREATE INDEX IF NOT EXISTS idx_factory_snapshots_date ON factory_snapshots(snapshot_date DESC);
+CREATE INDEX IF NOT EXISTS idx_transit_snapshots_date ON transit_snapshots(snapshot_date DESC);
+
+-- ===================
+-- LATEST SNAPSHOTS
+-- ===================
+-- Rows of the most recent snapshot_date of each snapshot table, as one jsonb
+-- document (no PostgREST max-rows cap on a scalar result):
+--   {"warehouse":  {"snapshot_date", "rows": [{product_id, warehouse_qty}]},
+--    "factory":    {"snapshot_date", "created_at", "rows": [{product_id, factory_available_m2,
+--                                                             factory_existencia_m2, factory_committed_m2}]},
+--    "in_transit": {"snapshot_date", "rows": [{product_id, in_transit_qty}]}}
+-- A table with no snapshots maps to null.
+CREATE OR REPLACE FUNCTION latest_snapshots()
+RETURNS jsonb AS $$
+    SELECT jsonb_build_object(
+        'warehouse', (
+            SELECT jsonb_build_object(
+                'snapshot_date', d.snapshot_date,
+                'rows', COALESCE((
+                    SELECT jsonb_agg(jsonb_build_object(
+                        'product_id', w.product_id,
+                        'warehouse_qty', w.warehouse_qty
+                    ))
+                    FROM warehouse_snapshots w
+                    WHERE w.snapshot_date = d.snapshot_date
+                ), '[]'::jsonb)
+            )
+            FROM (
+                SELECT snapshot_date FROM warehouse_snapshots
+                ORDER BY snapshot_date DESC LIMIT 1
+            ) d
+        ),
+        'factory', (
+            SELECT jsonb_build_object(
+                'snapshot_date', d.snapshot_date,
+                'created_at', d.created_at,
+                'rows', COALESCE((
+                    SELECT jsonb_agg(jsonb_build_object(
+                        'product_id', f.product_id,
+                        'factory_available_m2', f.factory_available_m2,
+                        'factory_existencia_m2', f.factory_existencia_m2,
+                        'factory_committed_m2', f.factory_committed_m2
+                    ))
+                    FROM factory_snapshots f
+                    WHERE f.snapshot_date = d.snapshot_date
+                ), '[]'::jsonb)
+            )
+            FROM (
+                SELECT snapshot_date, created_at FROM factory_snapshots
+                ORDER BY snapshot_date DESC LIMIT 1
+            ) d
+        ),
+        'in_transit', (
+            SELECT jsonb_build_object(
+                'snapshot_date', d.snapshot_date,
+                'rows', COALESCE((
+                    SELECT jsonb_agg(jsonb_build_object(
+                        'product_id', t.product_id,
+                        'in_transit_qty', t.in_transit_qty
+                    ))
+                    FROM transit_snapshots t
+                    WHERE t.snapshot_date = d.snapshot_date
+                ), '[]'::jsonb)
+            )
+            FROM (
+                SELECT snapshot_date FROM transit_snapshots
+                ORDER BY snapshot_date DESC LIMIT 1
+            ) d
+        )
+    );
+$$ LANGUAGE sql STABLE;
+
+-- ===================
+-- CURRENT INVENTORY (materialized)
+-- ===================
+-- inventory_current composes the latest warehouse/factory/transit value per
+-- product on every read. The materialized copy is refreshed by the upload
+-- confirm endpoints (refresh_inventory_current) after new snapshots land.
+CREATE MATERIALIZED VIEW IF NOT EXISTS inventory_current_mv AS
+SELECT * FROM inventory_current;
+
+-- Required for REFRESH ... CONCURRENTLY (readers are never blocked)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_inventory_current_mv_product
+    ON inventory_current_mv(product_id);
+
+CREATE OR REPLACE FUNCTION refresh_inventory_current()
+RETURNS void AS $$
+BEGIN
+    REFRESH MATERIALIZED VIEW CONCURRENTLY inventory_current_mv;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Runs as the owner: only the backend may trigger refreshes
+REVOKE EXECUTE ON FUNCTION refresh_inventory_current() FROM PUBLIC, anon;
+
+GRANT SELECT ON inventory_current_mv TO anon, authenticated, service_role;
+GRANT EXECUTE ON FUNCTION latest_snapshots() TO anon, authenticated, service_role;
+GRANT EXECUTE ON FUNCTION refresh_inventory_current() TO authenticated, service_role;
@@ -18,6 +18,8 @@ from models.boat_schedule import (
     RouteType,
 )
 from exceptions import BoatScheduleNotFoundError, DatabaseError
+from services import planning_inputs_service
+from parsers.tiba_parser import BoatScheduleRecord
 
 
 # ===================
@@ -63,6 +65,15 @@ def sample_schedule_data():
     }
 
 
+@pytest.fixture
+def planning_bundle():
+    """A cached planner bundle, dropped again after the test."""
+    with patch.object(planning_inputs_service, "get_supabase_client", return_value=MagicMock()):
+        bundle = planning_inputs_service.get_planning_inputs()
+        yield bundle
+    planning_inputs_service.invalidate_planning_inputs()
+
+
 @pytest.fixture
 def future_departure():
     """A future departure date."""
@@ -257,6 +268,19 @@ class TestUpdate:
         assert schedule.id == "schedule-uuid-123"
         mock_supabase.table.return_value.update.assert_called_once()
 
+    def test_update_drops_planner_inputs(self, boat_service, mock_supabase, sample_schedule_data, planning_bundle):
+        """A moved boat is visible to the Planning View and order plan right away."""
+        mock_supabase.table.return_value.select.return_value.eq.return_value.single.return_value.execute.return_value = MagicMock(
+            data=sample_schedule_data
+        )
+        mock_supabase.table.return_value.update.return_value.eq.return_value.execute.return_value = MagicMock(
+            data=[sample_schedule_data]
+        )
+
+        boat_service.update("schedule-uuid-123", BoatScheduleUpdate(arrival_date=date(2026, 1, 30)))
+
+        assert planning_inputs_service.get_planning_inputs() is not planning_bundle
+
     def test_update_not_found_raises_error(self, boat_service, mock_supabase):
         """update raises error when schedule not found."""
         mock_supabase.table.return_value.select.return_value.eq.return_value.single.return_value.execute.side_effect = Exception("0 rows")
@@ -325,6 +349,16 @@ class TestDelete:
 
         assert result is True
 
+    def test_delete_drops_planner_inputs(self, boat_service, mock_supabase, sample_schedule_data, planning_bundle):
+        """delete invalidates the shared planner inputs."""
+        mock_supabase.table.return_value.select.return_value.eq.return_value.single.return_value.execute.return_value = MagicMock(
+            data=sample_schedule_data
+        )
+
+        boat_service.delete("schedule-uuid-123")
+
+        assert planning_inputs_service.get_planning_inputs() is not planning_bundle
+
     def test_delete_not_found_raises_error(self, boat_service, mock_supabase):
         """delete raises error when schedule not found."""
         mock_supabase.table.return_value.select.return_value.eq.return_value.single.return_value.execute.side_effect = Exception("0 rows")
@@ -333,6 +367,112 @@ class TestDelete:
             boat_service.delete("nonexistent-uuid")
 
 
+# ===================
+# IMPORT MERGE TESTS
+# ===================
+
+def _record(vessel: str, departure: str, transit_days: int = 9) -> BoatScheduleRecord:
+    dep = date.fromisoformat(departure)
+    return BoatScheduleRecord(
+        departure_date=dep,
+        arrival_date=dep + timedelta(days=transit_days),
+        transit_days=transit_days,
+        booking_deadline=dep - timedelta(days=3),
+        vessel_name=vessel,
+        route_type="direct",
+    )
+
+
+def _existing(boat_id: str, vessel: str, departure: str, status: str = "available") -> dict:
+    dep = date.fromisoformat(departure)
+    return {
+        "id": boat_id,
+        "vessel_name": vessel,
+        "departure_date": departure,
+        "arrival_date": (dep + timedelta(days=9)).isoformat(),
+        "transit_days": 9,
+        "shipping_line": None,
+        "route_type": "direct",
+        "status": status,
+    }
+
+
+class TestPlanMerge:
+    """Tests for plan_merge() / _wipe_and_replace()"""
+
+    @pytest.fixture
+    def existing(self):
+        return [
+            _existing("b-same", "ALPHA", "2026-03-01"),
+            _existing("b-moved", "BETA", "2026-03-08"),
+            _existing("b-orphan", "GAMMA", "2026-03-15"),
+            _existing("b-drafts", "DELTA", "2026-03-22"),
+            _existing("b-sticky", "EPSILON", "2026-03-29", status="ordered"),
+        ]
+
+    def _plan(self, boat_service, existing, records):
+        def fake_select_in(db, table, column, values, columns="*"):
+            assert set(values) == {"b-orphan", "b-drafts"}
+            return [{"boat_id": "b-drafts"}] if table == "boat_factory_drafts" else []
+
+        with patch.object(boat_service, "_get_all_sorted", return_value=existing), \
+             patch("services.boat_schedule_service.select_in", side_effect=fake_select_in) as spy:
+            plan = boat_service.plan_merge(records)
+        return plan, spy
+
+    def test_plan_classifies_every_boat(self, boat_service, existing):
+        """Should compute update/insert/skip/delete/keep without writing."""
+        records = [
+            _record("ALPHA", "2026-03-01"),
+            _record("BETA", "2026-03-08", transit_days=12),
+            _record("ZETA", "2026-04-05"),
+        ]
+
+        plan, spy = self._plan(boat_service, existing, records)
+
+        assert [a for _, a in plan.record_actions] == ["skip", "update", "new"]
+        assert list(plan.updates) == ["b-moved"]
+        assert [r.vessel_name for r in plan.inserts] == ["ZETA"]
+        assert [b["id"] for b in plan.deletes] == ["b-orphan"]
+        assert {(b["id"], reason) for b, reason in plan.kept} == {
+            ("b-sticky", "sticky_status"),
+            ("b-drafts", "has_drafts"),
+        }
+        # Membership for all orphans in two queries, not two per orphan
+        assert spy.call_count == 2
+
+    def test_apply_uses_bulk_statements(self, boat_service, mock_supabase, existing):
+        """Should apply the plan with one upsert, one insert and one cascade."""
+        records = [
+            _record("BETA", "2026-03-08", transit_days=12),
+            _record("ZETA", "2026-04-05"),
+        ]
+
+        with patch.object(boat_service, "_get_all_sorted", return_value=existing), \
+             patch("services.boat_schedule_service.select_in", return_value=[]):
+            result = boat_service.import_from_records(records, "tiba.xlsx")
+
+        table = mock_supabase.table.return_value
+        upserted = table.upsert.call_args.args[0]
+        assert [row["id"] for row in upserted] == ["b-moved"]
+        assert upserted[0]["transit_days"] == 12
+        table.insert.assert_called_once()
+        assert result.updated == 1
+        assert result.imported == 1
+        assert result.deleted == 3  # ALPHA, GAMMA, DELTA — sticky EPSILON kept
+        assert result.kept == 1
+
+    def test_sticky_status_preserved_on_update(self, boat_service):
+        """Update rows should carry over sticky statuses."""
+        row = boat_service._record_to_row(
+            _record("EPSILON", "2026-03-29"),
+            "tiba.xlsx",
+            existing=_existing("b-sticky", "EPSILON", "2026-03-29", status="ordered"),
+        )
+
+        assert row["status"] == "ordered"
+
+
 # ===================
 # SINGLETON TESTS
 # ===================
@@ -0,0 +1,103 @@
+"""
+Unit tests for resuming the brain from a previous run.
+
+Run: pytest tests/unit/test_brain_resume.py -v
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+from lib.brain import compute_horizon, resume_horizon, run_horizon
+from routes import horizon
+from tests.unit.test_horizon_scenarios import TODAY, inputs  # noqa: F401  (fixture)
+
+
+def with_draft(inputs, boat_id, pallets_by_product):
+    """Inputs after the Order Builder saves a draft for one boat."""
+    return {
+        **inputs,
+        "drafts": [d for d in inputs["drafts"] if d["boat_id"] != boat_id] + [
+            {"boat_id": boat_id, "product_id": pid, "selected_pallets": pallets,
+             "status": "drafting", "draft_id": f"d-{boat_id}"}
+            for pid, pallets in pallets_by_product.items()
+        ],
+        "draft_headers": [h for h in inputs["draft_headers"] if h["boat_id"] != boat_id] + [
+            {"boat_id": boat_id, "status": "drafting", "draft_id": f"d-{boat_id}", "ordered_at": None},
+        ],
+    }
+
+
+# ===================
+# RESUME TESTS
+# ===================
+
+class TestResumeHorizon:
+    """Tests for run_horizon() / resume_horizon()"""
+
+    def test_run_matches_compute_horizon(self, inputs):
+        run = run_horizon(**inputs, today=TODAY)
+
+        assert run.result == compute_horizon(**inputs, today=TODAY)
+        assert len(run.checkpoints) == len(inputs["boats"]) + 1
+        assert run.checkpoints[0] == run.ctx.initial_state
+
+    def test_draft_save_resumes_at_edited_boat(self, inputs):
+        previous = run_horizon(**inputs, today=TODAY)
+        before = previous.checkpoints[2].copy()
+        edited = with_draft(inputs, "b2", {"p0": 8, "p3": 2})
+
+        run = resume_horizon(previous, **edited, today=TODAY)
+
+        assert run.resumed_at_boat == 2
+        assert run.boat_results[:2] == previous.boat_results[:2]
+        assert run.result == compute_horizon(**edited, today=TODAY)
+        # The previous run's checkpoints are left as they were
+        assert previous.checkpoints[2] == before
+
+    def test_chained_edits(self, inputs):
+        run = run_horizon(**inputs, today=TODAY)
+        for boat_id, pallets in (("b3", {"p1": 4}), ("b1", {"p5": 0}), ("b3", {"p1": 9})):
+            inputs = with_draft(inputs, boat_id, pallets)
+            run = resume_horizon(run, **inputs, today=TODAY)
+
+        assert run.resumed_at_boat == 3
+        assert run.result == compute_horizon(**inputs, today=TODAY)
+
+    def test_product_level_change_recomputes_all(self, inputs):
+        previous = run_horizon(**inputs, today=TODAY)
+        changed = {**inputs, "velocities": {**inputs["velocities"], "p0": Decimal(90)}}
+
+        run = resume_horizon(previous, **changed, today=TODAY)
+
+        assert run.resumed_at_boat == 0
+        assert run.result == compute_horizon(**changed, today=TODAY)
+
+
+class TestComputeHorizonRoute:
+    """Tests for routes.horizon._compute_horizon()"""
+
+    def test_resumes_per_factory(self, inputs, monkeypatch):
+        monkeypatch.setattr(horizon, "_last_runs", {})
+
+        horizon._compute_horizon("f1", inputs, TODAY)
+        horizon._compute_horizon("f2", inputs, TODAY)
+        result = horizon._compute_horizon("f1", with_draft(inputs, "b3", {"p2": 6}), TODAY)
+
+        assert horizon._last_runs["f1"].resumed_at_boat == 3
+        assert horizon._last_runs["f2"].resumed_at_boat == 0
+        assert result == compute_horizon(**with_draft(inputs, "b3", {"p2": 6}), today=TODAY)
+
+    def test_keeps_recent_factories_of_today(self, inputs, monkeypatch):
+        """Only the most recently used factories are kept, and only for the day they ran."""
+        monkeypatch.setattr(horizon, "_last_runs", {})
+
+        with patch.object(horizon.settings, "horizon_resume_factories", 2):
+            for factory_id in ("f1", "f2", "f1", "unknown"):
+                horizon._compute_horizon(factory_id, inputs, TODAY)
+            assert list(horizon._last_runs) == ["f1", "unknown"]
+
+            horizon._compute_horizon("f2", inputs, TODAY + timedelta(days=1))
+
+        assert list(horizon._last_runs) == ["f2"]
+        assert horizon._last_runs["f2"].resumed_at_boat == 0
@@ -0,0 +1,79 @@
+"""
+Unit tests for the data freshness registry and endpoint.
+
+Run: pytest tests/unit/test_data_freshness_service.py -v
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from routes import data_freshness
+from services.data_freshness_service import DataFreshnessService
+
+
+# ===================
+# FIXTURES
+# ===================
+
+@pytest.fixture
+def service():
+    with patch("services.data_freshness_service.get_supabase_client", return_value=MagicMock()):
+        yield DataFreshnessService()
+
+
+# ===================
+# REGISTRY TESTS
+# ===================
+
+class TestRecordUpload:
+    """Tests for DataFreshnessService.record_upload()"""
+
+    def test_maps_upload_type_to_source(self, service):
+        service.record_upload("sac_sales", "ventas.csv", 120)
+
+        row = service.db.table.return_value.upsert.call_args.args[0]
+        assert row["source"] == "sales"
+        assert row["upload_type"] == "sac_sales"
+        assert row["row_count"] == 120
+        assert row["source_file"] == "ventas.csv"
+        assert service.db.table.return_value.upsert.call_args.kwargs == {"on_conflict": "source"}
+
+    def test_ignores_untracked_upload_types(self, service):
+        service.record_upload("shipment_pdf", "bl.pdf", 1)
+
+        service.db.table.assert_not_called()
+
+
+# ===================
+# ENDPOINT TESTS
+# ===================
+
+class TestGetDataFreshness:
+    """Tests for GET /api/data-freshness"""
+
+    def test_answers_from_registry_and_probes_missing_sources(self):
+        """Should read the registry once and only probe sources it doesn't have, without counting."""
+        now = datetime.now(timezone.utc).isoformat()
+        registry = MagicMock()
+        registry.get_all.return_value = {
+            source: {"source": source, "last_uploaded_at": now, "row_count": 10, "source_file": f"{source}.xlsx"}
+            for source in ("sales", "inventory", "siesa", "in_transit", "boats")
+        }
+        db = MagicMock()
+
+        with patch.object(data_freshness, "get_data_freshness_service", return_value=registry), \
+             patch.object(data_freshness, "get_supabase_client", return_value=db), \
+             patch.object(data_freshness, "_latest_from_table", return_value=(None, None)) as probe:
+            result = asyncio.run(data_freshness.get_data_freshness())
+
+        assert result["sales"] == {
+            "last_updated": datetime.fromisoformat(now).isoformat(),
+            "status": "fresh",
+            "record_count": 10,
+            "source_file": "sales.xlsx",
+        }
+        assert result["production"] == {"last_updated": None, "status": "very_stale"}
+        probe.assert_called_once_with(db, "production_schedule", "updated_at", count=False)
@@ -0,0 +1,108 @@
+"""
+Unit tests for config.database: async access helpers and client pooling.
+
+Run: pytest tests/unit/test_database.py -v
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import config.database as database
+from config.database import run_db, execute_async
+
+
+request_tag: contextvars.ContextVar[str] = contextvars.ContextVar("request_tag", default="")
+
+
+class TestRunDb:
+    """Tests for run_db() / execute_async()"""
+
+    def test_runs_off_event_loop_thread(self):
+        """Should execute the callable on a worker thread."""
+        async def scenario():
+            return threading.get_ident(), await run_db(threading.get_ident)
+
+        loop_thread, worker_thread = asyncio.run(scenario())
+
+        assert loop_thread != worker_thread
+
+    def test_passes_args_and_returns_result(self):
+        """Should forward args/kwargs and return the result."""
+        result = asyncio.run(run_db(lambda a, b=0: a + b, 2, b=3))
+
+        assert result == 5
+
+    def test_propagates_contextvars(self):
+        """Should carry the caller's contextvars into the worker thread."""
+        async def scenario():
+            request_tag.set("req-1")
+            return await run_db(request_tag.get)
+
+        assert asyncio.run(scenario()) == "req-1"
+
+    def test_concurrent_calls_overlap(self):
+        """Blocking calls awaited concurrently should run in parallel."""
+        async def scenario():
+            start = time.perf_counter()
+            await asyncio.gather(*(run_db(time.sleep, 0.1) for _ in range(4)))
+            return time.perf_counter() - start
+
+        assert asyncio.run(scenario()) < 0.3
+
+    def test_execute_async_calls_execute(self):
+        """Should call the query builder's execute() and return its response."""
+        query = MagicMock()
+        query.execute.return_value = "response"
+
+        assert asyncio.run(execute_async(query)) == "response"
+        query.execute.assert_called_once_with()
+
+
+class TestAdminClient:
+    """Tests for get_admin_client() / get_pool_stats()"""
+
+    @pytest.fixture(autouse=True)
+    def reset(self):
+        database.reset_connection()
+        yield
+        database.reset_connection()
+
+    def test_returns_none_without_service_key(self):
+        """Should return None when SUPABASE_SERVICE_KEY is not set."""
+        with patch.object(database.settings, "supabase_service_key", None):
+            assert database.get_admin_client() is None
+
+    def test_is_cached_singleton(self):
+        """Should build the admin client once and reuse it."""
+        with patch.object(database.settings, "supabase_service_key", "service-key"), \
+             patch("config.database.create_client") as mock_create:
+            first = database.get_admin_client()
+            second = database.get_admin_client()
+
+        assert first is second
+        mock_create.assert_called_once()
+
+    def test_postgrest_and_storage_share_pooled_client(self):
+        """PostgREST and storage should reuse the same pooled httpx client."""
+        with patch.object(database.settings, "supabase_service_key", "service-key"):
+            client = database.get_admin_client()
+
+        pooled = database._http_clients["admin"]
+        assert client.postgrest.session is pooled
+        assert client.storage.session is pooled
+
+    def test_pool_stats_reports_limits(self):
+        """Should expose pool limits and connection counts per client."""
+        with patch.object(database.settings, "supabase_service_key", "service-key"):
+            database.get_admin_client()
+
+        stats = database.get_pool_stats()["admin"]
+
+        assert stats["max_connections"] == database.settings.supabase_pool_max_connections
+        assert stats["open_connections"] == 0
+        assert stats["requests_total"] == 0
@@ -0,0 +1,89 @@
+"""
+Unit tests for batched Supabase reads.
+
+Run: pytest tests/unit/test_db_batch.py -v
+"""
+
+import random
+
+from utils.db_batch import MAX_ROWS_PER_PAGE, select_in
+
+
+# ===================
+# FIXTURES
+# ===================
+
+class FakeQuery:
+    """PostgREST query over in-memory rows; without ORDER BY every request sees a new row order."""
+
+    def __init__(self, rows: list[dict], requests: list):
+        self.rows = rows
+        self.requests = requests
+        self.orders: list[str] = []
+
+    def select(self, columns):
+        return self
+
+    def in_(self, column, values):
+        self.rows = [r for r in self.rows if r[column] in values]
+        return self
+
+    def order(self, column):
+        self.orders.append(column)
+        return self
+
+    def range(self, start, end):
+        self.start, self.end = start, end
+        return self
+
+    def execute(self):
+        self.requests.append(list(self.orders))
+        rows = list(self.rows)
+        if self.orders:
+            rows.sort(key=lambda r: tuple(r[c] for c in self.orders))
+        else:
+            random.shuffle(rows)
+        return type("Result", (), {"data": rows[self.start:self.end + 1]})()
+
+
+class FakeDb:
+    def __init__(self, rows: list[dict]):
+        self.data = rows
+        self.requests: list[list[str]] = []
+
+    def table(self, name):
+        return FakeQuery(self.data, self.requests)
+
+
+# ===================
+# SELECT_IN TESTS
+# ===================
+
+class TestSelectIn:
+    """Tests for select_in()"""
+
+    def test_pages_past_max_rows_without_duplicates(self):
+        """2,500 items of two orders: three pages, every row exactly once."""
+        rows = [{"id": f"i{n:05d}", "order_id": f"o{n % 2}"} for n in range(2500)]
+        db = FakeDb(rows)
+
+        result = select_in(db, "items", "order_id", ["o0", "o1"])
+
+        assert len(db.requests) == 3
+        assert all(orders == ["id"] for orders in db.requests)
+        assert sorted(r["id"] for r in result) == [r["id"] for r in rows]
+
+    def test_id_breaks_ties_of_custom_order(self):
+        rows = [{"id": f"i{n:05d}", "order_id": "o1", "line": n % 3} for n in range(MAX_ROWS_PER_PAGE + 10)]
+        db = FakeDb(rows)
+
+        result = select_in(db, "items", "order_id", ["o1"], order="line")
+
+        assert db.requests[0] == ["line", "id"]
+        assert len({r["id"] for r in result}) == len(rows)
+
+    def test_nothing_to_look_up(self):
+        db = FakeDb([])
+
+        assert select_in(db, "items", "order_id", [None]) == []
+        assert db.requests == []
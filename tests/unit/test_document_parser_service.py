@@ -7,7 +7,7 @@ Run: pytest tests/unit/test_document_parser_service.py -v
 import pytest
 from unittest.mock import patch, MagicMock
 
-from services.document_parser_service import DocumentParserService, get_parser_service
+from services.document_parser_service import DocumentParserService, get_parser_service, shutdown_page_pool
 from models.ingest import ParsedFieldConfidence
 
 
@@ -477,4 +477,91 @@ class TestGetParserService:
         """Should return DocumentParserService instance."""
         service = get_parser_service()
 
-        assert isinstance(service, DocumentParserService)
\ No newline at end of file
+        assert isinstance(service, DocumentParserService)
+
+def _make_pdf(pages: list[str]) -> bytes:
+    """Build a native-text PDF with one block of text per page."""
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.set_font("helvetica", size=10)
+    for text in pages:
+        pdf.add_page()
+        pdf.multi_cell(0, 5, text)
+    return bytes(pdf.output())
+
+
+class TestPageParallelExtraction:
+    """Tests for DocumentParserService._extract_with_pdfplumber() page extraction."""
+
+    PAGES = [
+        "HOUSE BILL OF LADING\nB/L No.: SHP0045642\nVESSEL: HANSA SIEGBURG\n",
+        "Container TCLU1234567 20GP\n",
+        "Container MSCU7654321 40HC\n",
+        "Terms and conditions page\n",
+        "Container OOLU0352586 20GP\n",
+    ]
+
+    def test_pool_matches_sequential_text(self):
+        """Should join pages in order, identical to a sequential read."""
+        service = DocumentParserService()
+        pdf_bytes = _make_pdf(self.PAGES)
+
+        with patch("services.document_parser_service.settings") as mock_settings:
+            mock_settings.pdf_extract_workers = 0
+            mock_settings.pdf_parallel_min_pages = 2
+            sequential = service._extract_with_pdfplumber(pdf_bytes)
+
+            mock_settings.pdf_extract_workers = 2
+            try:
+                pooled = service._extract_with_pdfplumber(pdf_bytes)
+            finally:
+                shutdown_page_pool()
+
+        assert pooled == sequential
+        assert "OOLU0352586" in pooled
+
+    def test_early_exit_stops_after_required_fields(self):
+        """Should stop reading pages once the HBL's required fields are found."""
+        service = DocumentParserService()
+        pdf_bytes = _make_pdf(self.PAGES)
+
+        with patch("services.document_parser_service.settings") as mock_settings:
+            mock_settings.pdf_extract_workers = 0
+            mock_settings.pdf_parallel_min_pages = 2
+            text = service._extract_with_pdfplumber(pdf_bytes, stop_when=service._has_required_fields)
+
+        assert "TCLU1234567" in text
+        assert "OOLU0352586" not in text
+
+    def test_inline_opens_pdf_once(self):
+        """Should read every inline page from one open document, with or without early exit."""
+        import pdfplumber
+
+        service = DocumentParserService()
+        pdf_bytes = _make_pdf(self.PAGES)
+
+        with patch("services.document_parser_service.settings") as mock_settings, \
+             patch("utils.pdf_pages.pdfplumber.open", wraps=pdfplumber.open) as pdf_open:
+            mock_settings.pdf_extract_workers = 0
+            all_pages, _ = service._extract_pages(pdf_bytes, len(self.PAGES), None)
+            some_pages, _ = service._extract_pages(pdf_bytes, len(self.PAGES), service._has_required_fields)
+
+        assert pdf_open.call_count == 2
+        assert [index for index, _, _ in all_pages] == [0, 1, 2, 3, 4]
+        assert 0 < len(some_pages) < len(all_pages)
+
+    def test_pool_failure_falls_back_inline(self):
+        """Should extract inline if the process pool breaks."""
+        service = DocumentParserService()
+        pdf_bytes = _make_pdf(self.PAGES)
+        broken = MagicMock()
+        broken.submit.side_effect = RuntimeError("pool broken")
+
+        with patch("services.document_parser_service.settings") as mock_settings, \
+             patch("services.document_parser_service.get_page_pool", return_value=broken):
+            mock_settings.pdf_extract_workers = 2
+            mock_settings.pdf_parallel_min_pages = 2
+            text = service._extract_with_pdfplumber(pdf_bytes)
+
+        assert "OOLU0352586" in text
@@ -0,0 +1,181 @@
+"""
+Unit tests for DraftService.
+
+Run: pytest tests/unit/test_draft_service.py -v
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from services.draft_service import DraftService
+
+
+# ===================
+# FIXTURES
+# ===================
+
+@pytest.fixture
+def mock_supabase():
+    """Mock Supabase client."""
+    with patch("services.draft_service.get_supabase_client") as mock:
+        client = MagicMock()
+        mock.return_value = client
+        yield client
+
+
+@pytest.fixture
+def draft_service(mock_supabase):
+    return DraftService()
+
+
+def _tables(mock_supabase) -> list[str]:
+    return [c.args[0] for c in mock_supabase.table.call_args_list]
+
+
+# ===================
+# LOADING TESTS
+# ===================
+
+class TestBulkLoading:
+    """Tests for list_drafts_for_boat() / get_draft()"""
+
+    def test_list_embeds_items_in_one_query(self, draft_service, mock_supabase):
+        """Should load every draft and its items in a single round trip."""
+        query = mock_supabase.table.return_value.select.return_value
+        query.eq.return_value.execute.return_value.data = [
+            {"id": "d1", "items": [{"product_id": "p1"}]},
+            {"id": "d2", "items": None},
+        ]
+
+        drafts = draft_service.list_drafts_for_boat("boat-1")
+
+        assert _tables(mock_supabase) == ["boat_factory_drafts"]
+        assert "items:draft_items(*)" in mock_supabase.table.return_value.select.call_args.args[0]
+        assert [len(d["items"]) for d in drafts] == [1, 0]
+
+    def test_get_draft_returns_none_when_missing(self, draft_service, mock_supabase):
+        query = mock_supabase.table.return_value.select.return_value
+        query.eq.return_value.eq.return_value.execute.return_value.data = []
+
+        assert draft_service.get_draft("boat-1", "factory-1") is None
+
+
+# ===================
+# FLAGGING TESTS
+# ===================
+
+class TestFlagLaterDrafts:
+    """Tests for _flag_later_drafts()"""
+
+    def test_flags_later_drafts_in_one_update(self, draft_service, mock_supabase):
+        """Should flag only later, uncommitted drafts with a single in_ update."""
+        boats = MagicMock()
+        boats.select.return_value.eq.return_value.execute.return_value.data = [
+            {"departure_date": "2026-03-01"}
+        ]
+        drafts = MagicMock()
+        drafts.select.return_value.eq.return_value.neq.return_value.execute.return_value.data = [
+            {"id": "earlier", "status": "drafting", "boat_schedules": {"departure_date": "2026-02-01"}},
+            {"id": "later", "status": "drafting", "boat_schedules": {"departure_date": "2026-04-01"}},
+            {"id": "later-ordered", "status": "ordered", "boat_schedules": {"departure_date": "2026-04-01"}},
+            {"id": "later-2", "status": "action_needed", "boat_schedules": {"departure_date": "2026-05-01"}},
+        ]
+        mock_supabase.table.side_effect = lambda name: boats if name == "boat_schedules" else drafts
+
+        flagged = draft_service._flag_later_drafts("boat-1", "factory-1", "earlier_draft_modified")
+
+        assert flagged == 2
+        drafts.update.assert_called_once()
+        drafts.update.return_value.in_.assert_called_once_with("id", ["later", "later-2"])
+
+
+# ===================
+# SAVE TESTS
+# ===================
+
+def _stored(item_id: str, product_id: str, pallets: int, **extra) -> dict:
+    return {
+        "id": item_id,
+        "draft_id": "d1",
+        "product_id": product_id,
+        "selected_pallets": pallets,
+        "bl_number": None,
+        "notes": None,
+        "snapshot_data": None,
+        "suggested_pallets": None,
+        **extra,
+    }
+
+
+class TestSaveDraftDiff:
+    """Tests for save_draft() diffing"""
+
+    def test_diff_items(self):
+        """Should upsert changed/new rows, keep unchanged and delete removed."""
+        stored = [
+            _stored("i1", "p1", 2),
+            _stored("i2", "p2", 4),
+            _stored("i3", "p3", 1),
+        ]
+        rows = DraftService._build_item_rows("d1", [
+            {"product_id": "p1", "selected_pallets": 2.0},
+            {"product_id": "p2", "selected_pallets": 5},
+            {"product_id": "p4", "selected_pallets": 1},
+        ], auto_bl=False)
+
+        to_upsert, unchanged, to_delete = DraftService._diff_items(stored, rows)
+
+        assert [(r["product_id"], r.get("id")) for r in to_upsert] == [("p2", "i2"), ("p4", None)]
+        assert [r["id"] for r in unchanged] == ["i1"]
+        assert to_delete == ["i3"]
+
+    def _wire(self, mock_supabase, stored_items, notes=None):
+        boats = MagicMock()
+        boats.select.return_value.eq.return_value.single.return_value.execute.return_value.data = {
+            "status": "available", "departure_date": "2099-01-01",
+        }
+        drafts = MagicMock()
+        drafts.select.return_value.eq.return_value.eq.return_value.execute.return_value.data = [
+            {"id": "d1", "status": "drafting", "notes": notes, "items": stored_items},
+        ]
+        drafts.update.return_value.eq.return_value.execute.return_value.data = [{"id": "d1"}]
+        items = MagicMock()
+        items.upsert.return_value.execute.return_value.data = []
+        factories = MagicMock()
+        factories.select.return_value.eq.return_value.execute.return_value.data = []
+        by_name = {
+            "boat_schedules": boats,
+            "boat_factory_drafts": drafts,
+            "draft_items": items,
+            "factories": factories,
+        }
+        mock_supabase.table.side_effect = by_name.__getitem__
+        return drafts, items
+
+    def test_unchanged_save_is_noop(self, draft_service, mock_supabase):
+        """Should not write anything when items and notes are unchanged."""
+        drafts, items = self._wire(mock_supabase, [_stored("i1", "p1", 2)])
+
+        draft = draft_service.save_draft(
+            "boat-1", "factory-1", None, [{"product_id": "p1", "selected_pallets": 2}]
+        )
+
+        drafts.update.assert_not_called()
+        items.upsert.assert_not_called()
+        items.delete.assert_not_called()
+        assert [i["id"] for i in draft["items"]] == ["i1"]
+
+    def test_changed_save_upserts_and_deletes_once(self, draft_service, mock_supabase):
+        """Should issue one upsert for changes and one delete for removed products."""
+        drafts, items = self._wire(mock_supabase, [_stored("i1", "p1", 2), _stored("i2", "p2", 3)])
+
+        with patch.object(draft_service, "_flag_later_drafts") as flag:
+            draft_service.save_draft(
+                "boat-1", "factory-1", None, [{"product_id": "p1", "selected_pallets": 6}]
+            )
+
+        items.upsert.assert_called_once()
+        assert [r["id"] for r in items.upsert.call_args.args[0]] == ["i1"]
+        items.delete.return_value.in_.assert_called_once_with("id", ["i2"])
+        flag.assert_called_once()
@@ -165,6 +165,28 @@ class TestFactoryOrderServiceGetAll:
         assert len(orders) == 1
         assert orders[0].status == OrderStatus.PENDING
 
+    def test_get_all_loads_items_in_one_query(self, mock_supabase, sample_factory_order_data):
+        """Should fetch items for the whole page in one query and join per order."""
+        other = {**sample_factory_order_data, "id": "order-uuid-456", "pv_number": "PV-00017760"}
+        items = [
+            {"factory_order_id": "order-uuid-123", "quantity_ordered": 500.0},
+            {"factory_order_id": "order-uuid-123", "quantity_ordered": 300.0},
+            {"factory_order_id": "order-uuid-456", "quantity_ordered": 100.0},
+        ]
+        with patch("services.factory_order_service.get_supabase_client", return_value=mock_supabase):
+            mock_supabase.set_table_data("factory_orders", [sample_factory_order_data, other])
+            mock_supabase.set_table_data("factory_order_items", items)
+            service = FactoryOrderService()
+
+            with patch.object(mock_supabase, "table", wraps=mock_supabase.table) as table_spy:
+                orders, _ = service.get_all()
+
+        item_queries = [c for c in table_spy.call_args_list if c.args[0] == "factory_order_items"]
+        assert len(item_queries) == 1
+        assert [o.item_count for o in orders] == [2, 1]
+        assert orders[0].total_m2 == Decimal("800.0")
+        assert orders[1].total_m2 == Decimal("100.0")
+
 
 # ===================
 # GET BY ID TESTS
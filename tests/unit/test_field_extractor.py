@@ -0,0 +1,59 @@
+"""
+Unit tests for the precompiled field extraction engine.
+
+Run: pytest tests/unit/test_field_extractor.py -v
+"""
+
+import re
+
+from services.document_parser_service import DocumentParserService
+from utils.field_extractor import FieldExtractor, PatternSet
+
+
+SHP = [r'SHP[#:\s]*(\d{7})', r'B/L\s*No[.:]?\s*(\d{7})']
+
+
+class TestPatternSet:
+    """Tests for PatternSet.search() / find_all()"""
+
+    def test_priority_beats_position(self):
+        """Should return the first pattern that matches, even if a later one matches earlier."""
+        hit = PatternSet("shp", SHP).search("B/L No: 1234567 ... SHP 7654321")
+
+        assert hit.value == "7654321"
+        assert hit.pattern_index == 0
+        assert hit.source_text == "SHP 7654321"
+
+    def test_matches_naive_loop(self):
+        texts = ["", "shp:0045642", "B/L No. 0045642", "nothing here", "SHP 12 B/L No 1234567"]
+        pattern_set = PatternSet("shp", SHP)
+        for text in texts:
+            naive = next((m for p in SHP if (m := re.search(p, text, re.IGNORECASE))), None)
+            hit = pattern_set.search(text)
+            assert (hit.value if hit else None) == (naive.group(1) if naive else None)
+
+    def test_find_all_reports_offsets(self):
+        text = "B/L No: 1234567 ... SHP 7654321"
+        hits = PatternSet("shp", SHP).find_all(text)
+
+        assert [(h.value, h.pattern_index) for h in hits] == [("1234567", 1), ("7654321", 0)]
+        assert all(text[h.start:h.end] == h.source_text for h in hits)
+
+
+class TestFieldExtractor:
+    """Tests for FieldExtractor.scan()"""
+
+    def test_scan_orders_hits_by_offset(self):
+        extractor = FieldExtractor({"shp": SHP, "booking": [r'BOOKING[#:\s]*([A-Z]{3}\d{7})']})
+
+        hits = extractor.scan("BOOKING: BGA0505879\nSHP0045642")
+
+        assert [(h.field, h.value) for h in hits] == [("booking", "BGA0505879"), ("shp", "0045642")]
+
+    def test_parser_field_hits(self):
+        """Should expose every field hit found by the document parser patterns."""
+        text = "B/L No.: SHP0045642\nETD: 22-JAN-2026\nPOL: SHANGHAI\n"
+
+        fields = {h.field for h in DocumentParserService().extract_field_hits(text)}
+
+        assert {"shp_number", "etd", "pol"} <= fields
@@ -0,0 +1,95 @@
+"""
+Unit tests for the all-factories horizon.
+
+Run: pytest tests/unit/test_horizon_batch.py -v
+"""
+
+import asyncio
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+
+from routes import horizon
+from services import planning_inputs_service, snapshot_service
+from services.planning_inputs_service import invalidate_planning_inputs
+from tests.unit.test_planning_inputs_service import table_db
+
+
+# ===================
+# FIXTURES
+# ===================
+
+@pytest.fixture
+def db():
+    return table_db({
+        "factories": [
+            {"id": "f1", "name": "CERAMICA", "production_lead_days": 25,
+             "transport_to_port_days": 5, "monthly_quota_m2": None},
+            {"id": "f2", "name": "PORCELANATO", "production_lead_days": 30,
+             "transport_to_port_days": 3, "monthly_quota_m2": 50000},
+        ],
+        "products": [
+            {"id": "p1", "sku": "NOGAL", "category": "MADERAS", "factory_id": "f1", "tier": "A"},
+        ],
+        "boat_schedules": [
+            {"id": "b1", "vessel_name": "MSC ONE", "departure_date": "2099-01-10",
+             "arrival_date": "2099-01-24", "carrier": "MSC", "status": "available"},
+        ],
+        "boat_factory_drafts": [
+            {"id": "d1", "boat_id": "b1", "factory_id": "f1", "status": "ordered",
+             "ordered_at": "2026-10-17T10:00:00+00:00"},
+        ],
+        "draft_items": [{"draft_id": "d1", "product_id": "p1", "selected_pallets": 5}],
+        "sales": [{"product_id": "p1", "quantity_m2": 900, "week_start": "2026-09-28"}],
+    })
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(db, monkeypatch):
+    monkeypatch.setattr(snapshot_service, "_rpc_available", None)
+    invalidate_planning_inputs()
+    with patch.object(planning_inputs_service, "get_supabase_client", return_value=db), \
+         patch.object(horizon, "get_supabase_client", return_value=db):
+        yield
+    invalidate_planning_inputs()
+    horizon.shutdown_brain_pool()
+
+
+# ===================
+# BATCH TESTS
+# ===================
+
+class TestBatchInputs:
+    """Tests for _batch_inputs()"""
+
+    def test_one_fetch_drafts_per_factory(self, db):
+        factories, inputs = horizon._batch_inputs(date.today())
+
+        assert [f["id"] for f in factories] == ["f1", "f2"]
+        assert [d["selected_pallets"] for d in inputs["f1"]["drafts"]] == [5]
+        assert inputs["f2"]["drafts"] == [] and inputs["f2"]["draft_headers"] == []
+        assert inputs["f1"]["velocities"] is inputs["f2"]["velocities"]
+        assert [b["factory_id"] for b in inputs["f2"]["boats"]] == ["f2"]
+        for table in ("factories", "products", "boat_schedules", "sales", "shipment_items"):
+            assert db.queries[table] == 1, table
+
+    def test_matches_single_factory_inputs(self):
+        _, inputs = horizon._batch_inputs(date.today())
+
+        assert inputs["f1"] == horizon._query_inputs("f1", date.today())
+
+
+class TestGetHorizons:
+    """Tests for GET /api/v2/horizon"""
+
+    @pytest.mark.parametrize("workers", [0, 2])
+    def test_keyed_by_factory(self, workers):
+        with patch.object(horizon.settings, "horizon_batch_workers", workers):
+            response = asyncio.run(horizon.get_horizons())
+
+        f1, f2 = response["factories"]["f1"], response["factories"]["f2"]
+        assert f2["factory_name"] == "PORCELANATO"
+        assert f1["projections"][0]["state"] == "ORDERED"
+        assert f2["projections"][0]["state"] == "FUTURE"
+        assert f1["data_as_of"]["drafts"] == 1 and f2["data_as_of"]["drafts"] == 0
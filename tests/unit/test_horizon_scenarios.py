@@ -0,0 +1,144 @@
+"""
+Unit tests for horizon what-if scenarios.
+
+Run: pytest tests/unit/test_horizon_scenarios.py -v
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from lib.brain import compute_horizon, compute_horizon_variants
+from lib.horizon_scenarios import apply_scenario, diff_horizon
+
+TODAY = date(2026, 10, 18)
+
+
+# ===================
+# FIXTURES
+# ===================
+
+@pytest.fixture
+def inputs():
+    """Four boats a week apart, one ordered draft, SIESA stock on every product."""
+    boats = [
+        {
+            "id": f"b{i}",
+            "name": f"BOAT {i}",
+            "departure_date": (TODAY + timedelta(days=25 + 7 * i)).isoformat(),
+            "arrival_date": (TODAY + timedelta(days=39 + 7 * i)).isoformat(),
+            "carrier": "TIBA",
+        }
+        for i in range(4)
+    ]
+    pids = [f"p{i}" for i in range(6)]
+    return {
+        "products": [{"id": pid, "sku": f"SKU-{pid}", "active": True, "tier": None} for pid in pids],
+        "boats": boats,
+        "inventory": {pid: Decimal(500 * i) for i, pid in enumerate(pids)},
+        "in_transit": {},
+        "velocities": {pid: Decimal(20 + 15 * i) for i, pid in enumerate(pids)},
+        "peak_velocities": {},
+        "factory_stock": {pid: Decimal(4000) for pid in pids},
+        "drafts": [
+            {"boat_id": "b1", "product_id": "p5", "selected_pallets": 12, "status": "ordered", "draft_id": "d1"},
+        ],
+        "draft_headers": [
+            {"boat_id": "b1", "status": "ordered", "draft_id": "d1",
+             "ordered_at": datetime(2026, 10, 17, tzinfo=timezone.utc)},
+        ],
+        "shipment_items": [],
+        "production_schedule": [],
+        "snapshot_created_at": datetime(2026, 10, 10, tzinfo=timezone.utc),
+    }
+
+
+def run(inputs, *scenarios):
+    variants = [apply_scenario(inputs, s) for s in scenarios]
+    return compute_horizon_variants(base=inputs, variants=variants, today=TODAY)
+
+
+# ===================
+# APPLY TESTS
+# ===================
+
+class TestApplyScenario:
+    """Tests for apply_scenario()"""
+
+    def test_delay_skip_and_factory_pct(self, inputs):
+        variant = apply_scenario(inputs, {
+            "boat_delays": {"b2": 7},
+            "skip_boat_ids": ["b0"],
+            "factory_stock_pct": -25,
+        })
+
+        assert [b["id"] for b in variant["boats"]] == ["b1", "b2", "b3"]
+        assert variant["boats"][1]["departure_date"] == "2026-12-03"
+        assert variant["factory_stock"]["p0"] == Decimal(3000)
+        # Base untouched, untouched inputs shared
+        assert inputs["boats"][2]["departure_date"] == "2026-11-26"
+        assert variant["velocities"] is inputs["velocities"]
+
+
+# ===================
+# VARIANT TESTS
+# ===================
+
+class TestComputeHorizonVariants:
+    """Tests for compute_horizon_variants()"""
+
+    @pytest.mark.parametrize("scenario", [
+        {"boat_delays": {"b3": 10}},
+        {"boat_delays": {"b1": 10}},
+        {"skip_boat_ids": ["b2"]},
+        {"factory_stock_pct": -40},
+        {},
+    ])
+    def test_variant_matches_full_recompute(self, inputs, scenario):
+        _, [result] = run(inputs, scenario)
+
+        expected = compute_horizon(**apply_scenario(inputs, scenario), today=TODAY)
+        result.pop("_resumed_at_boat")
+        assert result == expected
+
+    def test_resumes_at_first_changed_boat(self, inputs):
+        _, results = run(
+            inputs,
+            {"boat_delays": {"b3": 3}},  # b2 reads b3's arrival
+            {"skip_boat_ids": ["b3"]},
+            {"factory_stock_pct": -20},
+            {},
+        )
+
+        assert [r["_resumed_at_boat"] for r in results] == [2, 2, 0, 4]
+
+
+# ===================
+# DIFF TESTS
+# ===================
+
+class TestDiffHorizon:
+    """Tests for diff_horizon()"""
+
+    def test_unchanged_scenario_is_empty(self, inputs):
+        base, [same] = run(inputs, {})
+
+        diff = diff_horizon(base, same)
+
+        assert diff["boats"] == [] and diff["boats_removed"] == []
+        assert diff["production_requests"] == {"added": [], "removed": [], "changed": []}
+        assert "factory_order_signal" not in diff
+
+    def test_lists_only_changes(self, inputs):
+        base, [skipped, delayed] = run(inputs, {"skip_boat_ids": ["b3"]}, {"boat_delays": {"b3": 14}})
+
+        assert diff_horizon(base, skipped)["boats_removed"] == ["b3"]
+        diff = diff_horizon(base, delayed)
+        b3 = next(b for b in diff["boats"] if b["boat_id"] == "b3")
+        assert b3["departure_date"] == ["2026-12-03", "2026-12-17"]
+        for boat in diff["boats"]:
+            for product in boat["products"]:
+                changes = {k: v for k, v in product.items() if k not in ("product_id", "sku")}
+                assert set(changes) <= {"suggested_pallets", "allocated_pallets"}
+                assert all(old != new for old, new in changes.values())
@@ -0,0 +1,171 @@
+"""
+Unit tests for JobService (background ingestion jobs).
+
+Run: pytest tests/unit/test_job_service.py -v
+"""
+
+import asyncio
+import os
+
+import pytest
+from fastapi import HTTPException
+
+from models.job import JobStatus
+from services.job_service import JobService
+
+
+# ===================
+# FIXTURES
+# ===================
+
+@pytest.fixture
+def job_service(tmp_path):
+    return JobService(str(tmp_path / "jobs.sqlite3"), max_concurrency=2, retention_hours=1)
+
+
+async def _wait(service: JobService, job_id: str):
+    for _ in range(200):
+        job = service.get(job_id)
+        if job.status.is_finished:
+            return job
+        await asyncio.sleep(0.005)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+# ===================
+# LIFECYCLE TESTS
+# ===================
+
+class TestJobLifecycle:
+    """Tests for submit() / get()"""
+
+    def test_success_stores_result(self, job_service):
+        """Should store the endpoint response as JSON once the job succeeds."""
+        async def scenario():
+            async def run():
+                return {"success": True, "count": 3}
+
+            job_id = job_service.submit("ingest_pdf", run, filename="a.pdf")
+            assert job_service.get(job_id).status in (JobStatus.QUEUED, JobStatus.RUNNING)
+            return await _wait(job_service, job_id)
+
+        job = asyncio.run(scenario())
+
+        assert job.status == JobStatus.SUCCEEDED
+        assert job.status_code == 200
+        assert job.result == {"success": True, "count": 3}
+        assert job.filename == "a.pdf"
+        assert job.started_at is not None
+
+    def test_http_exception_keeps_status_code(self, job_service):
+        """Should record the HTTP status and detail the endpoint would have raised."""
+        async def scenario():
+            async def run():
+                raise HTTPException(status_code=400, detail="File must be a PDF")
+
+            return await _wait(job_service, job_service.submit("ingest_pdf", run))
+
+        job = asyncio.run(scenario())
+
+        assert job.status == JobStatus.FAILED
+        assert job.status_code == 400
+        assert job.error == "File must be a PDF"
+
+    def test_unexpected_error_is_500(self, job_service):
+        async def scenario():
+            async def run():
+                raise RuntimeError("boom")
+
+            return await _wait(job_service, job_service.submit("packing_list", run))
+
+        job = asyncio.run(scenario())
+
+        assert job.status == JobStatus.FAILED
+        assert job.status_code == 500
+
+
+# ===================
+# CONCURRENCY TESTS
+# ===================
+
+class TestConcurrency:
+    """Tests for the max_concurrency bound"""
+
+    def test_runs_at_most_max_concurrency(self, job_service):
+        """Should never run more than max_concurrency jobs at once."""
+        running = 0
+        peak = 0
+
+        async def scenario():
+            async def run():
+                nonlocal running, peak
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+                return {}
+
+            ids = [job_service.submit("ingest_pdf", run) for _ in range(6)]
+            return [await _wait(job_service, job_id) for job_id in ids]
+
+        jobs = asyncio.run(scenario())
+
+        assert peak == 2
+        assert all(j.status == JobStatus.SUCCEEDED for j in jobs)
+
+
+# ===================
+# CANCELLATION TESTS
+# ===================
+
+class TestCancel:
+    """Tests for cancel() / recover()"""
+
+    def test_cancel_running_job(self, job_service):
+        """Should mark a running job cancelled and stop its task."""
+        async def scenario():
+            started = asyncio.Event()
+
+            async def run():
+                started.set()
+                await asyncio.sleep(10)
+                return {}
+
+            job_id = job_service.submit("ingest_pdf", run)
+            await started.wait()
+            assert job_service.cancel(job_id) is True
+            await asyncio.sleep(0)
+            await job_service.shutdown()
+            return job_id
+
+        job = job_service.get(asyncio.run(scenario()))
+
+        assert job.status == JobStatus.CANCELLED
+        assert job.result is None
+
+    def test_cancel_finished_job_is_noop(self, job_service):
+        async def scenario():
+            async def run():
+                return {"ok": True}
+
+            job_id = job_service.submit("ingest_pdf", run)
+            await _wait(job_service, job_id)
+            return job_id, job_service.cancel(job_id)
+
+        job_id, cancelled = asyncio.run(scenario())
+
+        assert cancelled is False
+        assert job_service.get(job_id).status == JobStatus.SUCCEEDED
+
+    def test_recover_fails_jobs_of_dead_workers(self, job_service):
+        """Should fail active jobs whose worker process is gone, not those of live workers."""
+        job_service._execute(
+            "INSERT INTO jobs (id, kind, status, worker_pid, created_at) VALUES"
+            " ('dead', 'ingest_pdf', 'running', NULL, '2026-01-01T00:00:00+00:00'),"
+            " ('live', 'ingest_pdf', 'running', ?, '2026-01-01T00:00:00+00:00')",
+            (os.getppid(),),
+        )
+
+        assert job_service.recover() == 1
+        assert job_service.get("dead").status == JobStatus.FAILED
+        assert job_service.get("live").status == JobStatus.RUNNING
@@ -0,0 +1,59 @@
+"""
+Unit tests for the order plan allocator.
+
+Run: pytest tests/unit/test_order_plan_service.py -v
+"""
+
+import numpy as np
+
+from services.order_plan_service import TIERS, _allocate_boat, _buffers_m2, _classify_tiers
+
+
+# ===================
+# TIER TESTS
+# ===================
+
+class TestClassifyTiers:
+    """Tests for _classify_tiers()"""
+
+    def test_quartiles(self):
+        velocities = np.array([10.0, 80.0, 0.0, 40.0, 20.0, 60.0, 30.0, 50.0, 70.0])
+
+        tiers = TIERS[_classify_tiers(velocities)]
+
+        # 8 positive: top 2 (>= 70) A, down to rank 6 (>= 30) B, rest + zero C
+        assert tiers.tolist() == ["C", "A", "C", "B", "C", "B", "B", "B", "A"]
+
+    def test_no_positive_velocity_is_all_c(self):
+        assert TIERS[_classify_tiers(np.array([0.0, 0.0]))].tolist() == ["C", "C"]
+
+    def test_buffers_clamped_to_tier_pallets(self):
+        """Should clamp weeks of velocity to the tier floor and ceiling (in m²)."""
+        buffers = _buffers_m2(np.array([10.0, 1000.0, 100.0]), np.array([0, 1, 2]))
+
+        assert buffers.tolist() == [5 * 134.4, 15 * 134.4, 200.0]
+
+
+# ===================
+# ALLOCATION TESTS
+# ===================
+
+class TestAllocateBoat:
+    """Tests for _allocate_boat()"""
+
+    def test_fills_in_queue_order_until_capacity(self):
+        """Should give each product min(target, available) until the boat is full."""
+        take = _allocate_boat(
+            target_pallets=np.array([4.0, 6.0, 5.0, 3.0]),
+            available_pallets=np.array([10.0, 2.7, 20.0, 9.0]),
+            capacity=9,
+        )
+
+        assert take.tolist() == [4, 2, 3, 0]
+
+    def test_float_noise_does_not_lose_a_pallet(self):
+        available = np.array([61 * 134.4 / 134.4, 0.0])  # 60.99999999999999
+
+        take = _allocate_boat(np.array([70.0, 5.0]), available, capacity=65)
+
+        assert take.tolist() == [61, 0]
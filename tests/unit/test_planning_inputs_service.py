@@ -0,0 +1,145 @@
+"""
+Unit tests for the shared planner inputs.
+
+Run: pytest tests/unit/test_planning_inputs_service.py -v
+"""
+
+from collections import Counter
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from services import planning_inputs_service, snapshot_service
+from services.planning_inputs_service import get_planning_inputs, invalidate_planning_inputs
+
+TODAY = date(2026, 10, 18)
+
+
+# ===================
+# FIXTURES
+# ===================
+
+def table_db(data_by_table: dict) -> MagicMock:
+    """Client whose every query chain on a table returns that table's rows; counts queries per table."""
+    db = MagicMock()
+    db.queries = Counter()
+
+    def table(name):
+        db.queries[name] += 1
+        query = MagicMock()
+        for method in ("select", "eq", "neq", "in_", "gte", "order", "range", "is_"):
+            getattr(query, method).return_value = query
+        query.execute.return_value = MagicMock(data=data_by_table.get(name, []))
+        return query
+
+    db.table.side_effect = table
+    db.rpc.return_value.execute.return_value.data = {
+        "warehouse": {"snapshot_date": "2026-10-17", "rows": [{"product_id": "p1", "warehouse_qty": 1344}]},
+        "factory": {
+            "snapshot_date": "2026-10-17",
+            "created_at": "2026-10-17T08:00:00+00:00",
+            "rows": [{"product_id": "p1", "factory_available_m2": 2688}],
+        },
+        "in_transit": None,
+    }
+    return db
+
+
+@pytest.fixture
+def db():
+    return table_db({
+        "products": [
+            {"id": "p1", "sku": "NOGAL", "category": "MADERAS", "factory_id": "f1", "tier": "A"},
+            {"id": "p2", "sku": "LAVAMANOS", "category": "SINK", "factory_id": "f1", "tier": None},
+        ],
+        "boat_schedules": [
+            {"id": "b1", "vessel_name": "MSC ONE", "departure_date": "2026-10-25",
+             "arrival_date": "2026-11-08", "carrier": "MSC", "status": "available"},
+            {"id": "b2", "vessel_name": "MSC TWO", "departure_date": "2026-11-10",
+             "arrival_date": "2026-11-24", "carrier": "MSC", "status": "available"},
+        ],
+        "boat_factory_drafts": [
+            {"id": "d1", "boat_id": "b1", "factory_id": "f1", "status": "ordered",
+             "ordered_at": "2026-10-17T10:00:00+00:00"},
+        ],
+        "draft_items": [{"draft_id": "d1", "product_id": "p1", "selected_pallets": 5}],
+        "sales": [
+            {"product_id": "p1", "quantity_m2": 900, "week_start": "2026-09-28"},
+            {"product_id": None, "quantity_m2": 50, "week_start": "2026-09-28"},
+        ],
+        "production_schedule": [
+            {"product_id": "p1", "status": "in_progress", "requested_m2": 1000, "completed_m2": 400,
+             "scheduled_start_date": "2026-10-01", "estimated_delivery_date": "2026-10-20"},
+        ],
+    })
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(db, monkeypatch):
+    monkeypatch.setattr(snapshot_service, "_rpc_available", None)
+    invalidate_planning_inputs()
+    with patch.object(planning_inputs_service, "get_supabase_client", return_value=db):
+        yield
+    invalidate_planning_inputs()
+
+
+# ===================
+# CACHE TESTS
+# ===================
+
+class TestGetPlanningInputs:
+    """Tests for get_planning_inputs() / invalidate_planning_inputs()"""
+
+    def test_bundle_shared_until_invalidated(self, db):
+        first = get_planning_inputs(TODAY)
+        first.sales
+        second = get_planning_inputs(TODAY)
+        second.sales
+
+        assert second is first
+        assert db.queries["sales"] == 1
+
+        invalidate_planning_inputs("draft_saved")
+        assert get_planning_inputs(TODAY) is not first
+
+    def test_new_bundle_for_new_day_or_zero_ttl(self):
+        first = get_planning_inputs(TODAY)
+
+        assert get_planning_inputs(date(2026, 10, 19)) is not first
+        with patch.object(planning_inputs_service.settings, "planning_inputs_ttl_seconds", 0):
+            assert get_planning_inputs(TODAY) is not get_planning_inputs(TODAY)
+
+    def test_sources_are_typed(self):
+        inputs = get_planning_inputs(TODAY)
+
+        assert [p.sku for p in inputs.products if p.is_tile] == ["NOGAL"]
+        assert [s.product_id for s in inputs.sales] == ["p1"]
+        assert inputs.production[0].requested_m2 - inputs.production[0].completed_m2 == 600
+        assert inputs.drafts[0].is_committed
+
+    def test_draft_items_fetches_only_new_drafts(self, db):
+        inputs = get_planning_inputs(TODAY)
+
+        assert [i.selected_pallets for i in inputs.draft_items(["d1"])] == [5]
+        inputs.draft_items(["d1"])
+        assert db.queries["draft_items"] == 1
+
+
+class TestPlannersShareInputs:
+    """Planning View followed by an order plan should not refetch"""
+
+    def test_horizon_then_order_plan_reuse_fetches(self, db):
+        from routes.horizon import _query_inputs
+        from services.order_plan_service import compute_plan
+
+        horizon_inputs = _query_inputs("f1", date.today())
+        plan = compute_plan(["b2", "b1"], max_containers=5, warehouse_buffer_pct=15,
+                            include_production=True, factory_id="f1")
+
+        assert [p["sku"] for p in horizon_inputs["products"]] == ["NOGAL"]
+        assert [b.boat_id for b in plan.boats] == ["b1", "b2"]
+        assert db.rpc.call_count == 1
+        for table in ("products", "boat_schedules", "boat_factory_drafts", "draft_items",
+                      "sales", "production_schedule", "shipment_items"):
+            assert db.queries[table] == 1, table
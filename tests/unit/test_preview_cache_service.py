@@ -0,0 +1,193 @@
+"""
+Unit tests for the upload preview cache.
+
+Run: pytest tests/unit/test_preview_cache_service.py -v
+"""
+
+import asyncio
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from lib.telemetry import CACHE_REQUESTS, PREVIEW_CACHE_EVICTIONS
+from services import preview_cache_service
+from services.preview_cache_service import MemoryPreviewBackend, PreviewBackend, SqlitePreviewBackend
+
+
+# ===================
+# FIXTURES
+# ===================
+
+def make_cache(tmp_path, max_memory_bytes=1_000_000, spill_bytes=100_000, max_disk_bytes=10_000_000):
+    return MemoryPreviewBackend(str(tmp_path), max_memory_bytes, spill_bytes, max_disk_bytes)
+
+
+def payload(n: int) -> bytes:
+    """Incompressible bytes so compressed size is ~n."""
+    return os.urandom(n)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return make_cache(tmp_path)
+
+
+# ===================
+# CACHE TESTS
+# ===================
+
+class TestMemoryPreviewBackend:
+    """Tests for MemoryPreviewBackend store/retrieve/eviction"""
+
+    def test_roundtrip_returns_copy(self, cache):
+        data = {"records": [{"sku": "A", "qty": 3}], "filename": "x.xlsx"}
+        preview_id = cache.store(data)
+
+        first = cache.retrieve(preview_id)
+        first["records"].append({"sku": "B"})
+
+        assert cache.retrieve(preview_id) == data
+        cache.delete(preview_id)
+        assert cache.retrieve(preview_id) is None
+
+    def test_expired_entry_is_a_miss(self, cache):
+        misses = CACHE_REQUESTS.get(cache="preview", result="miss")
+        preview_id = cache.store({"a": 1})
+        cache._entries[preview_id].expires_at = time.time() - 1
+
+        assert cache.retrieve(preview_id) is None
+        assert cache.count == 0
+        assert CACHE_REQUESTS.get(cache="preview", result="miss") == misses + 1
+
+    def test_large_entry_spills_to_disk(self, tmp_path):
+        """Should write entries over spill_bytes straight to disk and still serve them."""
+        cache = make_cache(tmp_path, spill_bytes=1000)
+        data = payload(5000)
+        preview_id = cache.store(data)
+
+        assert cache.memory_bytes == 0
+        assert os.path.exists(cache._entries[preview_id].path)
+        assert cache.retrieve(preview_id) == data
+
+        cache.delete(preview_id)
+        assert cache.disk_bytes == 0
+        assert not os.listdir(cache.directory)
+
+    def test_memory_budget_spills_least_recently_used(self, tmp_path):
+        """Should move the least recently read preview to disk when memory is over budget."""
+        cache = make_cache(tmp_path, max_memory_bytes=2500, spill_bytes=2000)
+        spills = PREVIEW_CACHE_EVICTIONS.get(reason="spill")
+        ids = [cache.store(payload(1000)) for _ in range(2)]
+        cache.retrieve(ids[0])  # ids[1] is now least recently used
+
+        cache.store(payload(1000))
+
+        assert cache._entries[ids[0]].blob is not None
+        assert cache._entries[ids[1]].path is not None
+        assert cache.memory_bytes <= 2500
+        assert PREVIEW_CACHE_EVICTIONS.get(reason="spill") == spills + 1
+        assert cache.retrieve(ids[1]) is not None
+
+    def test_disk_budget_drops_oldest_and_sweep_removes_expired(self, tmp_path):
+        cache = make_cache(tmp_path, spill_bytes=0, max_disk_bytes=2500)
+        ids = [cache.store(payload(1000)) for _ in range(3)]
+
+        assert cache.retrieve(ids[0]) is None
+        assert cache.retrieve(ids[2]) is not None
+
+        cache._entries[ids[1]].expires_at = time.time() - 1
+        assert cache.sweep() == 1
+        assert cache.count == 1
+
+    def test_removes_spill_dirs_of_dead_processes(self, tmp_path):
+        """Should clear spill directories left by exited workers but keep live ones."""
+        dead = tmp_path / "999999999"
+        live = tmp_path / str(os.getppid())
+        for directory in (dead, live):
+            directory.mkdir()
+            (directory / "x.preview").write_bytes(b"x")
+
+        make_cache(tmp_path)
+
+        assert not dead.exists()
+        assert live.exists()
+
+
+class TestSqlitePreviewBackend:
+    """Tests for SqlitePreviewBackend shared across workers"""
+
+    def test_preview_visible_to_other_worker(self, tmp_path):
+        """Should let a second backend on the same file (another worker) confirm and delete."""
+        db_path = str(tmp_path / "previews.sqlite3")
+        worker_a = SqlitePreviewBackend(db_path, max_bytes=10_000_000)
+        worker_b = SqlitePreviewBackend(db_path, max_bytes=10_000_000)
+        data = {"records": [{"sku": "A", "qty": 3}], "file_bytes": b"xlsx"}
+
+        preview_id = worker_a.store(data)
+
+        assert worker_b.retrieve(preview_id) == data
+        worker_b.delete(preview_id)
+        assert worker_a.retrieve(preview_id) is None
+
+    def test_expiry_and_capacity(self, tmp_path):
+        backend = SqlitePreviewBackend(str(tmp_path / "previews.sqlite3"), max_bytes=2500)
+        ids = [backend.store(payload(1000)) for _ in range(3)]
+
+        assert backend.retrieve(ids[0]) is None  # least recently used, over budget
+        assert backend.stats()["sqlite"] <= 2500
+
+        backend._execute("UPDATE previews SET expires_at = 0 WHERE id = ?", (ids[1],))
+        assert backend.sweep() == 1
+        assert backend.retrieve(ids[2]) is not None
+
+
+class TestPreviewBackend:
+    """Tests for the PreviewBackend interface"""
+
+    def test_incomplete_backend_fails_on_construction(self):
+        class NoSweep(PreviewBackend):
+            def store(self, data, ttl_minutes=30):
+                return "id"
+
+            def retrieve(self, preview_id):
+                return None
+
+            def delete(self, preview_id):
+                pass
+
+            def stats(self):
+                return {}
+
+        with pytest.raises(TypeError, match="sweep"):
+            NoSweep()
+
+
+class TestPreviewHelpers:
+    """Tests for store_preview / retrieve_preview / delete_preview"""
+
+    def test_backend_runs_off_the_event_loop(self, tmp_path):
+        """Should keep SQLite waits off the loop: the backend sees a worker thread."""
+        backend = SqlitePreviewBackend(str(tmp_path / "previews.sqlite3"), max_bytes=10_000_000)
+        threads = []
+        store = backend.store
+
+        def recording_store(*args):
+            threads.append(threading.current_thread())
+            return store(*args)
+
+        async def scenario():
+            preview_id = await preview_cache_service.store_preview({"rows": [1, 2]})
+            data = await preview_cache_service.retrieve_preview(preview_id)
+            await preview_cache_service.delete_preview(preview_id)
+            return data, await preview_cache_service.retrieve_preview(preview_id)
+
+        with patch.object(preview_cache_service, "get_preview_cache", return_value=backend), \
+             patch.object(backend, "store", side_effect=recording_store):
+            data, after_delete = asyncio.run(scenario())
+
+        assert data == {"rows": [1, 2]}
+        assert after_delete is None
+        assert threads and threads[0] is not threading.main_thread()
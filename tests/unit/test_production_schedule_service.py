@@ -0,0 +1,138 @@
+"""
+Unit tests for ProductionScheduleService Excel parsing and rematching.
+
+Run: pytest tests/unit/test_production_schedule_service.py -v
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+import pytest
+from openpyxl import Workbook
+from openpyxl.styles import PatternFill
+
+from models.production_schedule import ProductionStatus
+from services.production_schedule_service import ProductionScheduleService
+
+
+# ===================
+# FIXTURES
+# ===================
+
+@pytest.fixture
+def service(mock_supabase):
+    with patch("services.production_schedule_service.get_supabase_client", return_value=mock_supabase), \
+         patch("services.production_schedule_service.get_product_service"):
+        yield ProductionScheduleService()
+
+
+@pytest.fixture
+def schedule_file(tmp_path):
+    """Monthly sheet with two plants, color-coded referencias and rows outside the schedule block."""
+    wb = Workbook()
+    wb.active.title = "RESUMEN"
+    ws = wb.create_sheet("ENERO-26")
+
+    # Plant 1: item 5, ref 11, programa 17, real 19, dates 1-3
+    ws.cell(18, 11, "NOGAL CAFÉ BTE").fill = PatternFill("solid", fgColor=ProductionScheduleService.COLOR_GREEN)
+    ws.cell(18, 5, "1234")
+    ws.cell(18, 17, 1500.5)
+    ws.cell(18, 19, 1500.5)
+    ws.cell(18, 1, datetime(2026, 1, 5))
+    ws.cell(18, 2, date(2026, 1, 9))
+    ws.cell(18, 3, datetime(2026, 1, 20))
+
+    ws.cell(19, 11, "TOTAL")
+    ws.cell(19, 17, 9999)
+
+    ws.cell(20, 11, "CEIBA GRIS").fill = PatternFill("solid", fgColor=ProductionScheduleService.COLOR_ORANGE)
+    ws.cell(20, 17, 2000)
+
+    ws.cell(51, 11, "OUTSIDE RANGE")
+    ws.cell(51, 17, 100)
+
+    # Plant 2: item 20, ref 28, programa 34, real 36, dates 23-24
+    ws.cell(25, 28, "ALMENDRO").fill = PatternFill("solid", fgColor=ProductionScheduleService.COLOR_LIGHT_BLUE)
+    ws.cell(25, 20, 5678)
+    ws.cell(25, 36, 300)
+    ws.cell(25, 24, datetime(2026, 2, 1))
+
+    path = tmp_path / "programa.xlsx"
+    wb.save(path)
+    return str(path)
+
+
+# ===================
+# PARSING TESTS
+# ===================
+
+class TestParseProductionExcel:
+    """Tests for parse_production_excel()"""
+
+    def test_parses_both_plants_with_color_status(self, service, schedule_file):
+        records = service.parse_production_excel(schedule_file)
+
+        assert [(r.plant, r.referencia, r.source_row, r.status) for r in records] == [
+            ("plant_1", "NOGAL CAFÉ BTE", 18, ProductionStatus.COMPLETED),
+            ("plant_1", "CEIBA GRIS", 20, ProductionStatus.SCHEDULED),
+            ("plant_2", "ALMENDRO", 25, ProductionStatus.IN_PROGRESS),
+        ]
+        first = records[0]
+        assert first.factory_item_code == "1234"
+        assert first.requested_m2 == Decimal("1500.5")
+        assert first.scheduled_start_date == date(2026, 1, 5)
+        assert first.scheduled_end_date == date(2026, 1, 9)
+        assert first.estimated_delivery_date == date(2026, 1, 20)
+        assert first.source_month == "ENERO-26"
+        assert first.source_file == "programa.xlsx"
+
+        plant2 = records[2]
+        assert plant2.factory_item_code == "5678"
+        assert plant2.requested_m2 == Decimal("0")
+        assert plant2.completed_m2 == Decimal("300")
+        assert plant2.scheduled_end_date == date(2026, 2, 1)
+        assert plant2.estimated_delivery_date is None
+
+    def test_loads_workbook_once(self, service, schedule_file):
+        """Should read values and fills from a single workbook load."""
+        from services import production_schedule_service as module
+
+        with patch.object(module, "load_workbook", wraps=module.load_workbook) as load:
+            service.parse_production_excel(schedule_file, source_month="ENE")
+
+        assert load.call_count == 1
+
+
+# ===================
+# REMATCH TESTS
+# ===================
+
+class TestRematchProducts:
+    """Tests for rematch_products()"""
+
+    def test_one_update_per_product(self, service):
+        """Should update all rows of a product's factory codes at once and report per code."""
+        service.db = MagicMock()
+        table = service.db.table.return_value
+        table.select.return_value.is_.return_value.execute.return_value.data = [
+            {"id": "r1", "factory_code": "5495"},
+            {"id": "r2", "factory_code": "5495"},
+            {"id": "r3", "factory_code": "5498"},
+            {"id": "r4", "factory_code": "9999"},
+        ]
+        update = table.update.return_value.in_.return_value.is_.return_value.execute
+        update.side_effect = [
+            MagicMock(data=[{"factory_code": "5495"}, {"factory_code": "5495"}, {"factory_code": "5498"}]),
+        ]
+        service.product_service.get_by_factory_codes.return_value = [
+            MagicMock(id="p1", factory_code="5495"),
+            MagicMock(id="p1", factory_code="5498"),
+        ]
+
+        processed, matched, by_code = service.rematch_products()
+
+        assert (processed, matched) == (4, 3)
+        assert by_code == {"5495": 2, "5498": 1}
+        table.update.assert_called_once_with({"product_id": "p1"})
+        assert sorted(table.update.return_value.in_.call_args.args[1]) == ["5495", "5498"]
@@ -0,0 +1,118 @@
+"""
+Unit tests for per-request DB query instrumentation.
+
+Run: pytest tests/unit/test_query_stats.py -v
+"""
+
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from config.database import run_db
+from lib.query_stats import (
+    InstrumentedTransport,
+    QueryRecord,
+    QueryStats,
+    _table_from_path,
+    end_request_stats,
+    get_current_stats,
+    query_stats_middleware,
+    start_request_stats,
+)
+
+
+def _fake_postgrest(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, headers={"Content-Range": "0-9/*"}, json=[])
+
+
+def _client() -> httpx.Client:
+    return httpx.Client(transport=InstrumentedTransport(httpx.MockTransport(_fake_postgrest)))
+
+
+class TestTableFromPath:
+    """Tests for _table_from_path()"""
+
+    def test_rest_table(self):
+        assert _table_from_path("/rest/v1/products") == "products"
+
+    def test_rpc(self):
+        assert _table_from_path("/rest/v1/rpc/latest_stock") == "rpc:latest_stock"
+
+    def test_storage(self):
+        assert _table_from_path("/storage/v1/object/docs/a.pdf") == "storage"
+
+
+class TestInstrumentedTransport:
+    """Tests for InstrumentedTransport recording."""
+
+    def test_records_nothing_outside_request(self):
+        """Should pass through when no stats scope is open."""
+        _client().get("http://db/rest/v1/products")
+
+        assert get_current_stats() is None
+
+    def test_records_table_and_rows(self):
+        """Should record table, method and row count from Content-Range."""
+        stats, token = start_request_stats()
+        try:
+            client = _client()
+            client.get("http://db/rest/v1/products")
+            client.post("http://db/rest/v1/sales")
+        finally:
+            end_request_stats(token)
+
+        assert stats.count == 2
+        assert [r.table for r in stats.records] == ["products", "sales"]
+        assert stats.records[0].rows == 10
+        assert stats.by_table()["products"]["queries"] == 1
+
+    def test_records_from_db_thread_pool(self):
+        """Calls made through run_db should count toward the request."""
+        async def scenario():
+            stats, token = start_request_stats()
+            client = _client()
+            await asyncio.gather(*(
+                run_db(client.get, "http://db/rest/v1/draft_items") for _ in range(3)
+            ))
+            end_request_stats(token)
+            return stats
+
+        stats = asyncio.run(scenario())
+
+        assert stats.count == 3
+
+
+class TestServerTiming:
+    """Tests for QueryStats.server_timing() and the middleware."""
+
+    def test_server_timing_format(self):
+        stats = QueryStats()
+        stats.add(QueryRecord(
+            table="products", method="GET", duration_ms=12.34, rows=5, status=200,
+        ))
+
+        header = stats.server_timing()
+
+        assert header.startswith('db;dur=12.3;desc="1 queries"')
+        assert 'db-products;dur=12.3' in header
+
+    def test_middleware_adds_header(self):
+        """Should add Server-Timing to responses that queried the DB."""
+        app = FastAPI()
+        app.middleware("http")(query_stats_middleware)
+
+        @app.get("/with-db")
+        async def with_db():
+            await run_db(_client().get, "http://db/rest/v1/products")
+            return {"ok": True}
+
+        @app.get("/no-db")
+        async def no_db():
+            return {"ok": True}
+
+        client = TestClient(app)
+
+        assert "db;dur=" in client.get("/with-db").headers["server-timing"]
+        assert "server-timing" not in client.get("/no-db").headers
@@ -0,0 +1,134 @@
+"""
+Unit tests for latest-snapshot reads.
+
+Run: pytest tests/unit/test_snapshot_service.py -v
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from postgrest.exceptions import APIError
+
+from services import snapshot_service
+from services.snapshot_service import get_current_inventory, get_latest_snapshots
+
+
+# ===================
+# FIXTURES
+# ===================
+
+@pytest.fixture(autouse=True)
+def reset_availability(monkeypatch):
+    monkeypatch.setattr(snapshot_service, "_rpc_available", None)
+    monkeypatch.setattr(snapshot_service, "_mv_available", None)
+
+
+def table_db(data_by_table: dict) -> MagicMock:
+    """Client whose every query chain on a table returns that table's rows."""
+    db = MagicMock()
+
+    def table(name):
+        query = MagicMock()
+        for method in ("select", "order", "limit", "eq"):
+            getattr(query, method).return_value = query
+        query.execute.return_value = MagicMock(data=data_by_table.get(name, []))
+        return query
+
+    db.table.side_effect = table
+    return db
+
+
+# ===================
+# LATEST SNAPSHOTS
+# ===================
+
+class TestGetLatestSnapshots:
+    """Tests for get_latest_snapshots()"""
+
+    def test_single_rpc_call(self):
+        db = MagicMock()
+        db.rpc.return_value.execute.return_value.data = {
+            "warehouse": {"snapshot_date": "2026-10-01", "rows": [{"product_id": "p1", "warehouse_qty": 10}]},
+            "factory": {
+                "snapshot_date": "2026-10-02",
+                "created_at": "2026-10-02T08:00:00+00:00",
+                "rows": [{"product_id": "p1", "factory_available_m2": 500}],
+            },
+            "in_transit": None,
+        }
+
+        result = get_latest_snapshots(db)
+
+        db.rpc.assert_called_once_with("latest_snapshots", {})
+        db.table.assert_not_called()
+        assert result.warehouse.rows == [{"product_id": "p1", "warehouse_qty": 10}]
+        assert result.factory.created_at == "2026-10-02T08:00:00+00:00"
+        assert result.in_transit.snapshot_date is None
+        assert result.in_transit.rows == []
+
+    def test_falls_back_to_direct_queries_without_migration(self):
+        """Should use the two-query path when latest_snapshots() doesn't exist, and stop trying it."""
+        db = table_db({
+            "warehouse_snapshots": [{"snapshot_date": "2026-10-01", "product_id": "p1", "warehouse_qty": 10}],
+            "factory_snapshots": [],
+            "transit_snapshots": [{"snapshot_date": "2026-10-03", "product_id": "p2", "in_transit_qty": 5}],
+        })
+        db.rpc.side_effect = APIError({
+            "code": "PGRST202",
+            "message": "Could not find the function public.latest_snapshots without parameters",
+        })
+
+        result = get_latest_snapshots(db)
+        get_latest_snapshots(db)
+
+        assert db.rpc.call_count == 1
+        assert result.warehouse.snapshot_date == "2026-10-01"
+        assert result.factory.rows == []
+        assert result.in_transit.rows[0]["in_transit_qty"] == 5
+
+    def test_transient_error_retries_rpc(self):
+        """A timeout falls back for that call only; the next call tries the RPC again."""
+        db = table_db({})
+        db.rpc.return_value.execute.side_effect = [
+            TimeoutError("The read operation timed out"),
+            MagicMock(data={"warehouse": {"snapshot_date": "2026-10-01", "rows": []}}),
+        ]
+
+        first = get_latest_snapshots(db)
+        second = get_latest_snapshots(db)
+
+        assert first.warehouse.snapshot_date is None
+        assert second.warehouse.snapshot_date == "2026-10-01"
+        assert snapshot_service._rpc_available is True
+
+
+class TestGetCurrentInventory:
+    """Tests for get_current_inventory()"""
+
+    def test_falls_back_to_view(self):
+        db = MagicMock()
+        view_rows = [{"product_id": "p1"}]
+
+        def table(name):
+            query = MagicMock()
+            if name == "inventory_current_mv":
+                query.select.side_effect = APIError({"code": "42P01", "message": "relation does not exist"})
+            else:
+                query.select.return_value.execute.return_value.data = view_rows
+            return query
+
+        db.table.side_effect = table
+
+        assert get_current_inventory(db) == view_rows
+        assert [c.args[0] for c in db.table.call_args_list] == ["inventory_current_mv", "inventory_current"]
+
+    def test_transient_error_keeps_refreshing(self):
+        """A dropped connection on the MV read must not switch off its refreshes."""
+        db = MagicMock()
+        db.table.return_value.select.return_value.execute.side_effect = [ConnectionResetError(), MagicMock(data=[])]
+
+        get_current_inventory(db)
+        snapshot_service.refresh_current_inventory(db)
+
+        assert snapshot_service._mv_available is None
+        db.rpc.assert_called_once_with("refresh_inventory_current", {})
@@ -0,0 +1,151 @@
+"""
+Unit tests for the Monte Carlo stockout risk.
+
+Run: pytest tests/unit/test_stockout_risk.py -v
+"""
+
+import asyncio
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from lib.stockout_risk import horizon_stockout_risk, stockout_probabilities
+from routes import horizon
+from tests.unit.test_horizon_batch import db, fresh_cache  # noqa: F401  (fixtures)
+
+TODAY = date(2026, 10, 18)
+
+
+# ===================
+# ENGINE TESTS
+# ===================
+
+class TestStockoutProbabilities:
+    """Tests for stockout_probabilities()"""
+
+    def test_steady_demand_is_certain(self):
+        """Same sales every week: 70 m²/week = 10 m²/day, no randomness left."""
+        probabilities = stockout_probabilities(
+            stock=np.array([100.0]),
+            weekly_sales=np.array([[70.0, 70.0, 70.0]]),
+            arrival_days=np.array([7, 14, 28]),
+            arrivals=np.array([[50.0, 0.0, 0.0]]),
+            paths=200,
+            seed=1,
+        )
+
+        # Day 7: 70 sold of 100. Day 14: 140 of 150. Day 28: 280 of 150.
+        assert probabilities.tolist() == [[0.0, 0.0, 1.0]]
+
+    def test_bootstrap_over_weeks(self):
+        """Half the history weeks sell 140: a one-week gap runs out half the time."""
+        probabilities = stockout_probabilities(
+            stock=np.array([100.0, 1000.0]),
+            weekly_sales=np.array([[0.0, 140.0], [0.0, 140.0]]),
+            arrival_days=np.array([7]),
+            arrivals=np.zeros((2, 1)),
+            paths=4000,
+            seed=7,
+        )
+
+        assert probabilities[0, 0] == pytest.approx(0.5, abs=0.05)
+        assert probabilities[1, 0] == 0
+
+    def test_boats_in_any_order(self):
+        """Probabilities follow the boats given; once out, later boats count it too."""
+        rng = np.random.default_rng(3)
+        args = dict(
+            stock=rng.uniform(0, 500, 40),
+            weekly_sales=rng.uniform(0, 200, (40, 12)),
+            arrivals=rng.uniform(0, 300, (40, 4)),
+            paths=500,
+            seed=11,
+        )
+
+        ordered = stockout_probabilities(arrival_days=np.array([5, 19, 33, 60]), **args)
+        shuffled = stockout_probabilities(
+            arrival_days=np.array([33, 5, 60, 19]),
+            **{**args, "arrivals": args["arrivals"][:, [2, 0, 3, 1]]},
+        )
+
+        assert np.array_equal(shuffled, ordered[:, [2, 0, 3, 1]])
+        assert (np.diff(ordered, axis=1) >= 0).all()
+
+    def test_block_size_does_not_change_result(self, monkeypatch):
+        """Blocks follow the element budget; one product per block gives the same answer."""
+        from lib import stockout_risk
+
+        rng = np.random.default_rng(5)
+        args = dict(
+            stock=rng.uniform(0, 500, 30),
+            weekly_sales=rng.uniform(0, 200, (30, 8)),
+            arrival_days=np.array([3, 10, 10, 45]),
+            arrivals=rng.uniform(0, 300, (30, 4)),
+            paths=300,
+            seed=2,
+        )
+        whole = stockout_probabilities(**args)
+
+        monkeypatch.setattr(stockout_risk, "_MAX_BLOCK_ELEMENTS", 1)
+
+        assert np.array_equal(stockout_probabilities(**args), whole)
+
+    def test_no_history_never_runs_out(self):
+        probabilities = stockout_probabilities(
+            stock=np.array([0.0]),
+            weekly_sales=np.zeros((1, 0)),
+            arrival_days=np.array([30]),
+            arrivals=np.zeros((1, 1)),
+        )
+
+        assert probabilities.tolist() == [[0.0]]
+
+
+# ===================
+# HORIZON TESTS
+# ===================
+
+class TestHorizonStockoutRisk:
+    """Tests for horizon_stockout_risk()"""
+
+    def test_uses_allocations_of_boats_still_to_arrive(self):
+        projection = lambda bid, arrival, pallets: {
+            "boat_id": bid,
+            "boat_name": bid.upper(),
+            "arrival_date": arrival,
+            "products": [{"product_id": "p1", "allocated_pallets": pallets}],
+        }
+
+        risk = horizon_stockout_risk(
+            product_ids=["p1", "p2"],
+            inventory={"p1": Decimal(100)},
+            sales_by_week={"p1": {"2026-09-28": Decimal(70), "2026-10-05": Decimal(70)}},
+            projections=[
+                projection("b0", "2026-10-01", 50),  # already landed
+                projection("b1", "2026-10-25", 1),
+                projection("b2", "2026-11-15", 0),
+            ],
+            today=TODAY,
+            seed=1,
+        )
+
+        assert [b["boat_id"] for b in risk["boats"]] == ["b1", "b2"]
+        # Day 7: 70 of 100. Day 28: 280 of 100 + 134.4.
+        assert risk["products"] == {"p1": [0.0, 1.0], "p2": [0.0, 0.0]}
+
+
+class TestGetStockoutRisk:
+    """Tests for GET /api/v2/horizon/{factory_id}/risk"""
+
+    def test_one_row_per_product(self, monkeypatch):
+        monkeypatch.setattr(horizon, "_last_runs", {})
+
+        response = asyncio.run(horizon.get_stockout_risk("f1", paths=200, seed=1))
+
+        # b1 lands in 2099: 1,344 m² on hand never last that long
+        assert [b["boat_id"] for b in response["boats"]] == ["b1"]
+        assert response["products"] == [
+            {"product_id": "p1", "sku": "NOGAL", "stockout_probability": [1.0]},
+        ]
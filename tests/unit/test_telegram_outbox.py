@@ -0,0 +1,155 @@
+"""
+Unit tests for the Telegram outbox.
+
+Run: pytest tests/unit/test_telegram_outbox.py -v
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from integrations.telegram import (
+    DIGEST_SEPARATOR,
+    OutboxMessage,
+    TelegramOutbox,
+    build_digests,
+)
+
+
+class TestBuildDigests:
+    """Tests for build_digests()"""
+
+    def test_coalesces_burst_into_one_digest(self):
+        """Should join small messages with the separator."""
+        digests = build_digests([OutboxMessage("a"), OutboxMessage("b"), OutboxMessage("c")])
+
+        assert len(digests) == 1
+        assert digests[0].text == DIGEST_SEPARATOR.join(["a", "b", "c"])
+        assert digests[0].message_count == 3
+
+    def test_respects_length_limit(self):
+        """Should start a new digest when the limit would be exceeded."""
+        digests = build_digests([OutboxMessage("x" * 60), OutboxMessage("y" * 60)], limit=100)
+
+        assert [d.text for d in digests] == ["x" * 60, "y" * 60]
+
+    def test_does_not_mix_parse_modes(self):
+        """Should keep Markdown and HTML messages in separate digests."""
+        digests = build_digests([
+            OutboxMessage("a", "Markdown"),
+            OutboxMessage("b", "HTML"),
+            OutboxMessage("c", "Markdown"),
+        ])
+
+        assert [d.parse_mode for d in digests] == ["Markdown", "HTML", "Markdown"]
+
+    def test_splits_oversized_message_on_lines(self):
+        """Should split a long message and fire its callback with the last chunk."""
+        callback = lambda: None
+        text = "\n".join(["line %02d" % i for i in range(20)])
+
+        digests = build_digests([OutboxMessage(text, on_delivered=callback)], limit=30)
+
+        assert all(len(d.text) <= 30 for d in digests)
+        assert "\n".join(d.text for d in digests) == text
+        assert digests[-1].callbacks == [callback]
+        assert all(d.callbacks == [] for d in digests[:-1])
+
+
+class TestTelegramOutbox:
+    """Tests for TelegramOutbox delivery."""
+
+    @pytest.fixture(autouse=True)
+    def configured(self):
+        with patch("integrations.telegram.settings") as mock_settings, \
+             patch("integrations.telegram.get_telegram_config", return_value=("token", "chat")):
+            mock_settings.telegram_configured = True
+            yield
+
+    def _run(self, outbox, responses, messages):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return responses[min(len(calls), len(responses)) - 1]
+
+        async def scenario():
+            await outbox.start()
+            await outbox._client.aclose()
+            outbox._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            for msg in messages:
+                outbox.enqueue(*msg)
+            await outbox.stop()
+
+        asyncio.run(scenario())
+        return calls
+
+    def test_enqueue_returns_immediately_and_sends_digest(self):
+        """Should deliver a burst as a single sendMessage call."""
+        outbox = TelegramOutbox(batch_window_seconds=0.05)
+        delivered = []
+        ok = httpx.Response(200, json={"ok": True, "result": {"message_id": 1}})
+
+        calls = self._run(outbox, [ok], [
+            ("first", "Markdown", lambda: delivered.append(1)),
+            ("second", "Markdown", lambda: delivered.append(2)),
+        ])
+
+        assert len(calls) == 1
+        assert delivered == [1, 2]
+        assert outbox.stats["sent"] == 2
+
+    def test_retries_transient_errors(self):
+        """Should retry 5xx responses with backoff, then succeed."""
+        outbox = TelegramOutbox(batch_window_seconds=0, backoff_base_seconds=0.001)
+        responses = [
+            httpx.Response(502),
+            httpx.Response(429, json={"ok": False, "parameters": {"retry_after": 0}}),
+            httpx.Response(200, json={"ok": True, "result": {}}),
+        ]
+
+        calls = self._run(outbox, responses, [("hello", "Markdown", None)])
+
+        assert len(calls) == 3
+        assert outbox.stats["retries"] == 2
+        assert outbox.stats["sent"] == 1
+
+    def test_drops_permanent_errors_without_retry(self):
+        """Should not retry a 400 (e.g. bad Markdown)."""
+        outbox = TelegramOutbox(batch_window_seconds=0, backoff_base_seconds=0.001)
+        bad = httpx.Response(400, json={"ok": False, "description": "can't parse entities"})
+
+        calls = self._run(outbox, [bad], [("*broken", "Markdown", None)])
+
+        assert len(calls) == 1
+        assert outbox.stats["dropped"] == 1
+
+    def test_rejected_digest_resent_one_by_one(self):
+        """Should lose only the message Telegram rejects, not the rest of its digest."""
+        outbox = TelegramOutbox(batch_window_seconds=0.05, backoff_base_seconds=0.001)
+        delivered = []
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if b"*broken" in request.content:
+                return httpx.Response(400, json={"ok": False, "description": "can't parse entities"})
+            return httpx.Response(200, json={"ok": True, "result": {}})
+
+        async def scenario():
+            await outbox.start()
+            await outbox._client.aclose()
+            outbox._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            outbox.enqueue("first", "Markdown", lambda: delivered.append(1))
+            outbox.enqueue("*broken", "Markdown", lambda: delivered.append(2))
+            outbox.enqueue("third", "Markdown", lambda: delivered.append(3))
+            await outbox.stop()
+
+        asyncio.run(scenario())
+
+        assert len(calls) == 4  # the digest, then each message alone
+        assert delivered == [1, 3]
+        assert outbox.stats["sent"] == 2
+        assert outbox.stats["dropped"] == 1
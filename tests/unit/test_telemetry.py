@@ -0,0 +1,135 @@
+"""
+Unit tests for the in-process metrics registry.
+
+Run: pytest tests/unit/test_telemetry.py -v
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from lib.telemetry import (
+    Counter,
+    Histogram,
+    Registry,
+    StepTimer,
+    metrics_middleware,
+    timed_parser,
+    HTTP_REQUEST_DURATION,
+    PARSER_DURATION,
+    REGISTRY,
+    _Metric,
+)
+
+
+class TestHistogram:
+    """Tests for Histogram"""
+
+    def test_cumulative_buckets(self):
+        """Bucket counts should be cumulative and end with +Inf."""
+        h = Histogram("t_seconds", "test", ["step"], buckets=(0.1, 1.0))
+        h.observe(0.05, step="a")
+        h.observe(0.5, step="a")
+        h.observe(5.0, step="a")
+
+        lines = h.render().splitlines()
+
+        assert 't_seconds_bucket{step="a",le="0.1"} 1' in lines
+        assert 't_seconds_bucket{step="a",le="1"} 2' in lines
+        assert 't_seconds_bucket{step="a",le="+Inf"} 3' in lines
+        assert 't_seconds_count{step="a"} 3' in lines
+
+    def test_time_context_manager(self):
+        h = Histogram("t2_seconds", "test", ["step"])
+        with h.time(step="x"):
+            pass
+
+        assert h.count(step="x") == 1
+
+
+class TestCounterAndRegistry:
+    """Tests for Counter and Registry.render()"""
+
+    def test_render_includes_help_and_type(self):
+        registry = Registry()
+        c = registry.register(Counter("hits_total", "Hits", ["cache"]))
+        c.inc(cache="preview")
+        c.inc(cache="preview")
+
+        text = registry.render()
+
+        assert "# HELP hits_total Hits" in text
+        assert "# TYPE hits_total counter" in text
+        assert 'hits_total{cache="preview"} 2' in text
+
+    def test_label_values_escaped(self):
+        c = Counter("esc_total", "Escaping", ["route"])
+        c.inc(route='a"b')
+
+        assert 'esc_total{route="a\\"b"} 1' in c.render()
+
+    def test_metric_without_samples_fails_on_construction(self):
+        class Untyped(_Metric):
+            type_name = "untyped"
+
+        with pytest.raises(TypeError, match="samples"):
+            Untyped("broken", "No samples()")
+
+    def test_global_registry_renders(self):
+        """Callback gauges (cache ratio, queue depth) should render without error."""
+        text = REGISTRY.render()
+
+        assert "# TYPE executor_queue_depth gauge" in text
+        assert 'executor_queue_depth{executor="db"}' in text
+
+
+class TestHelpers:
+    """Tests for timed_parser() and StepTimer"""
+
+    def test_timed_parser_sync_and_async(self):
+        @timed_parser("test_sync")
+        def parse_sync():
+            return 1
+
+        @timed_parser("test_async")
+        async def parse_async():
+            return 2
+
+        assert parse_sync() == 1
+        assert asyncio.run(parse_async()) == 2
+        assert PARSER_DURATION.count(parser="test_sync") == 1
+        assert PARSER_DURATION.count(parser="test_async") == 1
+
+    def test_step_timer_records_steps_and_total(self):
+        h = Histogram("steps_seconds", "test", ["step"])
+        steps = StepTimer(h)
+        steps.mark("one")
+        steps.mark("two")
+        steps.finish()
+
+        assert h.count(step="one") == 1
+        assert h.count(step="two") == 1
+        assert h.count(step="total") == 1
+
+
+class TestMetricsMiddleware:
+    """Tests for metrics_middleware"""
+
+    def test_records_route_template(self):
+        """Should label by route template, not the concrete path."""
+        app = FastAPI()
+        app.middleware("http")(metrics_middleware)
+
+        @app.get("/things/{thing_id}")
+        async def get_thing(thing_id: str):
+            return {"id": thing_id}
+
+        client = TestClient(app)
+        client.get("/things/a")
+        client.get("/things/b")
+
+        assert HTTP_REQUEST_DURATION.count(
+            method="GET", route="/things/{thing_id}", status=200
+        ) == 2
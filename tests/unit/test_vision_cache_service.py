@@ -0,0 +1,160 @@
+"""
+Unit tests for the Claude Vision result cache.
+
+Run: pytest tests/unit/test_vision_cache_service.py -v
+"""
+
+import asyncio
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from services.vision_cache_service import VisionCache, prompt_fingerprint
+
+
+# ===================
+# FIXTURES
+# ===================
+
+@pytest.fixture
+def cache(tmp_path):
+    return VisionCache(str(tmp_path), ttl_seconds=3600, max_bytes=10_000)
+
+
+# ===================
+# CACHE TESTS
+# ===================
+
+class TestVisionCache:
+    """Tests for VisionCache get/put/eviction"""
+
+    def test_roundtrip(self, cache):
+        key = cache.make_key(b"%PDF-1", "v1", "model-a")
+        assert cache.get(key, "test") is None
+
+        cache.put(key, '{"a": 1}', {"a": 1})
+
+        assert cache.get(key, "test") == {"raw_response": '{"a": 1}', "parsed": {"a": 1}}
+
+    def test_key_depends_on_pdf_prompt_and_model(self, cache):
+        """Should give a different key when the PDF, prompt or model changes."""
+        keys = {
+            cache.make_key(b"pdf-1", "v1", "model-a"),
+            cache.make_key(b"pdf-2", "v1", "model-a"),
+            cache.make_key(b"pdf-1", "v2", "model-a"),
+            cache.make_key(b"pdf-1", "v1", "model-b"),
+        }
+        assert len(keys) == 4
+        assert prompt_fingerprint("system", "user") != prompt_fingerprint("system", "user + email")
+
+    def test_expired_entry_is_a_miss(self, cache):
+        key = cache.make_key(b"pdf", "v1", "m")
+        cache.put(key, "raw", {})
+        old = time.time() - 7200
+        os.utime(cache._path(key), (old, old))
+
+        assert cache.get(key, "test") is None
+        assert not os.path.exists(cache._path(key))
+
+    def test_failed_write_leaves_no_temp_file(self, cache):
+        key = cache.make_key(b"pdf", "v1", "m")
+
+        with patch("services.vision_cache_service.os.replace", side_effect=OSError("disk full")):
+            cache.put(key, "raw", {})
+
+        assert os.listdir(cache.directory) == []
+
+    def test_evicts_least_recently_used_over_budget(self, tmp_path):
+        """Should evict the least recently read entries once over max_bytes."""
+        cache = VisionCache(str(tmp_path), ttl_seconds=3600, max_bytes=2500)
+        keys = [cache.make_key(f"pdf-{i}".encode(), "v1", "m") for i in range(3)]
+        now = time.time()
+        for offset, key in enumerate(keys[:2]):
+            cache.put(key, "x" * 1000, {})
+            os.utime(cache._path(key), (now - 100 + offset, now))
+
+        cache.get(keys[0], "test")  # keys[1] is now least recently used
+        cache.put(keys[2], "x" * 1000, {})
+
+        assert os.path.exists(cache._path(keys[0]))
+        assert not os.path.exists(cache._path(keys[1]))
+        assert os.path.exists(cache._path(keys[2]))
+
+
+# ===================
+# PARSER INTEGRATION
+# ===================
+
+CLAUDE_JSON = '{"document_type": "booking", "booking_number": "BGA0505879", "containers": []}'
+
+
+class TestClaudeParserCache:
+    """Tests for ClaudeParserService.parse_pdf() cache use"""
+
+    def test_second_parse_skips_rasterization_and_api(self, cache):
+        """Should serve the same PDF from cache without rendering or calling Claude."""
+        from services import claude_parser_service as module
+
+        service = module.ClaudeParserService()
+        service.client = MagicMock()
+        service.client.messages.create.return_value.content = [MagicMock(text=CLAUDE_JSON)]
+
+        with patch.object(module, "CLAUDE_AVAILABLE", True), \
+             patch.object(module, "anthropic", MagicMock(), create=True), \
+             patch.object(module, "get_vision_cache", return_value=cache), \
+             patch.object(service, "_pdf_to_base64_images", return_value=[]) as rasterize:
+            first = asyncio.run(service.parse_pdf(b"%PDF-scanned"))
+            second = asyncio.run(service.parse_pdf(b"%PDF-scanned"))
+            with_context = asyncio.run(service.parse_pdf(b"%PDF-scanned", email_context="Subject: x"))
+
+        assert second == first
+        assert second.booking_number.value == "BGA0505879"
+        assert rasterize.call_count == 2  # first parse + different email context
+        assert service.client.messages.create.call_count == 2
+        assert with_context.booking_number.value == "BGA0505879"
+
+    def test_unreadable_entry_is_parsed_again(self, cache):
+        """An entry in an older model shape is a miss: Claude is called and the entry replaced."""
+        from services import claude_parser_service as module
+
+        service = module.ClaudeParserService()
+        service.client = MagicMock()
+        service.client.messages.create.return_value.content = [MagicMock(text=CLAUDE_JSON)]
+
+        with patch.object(module, "CLAUDE_AVAILABLE", True), \
+             patch.object(module, "anthropic", MagicMock(), create=True), \
+             patch.object(module, "get_vision_cache", return_value=cache), \
+             patch.object(service, "_pdf_to_base64_images", return_value=[]):
+            key = cache.make_key(
+                b"%PDF-scanned",
+                prompt_fingerprint(service.SYSTEM_PROMPT, "Parse this shipping document and extract all relevant data."),
+                service.MODEL,
+            )
+            cache.put(key, CLAUDE_JSON, {"document_type": "booking", "booking_number": "BGA0505879"})
+
+            result = asyncio.run(service.parse_pdf(b"%PDF-scanned"))
+
+        assert result.booking_number.value == "BGA0505879"
+        assert service.client.messages.create.call_count == 1
+        assert cache.get(key, "test")["parsed"]["booking_number"]["value"] == "BGA0505879"
+
+    def test_malformed_response_is_not_cached(self, cache):
+        """A reply that isn't JSON falls back for this upload only; the next one asks Claude again."""
+        from services import claude_parser_service as module
+
+        service = module.ClaudeParserService()
+        service.client = MagicMock()
+        service.client.messages.create.return_value.content = [MagicMock(text="Sorry, I can't read this.")]
+
+        with patch.object(module, "CLAUDE_AVAILABLE", True), \
+             patch.object(module, "anthropic", MagicMock(), create=True), \
+             patch.object(module, "get_vision_cache", return_value=cache), \
+             patch.object(service, "_pdf_to_base64_images", return_value=[]):
+            first = asyncio.run(service.parse_pdf(b"%PDF-scanned"))
+            asyncio.run(service.parse_pdf(b"%PDF-scanned"))
+
+        assert first.document_type == "unknown"
+        assert service.client.messages.create.call_count == 2
+        assert os.listdir(cache.directory) == []
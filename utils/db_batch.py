@@ -0,0 +1,78 @@
+"""
+Batched Supabase reads and writes.
+
+Replaces per-row query loops (one SELECT per parent row) with one
+`in_` query per chunk of ids, joined in memory by the caller.
+
+Chunking keeps the PostgREST URL (in_ filters go in the query string)
+and request bodies to a sane size; paging inside each chunk works around
+the server-side max-rows cap (1000 by default). Pages are always ordered
+by the unique `id` column: without an ORDER BY, Postgres gives no stable
+row order between page requests, so pages could repeat or skip rows.
+"""
+
+from collections import defaultdict
+from typing import Any, Iterable, Iterator, Sequence
+
+# UUIDs are 36 chars; 100 per in_ filter keeps URLs well under 8 KB
+IN_CHUNK_SIZE = 100
+WRITE_CHUNK_SIZE = 100
+MAX_ROWS_PER_PAGE = 1000
+
+
+def chunked(seq: Sequence, size: int) -> Iterator[Sequence]:
+    """Yield consecutive slices of at most `size` items."""
+    for i in range(0, len(seq), size):
+        yield seq[i:i + size]
+
+
+def select_in(
+    db,
+    table: str,
+    column: str,
+    values: Iterable[Any],
+    columns: str = "*",
+    order: str = "id",
+    chunk_size: int = IN_CHUNK_SIZE,
+) -> list[dict]:
+    """
+    SELECT `columns` FROM `table` WHERE `column` IN (values).
+
+    Duplicate and None values are dropped. Returns [] without querying
+    when there is nothing to look up.
+
+    Args:
+        db: Supabase client
+        table: Table name
+        column: Column to filter on
+        values: Ids to match
+        columns: PostgREST select string
+        order: Column to order each chunk by; `id` is always added as the
+               tie-breaker (the table must have a unique `id` column)
+        chunk_size: Max values per in_ filter
+
+    Returns:
+        All matching rows, in chunk order
+    """
+    unique = list(dict.fromkeys(v for v in values if v is not None))
+    rows: list[dict] = []
+    for chunk in chunked(unique, chunk_size):
+        offset = 0
+        while True:
+            query = db.table(table).select(columns).in_(column, list(chunk)).order(order)
+            if order != "id":
+                query = query.order("id")
+            page = query.range(offset, offset + MAX_ROWS_PER_PAGE - 1).execute().data or []
+            rows.extend(page)
+            if len(page) < MAX_ROWS_PER_PAGE:
+                break
+            offset += MAX_ROWS_PER_PAGE
+    return rows
+
+
+def group_by(rows: Iterable[dict], key: str) -> dict[Any, list[dict]]:
+    """Group rows by the value of `key`."""
+    grouped: dict[Any, list[dict]] = defaultdict(list)
+    for row in rows:
+        grouped[row.get(key)].append(row)
+    return dict(grouped)
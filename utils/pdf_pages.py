@@ -0,0 +1,47 @@
+"""
+Page-level pdfplumber text extraction.
+
+Worker-side functions for DocumentParserService's process pool. Kept in
+a module with no app imports so spawned workers start quickly: each
+worker opens the PDF from bytes and extracts a contiguous page range.
+"""
+
+import time
+from io import BytesIO
+from typing import Iterator, Optional
+
+import pdfplumber
+
+# (page index, text, seconds spent in extract_text)
+PageText = tuple[int, str, float]
+
+
+def count_pages(pdf_bytes: bytes) -> int:
+    """Number of pages in the PDF."""
+    with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
+        return len(pdf.pages)
+
+
+def iter_pages(pdf_bytes: bytes, start: int = 0, stop: Optional[int] = None) -> Iterator[PageText]:
+    """
+    Extract text from pages [start, stop) one at a time, opening the PDF once.
+
+    Pages with no text layer yield "". Timing covers extract_text only,
+    not opening the document. Closing the iterator early closes the PDF.
+    """
+    with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
+        end = len(pdf.pages) if stop is None else min(stop, len(pdf.pages))
+        for index in range(start, end):
+            started = time.perf_counter()
+            text = pdf.pages[index].extract_text() or ""
+            yield index, text, time.perf_counter() - started
+
+
+def extract_page_range(pdf_bytes: bytes, start: int, stop: int) -> list[PageText]:
+    """Extract text from pages [start, stop)."""
+    return list(iter_pages(pdf_bytes, start, stop))
+
+
+def page_ranges(page_count: int, chunk: int) -> list[tuple[int, int]]:
+    """Split [0, page_count) into consecutive ranges of at most `chunk` pages."""
+    return [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
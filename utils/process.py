@@ -0,0 +1,19 @@
+"""
+Process helpers shared by stores that several uvicorn workers write to.
+"""
+
+import os
+from typing import Optional
+
+
+def pid_alive(pid: Optional[int]) -> bool:
+    """True if a process with this pid exists on the host."""
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True